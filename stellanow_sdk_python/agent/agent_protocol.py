@@ -0,0 +1,170 @@
+"""
+Copyright (C) 2022-2025 Stella Technologies (UK) Limited.
+
+Permission is hereby granted, free of charge, to any person obtaining a copy
+of this software and associated documentation files (the "Software"), to deal
+in the Software without restriction, including without limitation the rights
+to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+copies of the Software, and to permit persons to whom the Software is
+furnished to do so, subject to the following conditions:
+
+The above copyright notice and this permission notice shall be included in
+all copies or substantial portions of the Software.
+
+THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING
+FROM, OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS
+IN THE SOFTWARE.
+"""
+
+import asyncio
+import json
+import struct
+from datetime import datetime
+from typing import Any, Optional
+
+from pydantic import PrivateAttr
+
+from stellanow_sdk_python.messages.event import EventKey, StellaNowEventWrapper
+from stellanow_sdk_python.messages.message import Entity, Metadata, StellaNowMessageWrapper
+
+DEFAULT_AGENT_SOCKET_PATH = "/tmp/stellanow-agent.sock"
+
+# Every frame starts with the lengths of the event JSON, the entity ID, the message ID and the priority, followed by
+# the entity ID, the message ID, the priority as a decimal number (empty if unset) and the event JSON, all UTF-8
+# encoded. The agent needs the entity ID to partition its queue and the priority to order it, and forwards the JSON as
+# is.
+FRAME_HEADER = struct.Struct(">IHBB")
+MAX_EVENT_SIZE = 16 * 1024 * 1024
+
+
+class ForwardedEvent(StellaNowEventWrapper):
+    """
+    An event already serialized, received from an agent client or read back from a dead letter file.
+
+    Only the entity ID, message ID and priority are populated, which is all the message queue relies on; the payload,
+    entities, event type and origin date, which some queue strategies and stages use, are read from the JSON when
+    first asked for. Publishing sends the JSON exactly as it was received instead of serializing the model.
+    """
+
+    _event_json: str = PrivateAttr(default="")
+    _value: Optional[dict[str, Any]] = PrivateAttr(default=None)
+
+    @classmethod
+    def from_json(
+        cls, event_json: str, entity_id: str, message_id: Optional[str], priority: Optional[int] = None
+    ) -> "ForwardedEvent":
+        event = cls.model_construct(
+            key=EventKey.model_construct(entity_id=entity_id),
+            value=StellaNowMessageWrapper.model_construct(metadata=Metadata.model_construct(message_id=message_id)),
+            priority=priority,
+        )
+        event._event_json = event_json
+        return event
+
+    def model_dump_json(self, *args: Any, **kwargs: Any) -> str:
+        return self._event_json
+
+    @property
+    def payload(self) -> str:
+        value = self._serialized_value().get("payload")
+        return value if isinstance(value, str) else ""
+
+    @property
+    def entities(self) -> list[Entity]:
+        entities = self._serialized_metadata().get("entityTypeIds")
+        return [
+            Entity(entity_type_definition_id=entity["entityTypeDefinitionId"], entity_id=entity["entityId"])
+            for entity in (entities if isinstance(entities, list) else [])
+            if isinstance(entity, dict) and "entityTypeDefinitionId" in entity and "entityId" in entity
+        ]
+
+    @property
+    def event_type_definition_id(self) -> Optional[str]:
+        value = self._serialized_metadata().get("eventTypeDefinitionId")
+        return value if isinstance(value, str) else None
+
+    @property
+    def message_origin_date_utc(self) -> Optional[datetime]:
+        value = self._serialized_metadata().get("messageOriginDateUTC")
+        try:
+            return datetime.fromisoformat(value.replace("Z", "+00:00")) if isinstance(value, str) else None
+        except ValueError:
+            return None
+
+    def _serialized_value(self) -> dict[str, Any]:
+        if self._value is None:
+            try:
+                value = json.loads(self._event_json)["value"]
+            except (ValueError, KeyError, TypeError):
+                value = None
+            self._value = value if isinstance(value, dict) else {}
+        return self._value
+
+    def _serialized_metadata(self) -> dict[str, Any]:
+        metadata = self._serialized_value().get("metadata")
+        return metadata if isinstance(metadata, dict) else {}
+
+
+def encode_event_frame(event: StellaNowEventWrapper) -> bytes:
+    """Serialize an event into a frame for the agent."""
+    entity_id = event.key.entity_id.encode("utf-8")
+    message_id = (event.message_id or "").encode("utf-8")
+    priority = b"" if event.priority is None else str(event.priority).encode("utf-8")
+    event_json = event.model_dump_json(by_alias=True).encode("utf-8")
+    if len(event_json) > MAX_EVENT_SIZE or len(entity_id) > 0xFFFF or len(message_id) > 0xFF or len(priority) > 0xFF:
+        raise ValueError(f"Event {event.message_id} is too large to forward to the agent")
+    header = FRAME_HEADER.pack(len(event_json), len(entity_id), len(message_id), len(priority))
+    return header + entity_id + message_id + priority + event_json
+
+
+async def read_event_frame(reader: asyncio.StreamReader) -> ForwardedEvent:
+    """
+    Read the next frame sent by an agent client.
+
+    Raises:
+        asyncio.IncompleteReadError: If the client closed the connection.
+        ValueError: If the frame is malformed.
+    """
+    header = FRAME_HEADER.unpack(await reader.readexactly(FRAME_HEADER.size))
+    json_length, entity_id_length, message_id_length, priority_length = header
+    if json_length > MAX_EVENT_SIZE:
+        raise ValueError(f"Event of {json_length} bytes exceeds the {MAX_EVENT_SIZE} byte limit")
+    body = await reader.readexactly(entity_id_length + message_id_length + priority_length + json_length)
+    return _decode_frame_body(body, entity_id_length, message_id_length, priority_length)
+
+
+def decode_event_frames(data: bytes) -> list[ForwardedEvent]:
+    """
+    Decode a block of whole frames, such as the ones read from a shared memory ring.
+
+    Raises:
+        ValueError: If the block does not consist of whole, well-formed frames.
+    """
+    events = []
+    offset = 0
+    while offset < len(data):
+        if len(data) - offset < FRAME_HEADER.size:
+            raise ValueError("Truncated frame header")
+        json_length, entity_id_length, message_id_length, priority_length = FRAME_HEADER.unpack_from(data, offset)
+        offset += FRAME_HEADER.size
+        end = offset + entity_id_length + message_id_length + priority_length + json_length
+        if end > len(data):
+            raise ValueError("Truncated frame body")
+        events.append(_decode_frame_body(data[offset:end], entity_id_length, message_id_length, priority_length))
+        offset = end
+    return events
+
+
+def _decode_frame_body(
+    body: bytes, entity_id_length: int, message_id_length: int, priority_length: int
+) -> ForwardedEvent:
+    entity_id = body[:entity_id_length].decode("utf-8")
+    offset = entity_id_length + message_id_length
+    message_id = body[entity_id_length:offset].decode("utf-8")
+    priority = body[offset : offset + priority_length]
+    event_json = body[offset + priority_length :].decode("utf-8")
+    return ForwardedEvent.from_json(event_json, entity_id, message_id or None, int(priority) if priority else None)
@@ -0,0 +1,197 @@
+"""
+Copyright (C) 2022-2025 Stella Technologies (UK) Limited.
+
+Permission is hereby granted, free of charge, to any person obtaining a copy
+of this software and associated documentation files (the "Software"), to deal
+in the Software without restriction, including without limitation the rights
+to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+copies of the Software, and to permit persons to whom the Software is
+furnished to do so, subject to the following conditions:
+
+The above copyright notice and this permission notice shall be included in
+all copies or substantial portions of the Software.
+
+THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING
+FROM, OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS
+IN THE SOFTWARE.
+"""
+
+import os
+import struct
+import tempfile
+import threading
+from multiprocessing import resource_tracker
+from multiprocessing.shared_memory import SharedMemory
+from typing import IO, Optional
+
+try:
+    import fcntl
+except ImportError:  # Windows: no advisory locks to serialize the processes sharing a ring
+    fcntl = None  # type: ignore[assignment]
+
+DEFAULT_RING_NAME = "stellanow-agent-ring"
+DEFAULT_RING_CAPACITY = 16 * 1024 * 1024
+
+# The ring starts with a header holding a magic number, whether the agent has closed the ring, the capacity of the data
+# area and the total number of bytes ever written (head) and read (tail); the data area follows the header
+RING_HEADER = struct.Struct("<IIQQQ")
+RING_HEADER_SIZE = 64
+RING_MAGIC = 0x53524E47
+
+
+class SharedMemoryRing:
+    """
+    A byte ring in named shared memory, written by many processes and read by one.
+
+    Writers append whole records, so the reader only ever sees complete ones. Writers and the reader serialize on an
+    advisory lock on a file next to the ring; the lock file is reopened after a fork, as a forked child would otherwise
+    share its parent's lock.
+
+    Use create() in the reading process and attach() in the writing ones. Rings need POSIX advisory locks and are not
+    available on Windows.
+    """
+
+    def __init__(self, shared_memory: SharedMemory, name: str):
+        self._shared_memory = shared_memory
+        self.name = name
+        self._buffer = _buffer_of(shared_memory)
+        magic, _, self.capacity, _, _ = RING_HEADER.unpack_from(self._buffer)
+        if magic != RING_MAGIC:
+            raise ValueError(f"Shared memory {name} is not a StellaNow ring")
+        self._thread_lock = threading.Lock()
+        self._lock_file: Optional[IO[bytes]] = None
+        self._lock_file_pid = 0
+
+    @classmethod
+    def create(cls, name: str = DEFAULT_RING_NAME, capacity: int = DEFAULT_RING_CAPACITY) -> "SharedMemoryRing":
+        """Create the ring, closing and replacing one left behind by a reader that did not shut down cleanly."""
+        _require_file_locks()
+        try:
+            shared_memory = SharedMemory(name, create=True, size=RING_HEADER_SIZE + capacity)
+        except FileExistsError:
+            stale = SharedMemory(name)
+            struct.pack_into("<I", _buffer_of(stale), 4, 1)  # Writers still attached to it move on to the new ring
+            stale.close()
+            stale.unlink()
+            shared_memory = SharedMemory(name, create=True, size=RING_HEADER_SIZE + capacity)
+        RING_HEADER.pack_into(_buffer_of(shared_memory), 0, RING_MAGIC, 0, capacity, 0, 0)
+        return cls(shared_memory, name)
+
+    @classmethod
+    def attach(cls, name: str = DEFAULT_RING_NAME) -> "SharedMemoryRing":
+        """
+        Attach to a ring created by another process.
+
+        :raises FileNotFoundError: If no ring of that name exists.
+        """
+        _require_file_locks()
+        shared_memory = SharedMemory(name)
+        # Attaching registers the segment with this process's resource tracker, which would unlink it on exit
+        resource_tracker.unregister(f"/{shared_memory.name}", "shared_memory")
+        return cls(shared_memory, name)
+
+    @property
+    def closed(self) -> bool:
+        """Whether the reader has closed the ring, so writers must attach to its replacement."""
+        return bool(RING_HEADER.unpack_from(self._buffer)[1])
+
+    @property
+    def size(self) -> int:
+        """Number of bytes written and not read yet."""
+        _, _, _, head, tail = RING_HEADER.unpack_from(self._buffer)
+        return int(head - tail)
+
+    def write(self, record: bytes) -> bool:
+        """
+        Append a record.
+
+        :return: False if the ring is too full to hold the record until the reader has caught up.
+        :raises ValueError: If the record is larger than the ring.
+        """
+        if len(record) > self.capacity:
+            raise ValueError(f"Record of {len(record)} bytes exceeds the {self.capacity} byte ring")
+        with self._locked():
+            magic, closed, capacity, head, tail = RING_HEADER.unpack_from(self._buffer)
+            if head - tail + len(record) > capacity:
+                return False
+            self._copy_in(head, record)
+            RING_HEADER.pack_into(self._buffer, 0, magic, closed, capacity, head + len(record), tail)
+        return True
+
+    def read(self) -> bytes:
+        """Take every record written since the last read, concatenated."""
+        with self._locked():
+            magic, closed, capacity, head, tail = RING_HEADER.unpack_from(self._buffer)
+            data = self._copy_out(tail, head - tail)
+            RING_HEADER.pack_into(self._buffer, 0, magic, closed, capacity, head, head)
+        return data
+
+    def close(self) -> None:
+        """Detach from the ring."""
+        del self._buffer
+        self._shared_memory.close()
+        if self._lock_file is not None:
+            self._lock_file.close()
+            self._lock_file = None
+
+    def unlink(self) -> None:
+        """Mark the ring closed for its writers and remove it; only called by the process that created it."""
+        struct.pack_into("<I", self._buffer, 4, 1)
+        self.close()
+        self._shared_memory.unlink()
+
+    def _copy_in(self, position: int, data: bytes) -> None:
+        offset = position % self.capacity
+        first = min(len(data), self.capacity - offset)
+        start = RING_HEADER_SIZE + offset
+        self._buffer[start : start + first] = data[:first]
+        if first < len(data):
+            self._buffer[RING_HEADER_SIZE : RING_HEADER_SIZE + len(data) - first] = data[first:]
+
+    def _copy_out(self, position: int, length: int) -> bytes:
+        offset = position % self.capacity
+        first = min(length, self.capacity - offset)
+        start = RING_HEADER_SIZE + offset
+        data = bytes(self._buffer[start : start + first])
+        if first < length:
+            data += bytes(self._buffer[RING_HEADER_SIZE : RING_HEADER_SIZE + length - first])
+        return data
+
+    def _locked(self) -> "_RingLock":
+        if self._lock_file is None or self._lock_file_pid != os.getpid():
+            # flock() locks belong to the open file, which a forked child shares with its parent
+            self._lock_file = open(os.path.join(tempfile.gettempdir(), f"{self.name}.lock"), "ab")
+            self._lock_file_pid = os.getpid()
+            self._thread_lock = threading.Lock()
+        return _RingLock(self._thread_lock, self._lock_file.fileno())
+
+
+def _buffer_of(shared_memory: SharedMemory) -> memoryview:
+    buffer = shared_memory.buf
+    assert buffer is not None  # Only None once the segment is closed
+    return buffer
+
+
+def _require_file_locks() -> None:
+    if fcntl is None:
+        raise OSError("Shared memory rings need POSIX advisory file locks, which this platform does not provide")
+
+
+class _RingLock:
+    """Holds the thread lock of this process and the file lock shared with the other processes."""
+
+    def __init__(self, thread_lock: threading.Lock, fd: int):
+        self._thread_lock = thread_lock
+        self._fd = fd
+
+    def __enter__(self) -> None:
+        self._thread_lock.acquire()
+        fcntl.flock(self._fd, fcntl.LOCK_EX)
+
+    def __exit__(self, *exc_info: object) -> None:
+        fcntl.flock(self._fd, fcntl.LOCK_UN)
+        self._thread_lock.release()
@@ -0,0 +1,229 @@
+"""
+Copyright (C) 2022-2025 Stella Technologies (UK) Limited.
+
+Permission is hereby granted, free of charge, to any person obtaining a copy
+of this software and associated documentation files (the "Software"), to deal
+in the Software without restriction, including without limitation the rights
+to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+copies of the Software, and to permit persons to whom the Software is
+furnished to do so, subject to the following conditions:
+
+The above copyright notice and this permission notice shall be included in
+all copies or substantial portions of the Software.
+
+THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING
+FROM, OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS
+IN THE SOFTWARE.
+"""
+
+import argparse
+import asyncio
+import os
+import signal
+from typing import Optional
+
+from loguru import logger
+
+from stellanow_sdk_python.agent.agent_protocol import DEFAULT_AGENT_SOCKET_PATH, decode_event_frames, read_event_frame
+from stellanow_sdk_python.agent.shared_memory_ring import DEFAULT_RING_CAPACITY, SharedMemoryRing
+from stellanow_sdk_python.config.eniviroment_config.stellanow_env_config import EnvConfig, StellaNowEnvironmentConfig
+from stellanow_sdk_python.config.enums.auth_strategy import AuthStrategyTypes
+from stellanow_sdk_python.config.enums.logger_config import LoggerLevel
+from stellanow_sdk_python.config.enums.mqtt_client import MqttClientTypes
+from stellanow_sdk_python.configure_sdk import configure_sdk
+from stellanow_sdk_python.message_queue.message_queue_strategy.i_message_queue_strategy import MessageQueueType
+from stellanow_sdk_python.sdk import StellaNowSDK
+
+# Events read from the shared memory ring are queued this many at a time before yielding to the event loop
+RING_BATCH_SIZE = 256
+
+DESCRIPTION = """
+Run a StellaNow agent: a single SDK instance (queue, sink and authentication) that publishes the events application
+processes on this host hand to it over a Unix domain socket with StellaNowAgentSink. Configure it with the same
+environment variables as the SDK (ORGANIZATION_ID, PROJECT_ID and the credentials of the chosen auth strategy).
+"""
+
+
+class StellaNowAgent:
+    """
+    Accepts events from agent clients and publishes them through an SDK instance.
+
+    Clients connect over a Unix domain socket; optionally, events are also drained from a shared memory ring written by
+    StellaNowSharedMemorySink clients.
+    """
+
+    def __init__(
+        self,
+        sdk: StellaNowSDK,
+        socket_path: str = DEFAULT_AGENT_SOCKET_PATH,
+        ring_name: Optional[str] = None,
+        ring_capacity: int = DEFAULT_RING_CAPACITY,
+        ring_poll_interval: float = 0.005,
+    ):
+        """
+        :param ring_name: Name of a shared memory ring to create and drain, or None to only accept socket clients.
+        :param ring_capacity: Size in bytes of the ring's data area; writers are refused while it is full.
+        :param ring_poll_interval: Seconds between checks of an empty ring.
+        """
+        self.sdk = sdk
+        self.socket_path = socket_path
+        self.ring_name = ring_name
+        self.ring_capacity = ring_capacity
+        self.ring_poll_interval = ring_poll_interval
+        self._server: Optional[asyncio.Server] = None
+        self._clients: set[asyncio.StreamWriter] = set()
+        self._ring: Optional[SharedMemoryRing] = None
+        self._ring_task: Optional[asyncio.Task[None]] = None
+
+    async def start(self) -> None:
+        """
+        Start accepting clients, then start the SDK.
+
+        Clients are accepted before the SDK has connected to the broker, so events handed over during startup wait in
+        the agent's queue.
+        """
+        if os.path.exists(self.socket_path):
+            os.unlink(self.socket_path)  # Left behind by an agent that did not shut down cleanly
+        self._server = await asyncio.start_unix_server(self._handle_client, self.socket_path)
+        logger.info(f"StellaNow agent listening on {self.socket_path}")
+        if self.ring_name is not None:
+            self._ring = SharedMemoryRing.create(self.ring_name, self.ring_capacity)
+            self._ring_task = asyncio.create_task(self._drain_ring(self._ring))
+            logger.info(f"StellaNow agent draining shared memory ring {self.ring_name}")
+        await self.sdk.start()
+
+    async def stop(self) -> None:
+        """Stop accepting events, then publish the ones already received and stop the SDK."""
+        server, self._server = self._server, None
+        if server is not None:
+            server.close()
+            await server.wait_closed()
+            for writer in list(self._clients):
+                writer.close()
+            if os.path.exists(self.socket_path):
+                os.unlink(self.socket_path)
+        ring, self._ring = self._ring, None
+        if ring is not None and self._ring_task is not None:
+            self._ring_task.cancel()
+            try:
+                await self._ring_task
+            except asyncio.CancelledError:
+                pass
+            self._ring_task = None
+            await self._publish_ring_events(ring)  # Written before the ring was closed
+            ring.unlink()
+        await self.sdk.stop()
+        logger.info("StellaNow agent stopped")
+
+    async def run(self) -> None:
+        """Run until SIGINT or SIGTERM."""
+        stop_requested = asyncio.Event()
+        loop = asyncio.get_running_loop()
+        for signal_number in (signal.SIGINT, signal.SIGTERM):
+            loop.add_signal_handler(signal_number, stop_requested.set)
+        await self.start()
+        await stop_requested.wait()
+        await self.stop()
+
+    async def _handle_client(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+        if self._server is None:
+            writer.close()  # Accepted just before the agent stopped
+            return
+        self._clients.add(writer)
+        logger.debug(f"Agent client connected ({len(self._clients)} connected)")
+        try:
+            while True:
+                await self.sdk.send_message(await read_event_frame(reader))
+        except (asyncio.IncompleteReadError, ConnectionError):
+            pass  # The client closed its connection
+        except ValueError as e:
+            logger.error(f"Closing agent client connection after a malformed frame: {e}")
+        finally:
+            self._clients.discard(writer)
+            writer.close()
+            logger.debug(f"Agent client disconnected ({len(self._clients)} connected)")
+
+    async def _drain_ring(self, ring: SharedMemoryRing) -> None:
+        while True:
+            if not await self._publish_ring_events(ring):
+                await asyncio.sleep(self.ring_poll_interval)
+
+    async def _publish_ring_events(self, ring: SharedMemoryRing) -> bool:
+        """Publish the events written to the ring since the last call, returning whether there were any."""
+        data = ring.read()
+        if not data:
+            return False
+        try:
+            events = decode_event_frames(data)
+        except ValueError as e:
+            logger.error(f"Dropping {len(data)} bytes of malformed frames read from the shared memory ring: {e}")
+            return True
+        for start in range(0, len(events), RING_BATCH_SIZE):
+            for event in events[start : start + RING_BATCH_SIZE]:
+                await self.sdk.send_message(event)
+            await asyncio.sleep(0)  # Let socket clients and the queue workers run between batches
+        return True
+
+
+def create_env_config(
+    env: str, api_base_url: Optional[str], mqtt_broker_url: Optional[str]
+) -> StellaNowEnvironmentConfig:
+    """Create the environment configuration selected on the command line."""
+    match env:
+        case "dev":
+            return EnvConfig.stellanow_dev()
+        case "prod":
+            return EnvConfig.stellanow_prod()
+        case "nanomq":
+            return EnvConfig.nanomq_local()
+        case _:
+            if not api_base_url or not mqtt_broker_url:
+                raise ValueError("A custom environment requires --api-base-url and --mqtt-broker-url")
+            return EnvConfig.create_custom_env(api_base_url=api_base_url, mqtt_broker_url=mqtt_broker_url)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=DESCRIPTION, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--socket-path", default=os.getenv("STELLANOW_AGENT_SOCKET", DEFAULT_AGENT_SOCKET_PATH))
+    parser.add_argument(
+        "--shared-memory-ring",
+        default=os.getenv("STELLANOW_AGENT_RING"),
+        help="Name of a shared memory ring to drain events from, besides the socket",
+    )
+    parser.add_argument("--ring-capacity", type=int, default=DEFAULT_RING_CAPACITY, help="Ring size in bytes")
+    parser.add_argument("--env", choices=["dev", "prod", "nanomq", "custom"], default="dev")
+    parser.add_argument("--api-base-url", help="API base URL of a custom environment")
+    parser.add_argument("--mqtt-broker-url", help="MQTT broker URL(s) of a custom environment, comma-separated")
+    parser.add_argument(
+        "--auth-strategy", choices=[item.value for item in AuthStrategyTypes], default=AuthStrategyTypes.OIDC.value
+    )
+    parser.add_argument(
+        "--queue-strategy", choices=[item.value for item in MessageQueueType], default=MessageQueueType.FIFO.value
+    )
+    parser.add_argument("--queue-workers", type=int, default=1)
+    parser.add_argument("--connection-pool-size", type=int, default=1)
+    parser.add_argument(
+        "--mqtt-client", choices=[item.value for item in MqttClientTypes], default=MqttClientTypes.PAHO.value
+    )
+    parser.add_argument("--log-level", choices=[item.value for item in LoggerLevel], default=LoggerLevel.INFO.value)
+    args = parser.parse_args()
+
+    sdk = configure_sdk(
+        auth_strategy_type=args.auth_strategy,
+        env_config=create_env_config(args.env, args.api_base_url, args.mqtt_broker_url),
+        queue_strategy_type=args.queue_strategy,
+        logger_level=LoggerLevel(args.log_level),
+        queue_workers=args.queue_workers,
+        connection_pool_size=args.connection_pool_size,
+        mqtt_client_type=args.mqtt_client,
+    )
+    agent = StellaNowAgent(sdk, args.socket_path, ring_name=args.shared_memory_ring, ring_capacity=args.ring_capacity)
+    asyncio.run(agent.run())
+
+
+if __name__ == "__main__":
+    main()
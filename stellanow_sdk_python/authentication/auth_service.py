@@ -21,21 +21,37 @@ IN THE SOFTWARE.
 """
 
 import asyncio
-from datetime import datetime, timedelta
-from typing import Any, Callable, Dict, Optional
+import random
+import time
+from datetime import datetime
+from typing import Any, Callable, Dict, Optional, Tuple
 
 from keycloak import KeycloakOpenID
 from keycloak.exceptions import KeycloakError
 from loguru import logger
 
+from stellanow_sdk_python.authentication.i_token_cache import CachedToken, ITokenCache, token_cache_key
+from stellanow_sdk_python.authentication.jwt_claims import decode_jwt_claims, numeric_claim
 from stellanow_sdk_python.config.eniviroment_config.stellanow_env_config import StellaNowEnvironmentConfig
 from stellanow_sdk_python.config.stellanow_auth_credentials import StellaNowCredentials
 from stellanow_sdk_python.config.stellanow_config import StellaProjectInfo
 
+# Seconds before its expiry at which a token is treated as expired
+TOKEN_EXPIRY_MARGIN = 10
+
+# Range of the token lifetime after which a refresh is scheduled. The point is drawn at random for every token, so
+# clients started together do not refresh against Keycloak at the same moment.
+REFRESH_LIFETIME_FRACTION = (0.7, 0.85)
+
 
 class StellaNowAuthenticationService:
     def __init__(
-        self, project_info: StellaProjectInfo, credentials: StellaNowCredentials, env_config: StellaNowEnvironmentConfig
+        self,
+        project_info: StellaProjectInfo,
+        credentials: StellaNowCredentials,
+        env_config: StellaNowEnvironmentConfig,
+        token_cache: Optional[ITokenCache] = None,
+        refresh_lifetime_fraction: Tuple[float, float] = REFRESH_LIFETIME_FRACTION,
     ):
         if credentials.client_id is None:
             raise ValueError("Client ID is not set.")
@@ -51,9 +67,18 @@ class StellaNowAuthenticationService:
         self.credentials = credentials
         self.token_response: Optional[Dict[str, str]] = None
         self.token_expires: Optional[datetime] = None
+        self.token_expires_at: Optional[float] = None  # Local epoch time at which the access token expires
+        self.refresh_at: Optional[datetime] = None
+        self.clock_skew = 0.0  # Seconds the authority's clock is ahead of the local clock
+        self.refresh_lifetime_fraction = refresh_lifetime_fraction
         self.lock = asyncio.Lock()
         self._refresh_task: Optional[asyncio.Task[None]] = None
+        self._token_request: Optional[asyncio.Task[str]] = None
         self._token_update_callbacks: list[Callable[[str], Any]] = []  # Callbacks for token updates
+        self.token_cache = token_cache
+        self._token_cache_key = token_cache_key(
+            env_config.authority, str(project_info.organization_id), credentials.client_id, credentials.username or ""
+        )
 
     def register_token_update_callback(self, callback: Callable[[str], Any]) -> None:
         """Register a callback to be called when the token is refreshed."""
@@ -76,15 +101,24 @@ class StellaNowAuthenticationService:
                 logger.info("Token refresh task cancelled.")
             self._refresh_task = None
 
+    def reset_after_fork(self) -> None:
+        """
+        Drop the refresh task and lock inherited from the parent process, called in a forked child process.
+
+        The inherited token is kept, so the child does not authenticate again while it is valid.
+        """
+        self.lock = asyncio.Lock()
+        self._refresh_task = None
+        self._token_request = None
+
     async def _auto_refresh(self) -> None:
         """Periodically refresh the token before it expires."""
         while True:
-            if self.token_response and self.token_expires and not self._is_token_expired():
+            if self.token_response and self.refresh_at and not self._is_token_expired():
                 logger.debug("In _auto_refresh loop")
-                logger.debug(f"Token expired: {self._is_token_expired()}")
-                logger.debug(f"Token expires at: {self.token_expires}")
-                expires_in = (self.token_expires - datetime.now()).total_seconds()
-                await asyncio.sleep(max(expires_in - 30, 1))
+                logger.debug(f"Token expires at: {self.token_expires}, refresh scheduled at: {self.refresh_at}")
+                refresh_in = (self.refresh_at - datetime.now()).total_seconds()
+                await asyncio.sleep(max(refresh_in, 1))
             else:
                 logger.debug("No valid token to refresh, attempting initial authentication.")
                 await asyncio.sleep(1)
@@ -100,40 +134,121 @@ class StellaNowAuthenticationService:
     async def authenticate(self) -> str:
         """Authenticate and get the access token asynchronously."""
         async with self.lock:
+            return await self._authenticate()
+
+    async def _authenticate(self) -> str:
+        """Reuse or refresh a cached token if possible, otherwise perform a password grant. Requires the lock."""
+        cached_access_token = await self._authenticate_from_cache()
+        if cached_access_token is not None:
+            return cached_access_token
+        try:
+            token_response = await self.keycloak_openid.a_token(
+                username=self.credentials.username, password=self.credentials.password  # type: ignore[arg-type]
+            )
+            if not isinstance(token_response, dict):
+                logger.error(f"Unexpected response type from Keycloak: {type(token_response)}, value: {token_response}")
+                raise ValueError(f"Keycloak returned non-dict response: {token_response}")
+            if "access_token" not in token_response:
+                logger.error(f"Token response missing 'access_token': {token_response}")
+                raise ValueError(f"Token response missing 'access_token': {token_response}")
+            self._accept_token_response(token_response)
+            logger.info("Authentication successful!")
+            logger.debug(f"Token expires_in: {token_response.get('expires_in')}, expires at: {self.token_expires}")
+            await self._cache_token(token_response)
+            await self.start_refresh_task()
+            access_token: str = token_response["access_token"]
+            return access_token
+        except KeycloakError as e:
+            error_status = getattr(e, "response_code", "Unknown")
+            error_message = (
+                getattr(e, "error_message", str(e)).splitlines()[0] if hasattr(e, "error_message") else str(e)[:100]
+            )
+            logger.error(f"Keycloak authentication failed: {error_status} - {error_message}")
+            logger.debug(f"Full Keycloak error details: {e}")
+            raise Exception(f"Failed to authenticate with Keycloak: {error_status} - {error_message}")
+        except Exception as e:
+            logger.error(f"Unexpected authentication error: {e}")
+            raise Exception(f"Authentication failed: {e}")
+
+    async def _authenticate_from_cache(self) -> Optional[str]:
+        """Adopt a still valid cached access token, or redeem a cached refresh token, sparing a password grant."""
+        if self.token_cache is None:
+            return None
+        cached = await asyncio.to_thread(self.token_cache.load, self._token_cache_key)
+        if cached is None:
+            return None
+        if cached.access_token_valid(margin=TOKEN_EXPIRY_MARGIN):
+            token_response: Dict[str, Any] = {
+                "access_token": cached.access_token,
+                "expires_in": cached.access_token_expires_at - time.time(),
+            }
+            if cached.refresh_token is not None:
+                token_response["refresh_token"] = cached.refresh_token
+            self._accept_token_response(token_response, fresh=False)
+            logger.info("Reusing cached access token.")
+            await self.start_refresh_task()
+            return cached.access_token
+        if cached.refresh_token is not None and cached.refresh_token_valid(margin=TOKEN_EXPIRY_MARGIN):
             try:
-                token_response = await self.keycloak_openid.a_token(
-                    username=self.credentials.username, password=self.credentials.password  # type: ignore[arg-type]
-                )
-                if not isinstance(token_response, dict):
-                    logger.error(
-                        f"Unexpected response type from Keycloak: {type(token_response)}, value: {token_response}"
-                    )
-                    raise ValueError(f"Keycloak returned non-dict response: {token_response}")
-                if "access_token" not in token_response:
-                    logger.error(f"Token response missing 'access_token': {token_response}")
-                    raise ValueError(f"Token response missing 'access_token': {token_response}")
-                self.token_response = token_response
-                self.token_expires = self._calculate_token_expires_time(self.token_response)
-                logger.info("Authentication successful!")
-                logger.debug(f"Token expires_in: {token_response.get('expires_in')}, expires at: {self.token_expires}")
-                await self.start_refresh_task()
-                return self.token_response["access_token"]
+                logger.info("Refreshing cached token...")
+                token_response = await self.keycloak_openid.a_refresh_token(cached.refresh_token)
             except KeycloakError as e:
-                error_status = getattr(e, "response_code", "Unknown")
-                error_message = (
-                    getattr(e, "error_message", str(e)).splitlines()[0] if hasattr(e, "error_message") else str(e)[:100]
-                )
-                logger.error(f"Keycloak authentication failed: {error_status} - {error_message}")
-                logger.debug(f"Full Keycloak error details: {e}")
-                raise Exception(f"Failed to authenticate with Keycloak: {error_status} - {error_message}")
-            except Exception as e:
-                logger.error(f"Unexpected authentication error: {e}")
-                raise Exception(f"Authentication failed: {e}")
+                logger.warning(f"Cached refresh token was rejected, falling back to a password grant: {e}")
+            else:
+                self._accept_token_response(token_response)
+                await self._cache_token(token_response)
+                await self.start_refresh_task()
+                access_token: str = token_response["access_token"]
+                return access_token
+        await asyncio.to_thread(self.token_cache.remove, self._token_cache_key)
+        return None
 
-    @staticmethod
-    def _calculate_token_expires_time(token_response: Dict[str, Any]) -> datetime:
-        token_expires_time = datetime.now() + timedelta(seconds=token_response.get("expires_in", 60))
-        return token_expires_time - timedelta(seconds=10)
+    async def _cache_token(self, token_response: Dict[str, Any]) -> None:
+        if self.token_cache is None:
+            return
+        now = time.time()
+        refresh_expires_in = token_response.get("refresh_expires_in")
+        cached = CachedToken(
+            access_token=token_response["access_token"],
+            access_token_expires_at=self.token_expires_at or now + token_response.get("expires_in", 60),
+            refresh_token=token_response.get("refresh_token"),
+            # Keycloak reports 0 for refresh tokens that do not expire, such as offline tokens
+            refresh_token_expires_at=now + refresh_expires_in if refresh_expires_in else None,
+        )
+        try:
+            await asyncio.to_thread(self.token_cache.store, self._token_cache_key, cached)
+        except OSError as e:
+            logger.warning(f"Failed to cache token: {e}")
+
+    def _accept_token_response(self, token_response: Dict[str, Any], fresh: bool = True) -> None:
+        """
+        Adopt a token response and schedule its refresh.
+
+        Expiry is taken from the JWT ``exp`` claim, shifted by the clock skew estimated from the ``iat`` claim of
+        freshly issued tokens, and falls back to ``expires_in``. Tokens read from the cache carry a stale ``iat``,
+        so their expiry comes from ``expires_in`` and the skew estimate is left untouched.
+        """
+        now = time.time()
+        expires_in = token_response.get("expires_in", 60)
+        claims = decode_jwt_claims(token_response["access_token"])
+        issued_claim, expires_claim = numeric_claim(claims, "iat"), numeric_claim(claims, "exp")
+        if fresh and expires_claim is not None:
+            self.clock_skew = issued_claim - now if issued_claim is not None else expires_claim - (now + expires_in)
+            expires_at = expires_claim - self.clock_skew
+        else:
+            expires_at = now + expires_in
+        if issued_claim is not None and expires_claim is not None and expires_claim > issued_claim:
+            lifetime = expires_claim - issued_claim
+        else:
+            lifetime = expires_at - now
+        refresh_at = expires_at - lifetime * (1 - random.uniform(*self.refresh_lifetime_fraction))
+
+        self.token_response = token_response
+        self.token_expires_at = expires_at
+        self.token_expires = datetime.fromtimestamp(expires_at - TOKEN_EXPIRY_MARGIN)
+        self.refresh_at = datetime.fromtimestamp(min(refresh_at, expires_at - TOKEN_EXPIRY_MARGIN))
+        if abs(self.clock_skew) > 1:
+            logger.debug(f"Authority clock is {self.clock_skew:+.1f}s off the local clock")
 
     def _is_token_expired(self) -> bool:
         if self.token_expires is None:
@@ -141,24 +256,35 @@ class StellaNowAuthenticationService:
         return datetime.now() >= self.token_expires
 
     async def get_access_token(self) -> str:
-        if self.token_response is None or self._is_token_expired():
+        """Return a valid access token. Concurrent callers needing a new token share a single request."""
+        if self.token_response is not None and not self._is_token_expired():
+            return self.token_response["access_token"]
+        if self._token_request is None:
             logger.info("Token expired or missing. Re-authenticating...")
-            return await self.authenticate()
-        assert self.token_response is not None
-        return self.token_response["access_token"]
+            self._token_request = asyncio.create_task(self.authenticate())
+            self._token_request.add_done_callback(self._clear_token_request)
+        # Shielded, so a cancelled caller does not cancel the request other callers are waiting for
+        return await asyncio.shield(self._token_request)
+
+    def _clear_token_request(self, task: "asyncio.Task[str]") -> None:
+        if self._token_request is task:
+            self._token_request = None
+        if not task.cancelled():
+            task.exception()  # Retrieved here in case every caller was cancelled
 
     async def refresh_access_token(self) -> str:
         async with self.lock:
             if not self.token_response or "refresh_token" not in self.token_response:
                 logger.warning("No valid refresh token available, falling back to authenticate.")
-                return await self.authenticate()
+                return await self._authenticate()  # The lock is already held
             try:
                 refresh_token = self.token_response["refresh_token"]
                 logger.info("Refreshing access token...")
-                self.token_response = await self.keycloak_openid.a_refresh_token(refresh_token)
-                self.token_expires = self._calculate_token_expires_time(self.token_response)
-                access_token: str = self.token_response["access_token"]
+                token_response = await self.keycloak_openid.a_refresh_token(refresh_token)
+                self._accept_token_response(token_response)
+                access_token: str = token_response["access_token"]
                 logger.info("Access token refreshed successfully.")
+                await self._cache_token(token_response)
                 logger.debug(f"Refreshed token: {access_token[:20]}..., expires: {self.token_expires}")
                 # Notify callbacks of new token
                 for callback in self._token_update_callbacks:
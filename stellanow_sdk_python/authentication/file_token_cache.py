@@ -0,0 +1,111 @@
+"""
+Copyright (C) 2022-2025 Stella Technologies (UK) Limited.
+
+Permission is hereby granted, free of charge, to any person obtaining a copy
+of this software and associated documentation files (the "Software"), to deal
+in the Software without restriction, including without limitation the rights
+to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+copies of the Software, and to permit persons to whom the Software is
+furnished to do so, subject to the following conditions:
+
+The above copyright notice and this permission notice shall be included in
+all copies or substantial portions of the Software.
+
+THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING
+FROM, OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS
+IN THE SOFTWARE.
+"""
+
+import json
+import os
+import tempfile
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Dict, Iterator, Optional, Union
+
+from loguru import logger
+from pydantic import ValidationError
+
+from stellanow_sdk_python.authentication.i_token_cache import CachedToken, ITokenCache
+
+try:
+    import fcntl
+except ImportError:  # Windows: no advisory locks, writes stay atomic through os.replace
+    fcntl = None  # type: ignore[assignment]
+
+DEFAULT_TOKEN_CACHE_PATH = Path.home() / ".cache" / "stellanow" / "tokens.json"
+
+
+class FileTokenCache(ITokenCache):
+    """
+    Caches tokens in a JSON file readable only by the current user.
+
+    Several processes on one host can share the file: reads and read-modify-write updates hold an advisory lock on a
+    sibling lock file, and updates are written to a temporary file that atomically replaces the cache, so a reader
+    never sees a partially written file.
+    """
+
+    def __init__(self, path: Union[str, Path] = DEFAULT_TOKEN_CACHE_PATH):
+        self.path = Path(path)
+        self._lock_path = self.path.with_name(self.path.name + ".lock")
+
+    def load(self, key: str) -> Optional[CachedToken]:
+        with self._locked(exclusive=False):
+            entry = self._read().get(key)
+        if entry is None:
+            return None
+        try:
+            return CachedToken.model_validate(entry)
+        except ValidationError as e:
+            logger.warning(f"Ignoring malformed token cache entry: {e}")
+            return None
+
+    def store(self, key: str, token: CachedToken) -> None:
+        with self._locked(exclusive=True):
+            entries = self._read()
+            entries[key] = token.model_dump()
+            self._write(entries)
+
+    def remove(self, key: str) -> None:
+        with self._locked(exclusive=True):
+            entries = self._read()
+            if entries.pop(key, None) is not None:
+                self._write(entries)
+
+    @contextmanager
+    def _locked(self, exclusive: bool) -> Iterator[None]:
+        self.path.parent.mkdir(mode=0o700, parents=True, exist_ok=True)
+        fd = os.open(self._lock_path, os.O_RDWR | os.O_CREAT, 0o600)
+        try:
+            if fcntl is not None:
+                fcntl.flock(fd, fcntl.LOCK_EX if exclusive else fcntl.LOCK_SH)
+            yield
+        finally:
+            os.close(fd)  # Closing the descriptor releases the lock
+
+    def _read(self) -> Dict[str, object]:
+        try:
+            with open(self.path, encoding="utf-8") as file:
+                entries = json.load(file)
+        except FileNotFoundError:
+            return {}
+        except (OSError, ValueError) as e:
+            logger.warning(f"Ignoring unreadable token cache {self.path}: {e}")
+            return {}
+        return entries if isinstance(entries, dict) else {}
+
+    def _write(self, entries: Dict[str, object]) -> None:
+        fd, temp_path = tempfile.mkstemp(dir=self.path.parent, prefix=f".{self.path.name}.")  # Created with 0o600
+        try:
+            with os.fdopen(fd, "w", encoding="utf-8") as file:
+                json.dump(entries, file)
+                file.flush()
+                os.fsync(file.fileno())
+            os.replace(temp_path, self.path)
+        except BaseException:
+            os.unlink(temp_path)
+            raise
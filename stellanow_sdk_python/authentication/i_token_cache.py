@@ -0,0 +1,78 @@
+"""
+Copyright (C) 2022-2025 Stella Technologies (UK) Limited.
+
+Permission is hereby granted, free of charge, to any person obtaining a copy
+of this software and associated documentation files (the "Software"), to deal
+in the Software without restriction, including without limitation the rights
+to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+copies of the Software, and to permit persons to whom the Software is
+furnished to do so, subject to the following conditions:
+
+The above copyright notice and this permission notice shall be included in
+all copies or substantial portions of the Software.
+
+THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING
+FROM, OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS
+IN THE SOFTWARE.
+"""
+
+import time
+from abc import ABC, abstractmethod
+from typing import Optional
+
+from pydantic import BaseModel
+
+
+class CachedToken(BaseModel):
+    """An OIDC token pair with the absolute times (seconds since the epoch) at which each token expires."""
+
+    access_token: str
+    access_token_expires_at: float
+    refresh_token: Optional[str] = None
+    refresh_token_expires_at: Optional[float] = None
+
+    def access_token_valid(self, margin: float = 0.0) -> bool:
+        return time.time() + margin < self.access_token_expires_at
+
+    def refresh_token_valid(self, margin: float = 0.0) -> bool:
+        if self.refresh_token is None:
+            return False
+        return self.refresh_token_expires_at is None or time.time() + margin < self.refresh_token_expires_at
+
+
+def token_cache_key(authority: str, realm: str, client_id: str, username: str) -> str:
+    """Build the key a token is cached under, so tokens are only ever reused for the identity they were issued to."""
+    return "|".join([authority.rstrip("/"), realm, client_id, username])
+
+
+class ITokenCache(ABC):
+    """
+    Defines a store for OIDC tokens that outlives the process, so a restart can skip the password grant.
+    """
+
+    @abstractmethod
+    def load(self, key: str) -> Optional[CachedToken]:
+        """
+        Loads the token cached under the key.
+        :param key: The key built with token_cache_key.
+        :return: The cached token, or None if there is none.
+        """
+
+    @abstractmethod
+    def store(self, key: str, token: CachedToken) -> None:
+        """
+        Caches a token under the key, replacing any previous one.
+        :param key: The key built with token_cache_key.
+        :param token: The token to cache.
+        """
+
+    @abstractmethod
+    def remove(self, key: str) -> None:
+        """
+        Removes the token cached under the key, for example after it was rejected.
+        :param key: The key built with token_cache_key.
+        """
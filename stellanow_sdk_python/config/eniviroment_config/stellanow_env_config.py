@@ -20,13 +20,15 @@ FROM, OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS
 IN THE SOFTWARE.
 """
 
-from typing import Optional, Protocol
+from typing import Optional, Protocol, Sequence, Union
 
-from stellanow_sdk_python.sinks.mqtt.utils.mqtt_url_parser import MqttUrlConfig, parse_mqtt_url
+from stellanow_sdk_python.sinks.mqtt.utils.mqtt_url_parser import MqttUrlConfig, parse_mqtt_urls
+from stellanow_sdk_python.sinks.mqtt.utils.tls_context import TlsConfig
 
 
 class StellaNowEnvironmentConfig(Protocol):
-    mqtt_url_config: MqttUrlConfig
+    mqtt_url_config: MqttUrlConfig  # The first of mqtt_url_configs
+    mqtt_url_configs: list[MqttUrlConfig]  # Equivalent brokers the sinks can fail over between
     api_base_url: Optional[str] = None
 
     @property
@@ -35,8 +37,14 @@ class StellaNowEnvironmentConfig(Protocol):
 
 
 class _StellaNowEnvironmentConfigImpl:
-    def __init__(self, mqtt_url: str, api_base_url: Optional[str] = None):
-        self.mqtt_url_config = parse_mqtt_url(mqtt_url)
+    def __init__(
+        self,
+        mqtt_url: Union[str, Sequence[str]],
+        api_base_url: Optional[str] = None,
+        tls_config: Optional[TlsConfig] = None,
+    ):
+        self.mqtt_url_configs = parse_mqtt_urls(mqtt_url, tls_config)
+        self.mqtt_url_config = self.mqtt_url_configs[0]
         self.api_base_url = api_base_url
 
     @property
@@ -48,19 +56,21 @@ class EnvConfig:
     """Factory for creating environment configurations."""
 
     @staticmethod
-    def stellanow_prod() -> StellaNowEnvironmentConfig:
+    def stellanow_prod(tls_config: Optional[TlsConfig] = None) -> StellaNowEnvironmentConfig:
         """Configuration for the StellaNow production environment."""
         return _StellaNowEnvironmentConfigImpl(
             mqtt_url="wss://ingestor.prod.stella.cloud:8083",
             api_base_url="https://api.prod.stella.cloud",
+            tls_config=tls_config,
         )
 
     @staticmethod
-    def stellanow_dev() -> StellaNowEnvironmentConfig:
+    def stellanow_dev(tls_config: Optional[TlsConfig] = None) -> StellaNowEnvironmentConfig:
         """Configuration for the StellaNow dev environment."""
         return _StellaNowEnvironmentConfigImpl(
             mqtt_url="wss://ingestor.dev.stella.cloud:8083",
             api_base_url="https://api.dev.stella.cloud",
+            tls_config=tls_config,
         )
 
     @staticmethod
@@ -69,6 +79,15 @@ class EnvConfig:
         return _StellaNowEnvironmentConfigImpl(mqtt_url="mqtt-tcp://localhost:1883")
 
     @staticmethod
-    def create_custom_env(api_base_url: str, mqtt_broker_url: str) -> StellaNowEnvironmentConfig:
-        """Create a custom environment configuration."""
-        return _StellaNowEnvironmentConfigImpl(api_base_url=api_base_url, mqtt_url=mqtt_broker_url)
+    def create_custom_env(
+        api_base_url: str, mqtt_broker_url: Union[str, Sequence[str]], tls_config: Optional[TlsConfig] = None
+    ) -> StellaNowEnvironmentConfig:
+        """
+        Create a custom environment configuration.
+
+        mqtt_broker_url may list several equivalent brokers, as a sequence or comma-separated, which the sinks fail
+        over between. tls_config applies to 'mqtts' and 'wss' broker URLs.
+        """
+        return _StellaNowEnvironmentConfigImpl(
+            api_base_url=api_base_url, mqtt_url=mqtt_broker_url, tls_config=tls_config
+        )
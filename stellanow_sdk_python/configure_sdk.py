@@ -21,24 +21,74 @@ IN THE SOFTWARE.
 """
 
 import sys
+from typing import Iterable, Mapping, Optional, Sequence
 
 from loguru import logger
 
+from stellanow_sdk_python.agent.agent_protocol import DEFAULT_AGENT_SOCKET_PATH
+from stellanow_sdk_python.authentication.i_token_cache import ITokenCache
 from stellanow_sdk_python.config.eniviroment_config.stellanow_env_config import EnvConfig, StellaNowEnvironmentConfig
 from stellanow_sdk_python.config.enums.auth_strategy import AuthStrategyTypes
 from stellanow_sdk_python.config.enums.logger_config import LoggerLevel
+from stellanow_sdk_python.config.enums.mqtt_client import MqttClientTypes
+from stellanow_sdk_python.config.enums.token_rotation import TokenRotationMode
 from stellanow_sdk_python.config.stellanow_auth_credentials import StellaNowCredentials
 from stellanow_sdk_python.config.stellanow_config import project_info_from_env
+from stellanow_sdk_python.message_queue.duplicate_filter import DuplicateFilter
+from stellanow_sdk_python.message_queue.message_queue_strategy.coalescing_message_queue_strategy import (
+    CoalescingMessageQueueStrategy,
+)
+from stellanow_sdk_python.message_queue.message_queue_strategy.expiring_message_queue_strategy import (
+    ExpiringMessageQueueStrategy,
+)
 from stellanow_sdk_python.message_queue.message_queue_strategy.fifo_message_queue_strategy import (
     FifoMessageQueueStrategy,
 )
-from stellanow_sdk_python.message_queue.message_queue_strategy.i_message_queue_strategy import MessageQueueType
+from stellanow_sdk_python.message_queue.message_queue_strategy.i_message_queue_strategy import (
+    IMessageQueueStrategy,
+    MessageQueueType,
+)
 from stellanow_sdk_python.message_queue.message_queue_strategy.lifo_message_queue_strategy import (
     LifoMessageQueueStrategy,
 )
+from stellanow_sdk_python.message_queue.message_queue_strategy.priority_message_queue_strategy import (
+    PriorityMessageQueueStrategy,
+)
+from stellanow_sdk_python.message_queue.message_stage.i_message_stage import IMessageStage
 from stellanow_sdk_python.sdk import StellaNowSDK
+from stellanow_sdk_python.sinks.i_stellanow_sink import IStellaNowSink
 from stellanow_sdk_python.sinks.mqtt.auth_strategy.auth_factory import create_auth_strategy
-from stellanow_sdk_python.sinks.mqtt.stellanow_mqtt_sink import StellaNowMqttSink
+
+# Sinks are imported where they are created, so an application only loads the MQTT client and the subsystems it uses
+
+
+def _create_queue_strategy(
+    queue_strategy_type: str,
+    coalesced_event_types: Optional[Iterable[str]],
+    event_type_priorities: Optional[Mapping[str, int]],
+    max_message_age: Optional[float],
+    event_type_max_ages: Optional[Mapping[str, float]],
+) -> IMessageQueueStrategy:
+    strategy = _create_base_queue_strategy(queue_strategy_type, coalesced_event_types, event_type_priorities)
+    if max_message_age is None and not event_type_max_ages:
+        return strategy
+    return ExpiringMessageQueueStrategy(strategy, max_age=max_message_age, event_type_max_ages=event_type_max_ages)
+
+
+def _create_base_queue_strategy(
+    queue_strategy_type: str,
+    coalesced_event_types: Optional[Iterable[str]],
+    event_type_priorities: Optional[Mapping[str, int]],
+) -> IMessageQueueStrategy:
+    if queue_strategy_type == MessageQueueType.PRIORITY.value:
+        return PriorityMessageQueueStrategy(event_type_priorities)
+    if queue_strategy_type == MessageQueueType.COALESCING.value:
+        if not coalesced_event_types:
+            raise ValueError("The coalescing queue strategy requires the event types to coalesce")
+        return CoalescingMessageQueueStrategy(coalesced_event_types)
+    if queue_strategy_type == MessageQueueType.LIFO.value:
+        return LifoMessageQueueStrategy()
+    return FifoMessageQueueStrategy()
 
 
 def configure_sdk(
@@ -46,6 +96,18 @@ def configure_sdk(
     env_config: StellaNowEnvironmentConfig,
     queue_strategy_type: str = MessageQueueType.FIFO.value,
     logger_level: LoggerLevel = LoggerLevel.INFO,
+    queue_workers: int = 1,
+    connection_pool_size: int = 1,
+    mqtt_client_type: str = MqttClientTypes.PAHO.value,
+    token_rotation_mode: str = TokenRotationMode.RECONNECT.value,
+    token_cache: Optional[ITokenCache] = None,
+    hot_standby: bool = False,
+    coalesced_event_types: Optional[Iterable[str]] = None,
+    event_type_priorities: Optional[Mapping[str, int]] = None,
+    max_message_age: Optional[float] = None,
+    event_type_max_ages: Optional[Mapping[str, float]] = None,
+    duplicate_filter: Optional[DuplicateFilter] = None,
+    stages: Sequence[IMessageStage] = (),
 ) -> StellaNowSDK:
     """
     Generic method to configure and return a StellaNowSDK instance.
@@ -53,15 +115,49 @@ def configure_sdk(
     Args:
         auth_strategy_type (str): Authentication strategy ("oidc", "basic", "none").
         env_config (StellaNowEnvironmentConfig): Environment configuration (e.g., from EnvConfig).
-        queue_strategy_type (str, optional): Queue strategy ("fifo" or "lifo"). Defaults to "fifo".
+        queue_strategy_type (str, optional): Queue strategy ("fifo", "lifo", "coalescing" or
+            "priority"). Defaults to "fifo".
         logger_level (LoggerLevel, optional): Logging level for the SDK. Defaults to LoggerLevel.INFO.
+        queue_workers (int, optional): Number of concurrent queue consumers, partitioned by entity ID. Defaults to 1.
+        connection_pool_size (int, optional): Number of MQTT broker connections to publish over. Defaults to 1.
+        mqtt_client_type (str, optional): MQTT client implementation ("paho" or "asyncio"). Defaults to "paho".
+        token_rotation_mode (str, optional): How connections move to a refreshed OIDC token ("reconnect" or
+            "make_before_break", which requires the paho client). Defaults to "reconnect".
+        token_cache (Optional[ITokenCache], optional): Store persisting OIDC tokens across process restarts, such as
+            FileTokenCache. Defaults to None.
+        hot_standby (bool, optional): Keep an idle standby connection for the paho sink to switch to as soon as its
+            connection is lost. Defaults to False.
+        coalesced_event_types (Optional[Iterable[str]], optional): Event types of which the coalescing queue strategy
+            keeps only the latest queued message per entity. Defaults to None.
+        event_type_priorities (Optional[Mapping[str, int]], optional): Priority of each event type for the priority
+            queue strategy, which sends higher priorities first; other event types have priority 0. Defaults to None.
+        max_message_age (Optional[float], optional): Seconds after their origin date after which queued messages are
+            dropped instead of sent. Defaults to None, sending messages however old.
+        event_type_max_ages (Optional[Mapping[str, float]], optional): Maximum age in seconds of the messages of each
+            event type, overriding max_message_age. Defaults to None.
+        duplicate_filter (Optional[DuplicateFilter], optional): Filter dropping messages sent again within its window.
+            Defaults to None.
+        stages (Sequence[IMessageStage], optional): Steps messages pass through, in order, before they are queued,
+            such as LoadSheddingMessageStage. Defaults to none.
 
     Returns:
         StellaNowSDK: A configured SDK instance.
 
     Raises:
-        ValueError: If required environment variables are missing or invalid.
+        ValueError: If required environment variables are missing or invalid, or if the connection options cannot be
+            combined.
     """
+    queue_strategy = _create_queue_strategy(
+        queue_strategy_type, coalesced_event_types, event_type_priorities, max_message_age, event_type_max_ages
+    )
+    if connection_pool_size > 1 and mqtt_client_type != MqttClientTypes.PAHO.value:
+        raise ValueError(f"A connection pool requires the paho MQTT client, got '{mqtt_client_type}'")
+    if connection_pool_size > 1 and hot_standby:
+        raise ValueError("A connection pool cannot be combined with a hot standby connection")
+    if mqtt_client_type == MqttClientTypes.ASYNCIO.value and hot_standby:
+        raise ValueError("The asyncio MQTT client does not support a hot standby connection")
+    if mqtt_client_type == MqttClientTypes.ASYNCIO.value and token_rotation_mode != TokenRotationMode.RECONNECT.value:
+        raise ValueError("The asyncio MQTT client only supports the 'reconnect' token rotation mode")
     try:
         logger.remove()
         logger.add(sys.stderr, level=logger_level.value)
@@ -77,17 +173,47 @@ def configure_sdk(
         credentials = StellaNowCredentials.from_env(auth_strategy=auth_strategy_type)
 
         # Create auth strategy
-        auth_strategy = create_auth_strategy(auth_strategy_type, project_info, credentials, env_config)
+        auth_strategy = create_auth_strategy(
+            auth_strategy_type, project_info, credentials, env_config, token_cache=token_cache
+        )
 
         # Initialize components
-        queue_strategies = {
-            MessageQueueType.FIFO.value: FifoMessageQueueStrategy,
-            MessageQueueType.LIFO.value: LifoMessageQueueStrategy,
-        }
-        queue_strategy_class = queue_strategies.get(queue_strategy_type, FifoMessageQueueStrategy)
-        queue_strategy = queue_strategy_class()
-        mqtt_sink = StellaNowMqttSink(auth_strategy=auth_strategy, env_config=env_config, project_info=project_info)
-        sdk = StellaNowSDK(project_info=project_info, sink=mqtt_sink, queue_strategy=queue_strategy)
+        token_rotation = TokenRotationMode(token_rotation_mode)
+        mqtt_sink: IStellaNowSink
+        if connection_pool_size > 1:
+            from stellanow_sdk_python.sinks.mqtt.stellanow_mqtt_pool_sink import StellaNowMqttPoolSink
+
+            mqtt_sink = StellaNowMqttPoolSink(
+                auth_strategy=auth_strategy,
+                env_config=env_config,
+                project_info=project_info,
+                pool_size=connection_pool_size,
+                token_rotation=token_rotation,
+            )
+        elif mqtt_client_type == MqttClientTypes.ASYNCIO.value:
+            from stellanow_sdk_python.sinks.mqtt.stellanow_asyncio_mqtt_sink import StellaNowAsyncioMqttSink
+
+            mqtt_sink = StellaNowAsyncioMqttSink(
+                auth_strategy=auth_strategy, env_config=env_config, project_info=project_info
+            )
+        else:
+            from stellanow_sdk_python.sinks.mqtt.stellanow_mqtt_sink import StellaNowMqttSink
+
+            mqtt_sink = StellaNowMqttSink(
+                auth_strategy=auth_strategy,
+                env_config=env_config,
+                project_info=project_info,
+                token_rotation=token_rotation,
+                hot_standby=hot_standby,
+            )
+        sdk = StellaNowSDK(
+            project_info=project_info,
+            sink=mqtt_sink,
+            queue_strategy=queue_strategy,
+            queue_workers=queue_workers,
+            duplicate_filter=duplicate_filter,
+            stages=stages,
+        )
         logger.info(f"SDK initialized with MQTT sink and {queue_strategy_type.upper()} queue strategy.")
 
         return sdk
@@ -103,6 +229,63 @@ def configure_sdk(
         raise
 
 
+def configure_agent_sdk(
+    socket_path: str = DEFAULT_AGENT_SOCKET_PATH,
+    queue_strategy_type: str = MessageQueueType.FIFO.value,
+    logger_level: LoggerLevel = LoggerLevel.INFO,
+    ring_name: Optional[str] = None,
+    coalesced_event_types: Optional[Iterable[str]] = None,
+    event_type_priorities: Optional[Mapping[str, int]] = None,
+    max_message_age: Optional[float] = None,
+    event_type_max_ages: Optional[Mapping[str, float]] = None,
+) -> StellaNowSDK:
+    """
+    Configure and return a StellaNowSDK instance that hands its events to a StellaNow agent on the same host.
+
+    The agent (started with the stellanow-agent command) authenticates and holds the broker connection, so the only
+    credentials needed here are ORGANIZATION_ID and PROJECT_ID.
+
+    Args:
+        socket_path (str, optional): Unix domain socket the agent listens on. Defaults to /tmp/stellanow-agent.sock.
+        queue_strategy_type (str, optional): Queue strategy ("fifo", "lifo", "coalescing" or
+            "priority"). Defaults to "fifo".
+        logger_level (LoggerLevel, optional): Logging level for the SDK. Defaults to LoggerLevel.INFO.
+        ring_name (Optional[str], optional): Shared memory ring of the agent to write events into instead of the
+            socket, for an agent started with --shared-memory-ring. Defaults to None.
+        coalesced_event_types (Optional[Iterable[str]], optional): Event types of which the coalescing queue strategy
+            keeps only the latest queued message per entity. Defaults to None.
+        event_type_priorities (Optional[Mapping[str, int]], optional): Priority of each event type for the priority
+            queue strategy, which sends higher priorities first; other event types have priority 0. Defaults to None.
+        max_message_age (Optional[float], optional): Seconds after their origin date after which queued messages are
+            dropped instead of sent. Defaults to None, sending messages however old.
+        event_type_max_ages (Optional[Mapping[str, float]], optional): Maximum age in seconds of the messages of each
+            event type, overriding max_message_age. Defaults to None.
+
+    Returns:
+        StellaNowSDK: A configured SDK instance.
+
+    Raises:
+        ValueError: If required environment variables are missing or invalid, or if the coalescing queue strategy
+            has no event types to coalesce.
+    """
+    logger.remove()
+    logger.add(sys.stderr, level=logger_level.value)
+    project_info = project_info_from_env()
+    queue_strategy = _create_queue_strategy(
+        queue_strategy_type, coalesced_event_types, event_type_priorities, max_message_age, event_type_max_ages
+    )
+    sink: IStellaNowSink
+    if ring_name is not None:
+        from stellanow_sdk_python.sinks.agent.stellanow_shared_memory_sink import StellaNowSharedMemorySink
+
+        sink = StellaNowSharedMemorySink(ring_name=ring_name)
+    else:
+        from stellanow_sdk_python.sinks.agent.stellanow_agent_sink import StellaNowAgentSink
+
+        sink = StellaNowAgentSink(socket_path=socket_path)
+    return StellaNowSDK(project_info=project_info, sink=sink, queue_strategy=queue_strategy)
+
+
 # Pre-defined configurations
 def configure_dev_oidc_mqtt_fifo_sdk(logger_level: LoggerLevel = LoggerLevel.INFO) -> StellaNowSDK:
     """Configure SDK for stellanow_dev env with OIDC auth, MQTT sink, and FIFO queue."""
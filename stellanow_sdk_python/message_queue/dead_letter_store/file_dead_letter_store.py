@@ -0,0 +1,106 @@
+"""
+Copyright (C) 2022-2025 Stella Technologies (UK) Limited.
+
+Permission is hereby granted, free of charge, to any person obtaining a copy
+of this software and associated documentation files (the "Software"), to deal
+in the Software without restriction, including without limitation the rights
+to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+copies of the Software, and to permit persons to whom the Software is
+furnished to do so, subject to the following conditions:
+
+The above copyright notice and this permission notice shall be included in
+all copies or substantial portions of the Software.
+
+THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING
+FROM, OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS
+IN THE SOFTWARE.
+"""
+
+import json
+import os
+import threading
+from pathlib import Path
+from typing import Union
+
+from loguru import logger
+
+from stellanow_sdk_python.agent.agent_protocol import ForwardedEvent
+from stellanow_sdk_python.message_queue.dead_letter_store.i_dead_letter_store import IDeadLetterStore
+from stellanow_sdk_python.messages.event import StellaNowEventWrapper
+
+DEFAULT_DEAD_LETTER_PATH = Path.home() / ".cache" / "stellanow" / "dead_letters.jsonl"
+DEFAULT_MAX_FILE_DEAD_LETTERS = 100_000
+
+
+class FileDeadLetterStore(IDeadLetterStore):
+    """
+    Keeps dead letters in a JSON lines file readable only by the current user, so they survive a restart.
+
+    Every line holds the entity ID, message ID and serialized event, along with the error of the last attempt.
+    Replayed messages are published exactly as they were serialized. Up to max_messages are kept; further ones are
+    dropped. The file belongs to one process at a time.
+    """
+
+    def __init__(
+        self, path: Union[str, Path] = DEFAULT_DEAD_LETTER_PATH, max_messages: int = DEFAULT_MAX_FILE_DEAD_LETTERS
+    ):
+        self.path = Path(path)
+        self.max_messages = max_messages
+        self._lock = threading.Lock()
+        self._count = self._count_lines()
+
+    def add(self, message: StellaNowEventWrapper, reason: str) -> bool:
+        entry = {
+            "entity_id": message.key.entity_id,
+            "message_id": message.message_id,
+            "priority": message.priority,
+            "reason": reason,
+            "event": message.model_dump_json(by_alias=True),
+        }
+        with self._lock:
+            if self._count >= self.max_messages:
+                logger.error(f"Dead letter file {self.path} is full, dropping message {message.message_id}")
+                return False
+            self.path.parent.mkdir(mode=0o700, parents=True, exist_ok=True)
+            fd = os.open(self.path, os.O_WRONLY | os.O_APPEND | os.O_CREAT, 0o600)
+            with os.fdopen(fd, "a", encoding="utf-8") as file:
+                file.write(json.dumps(entry) + "\n")
+            self._count += 1
+            return True
+
+    def drain(self) -> list[StellaNowEventWrapper]:
+        with self._lock:
+            try:
+                with open(self.path, encoding="utf-8") as file:
+                    lines = file.readlines()
+            except FileNotFoundError:
+                return []
+            os.unlink(self.path)
+            self._count = 0
+        messages: list[StellaNowEventWrapper] = []
+        for line in lines:
+            try:
+                entry = json.loads(line)
+                messages.append(
+                    ForwardedEvent.from_json(
+                        entry["event"], entry["entity_id"], entry["message_id"], entry.get("priority")
+                    )
+                )
+            except (ValueError, KeyError, TypeError) as e:
+                logger.warning(f"Skipping malformed dead letter in {self.path}: {e}")
+        return messages
+
+    def get_message_count(self) -> int:
+        with self._lock:
+            return self._count
+
+    def _count_lines(self) -> int:
+        try:
+            with open(self.path, encoding="utf-8") as file:
+                return sum(1 for _ in file)
+        except FileNotFoundError:
+            return 0
@@ -0,0 +1,54 @@
+"""
+Copyright (C) 2022-2025 Stella Technologies (UK) Limited.
+
+Permission is hereby granted, free of charge, to any person obtaining a copy
+of this software and associated documentation files (the "Software"), to deal
+in the Software without restriction, including without limitation the rights
+to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+copies of the Software, and to permit persons to whom the Software is
+furnished to do so, subject to the following conditions:
+
+The above copyright notice and this permission notice shall be included in
+all copies or substantial portions of the Software.
+
+THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING
+FROM, OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS
+IN THE SOFTWARE.
+"""
+
+from abc import ABC, abstractmethod
+
+from stellanow_sdk_python.messages.event import StellaNowEventWrapper
+
+
+class IDeadLetterStore(ABC):
+    """
+    Defines a bounded store for messages the queue gave up sending after its maximum number of attempts.
+    """
+
+    @abstractmethod
+    def add(self, message: StellaNowEventWrapper, reason: str) -> bool:
+        """
+        Stores a message that could not be sent.
+        :param message: The message given up on.
+        :param reason: The error of the last attempt.
+        :return: True if stored; False if the store is full and the message was dropped.
+        """
+
+    @abstractmethod
+    def drain(self) -> list[StellaNowEventWrapper]:
+        """
+        Removes and returns every stored message, oldest first, for example to replay them.
+        :return: The stored messages.
+        """
+
+    @abstractmethod
+    def get_message_count(self) -> int:
+        """
+        Gets the number of stored messages.
+        :return: The count of stored messages.
+        """
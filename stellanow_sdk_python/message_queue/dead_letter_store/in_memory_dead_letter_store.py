@@ -0,0 +1,58 @@
+"""
+Copyright (C) 2022-2025 Stella Technologies (UK) Limited.
+
+Permission is hereby granted, free of charge, to any person obtaining a copy
+of this software and associated documentation files (the "Software"), to deal
+in the Software without restriction, including without limitation the rights
+to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+copies of the Software, and to permit persons to whom the Software is
+furnished to do so, subject to the following conditions:
+
+The above copyright notice and this permission notice shall be included in
+all copies or substantial portions of the Software.
+
+THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING
+FROM, OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS
+IN THE SOFTWARE.
+"""
+
+import threading
+
+from loguru import logger
+
+from stellanow_sdk_python.message_queue.dead_letter_store.i_dead_letter_store import IDeadLetterStore
+from stellanow_sdk_python.messages.event import StellaNowEventWrapper
+
+DEFAULT_MAX_DEAD_LETTERS = 10_000
+
+
+class InMemoryDeadLetterStore(IDeadLetterStore):
+    """
+    Keeps dead letters in memory, up to max_messages; further ones are dropped. They are lost when the process exits.
+    """
+
+    def __init__(self, max_messages: int = DEFAULT_MAX_DEAD_LETTERS) -> None:
+        self.max_messages = max_messages
+        self._messages: list[StellaNowEventWrapper] = []
+        self._lock = threading.Lock()
+
+    def add(self, message: StellaNowEventWrapper, reason: str) -> bool:
+        with self._lock:
+            if len(self._messages) >= self.max_messages:
+                logger.error(f"Dead letter store is full, dropping message {message.message_id}")
+                return False
+            self._messages.append(message)
+            return True
+
+    def drain(self) -> list[StellaNowEventWrapper]:
+        with self._lock:
+            messages, self._messages = self._messages, []
+            return messages
+
+    def get_message_count(self) -> int:
+        with self._lock:
+            return len(self._messages)
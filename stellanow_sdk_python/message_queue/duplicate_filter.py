@@ -0,0 +1,130 @@
+"""
+Copyright (C) 2022-2025 Stella Technologies (UK) Limited.
+
+Permission is hereby granted, free of charge, to any person obtaining a copy
+of this software and associated documentation files (the "Software"), to deal
+in the Software without restriction, including without limitation the rights
+to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+copies of the Software, and to permit persons to whom the Software is
+furnished to do so, subject to the following conditions:
+
+The above copyright notice and this permission notice shall be included in
+all copies or substantial portions of the Software.
+
+THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING
+FROM, OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS
+IN THE SOFTWARE.
+"""
+
+import hashlib
+import threading
+import time
+from math import ceil, log
+from typing import Optional
+
+from stellanow_sdk_python.messages.event import StellaNowEventWrapper
+
+
+class _BloomFilter:
+    """A fixed-size set of digests that may report a digest it never saw, but never misses one it did."""
+
+    def __init__(self, size: int, hashes: int):
+        self.size = size
+        self.hashes = hashes
+        self.count = 0
+        self._bits = bytearray((size + 7) // 8)
+
+    def __contains__(self, digest: bytes) -> bool:
+        return all(self._bits[position >> 3] & (1 << (position & 7)) for position in self._positions(digest))
+
+    def add(self, digest: bytes) -> None:
+        for position in self._positions(digest):
+            self._bits[position >> 3] |= 1 << (position & 7)
+        self.count += 1
+
+    def clear(self) -> None:
+        self._bits = bytearray(len(self._bits))
+        self.count = 0
+
+    def _positions(self, digest: bytes) -> list[int]:
+        # Double hashing derives every position from the two halves of a single digest
+        first, second = int.from_bytes(digest[:8], "little"), int.from_bytes(digest[8:], "little") | 1
+        return [(first + i * second) % self.size for i in range(self.hashes)]
+
+
+class DuplicateFilter:
+    """
+    Suppresses messages sent again within a time window, such as by a producer retrying at the application layer.
+
+    A message is identified by the idempotency key given to StellaNowSDK.send_message or, without one, by a hash of its
+    event type, entity ID and payload. Keys are remembered in two Bloom filters of fixed size: new keys go into the
+    current one, which replaces the previous one every window, so a key is remembered for one to two windows. A
+    current filter holding capacity keys is replaced early, which keeps the false positive rate, and the memory, in
+    bounds at the cost of a shorter window. A false positive suppresses a message that was not sent before.
+    """
+
+    def __init__(self, window: float = 60.0, capacity: int = 1_000_000, false_positive_rate: float = 0.001):
+        """
+        :param window: Seconds a key is remembered for at least.
+        :param capacity: Keys remembered per window; memory use is about 3.6 bytes per key at the default rate.
+        :param false_positive_rate: Probability of suppressing a new message while the filter is within capacity.
+        """
+        if window <= 0:
+            raise ValueError(f"The duplicate window must be positive, got {window}")
+        if capacity < 1:
+            raise ValueError(f"The duplicate filter capacity must be at least 1, got {capacity}")
+        if not 0 < false_positive_rate < 1:
+            raise ValueError(f"The false positive rate must be between 0 and 1, got {false_positive_rate}")
+        self.window = window
+        self.capacity = capacity
+        size = ceil(-capacity * log(false_positive_rate) / log(2) ** 2)
+        hashes = max(1, round(size / capacity * log(2)))
+        self.suppressed_count = 0
+        self._current = _BloomFilter(size, hashes)
+        self._previous = _BloomFilter(size, hashes)
+        self._rotated_at = time.monotonic()
+        self._lock = threading.Lock()
+
+    @property
+    def memory_bytes(self) -> int:
+        """Bytes taken by both filters, independent of the number of keys seen."""
+        return 2 * ((self._current.size + 7) // 8)
+
+    def is_duplicate(self, message: StellaNowEventWrapper, idempotency_key: Optional[str] = None) -> bool:
+        """
+        Checks whether a message was seen within the window, remembering it if not.
+        :param message: The message about to be queued.
+        :param idempotency_key: Key identifying the message, shared by every attempt to send it; if None, the message
+            is identified by its event type, entity ID and payload.
+        :return: True if the message is a duplicate and should not be sent.
+        """
+        digest = hashlib.blake2b(_key_of(message, idempotency_key), digest_size=16).digest()
+        with self._lock:
+            self._rotate_if_due()
+            if digest in self._current or digest in self._previous:
+                self.suppressed_count += 1
+                return True
+            self._current.add(digest)
+            return False
+
+    def _rotate_if_due(self) -> None:
+        now = time.monotonic()
+        elapsed = now - self._rotated_at
+        if elapsed < self.window and self._current.count < self.capacity:
+            return
+        self._previous, self._current = self._current, self._previous
+        self._current.clear()
+        if elapsed >= 2 * self.window:
+            self._previous.clear()
+        self._rotated_at = now
+
+
+def _key_of(message: StellaNowEventWrapper, idempotency_key: Optional[str]) -> bytes:
+    if idempotency_key is not None:
+        return b"key\0" + idempotency_key.encode()
+    event_type = message.event_type_definition_id or ""
+    return "\0".join(("payload", event_type, message.key.entity_id, message.payload)).encode()
@@ -21,82 +21,302 @@ IN THE SOFTWARE.
 """
 
 import asyncio
-from typing import Optional
+import contextlib
+import zlib
+from typing import AsyncIterator, Optional
 
 from loguru import logger
 
+from stellanow_sdk_python.message_queue.dead_letter_store.i_dead_letter_store import IDeadLetterStore
+from stellanow_sdk_python.message_queue.dead_letter_store.in_memory_dead_letter_store import InMemoryDeadLetterStore
 from stellanow_sdk_python.message_queue.message_queue_strategy.i_message_queue_strategy import IMessageQueueStrategy
+from stellanow_sdk_python.message_queue.retry_scheduler import Delivery, RetryScheduler
 from stellanow_sdk_python.messages.event import StellaNowEventWrapper
 from stellanow_sdk_python.sinks.i_stellanow_sink import IStellaNowSink
+from stellanow_sdk_python.utils.backoff import ExponentialBackoff
+
+DEFAULT_PARTITION_BUFFER_SIZE = 64
+DEFAULT_MAX_SEND_ATTEMPTS = 10
+DRAIN_CHECK_INTERVAL = 0.1  # Strategies such as the expiring one drop messages without a delivery to signal it
 
 
 class StellaNowMessageQueue:
-    def __init__(self, strategy: IMessageQueueStrategy, sink: IStellaNowSink):
-        """Initialize the message queue with a strategy and sink."""
+    def __init__(
+        self,
+        strategy: IMessageQueueStrategy,
+        sink: IStellaNowSink,
+        workers: int = 1,
+        partition_buffer_size: int = DEFAULT_PARTITION_BUFFER_SIZE,
+        max_attempts: int = DEFAULT_MAX_SEND_ATTEMPTS,
+        retry_backoff: Optional[ExponentialBackoff] = None,
+        dead_letter_store: Optional[IDeadLetterStore] = None,
+    ):
+        """
+        Initialize the message queue with a strategy and sink.
+
+        With more than one worker, messages are partitioned by `EventKey.entity_id` so events for the same entity are
+        delivered in order while different entities are published concurrently.
+
+        A message the sink fails to send is retried after a backoff delay, without holding up the messages of other
+        entities; later messages of the same entity wait behind it. After max_attempts failed attempts the message is
+        moved to the dead letter store, from which replay_dead_letters() queues it again. A message the receiving end
+        rejects after the sink sent it goes to the dead letter store straight away.
+
+        :param max_attempts: Attempts to send a message before it is given up on.
+        :param retry_backoff: Delay policy between attempts to send a message. Defaults to full-jitter exponential
+            backoff starting at 0.5 seconds.
+        :param dead_letter_store: Where messages given up on are kept. Defaults to an in-memory store.
+        """
+        if workers < 1:
+            raise ValueError(f"Number of queue workers must be at least 1, got {workers}")
+        if max_attempts < 1:
+            raise ValueError(f"Maximum number of send attempts must be at least 1, got {max_attempts}")
         self.strategy = strategy
         self.sink = sink
+        self.workers = workers
+        self.partition_buffer_size = partition_buffer_size
+        self.max_attempts = max_attempts
+        self.retry_backoff = retry_backoff or ExponentialBackoff(initial_delay=0.5, max_delay=30.0)
+        self.dead_letters = dead_letter_store or InMemoryDeadLetterStore()
         self.processing = False
         self._task: Optional[asyncio.Task[None]] = None
+        self._worker_tasks: list[asyncio.Task[None]] = []
+        self._partitions: list[asyncio.Queue[StellaNowEventWrapper]] = []
+        self._retries: list[RetryScheduler] = []
+        self._in_hand = 0  # Messages taken out of the strategy or a partition and not yet sent or put back
+        self._drained = asyncio.Event()  # Set whenever a delivery leaves the queue empty
+        self.sent_count = 0  # Messages the sink accepted since the queue was created
+        self.rejected_count = 0  # Messages the sink accepted that the receiving end refused afterwards
+        sink.add_rejection_listener(self._on_rejected)
 
     def start_processing(self) -> None:
         """Start processing the queue as an asyncio task."""
         if not self.processing:
             self.processing = True
             loop = asyncio.get_running_loop()
-            self._task = loop.create_task(self._process_queue())
-            logger.info("Message queue processing started as asyncio task...")
+            self._retries = [RetryScheduler(self.retry_backoff) for _ in range(self.workers)]
+            if self.workers == 1:
+                self._task = loop.create_task(self._process_queue())
+                logger.info("Message queue processing started as asyncio task...")
+            else:
+                self._partitions = [asyncio.Queue(maxsize=self.partition_buffer_size) for _ in range(self.workers)]
+                self._task = loop.create_task(self._dispatch_queue())
+                self._worker_tasks = [loop.create_task(self._process_partition(i)) for i in range(self.workers)]
+                logger.info(f"Message queue processing started with {self.workers} partitioned workers...")
 
     async def stop_processing(self, timeout: float = 5.0) -> None:
         """
         Stop the queue processing with an optional timeout.
         """
         if self.processing:
-            self.processing = False
-            if self._task:
+            self.processing = False  # Workers and the dispatcher check this at least every 0.1 seconds
+            tasks = [task for task in [self._task, *self._worker_tasks] if task is not None]
+            if tasks:
                 try:
-                    await asyncio.wait_for(self._task, timeout=timeout)
+                    await asyncio.wait_for(asyncio.gather(*tasks), timeout=timeout)
                 except asyncio.TimeoutError:
                     logger.warning(f"Queue processing did not stop within {timeout} seconds, forcing shutdown.")
-                    self._task.cancel()
-                    try:
-                        await self._task
-                    except asyncio.CancelledError:
-                        pass
+                    for task in tasks:
+                        task.cancel()
+                    await asyncio.gather(*tasks, return_exceptions=True)
                 finally:
                     self._task = None
+                    self._worker_tasks = []
+            self._return_pending_messages()
             logger.info("Message queue processing stopped.")
 
+    def reset_after_fork(self) -> None:
+        """
+        Drop the tasks and messages inherited from the parent process; called in a forked child process.
+
+        Messages queued before the fork are the parent's to publish, so the child starts with an empty queue.
+        """
+        self.processing = False
+        self._task = None
+        self._worker_tasks = []
+        self._partitions = []
+        self._retries = []
+        self._in_hand = 0
+        while self.strategy.try_dequeue() is not None:
+            pass
+
+    async def wait_until_empty(self, timeout: float) -> bool:
+        """
+        Wait until every queued message has been handed to the sink or given up on.
+
+        :return: False if messages are still queued after timeout seconds, or the queue is not processing.
+        """
+        try:
+            async with asyncio.timeout(timeout):
+                while self.processing and not self._is_drained():
+                    self._drained.clear()
+                    try:
+                        await asyncio.wait_for(self._drained.wait(), timeout=DRAIN_CHECK_INTERVAL)
+                    except TimeoutError:
+                        pass
+        except TimeoutError:
+            logger.warning(f"Message queue still holds {self.get_message_count()} messages after {timeout} seconds")
+        return self._is_drained()
+
     def enqueue(self, message: StellaNowEventWrapper) -> None:
         """Add a message to the queue."""
         self.strategy.enqueue(message)
         logger.info(f"Message queued with messageId: {message.message_id}, Queue size: {self.get_message_count()}")
 
+    def replay_dead_letters(self) -> int:
+        """Queue the messages of the dead letter store again, returning how many were queued."""
+        return self.restore(self.dead_letters)
+
+    def restore(self, store: IDeadLetterStore) -> int:
+        """Queue the messages kept in a store, returning how many were queued."""
+        messages = store.drain()
+        for message in messages:
+            self.strategy.enqueue(message)
+        if messages:
+            logger.info(f"Queued {len(messages)} stored messages again, Queue size: {self.get_message_count()}")
+        return len(messages)
+
+    def persist(self, store: IDeadLetterStore, reason: str) -> int:
+        """Move the queued messages into a store, returning how many it accepted; only while not processing."""
+        persisted = 0
+        while (message := self.strategy.try_dequeue()) is not None:
+            persisted += store.add(message, reason=reason)
+        return persisted
+
     async def _process_queue(self) -> None:
         """Process the queue asynchronously with connection handling."""
         logger.info(f"Starting queue processing with initial queue size: {self.get_message_count()}")
+        retries = self._retries[0]
         while self.processing:
             if not self.sink.is_connected():
                 logger.warning("Sink is disconnected, pausing queue processing...")
                 await self._wait_for_connection()
                 logger.info(f"Sink reconnected, resuming queue processing with queue size: {self.get_message_count()}")
+                continue
+            delivery = retries.next_delivery()
+            if delivery is None:
+                message = None if self.strategy.is_empty() else self.strategy.try_dequeue()
+                if message is None:
+                    due = retries.seconds_until_due()
+                    await asyncio.sleep(0.1 if due is None else min(0.1, due))
+                    continue
+                logger.debug(f"Dequeued message {message.message_id}, Queue size: {self.get_message_count()}")
+                delivery = Delivery(message)
+            if delivery.attempts or not retries.hold(delivery):
+                async with self._holding():
+                    await self._deliver(delivery, retries)
+            await asyncio.sleep(0)  # A sink that sends without suspending would otherwise starve the event loop
+
+    async def _dispatch_queue(self) -> None:
+        """Move messages from the strategy into per-entity partitions consumed by the workers."""
+        logger.info(f"Starting queue dispatching with initial queue size: {self.get_message_count()}")
+        while self.processing:
+            if not self.sink.is_connected():
+                logger.warning("Sink is disconnected, pausing queue dispatching...")
+                await self._wait_for_connection()
+                logger.info(f"Sink reconnected, resuming queue dispatching with queue size: {self.get_message_count()}")
             elif not self.strategy.is_empty():
                 message = self.strategy.try_dequeue()
                 if message:
-                    logger.debug(f"Dequeued message {message.message_id}, Queue size: {self.get_message_count()}")
-                    await self._send_message_to_sink(message)
+                    index = self._partition_for(message)
+                    logger.debug(f"Dispatching message {message.message_id} to partition {index}")
+                    async with self._holding():
+                        await self._put_partitioned(index, message)
             else:
                 await asyncio.sleep(0.1)
 
-    async def _send_message_to_sink(self, message: StellaNowEventWrapper) -> None:
-        """Send a message to the sink with retry on failure."""
+    async def _put_partitioned(self, index: int, message: StellaNowEventWrapper) -> None:
+        """Wait for room in a partition, returning the message to the strategy if the queue stops first."""
+        partition = self._partitions[index]
+        try:
+            while self.processing:
+                try:
+                    await asyncio.wait_for(partition.put(message), timeout=0.1)
+                    return
+                except asyncio.TimeoutError:
+                    pass  # The partition is full; check whether the queue is stopping
+        except asyncio.CancelledError:
+            self.strategy.enqueue(message)
+            raise
+        self.strategy.enqueue(message)
+
+    async def _process_partition(self, index: int) -> None:
+        """Send the messages of a single partition, in order per entity."""
+        partition, retries = self._partitions[index], self._retries[index]
+        while self.processing:
+            delivery = retries.next_delivery()
+            if delivery is None:
+                try:
+                    if partition.empty():
+                        due = retries.seconds_until_due()
+                        message = await asyncio.wait_for(partition.get(), timeout=0.1 if due is None else min(0.1, due))
+                    else:
+                        message = partition.get_nowait()
+                except asyncio.TimeoutError:
+                    continue  # A retry is due, or the queue may be stopping
+                delivery = Delivery(message)
+            if delivery.attempts or not retries.hold(delivery):
+                async with self._holding():
+                    await self._wait_for_connection()
+                    if not self.processing:
+                        self.strategy.enqueue(delivery.message)
+                        logger.warning(f"Message {delivery.message.message_id} returned to queue on shutdown")
+                        return
+                    await self._deliver(delivery, retries)
+            await asyncio.sleep(0)
+
+    def _partition_for(self, message: StellaNowEventWrapper) -> int:
+        """Pick the partition for a message by hashing its entity ID."""
+        return zlib.crc32(message.key.entity_id.encode("utf-8")) % self.workers
+
+    def _return_pending_messages(self) -> None:
+        """Return messages backing off or waiting in the partitions to the strategy so they are not lost."""
+        for retries in self._retries:
+            for message in retries.drain():
+                self.strategy.enqueue(message)
+        for partition in self._partitions:
+            while not partition.empty():
+                self.strategy.enqueue(partition.get_nowait())
+        self._partitions = []
+
+    async def _deliver(self, delivery: Delivery, retries: RetryScheduler) -> None:
+        """Send a message, scheduling a retry or giving up on it if the sink fails to send it."""
+        message = delivery.message
         try:
             await self.sink.send_message(message)
-            logger.success(f"Message sent successfully with messageId: {message.message_id}")
         except Exception as e:
-            logger.error(f"Failed to send message {message.message_id}: {e}")
-            self.strategy.enqueue(message)
-            logger.warning(f"Message {message.message_id} re-queued, Queue size: {self.get_message_count()}")
-            await asyncio.sleep(1)
+            delivery.attempts += 1
+            if delivery.attempts < self.max_attempts:
+                logger.error(f"Failed to send message {message.message_id} (attempt {delivery.attempts}): {e}")
+                retries.schedule(delivery)
+                return
+            logger.error(f"Giving up on message {message.message_id} after {delivery.attempts} attempts: {e}")
+            self.dead_letters.add(message, reason=str(e))
+        else:
+            self.sent_count += 1
+            logger.success(f"Message sent successfully with messageId: {message.message_id}")
+        if delivery.attempts:
+            retries.release(message.key.entity_id)
+
+    def _on_rejected(self, message: StellaNowEventWrapper, reason: str) -> None:
+        """Move a message the receiving end refused to the dead letter store."""
+        self.rejected_count += 1
+        logger.error(f"Message {message.message_id} was rejected after sending: {reason}")
+        self.dead_letters.add(message, reason=reason)
+
+    @contextlib.asynccontextmanager
+    async def _holding(self) -> AsyncIterator[None]:
+        """Count a message taken out of the queue as queued until it is sent or put back."""
+        self._in_hand += 1
+        try:
+            yield
+        finally:
+            self._in_hand -= 1
+            if self._is_drained():
+                self._drained.set()
+
+    def _is_drained(self) -> bool:
+        return not self._in_hand and self.is_empty()
 
     async def _wait_for_connection(self) -> None:
         """Wait for the sink to reconnect."""
@@ -105,9 +325,17 @@ class StellaNowMessageQueue:
             await asyncio.sleep(0.5)
 
     def is_empty(self) -> bool:
-        """Check if the queue is empty."""
-        return self.strategy.is_empty()
+        """Check if the queue is empty, including messages waiting for a retry."""
+        return (
+            self.strategy.is_empty()
+            and all(partition.empty() for partition in self._partitions)
+            and not any(self._retries)
+        )
 
     def get_message_count(self) -> int:
-        """Get the number of messages in the queue."""
-        return self.strategy.get_message_count()
+        """Get the number of messages in the queue, including messages waiting for a retry."""
+        return (
+            self.strategy.get_message_count()
+            + sum(partition.qsize() for partition in self._partitions)
+            + sum(len(retries) for retries in self._retries)
+        )
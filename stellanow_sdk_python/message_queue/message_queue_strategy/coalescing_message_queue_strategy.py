@@ -0,0 +1,100 @@
+"""
+Copyright (C) 2022-2025 Stella Technologies (UK) Limited.
+
+Permission is hereby granted, free of charge, to any person obtaining a copy
+of this software and associated documentation files (the "Software"), to deal
+in the Software without restriction, including without limitation the rights
+to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+copies of the Software, and to permit persons to whom the Software is
+furnished to do so, subject to the following conditions:
+
+The above copyright notice and this permission notice shall be included in
+all copies or substantial portions of the Software.
+
+THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING
+FROM, OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS
+IN THE SOFTWARE.
+"""
+
+import threading
+from collections import deque
+from typing import Iterable, Optional
+
+from stellanow_sdk_python.message_queue.message_queue_strategy.i_message_queue_strategy import IMessageQueueStrategy
+from stellanow_sdk_python.messages.event import StellaNowEventWrapper
+
+CoalescingKey = tuple[str, str]  # Entity ID and event type definition ID
+
+
+class _Slot:
+    """A place in the queue whose message a newer one of the same entity and event type can take over."""
+
+    __slots__ = ("message",)
+
+    def __init__(self, message: StellaNowEventWrapper):
+        self.message = message
+
+
+class CoalescingMessageQueueStrategy(IMessageQueueStrategy):
+    """
+    A first-in, first-out message_queue strategy keeping only the latest queued message per entity and event type.
+
+    For the event types given, such as state updates of which only the newest value matters, a message whose entity
+    and event type already have a message queued replaces that message in its place in the queue, so a backlog of
+    repeated updates collapses into one message each. A message older than the queued one, by message origin date,
+    is dropped instead; that happens when the message queue hands a message back after a failed attempt. Messages of
+    other event types are queued as they are.
+    """
+
+    keeps_every_message = False
+
+    def __init__(self, coalesced_event_types: Iterable[str]) -> None:
+        self.coalesced_event_types = frozenset(coalesced_event_types)
+        self.coalesced_count = 0  # Messages dropped because a newer one of their entity and event type was queued
+        self._queue: deque[_Slot] = deque()
+        self._slots: dict[CoalescingKey, _Slot] = {}
+        self._lock = threading.Lock()
+
+    def enqueue(self, message: StellaNowEventWrapper) -> None:
+        event_type = message.event_type_definition_id
+        with self._lock:
+            if event_type is None or event_type not in self.coalesced_event_types:
+                self._queue.append(_Slot(message))
+                return
+            key = (message.key.entity_id, event_type)
+            slot = self._slots.get(key)
+            if slot is None:
+                slot = self._slots[key] = _Slot(message)
+                self._queue.append(slot)
+                return
+            self.coalesced_count += 1
+            if _is_newer(message, slot.message):
+                slot.message = message
+
+    def try_dequeue(self) -> Optional[StellaNowEventWrapper]:
+        with self._lock:
+            if not self._queue:
+                return None
+            message = self._queue.popleft().message
+            event_type = message.event_type_definition_id
+            if event_type is not None and event_type in self.coalesced_event_types:
+                del self._slots[(message.key.entity_id, event_type)]
+            return message
+
+    def is_empty(self) -> bool:
+        with self._lock:
+            return not self._queue
+
+    def get_message_count(self) -> int:
+        with self._lock:
+            return len(self._queue)
+
+
+def _is_newer(message: StellaNowEventWrapper, queued: StellaNowEventWrapper) -> bool:
+    """Whether a message is at least as new as the queued one; without origin dates, the later one wins."""
+    origin, queued_origin = message.message_origin_date_utc, queued.message_origin_date_utc
+    return origin is None or queued_origin is None or origin >= queued_origin
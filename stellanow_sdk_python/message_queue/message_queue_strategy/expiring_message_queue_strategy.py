@@ -0,0 +1,148 @@
+"""
+Copyright (C) 2022-2025 Stella Technologies (UK) Limited.
+
+Permission is hereby granted, free of charge, to any person obtaining a copy
+of this software and associated documentation files (the "Software"), to deal
+in the Software without restriction, including without limitation the rights
+to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+copies of the Software, and to permit persons to whom the Software is
+furnished to do so, subject to the following conditions:
+
+The above copyright notice and this permission notice shall be included in
+all copies or substantial portions of the Software.
+
+THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING
+FROM, OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS
+IN THE SOFTWARE.
+"""
+
+import heapq
+import threading
+import time
+from collections import Counter
+from typing import Mapping, Optional
+
+from stellanow_sdk_python.message_queue.message_queue_strategy.i_message_queue_strategy import IMessageQueueStrategy
+from stellanow_sdk_python.messages.event import StellaNowEventWrapper
+
+DEFAULT_EXPIRY_RESOLUTION = 1.0
+
+
+class ExpiringMessageQueueStrategy(IMessageQueueStrategy):
+    """
+    Wraps a message_queue strategy, dropping messages older than their maximum age instead of sending them.
+
+    A message's age is measured from its message origin date, or from when it was queued if it has none. Expired
+    messages are dropped when dequeued. They are also found as they expire through an index of messages bucketed by
+    expiry time, so the message count leaves them out straight away and, once only expired messages are left, they are
+    released without waiting for the sink; otherwise finding them would mean scanning the queue. The index is not used
+    for strategies that replace messages, such as the coalescing strategy, whose messages only expire when dequeued.
+    """
+
+    def __init__(
+        self,
+        strategy: IMessageQueueStrategy,
+        max_age: Optional[float] = None,
+        event_type_max_ages: Optional[Mapping[str, float]] = None,
+        resolution: float = DEFAULT_EXPIRY_RESOLUTION,
+    ) -> None:
+        """
+        :param strategy: The strategy holding the messages.
+        :param max_age: Seconds after which messages expire, unless their event type has a maximum age of its own;
+            None keeps them until sent.
+        :param event_type_max_ages: Seconds after which messages of each event type expire.
+        :param resolution: Width in seconds of the expiry index buckets; a message is left out of the message count
+            at most this long after it expired.
+        """
+        if resolution <= 0:
+            raise ValueError(f"The expiry resolution must be positive, got {resolution}")
+        self.strategy = strategy
+        self.max_age = max_age
+        self.event_type_max_ages = dict(event_type_max_ages or {})
+        self.resolution = resolution
+        self.expired_counts: Counter[str] = Counter()  # Event type -> messages dropped as expired
+        self._indexed = strategy.keeps_every_message
+        self._expires_at: dict[int, float] = {}  # id() of queued messages -> expiry time
+        self._expired: dict[int, StellaNowEventWrapper] = {}  # id() -> expired messages still in the strategy
+        self._buckets: dict[int, list[StellaNowEventWrapper]] = {}  # Bucket -> messages expiring within it
+        self._bucket_heap: list[int] = []
+        self._lock = threading.Lock()
+
+    def max_age_of(self, message: StellaNowEventWrapper) -> Optional[float]:
+        """The maximum age of a message in seconds, or None if it does not expire."""
+        event_type = message.event_type_definition_id
+        if event_type is not None and event_type in self.event_type_max_ages:
+            return self.event_type_max_ages[event_type]
+        return self.max_age
+
+    def enqueue(self, message: StellaNowEventWrapper) -> None:
+        max_age = self.max_age_of(message)
+        if max_age is None:
+            self.strategy.enqueue(message)
+            return
+        now = time.time()
+        origin = message.message_origin_date_utc
+        expires_at = (origin.timestamp() if origin is not None else now) + max_age
+        with self._lock:
+            if expires_at <= now:
+                self._count_expired(message)
+                return
+            self.strategy.enqueue(message)
+            if self._indexed:
+                self._index(message, expires_at)
+
+    def try_dequeue(self) -> Optional[StellaNowEventWrapper]:
+        with self._lock:
+            self._expire_due(time.time())
+            while (message := self.strategy.try_dequeue()) is not None:
+                if self._expired.pop(id(message), None) is not None:
+                    continue
+                expires_at = self._expires_at.pop(id(message), None)
+                if expires_at is None and not self._indexed:
+                    expires_at = self._unindexed_expiry(message)
+                if expires_at is not None and expires_at <= time.time():
+                    self._count_expired(message)
+                    continue
+                return message
+            return None
+
+    def is_empty(self) -> bool:
+        return self.get_message_count() == 0
+
+    def get_message_count(self) -> int:
+        with self._lock:
+            self._expire_due(time.time())
+            return self.strategy.get_message_count() - len(self._expired)
+
+    def _index(self, message: StellaNowEventWrapper, expires_at: float) -> None:
+        self._expires_at[id(message)] = expires_at
+        bucket = int(expires_at // self.resolution)
+        messages = self._buckets.get(bucket)
+        if messages is None:
+            messages = self._buckets[bucket] = []
+            heapq.heappush(self._bucket_heap, bucket)
+        messages.append(message)
+
+    def _unindexed_expiry(self, message: StellaNowEventWrapper) -> Optional[float]:
+        max_age = self.max_age_of(message)
+        origin = message.message_origin_date_utc
+        return None if max_age is None or origin is None else origin.timestamp() + max_age
+
+    def _expire_due(self, now: float) -> None:
+        # A bucket is due once all of its messages have expired; the bucket holds them, so their id() stays unique
+        while self._bucket_heap and (self._bucket_heap[0] + 1) * self.resolution <= now:
+            for message in self._buckets.pop(heapq.heappop(self._bucket_heap)):
+                if self._expires_at.pop(id(message), None) is not None:
+                    self._expired[id(message)] = message
+                    self._count_expired(message)
+        if self._expired and len(self._expired) >= self.strategy.get_message_count():
+            while self.strategy.try_dequeue() is not None:  # Only expired messages are left
+                pass
+            self._expired.clear()
+
+    def _count_expired(self, message: StellaNowEventWrapper) -> None:
+        self.expired_counts[message.event_type_definition_id or ""] += 1
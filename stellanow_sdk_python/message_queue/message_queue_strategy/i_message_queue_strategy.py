@@ -30,6 +30,8 @@ from stellanow_sdk_python.messages.event import StellaNowEventWrapper
 class MessageQueueType(Enum):
     FIFO = "fifo"
     LIFO = "lifo"
+    COALESCING = "coalescing"
+    PRIORITY = "priority"
 
 
 class IMessageQueueStrategy(ABC):
@@ -37,6 +39,9 @@ class IMessageQueueStrategy(ABC):
     Defines the contract for a message message_queue strategy in StellaNow.
     """
 
+    # Whether every message queued is dequeued again, rather than some being dropped or replaced by the strategy
+    keeps_every_message = True
+
     @abstractmethod
     def enqueue(self, message: StellaNowEventWrapper) -> None:
         """
@@ -0,0 +1,119 @@
+"""
+Copyright (C) 2022-2025 Stella Technologies (UK) Limited.
+
+Permission is hereby granted, free of charge, to any person obtaining a copy
+of this software and associated documentation files (the "Software"), to deal
+in the Software without restriction, including without limitation the rights
+to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+copies of the Software, and to permit persons to whom the Software is
+furnished to do so, subject to the following conditions:
+
+The above copyright notice and this permission notice shall be included in
+all copies or substantial portions of the Software.
+
+THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING
+FROM, OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS
+IN THE SOFTWARE.
+"""
+
+import bisect
+import threading
+import time
+from collections import deque
+from typing import Mapping, Optional
+
+from stellanow_sdk_python.message_queue.message_queue_strategy.i_message_queue_strategy import IMessageQueueStrategy
+from stellanow_sdk_python.messages.event import StellaNowEventWrapper
+
+DEFAULT_PRIORITY = 0
+DEFAULT_AGING_INTERVAL = 30.0
+
+
+class PriorityMessageQueueStrategy(IMessageQueueStrategy):
+    """
+    A message_queue strategy sending messages of a higher priority first, and messages of equal priority first-in,
+    first-out.
+
+    A message takes the priority set on it, else the priority of its event type, else the default priority. Each
+    priority has a queue of its own, so queuing and dequeuing cost no more than the number of distinct priorities in
+    use. To keep a steady stream of important messages from holding back the others forever, a message waiting for
+    longer counts as one priority higher for every aging interval it waited.
+    """
+
+    def __init__(
+        self,
+        event_type_priorities: Optional[Mapping[str, int]] = None,
+        default_priority: int = DEFAULT_PRIORITY,
+        aging_interval: Optional[float] = DEFAULT_AGING_INTERVAL,
+    ) -> None:
+        """
+        :param event_type_priorities: Priority of each event type; higher priorities are sent first.
+        :param default_priority: Priority of messages of the other event types.
+        :param aging_interval: Seconds of waiting after which a message counts as one priority higher; None lets
+            messages of a lower priority wait as long as higher priority ones keep coming.
+        """
+        if aging_interval is not None and aging_interval <= 0:
+            raise ValueError(f"The aging interval must be positive, got {aging_interval}")
+        self.event_type_priorities = dict(event_type_priorities or {})
+        self.default_priority = default_priority
+        self.aging_interval = aging_interval
+        self._queues: dict[int, deque[tuple[float, StellaNowEventWrapper]]] = {}  # Priority -> (queued at, message)
+        self._priorities: list[int] = []  # Priorities with a queue, highest first
+        self._count = 0
+        self._lock = threading.Lock()
+
+    def priority_of(self, message: StellaNowEventWrapper) -> int:
+        """The priority a message is queued with."""
+        if message.priority is not None:
+            return message.priority
+        event_type = message.event_type_definition_id
+        if event_type is None:
+            return self.default_priority
+        return self.event_type_priorities.get(event_type, self.default_priority)
+
+    def enqueue(self, message: StellaNowEventWrapper) -> None:
+        priority = self.priority_of(message)
+        with self._lock:
+            queue = self._queues.get(priority)
+            if queue is None:
+                queue = self._queues[priority] = deque()
+                bisect.insort(self._priorities, priority, key=lambda level: -level)
+            queue.append((time.monotonic(), message))
+            self._count += 1
+
+    def try_dequeue(self) -> Optional[StellaNowEventWrapper]:
+        with self._lock:
+            if not self._count:
+                return None
+            queue = self._next_queue()
+            self._count -= 1
+            return queue.popleft()[1]
+
+    def is_empty(self) -> bool:
+        with self._lock:
+            return not self._count
+
+    def get_message_count(self) -> int:
+        with self._lock:
+            return self._count
+
+    def _next_queue(self) -> deque[tuple[float, StellaNowEventWrapper]]:
+        # Each queue's oldest message has waited the longest, so only the heads compete for being sent next
+        if self.aging_interval is None:
+            return next(self._queues[priority] for priority in self._priorities if self._queues[priority])
+        now = time.monotonic()
+        best: Optional[deque[tuple[float, StellaNowEventWrapper]]] = None
+        best_priority = 0.0
+        for priority in self._priorities:
+            queue = self._queues[priority]
+            if not queue:
+                continue
+            aged_priority = priority + (now - queue[0][0]) / self.aging_interval
+            if best is None or aged_priority > best_priority:
+                best, best_priority = queue, aged_priority
+        assert best is not None
+        return best
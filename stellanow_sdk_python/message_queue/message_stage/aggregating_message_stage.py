@@ -0,0 +1,214 @@
+"""
+Copyright (C) 2022-2025 Stella Technologies (UK) Limited.
+
+Permission is hereby granted, free of charge, to any person obtaining a copy
+of this software and associated documentation files (the "Software"), to deal
+in the Software without restriction, including without limitation the rights
+to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+copies of the Software, and to permit persons to whom the Software is
+furnished to do so, subject to the following conditions:
+
+The above copyright notice and this permission notice shall be included in
+all copies or substantial portions of the Software.
+
+THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING
+FROM, OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS
+IN THE SOFTWARE.
+"""
+
+import json
+import math
+import time
+from dataclasses import dataclass
+from datetime import UTC, datetime
+from typing import Any, Mapping, Optional, Sequence
+
+from stellanow_sdk_python.config.stellanow_config import StellaProjectInfo
+from stellanow_sdk_python.message_queue.message_queue import StellaNowMessageQueue
+from stellanow_sdk_python.message_queue.message_stage.i_message_stage import Forward, IMessageStage
+from stellanow_sdk_python.messages.aggregate_message import AggregateMessage, FieldSummary
+from stellanow_sdk_python.messages.event import StellaNowEventWrapper
+from stellanow_sdk_python.messages.message import Entity, StellaNowMessageWrapper
+from stellanow_sdk_python.utils.quantile_sketch import QuantileSketch
+
+DEFAULT_WINDOW = 60.0
+DEFAULT_MAX_GROUPS = 100_000
+
+
+@dataclass
+class Aggregation:
+    """How the messages of one event type are aggregated."""
+
+    event_name: str  # Event type of the aggregate messages, defined in StellaNow like any other
+    fields: Sequence[str] = ()  # Numeric payload fields to summarize; every numeric top-level field if empty
+    quantiles: Sequence[float] = ()  # Quantiles to estimate of each field, such as (0.5, 0.99)
+
+
+class _FieldAccumulator:
+    __slots__ = ("count", "sum", "min", "max", "sketch")
+
+    def __init__(self, with_sketch: bool):
+        self.count = 0
+        self.sum = 0.0
+        self.min = math.inf
+        self.max = -math.inf
+        self.sketch = QuantileSketch() if with_sketch else None
+
+    def add(self, value: float) -> None:
+        self.count += 1
+        self.sum += value
+        self.min = min(self.min, value)
+        self.max = max(self.max, value)
+        if self.sketch is not None:
+            self.sketch.add(value)
+
+    def summary(self, quantiles: Sequence[float]) -> FieldSummary:
+        estimates = None
+        if self.sketch is not None:
+            estimates = {f"p{quantile * 100:g}": self.sketch.quantile(quantile) for quantile in quantiles}
+        return FieldSummary(count=self.count, sum=self.sum, min=self.min, max=self.max, quantiles=estimates)
+
+
+class _Group:
+    """The messages of one entity and event type within the current window."""
+
+    __slots__ = ("entities", "count", "fields")
+
+    def __init__(self, entities: list[Entity]):
+        self.entities = entities
+        self.count = 0
+        self.fields: dict[str, _FieldAccumulator] = {}
+
+
+class AggregatingMessageStage(IMessageStage):
+    """
+    Replaces the messages of high-frequency numeric event types by one aggregate message per entity and time window.
+
+    For each entity and event type, the stage keeps the number of messages sent within the window and the count, sum,
+    minimum, maximum and, optionally, quantiles of their numeric fields. Windows are aligned to multiples of their
+    length in wall clock time; when one closes, the stage passes on an AggregateMessage of the event type configured
+    for each group instead of the messages themselves. Windows close as messages arrive and when the SDK polls its
+    stages, and the open window is flushed when the SDK stops. Once max_groups entities and event types are being
+    aggregated, messages of further ones are passed on as they are, so memory stays bounded.
+    """
+
+    def __init__(
+        self,
+        aggregations: Mapping[str, Aggregation],
+        window: float = DEFAULT_WINDOW,
+        max_groups: int = DEFAULT_MAX_GROUPS,
+    ) -> None:
+        """
+        :param aggregations: How to aggregate each event type; messages of other event types are passed on.
+        :param window: Length of the windows in seconds.
+        :param max_groups: Entities and event types aggregated at most within a window.
+        """
+        if window <= 0:
+            raise ValueError(f"The aggregation window must be positive, got {window}")
+        for aggregation in aggregations.values():
+            if any(not 0 <= quantile <= 1 for quantile in aggregation.quantiles):
+                raise ValueError(f"Quantiles must be between 0 and 1, got {list(aggregation.quantiles)}")
+        self.aggregations = dict(aggregations)
+        self.window = window
+        self.max_groups = max_groups
+        self.aggregated_count = 0  # Messages replaced by aggregates
+        self.emitted_count = 0  # Aggregate messages passed on
+        self.overflow_count = 0  # Messages passed on as they are because max_groups was reached
+        self._project_info: Optional[StellaProjectInfo] = None
+        self._window_start = math.floor(time.time() / window) * window
+        self._groups: dict[tuple[str, str], _Group] = {}
+
+    def attach(self, message_queue: StellaNowMessageQueue, project_info: StellaProjectInfo) -> None:
+        self._project_info = project_info
+
+    def process(self, message: StellaNowEventWrapper, forward: Forward) -> None:
+        event_type = message.event_type_definition_id
+        aggregation = self.aggregations.get(event_type) if event_type is not None else None
+        if event_type is None or aggregation is None:
+            forward(message)
+            return
+        self._close_window_if_due(time.time(), forward)
+        values = _numeric_fields(message.payload, aggregation.fields)
+        if values is None:
+            forward(message)
+            return
+        key = (message.key.entity_id, event_type)
+        group = self._groups.get(key)
+        if group is None:
+            if len(self._groups) >= self.max_groups:
+                self.overflow_count += 1
+                forward(message)
+                return
+            group = self._groups[key] = _Group(message.entities)
+        group.count += 1
+        for name, value in values.items():
+            accumulator = group.fields.get(name)
+            if accumulator is None:
+                accumulator = group.fields[name] = _FieldAccumulator(with_sketch=bool(aggregation.quantiles))
+            accumulator.add(value)
+        self.aggregated_count += 1
+
+    def poll(self, forward: Forward) -> None:
+        self._close_window_if_due(time.time(), forward)
+
+    def flush(self, forward: Forward) -> None:
+        self._emit(min(time.time(), self._window_start + self.window), forward)
+
+    def _close_window_if_due(self, now: float, forward: Forward) -> None:
+        window_start = math.floor(now / self.window) * self.window
+        if window_start != self._window_start:
+            self._emit(self._window_start + self.window, forward)
+            self._window_start = window_start
+
+    def _emit(self, window_end: float, forward: Forward) -> None:
+        if not self._groups:
+            return
+        if self._project_info is None:
+            raise RuntimeError("The aggregating stage is not attached to the SDK")
+        groups, self._groups = self._groups, {}
+        start, end = datetime.fromtimestamp(self._window_start, UTC), datetime.fromtimestamp(window_end, UTC)
+        for (_, event_type), group in groups.items():
+            aggregation = self.aggregations[event_type]
+            message = AggregateMessage(
+                event_name=aggregation.event_name,
+                entities=group.entities,
+                source_event_type=event_type,
+                window_start=start,
+                window_end=end,
+                count=group.count,
+                fields={name: field.summary(aggregation.quantiles) for name, field in group.fields.items()},
+            )
+            forward(
+                StellaNowEventWrapper.create(
+                    message=StellaNowMessageWrapper.create(message),
+                    organization_id=self._project_info.organization_id,
+                    project_id=self._project_info.project_id,
+                )
+            )
+            self.emitted_count += 1
+
+
+def _numeric_fields(payload: str, fields: Sequence[str]) -> Optional[dict[str, float]]:
+    """The numeric fields of a JSON payload within the range of a float, or None if it is not a JSON object."""
+    try:
+        data: Any = json.loads(payload)
+    except ValueError:
+        return None
+    if not isinstance(data, dict):
+        return None
+    values: dict[str, float] = {}
+    for name in fields or data.keys():
+        value = data.get(name)
+        if isinstance(value, bool) or not isinstance(value, (int, float)):
+            continue
+        try:
+            number = float(value)
+        except OverflowError:  # An integer beyond the range of a float
+            continue
+        if math.isfinite(number):  # Literals such as 1e400 parse to infinity
+            values[name] = number
+    return values
@@ -0,0 +1,66 @@
+"""
+Copyright (C) 2022-2025 Stella Technologies (UK) Limited.
+
+Permission is hereby granted, free of charge, to any person obtaining a copy
+of this software and associated documentation files (the "Software"), to deal
+in the Software without restriction, including without limitation the rights
+to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+copies of the Software, and to permit persons to whom the Software is
+furnished to do so, subject to the following conditions:
+
+The above copyright notice and this permission notice shall be included in
+all copies or substantial portions of the Software.
+
+THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING
+FROM, OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS
+IN THE SOFTWARE.
+"""
+
+from abc import ABC, abstractmethod
+from typing import Callable
+
+from stellanow_sdk_python.config.stellanow_config import StellaProjectInfo
+from stellanow_sdk_python.message_queue.message_queue import StellaNowMessageQueue
+from stellanow_sdk_python.messages.event import StellaNowEventWrapper
+
+Forward = Callable[[StellaNowEventWrapper], None]  # Passes a message on to the next stage, or to the message queue
+
+
+class IMessageStage(ABC):
+    """
+    Defines a step messages pass through between StellaNowSDK.send_message and the message queue.
+
+    A stage may pass a message on, drop it, or hold it back to pass on later, such as when polled or flushed.
+    """
+
+    def attach(self, message_queue: StellaNowMessageQueue, project_info: StellaProjectInfo) -> None:
+        """
+        Called once by the SDK with the message queue the stage feeds, for stages that adapt to its backlog, and the
+        project of its messages, for stages that create messages of their own.
+        :param message_queue: The SDK's message queue.
+        :param project_info: The project messages are sent to.
+        """
+
+    @abstractmethod
+    def process(self, message: StellaNowEventWrapper, forward: Forward) -> None:
+        """
+        Handles a message sent through the SDK.
+        :param message: The message sent.
+        :param forward: Passes a message on towards the message queue.
+        """
+
+    def poll(self, forward: Forward) -> None:
+        """
+        Called periodically while the SDK runs, to pass on messages held back for long enough.
+        :param forward: Passes a message on towards the message queue.
+        """
+
+    def flush(self, forward: Forward) -> None:
+        """
+        Passes on every message held back, called when the SDK stops.
+        :param forward: Passes a message on towards the message queue.
+        """
@@ -0,0 +1,134 @@
+"""
+Copyright (C) 2022-2025 Stella Technologies (UK) Limited.
+
+Permission is hereby granted, free of charge, to any person obtaining a copy
+of this software and associated documentation files (the "Software"), to deal
+in the Software without restriction, including without limitation the rights
+to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+copies of the Software, and to permit persons to whom the Software is
+furnished to do so, subject to the following conditions:
+
+The above copyright notice and this permission notice shall be included in
+all copies or substantial portions of the Software.
+
+THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING
+FROM, OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS
+IN THE SOFTWARE.
+"""
+
+import time
+from collections import Counter
+from typing import Optional, Sequence
+
+from loguru import logger
+
+from stellanow_sdk_python.config.stellanow_config import StellaProjectInfo
+from stellanow_sdk_python.message_queue.message_queue import StellaNowMessageQueue
+from stellanow_sdk_python.message_queue.message_stage.i_message_stage import Forward, IMessageStage
+from stellanow_sdk_python.message_queue.message_stage.shedding_policy import ISheddingPolicy
+from stellanow_sdk_python.messages.event import StellaNowEventWrapper
+
+DEFAULT_MAX_QUEUE_DEPTH = 10_000
+DEFAULT_RECOVERY_RATIO = 0.5
+DEFAULT_CHECK_INTERVAL = 0.1
+
+
+class LoadSheddingMessageStage(IMessageStage):
+    """
+    Sheds load by its policies while the message queue's backlog is over its limits, instead of letting it grow.
+
+    The backlog is measured by the number of queued messages and by the time a new message would wait, estimated from
+    that number and the rate the queue has been sending at. Its pressure is the larger of the two relative to their
+    limits. Shedding starts once the pressure reaches 1 and stops, releasing the messages the policies held back,
+    once it falls below the recovery ratio. The backlog is checked at most once per check interval, so deciding on a
+    message costs no more than reading the clock while the queue is not overloaded.
+    """
+
+    def __init__(
+        self,
+        policies: Sequence[ISheddingPolicy],
+        max_queue_depth: Optional[int] = DEFAULT_MAX_QUEUE_DEPTH,
+        max_queue_wait: Optional[float] = None,
+        recovery_ratio: float = DEFAULT_RECOVERY_RATIO,
+        check_interval: float = DEFAULT_CHECK_INTERVAL,
+    ) -> None:
+        """
+        :param policies: How messages are shed, the first policy applying to a message deciding on it; messages none
+            applies to are always passed on.
+        :param max_queue_depth: Number of queued messages from which load is shed; None for no limit.
+        :param max_queue_wait: Estimated seconds a new message waits in the queue from which load is shed; None for no
+            limit.
+        :param recovery_ratio: Fraction of the limits the backlog has to fall below for shedding to stop.
+        :param check_interval: Seconds between checks of the backlog.
+        """
+        if max_queue_depth is None and max_queue_wait is None:
+            raise ValueError("Load shedding requires a maximum queue depth or wait")
+        if not 0 < recovery_ratio <= 1:
+            raise ValueError(f"The recovery ratio must be between 0 and 1, got {recovery_ratio}")
+        self.policies = list(policies)
+        self.max_queue_depth = max_queue_depth
+        self.max_queue_wait = max_queue_wait
+        self.recovery_ratio = recovery_ratio
+        self.check_interval = check_interval
+        self.shedding = False
+        self.pressure = 0.0
+        self._message_queue: Optional[StellaNowMessageQueue] = None
+        self._checked_at = 0.0
+        self._sent_count = 0
+        self._send_rate = 0.0  # Messages per second, smoothed over recent checks
+
+    @property
+    def shed_counts(self) -> Counter[str]:
+        """Messages dropped by the policies, by event type."""
+        return sum((policy.shed_counts for policy in self.policies), Counter())
+
+    def attach(self, message_queue: StellaNowMessageQueue, project_info: StellaProjectInfo) -> None:
+        self._message_queue = message_queue
+        self._checked_at = time.monotonic()
+        self._sent_count = message_queue.sent_count
+
+    def process(self, message: StellaNowEventWrapper, forward: Forward) -> None:
+        now = time.monotonic()
+        if now - self._checked_at >= self.check_interval:
+            self._check(now, forward)
+        if self.shedding:
+            for policy in self.policies:
+                if policy.applies_to(message):
+                    if policy.admit(message, self.pressure):
+                        break
+                    return
+        forward(message)
+
+    def poll(self, forward: Forward) -> None:
+        self._check(time.monotonic(), forward)
+
+    def flush(self, forward: Forward) -> None:
+        self.shedding = False
+        for policy in self.policies:
+            policy.release(forward)
+
+    def _check(self, now: float, forward: Forward) -> None:
+        if self._message_queue is None:
+            raise RuntimeError("The load shedding stage is not attached to a message queue")
+        elapsed, self._checked_at = now - self._checked_at, now
+        sent_count = self._message_queue.sent_count
+        if elapsed > 0:
+            self._send_rate = 0.5 * self._send_rate + 0.5 * (sent_count - self._sent_count) / elapsed
+        self._sent_count = sent_count
+        depth = self._message_queue.get_message_count()
+        self.pressure = 0.0
+        if self.max_queue_depth is not None:
+            self.pressure = depth / self.max_queue_depth
+        if self.max_queue_wait is not None and depth:
+            wait = depth / self._send_rate if self._send_rate > 0 else float("inf")
+            self.pressure = max(self.pressure, wait / self.max_queue_wait)
+        if not self.shedding and self.pressure >= 1:
+            self.shedding = True
+            logger.warning(f"Message queue overloaded with {depth} messages, shedding load")
+        elif self.shedding and self.pressure < self.recovery_ratio:
+            logger.info(f"Message queue recovered with {depth} messages, shed {sum(self.shed_counts.values())} so far")
+            self.flush(forward)
@@ -0,0 +1,110 @@
+"""
+Copyright (C) 2022-2025 Stella Technologies (UK) Limited.
+
+Permission is hereby granted, free of charge, to any person obtaining a copy
+of this software and associated documentation files (the "Software"), to deal
+in the Software without restriction, including without limitation the rights
+to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+copies of the Software, and to permit persons to whom the Software is
+furnished to do so, subject to the following conditions:
+
+The above copyright notice and this permission notice shall be included in
+all copies or substantial portions of the Software.
+
+THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING
+FROM, OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS
+IN THE SOFTWARE.
+"""
+
+import random
+from abc import ABC, abstractmethod
+from collections import Counter
+from typing import Iterable
+
+from stellanow_sdk_python.message_queue.message_stage.i_message_stage import Forward
+from stellanow_sdk_python.messages.event import StellaNowEventWrapper
+
+DEFAULT_MIN_KEEP_RATE = 0.01
+DEFAULT_MAX_HELD_MESSAGES = 100_000
+
+
+class ISheddingPolicy(ABC):
+    """
+    Defines how the load shedding stage cuts the messages it lets through while the message queue is overloaded.
+    """
+
+    def __init__(self, event_types: Iterable[str]) -> None:
+        self.event_types = frozenset(event_types)
+        self.shed_counts: Counter[str] = Counter()  # Event type -> messages dropped
+
+    def applies_to(self, message: StellaNowEventWrapper) -> bool:
+        """Whether the policy decides on the message."""
+        return message.event_type_definition_id in self.event_types
+
+    @abstractmethod
+    def admit(self, message: StellaNowEventWrapper, pressure: float) -> bool:
+        """
+        Decides on a message the policy applies to, while shedding load.
+        :param message: The message sent.
+        :param pressure: How far the backlog is over its limit; above 1 while the limit is exceeded.
+        :return: True to pass the message on; False if the policy dropped it or holds it back.
+        """
+
+    def release(self, forward: Forward) -> None:
+        """
+        Passes on the messages held back, once the backlog has cleared.
+        :param forward: Passes a message on towards the message queue.
+        """
+
+
+class SamplingSheddingPolicy(ISheddingPolicy):
+    """
+    Lets a random sample of messages through, at a rate falling as the backlog grows past its limit.
+
+    At twice the limit half of the messages are kept, at ten times the limit one in ten, but never fewer than the
+    minimum keep rate.
+    """
+
+    def __init__(self, event_types: Iterable[str], min_keep_rate: float = DEFAULT_MIN_KEEP_RATE) -> None:
+        if not 0 < min_keep_rate <= 1:
+            raise ValueError(f"The minimum keep rate must be between 0 and 1, got {min_keep_rate}")
+        super().__init__(event_types)
+        self.min_keep_rate = min_keep_rate
+
+    def admit(self, message: StellaNowEventWrapper, pressure: float) -> bool:
+        if random.random() < max(self.min_keep_rate, 1 / pressure):
+            return True
+        self.shed_counts[message.event_type_definition_id or ""] += 1
+        return False
+
+
+class LatestPerEntitySheddingPolicy(ISheddingPolicy):
+    """
+    Holds back the newest message of each entity and event type, dropping the ones it replaces, and passes the held
+    messages on once the backlog has cleared.
+
+    Once max_held_messages are held, messages of entities not held yet are passed on, so memory stays bounded.
+    """
+
+    def __init__(self, event_types: Iterable[str], max_held_messages: int = DEFAULT_MAX_HELD_MESSAGES) -> None:
+        super().__init__(event_types)
+        self.max_held_messages = max_held_messages
+        self._held: dict[tuple[str, str], StellaNowEventWrapper] = {}
+
+    def admit(self, message: StellaNowEventWrapper, pressure: float) -> bool:
+        key = (message.key.entity_id, message.event_type_definition_id or "")
+        if key in self._held:
+            self.shed_counts[key[1]] += 1
+        elif len(self._held) >= self.max_held_messages:
+            return True
+        self._held[key] = message
+        return False
+
+    def release(self, forward: Forward) -> None:
+        held, self._held = self._held, {}
+        for message in held.values():
+            forward(message)
@@ -0,0 +1,104 @@
+"""
+Copyright (C) 2022-2025 Stella Technologies (UK) Limited.
+
+Permission is hereby granted, free of charge, to any person obtaining a copy
+of this software and associated documentation files (the "Software"), to deal
+in the Software without restriction, including without limitation the rights
+to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+copies of the Software, and to permit persons to whom the Software is
+furnished to do so, subject to the following conditions:
+
+The above copyright notice and this permission notice shall be included in
+all copies or substantial portions of the Software.
+
+THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING
+FROM, OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS
+IN THE SOFTWARE.
+"""
+
+import heapq
+import itertools
+import time
+from collections import deque
+from dataclasses import dataclass
+from typing import Optional
+
+from stellanow_sdk_python.messages.event import StellaNowEventWrapper
+from stellanow_sdk_python.utils.backoff import ExponentialBackoff
+
+
+@dataclass
+class Delivery:
+    """A message on its way to the sink, with the number of attempts that failed so far."""
+
+    message: StellaNowEventWrapper
+    attempts: int = 0
+
+
+class RetryScheduler:
+    """
+    Holds the messages of one queue worker that failed to send until their backoff has elapsed.
+
+    While a message backs off, later messages of the same entity are held behind it, so an entity's messages are still
+    sent in order while the messages of other entities keep flowing. Once the failed message is sent, or given up on,
+    the messages held behind it are released ahead of new ones.
+    """
+
+    def __init__(self, backoff: ExponentialBackoff):
+        self.backoff = backoff
+        self._retries: list[tuple[float, int, Delivery]] = []  # Heap of (eligible time, sequence, delivery)
+        self._sequence = itertools.count()
+        self._held: dict[str, list[Delivery]] = {}  # Entity ID -> messages behind its backing off message
+        self._released: deque[Delivery] = deque()
+
+    def schedule(self, delivery: Delivery) -> None:
+        """Schedule a failed delivery for another attempt after its backoff delay."""
+        eligible_at = time.monotonic() + self.backoff.delay(delivery.attempts - 1)
+        heapq.heappush(self._retries, (eligible_at, next(self._sequence), delivery))
+        self._held.setdefault(delivery.message.key.entity_id, [])
+
+    def hold(self, delivery: Delivery) -> bool:
+        """Hold a new delivery back if a message of its entity is backing off, returning whether it was held."""
+        held = self._held.get(delivery.message.key.entity_id)
+        if held is None:
+            return False
+        held.append(delivery)
+        return True
+
+    def release(self, entity_id: str) -> None:
+        """Release the messages held behind an entity's failed message, once it was sent or given up on."""
+        self._released.extend(self._held.pop(entity_id, []))
+
+    def next_delivery(self) -> Optional[Delivery]:
+        """A retry whose backoff has elapsed, else a released message, else None."""
+        if self._retries and self._retries[0][0] <= time.monotonic():
+            return heapq.heappop(self._retries)[2]
+        if self._released:
+            return self._released.popleft()
+        return None
+
+    def seconds_until_due(self) -> Optional[float]:
+        """Seconds until the next delivery is due, or None if nothing is scheduled."""
+        if self._released:
+            return 0.0
+        if self._retries:
+            return max(0.0, self._retries[0][0] - time.monotonic())
+        return None
+
+    def drain(self) -> list[StellaNowEventWrapper]:
+        """Remove every message, each entity's failed message ahead of the ones held behind it."""
+        messages = [delivery.message for delivery in self._released]
+        for _, _, delivery in sorted(self._retries, key=lambda retry: retry[1]):
+            messages.append(delivery.message)
+            messages.extend(held.message for held in self._held.pop(delivery.message.key.entity_id, []))
+        for held_deliveries in self._held.values():
+            messages.extend(held.message for held in held_deliveries)
+        self._retries, self._held, self._released = [], {}, deque()
+        return messages
+
+    def __len__(self) -> int:
+        return len(self._retries) + len(self._released) + sum(len(held) for held in self._held.values())
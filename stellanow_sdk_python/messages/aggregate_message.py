@@ -0,0 +1,68 @@
+"""
+Copyright (C) 2022-2025 Stella Technologies (UK) Limited.
+
+Permission is hereby granted, free of charge, to any person obtaining a copy
+of this software and associated documentation files (the "Software"), to deal
+in the Software without restriction, including without limitation the rights
+to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+copies of the Software, and to permit persons to whom the Software is
+furnished to do so, subject to the following conditions:
+
+The above copyright notice and this permission notice shall be included in
+all copies or substantial portions of the Software.
+
+THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING
+FROM, OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS
+IN THE SOFTWARE.
+"""
+
+from datetime import datetime
+from typing import Dict, List, Optional
+
+from pydantic import Field
+
+from stellanow_sdk_python.messages.base import StellaNowBaseModel
+from stellanow_sdk_python.messages.message import Entity, StellaNowMessageBase
+
+
+class FieldSummary(StellaNowBaseModel):
+    count: int = Field(..., serialization_alias="count")
+    sum: float = Field(..., serialization_alias="sum")
+    min: float = Field(..., serialization_alias="min")
+    max: float = Field(..., serialization_alias="max")
+    quantiles: Optional[Dict[str, float]] = Field(None, serialization_alias="quantiles")  # e.g. "p99" -> value
+
+
+class AggregateMessage(StellaNowMessageBase):
+    """Summary of the messages of one entity and event type sent within a time window."""
+
+    source_event_type: str = Field(..., serialization_alias="source_event_type")
+    window_start: datetime = Field(..., serialization_alias="window_start")
+    window_end: datetime = Field(..., serialization_alias="window_end")
+    count: int = Field(..., serialization_alias="count")
+    fields: Dict[str, FieldSummary] = Field(..., serialization_alias="fields")
+
+    def __init__(
+        self,
+        event_name: str,
+        entities: List[Entity],
+        source_event_type: str,
+        window_start: datetime,
+        window_end: datetime,
+        count: int,
+        fields: Dict[str, FieldSummary],
+    ):
+        super().__init__(
+            event_name=event_name,
+            entities=entities,
+            source_event_type=source_event_type,
+            window_start=window_start,
+            window_end=window_end,
+            count=count,
+            fields=fields,
+            message_origin_date_utc=window_end,
+        )
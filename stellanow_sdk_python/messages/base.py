@@ -30,6 +30,7 @@ class StellaNowBaseModel(BaseModel):
     model_config = ConfigDict(
         populate_by_name=True,
         ser_json_timedelta="iso8601",
+        defer_build=True,  # Validators are built on first use rather than when the SDK is imported
     )
 
     @model_serializer(mode="wrap")
@@ -20,7 +20,8 @@ FROM, OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS
 IN THE SOFTWARE.
 """
 
-from typing import Optional
+from datetime import datetime
+from typing import List, Optional
 from uuid import UUID
 
 from pydantic import Field, field_serializer
@@ -43,11 +44,30 @@ class EventKey(StellaNowBaseModel):
 class StellaNowEventWrapper(StellaNowBaseModel):
     key: EventKey
     value: StellaNowMessageWrapper
+    # Overrides the priority of its event type if set. Not published: dead letter files and agent frames carry it
+    # next to the serialized event
+    priority: Optional[int] = Field(default=None, exclude=True)
 
     @property
     def message_id(self) -> Optional[str]:
         return self.value.message_id
 
+    @property
+    def payload(self) -> str:
+        return self.value.payload
+
+    @property
+    def entities(self) -> List[Entity]:
+        return self.value.metadata.entities
+
+    @property
+    def event_type_definition_id(self) -> Optional[str]:
+        return self.value.metadata.event_type_definition_id
+
+    @property
+    def message_origin_date_utc(self) -> Optional[datetime]:
+        return self.value.metadata.message_origin_date_utc
+
     @classmethod
     def create(
         cls, message: StellaNowMessageWrapper, organization_id: UUID, project_id: UUID
@@ -1,7 +1,7 @@
 import json
 import uuid
 from datetime import UTC, datetime
-from typing import Any, Dict, List, Optional, Union
+from typing import Any, List, Optional, Union
 
 from pydantic import Field, PrivateAttr
 
@@ -29,7 +29,7 @@ class StellaNowMessageBase(StellaNowBaseModel):
     entities: List[Entity] = Field(exclude=True)
     _message_origin_date_utc: Optional[datetime] = PrivateAttr(default=None)
 
-    def __init__(self, **data: Dict[str, Any]) -> None:
+    def __init__(self, **data: Any) -> None:
         # Handle message_origin_date_utc during initialization
         message_origin_date_utc = data.pop("message_origin_date_utc", None)
         super().__init__(**data)
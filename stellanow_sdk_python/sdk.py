@@ -37,62 +37,214 @@ This demo sends two `UserDetailsMessage` events, simulating real-time user data
 lifecycle: initialization, event sending, and shutdown.
 """
 
+import asyncio
+import os
 import time
-from typing import Optional
+import weakref
+from dataclasses import dataclass
+from typing import Optional, Sequence
 
 from loguru import logger
 
 from stellanow_sdk_python.config.stellanow_config import StellaProjectInfo
-from stellanow_sdk_python.message_queue.message_queue import StellaNowMessageQueue
+from stellanow_sdk_python.message_queue.dead_letter_store.i_dead_letter_store import IDeadLetterStore
+from stellanow_sdk_python.message_queue.duplicate_filter import DuplicateFilter
+from stellanow_sdk_python.message_queue.message_queue import DEFAULT_MAX_SEND_ATTEMPTS, StellaNowMessageQueue
 from stellanow_sdk_python.message_queue.message_queue_strategy.i_message_queue_strategy import IMessageQueueStrategy
+from stellanow_sdk_python.message_queue.message_stage.i_message_stage import Forward, IMessageStage
 from stellanow_sdk_python.messages.event import StellaNowEventWrapper
 from stellanow_sdk_python.messages.message import StellaNowMessageBase, StellaNowMessageWrapper
 from stellanow_sdk_python.sinks.i_stellanow_sink import IStellaNowSink
 
+DEFAULT_STOP_TIMEOUT = 20.0
+STAGE_POLL_INTERVAL = 0.5
+
+
+@dataclass
+class FlushResult:
+    """Outcome of flushing the SDK's queue."""
+
+    delivered: int  # Messages sent and acknowledged by the sink while flushing
+    abandoned: int  # Messages still queued or awaiting acknowledgement when the flush ended
+    persisted: int = 0  # Queued messages written to the pending store on stop() for the next start()
+    rejected: int = 0  # Messages the receiving end refused while flushing, moved to the dead letter store
+
 
 class StellaNowSDK:
-    def __init__(self, project_info: StellaProjectInfo, sink: IStellaNowSink, queue_strategy: IMessageQueueStrategy):
-        """Initialize the SDK with project info, sink, and queue strategy."""
+    def __init__(
+        self,
+        project_info: StellaProjectInfo,
+        sink: IStellaNowSink,
+        queue_strategy: IMessageQueueStrategy,
+        queue_workers: int = 1,
+        max_send_attempts: int = DEFAULT_MAX_SEND_ATTEMPTS,
+        dead_letter_store: Optional[IDeadLetterStore] = None,
+        pending_store: Optional[IDeadLetterStore] = None,
+        duplicate_filter: Optional[DuplicateFilter] = None,
+        stages: Sequence[IMessageStage] = (),
+    ):
+        """
+        Initialize the SDK with project info, sink, and queue strategy.
+        :param queue_workers: Number of concurrent queue consumers; messages are partitioned by entity ID.
+        :param max_send_attempts: Attempts to send a message, with a growing backoff in between, before it is moved
+            to the dead letter store.
+        :param dead_letter_store: Where messages given up on are kept until replay_dead_letters(). Defaults to an
+            in-memory store; use FileDeadLetterStore to keep them across restarts.
+        :param pending_store: Where stop() writes the messages it could not deliver in time, to be queued again by the
+            next start(). Use a FileDeadLetterStore with a path of its own. Defaults to None, dropping them.
+        :param duplicate_filter: Drops messages sent again within its window instead of queuing them. Defaults to None,
+            queuing every message.
+        :param stages: Steps messages pass through, in order, before they are queued, such as load shedding.
+        """
         self.__project_info = project_info
         self.__sink = sink
-        self.__message_queue = StellaNowMessageQueue(strategy=queue_strategy, sink=sink)
+        self.__pending_store = pending_store
+        self.__duplicate_filter = duplicate_filter
+        self.__message_queue = StellaNowMessageQueue(
+            strategy=queue_strategy,
+            sink=sink,
+            workers=queue_workers,
+            max_attempts=max_send_attempts,
+            dead_letter_store=dead_letter_store,
+        )
+        self.__stages = [(stage, self._forward_from(stages, index + 1)) for index, stage in enumerate(stages)]
+        self.__forward = self._forward_from(stages, 0)
+        for stage in stages:
+            stage.attach(self.__message_queue, project_info)
 
         self.__started = False
+        self.__connect_task: Optional[asyncio.Task[None]] = None
+        self.__poll_task: Optional[asyncio.Task[None]] = None
+        _reset_in_forked_children(self)
 
-    async def start(self) -> None:
+    async def start(self, wait_for_connection: bool = True) -> None:
         """
         Starts the SDK and connects to the sink.
+        :param wait_for_connection: Return only once the sink is connected. With False, the SDK returns right away
+            and queues messages while the sink connects in the background; await wait_until_ready() to know when the
+            connection is established.
         """
-        await self.__sink.connect()  # Blocks until connected
-        self.__message_queue.start_processing()
+        self.__connect_task = asyncio.create_task(self.__sink.connect())
+        self.__connect_task.add_done_callback(_log_connect_failure)
+        if self.__pending_store is not None:
+            self.__message_queue.restore(self.__pending_store)
+        self.__message_queue.start_processing()  # Workers wait for the connection before sending
+        if self.__stages:
+            self.__poll_task = asyncio.create_task(self._poll_stages())
         self.__started = True
+        if wait_for_connection:
+            await self.__connect_task
+            logger.info("SDK started successfully")
+        else:
+            logger.info("SDK started, connecting in the background")
 
-        logger.info("SDK started successfully")
+    async def wait_until_ready(self, timeout: Optional[float] = None) -> bool:
+        """
+        Waits until the sink connection started by start() is established.
+        :param timeout: Maximum time to wait (in seconds). If None, waits indefinitely.
+        :return: True if connected, False if the timeout is reached first. The connection attempt continues either way.
+        """
+        if self.__connect_task is None:
+            raise RuntimeError("The SDK has not been started")
+        try:
+            await asyncio.wait_for(asyncio.shield(self.__connect_task), timeout=timeout)
+        except asyncio.TimeoutError:
+            return False
+        return True
 
-    async def send_message(self, message: StellaNowMessageBase | StellaNowMessageWrapper) -> None:
+    async def send_message(
+        self,
+        message: StellaNowMessageBase | StellaNowMessageWrapper | StellaNowEventWrapper,
+        idempotency_key: Optional[str] = None,
+        priority: Optional[int] = None,
+    ) -> None:
         """
         Sends a message through the sink.
-        :param message: The message to send, either as a StellaNowMessageBase or StellaNowMessageWrapper.
+        :param message: The message to send, either as a StellaNowMessageBase or StellaNowMessageWrapper, or as a
+            StellaNowEventWrapper already carrying its organization and project, such as one forwarded to an agent.
+        :param idempotency_key: Key shared by every attempt to send the same logical event, by which the duplicate
+            filter recognizes repeats. Without one, repeats are recognized by their event type, entity and payload.
+        :param priority: Priority of the message for the priority queue strategy, overriding that of its event type.
         """
         if isinstance(message, StellaNowMessageBase):
             # If the message is a StellaNowMessageBase, wrap it and call send_message recursively
             wrapped_message = StellaNowMessageWrapper.create(message=message)
-            await self.send_message(wrapped_message)
+            await self.send_message(wrapped_message, idempotency_key, priority)
         elif isinstance(message, StellaNowMessageWrapper):
-            # If the message is already a StellaNowMessageWrapper, enqueue it
-            self.__message_queue.enqueue(
-                StellaNowEventWrapper.create(
-                    message=message,
-                    organization_id=self.__project_info.organization_id,
-                    project_id=self.__project_info.project_id,
-                )
+            # If the message is already a StellaNowMessageWrapper, wrap it with the project and enqueue it
+            event = StellaNowEventWrapper.create(
+                message=message,
+                organization_id=self.__project_info.organization_id,
+                project_id=self.__project_info.project_id,
             )
+            await self.send_message(event, idempotency_key, priority)
+        elif isinstance(message, StellaNowEventWrapper):
+            if priority is not None:
+                message.priority = priority
+            self._enqueue(message, idempotency_key)
         else:
-            raise ValueError(f"Expected StellaNowMessageBase or StellaNowMessageWrapper, got {type(message)}")
+            raise ValueError(
+                f"Expected StellaNowMessageBase, StellaNowMessageWrapper or StellaNowEventWrapper, got {type(message)}"
+            )
+
+    def _enqueue(self, message: StellaNowEventWrapper, idempotency_key: Optional[str]) -> None:
+        if self.__duplicate_filter is not None and self.__duplicate_filter.is_duplicate(message, idempotency_key):
+            logger.debug(f"Suppressed duplicate message {message.message_id}")
+            return
+        self.__forward(message)
+
+    def _forward_from(self, stages: Sequence[IMessageStage], index: int) -> Forward:
+        """Passes messages on to the stage at the index, or to the message queue after the last stage."""
+        if index == len(stages):
+            return self.__message_queue.enqueue
+        stage, forward = stages[index], self._forward_from(stages, index + 1)
+        return lambda message: stage.process(message, forward)
+
+    async def _poll_stages(self) -> None:
+        while True:
+            await asyncio.sleep(STAGE_POLL_INTERVAL)
+            for stage, forward in self.__stages:
+                try:
+                    stage.poll(forward)
+                except Exception as e:
+                    logger.error(f"Polling message stage {type(stage).__name__} failed: {e}")
+
+    def replay_dead_letters(self) -> int:
+        """
+        Queues the messages of the dead letter store again, for example once an outage of the sink is over.
+        :return: The number of messages queued.
+        """
+        return self.__message_queue.replay_dead_letters()
+
+    async def flush(self, timeout: float = DEFAULT_STOP_TIMEOUT) -> FlushResult:
+        """
+        Waits until the queued messages are sent and acknowledged by the sink, or the timeout is reached.
+        :param timeout: Maximum time to wait (in seconds) for both the queue and the acknowledgements.
+        :return: How many messages were delivered or rejected while flushing, and how many were still undelivered at
+            the end.
+        """
+        loop = asyncio.get_running_loop()
+        deadline = loop.time() + timeout
+        sent_before, rejected_before = self.__message_queue.sent_count, self.__message_queue.rejected_count
+        await self.__message_queue.wait_until_empty(timeout)
+        unacknowledged = await self.__sink.wait_for_acknowledgements(max(0.0, deadline - loop.time()))
+        rejected = self.__message_queue.rejected_count - rejected_before
+        result = FlushResult(
+            delivered=max(0, self.__message_queue.sent_count - sent_before - unacknowledged - rejected),
+            abandoned=self.__message_queue.get_message_count() + unacknowledged,
+            rejected=rejected,
+        )
+        logger.info(
+            f"Flushed message queue: {result.delivered} delivered, {result.rejected} rejected, "
+            f"{result.abandoned} undelivered"
+        )
+        return result
 
     def wait_for_queue_to_empty(self, timeout: Optional[float] = None) -> bool:
         """
         Waits for the message queue to be empty before proceeding.
+
+        This blocks the calling thread, including the event loop the queue runs on; use flush() from a coroutine.
         :param timeout: Maximum time to wait (in seconds). If None, waits indefinitely.
         :return: True if the queue is empty, False if timeout is reached and queue is not empty.
         """
@@ -105,9 +257,62 @@ class StellaNowSDK:
         logger.info("Message queue is empty.")
         return True
 
-    async def stop(self) -> None:
-        """Stops the SDK after ensuring the message queue is empty."""
-        self.wait_for_queue_to_empty(timeout=10)
+    def _reset_after_fork(self) -> None:
+        """
+        Drop the connection, tasks and queued messages inherited from the parent process.
+
+        Runs in every child forked after the SDK was created, such as the workers of a pre-fork server. The child
+        starts the SDK again with start() in its own event loop, connecting under a client ID of its own.
+        """
+        self.__started = False
+        self.__connect_task = None
+        self.__poll_task = None
+        self.__message_queue.reset_after_fork()
+        self.__sink.reset_after_fork()
+        logger.info(f"SDK reset in forked child process {os.getpid()}")
+
+    async def stop(self, timeout: float = DEFAULT_STOP_TIMEOUT) -> FlushResult:
+        """
+        Stops the SDK after flushing its stages and the message queue.
+        :param timeout: Maximum time to wait (in seconds) for queued messages to be delivered. The default leaves room
+            for disconnecting within the 30 second grace period Kubernetes gives a pod on SIGTERM.
+        :return: How many messages were delivered, abandoned and written to the pending store.
+        """
+        poll_task, self.__poll_task = self.__poll_task, None
+        if poll_task is not None:
+            poll_task.cancel()
+        for stage, forward in self.__stages:
+            stage.flush(forward)  # Held messages are queued, to be delivered or persisted below
+        result = await self.flush(timeout) if self.__started else FlushResult(delivered=0, abandoned=0)
         await self.__message_queue.stop_processing(timeout=5.0)
+        connect_task, self.__connect_task = self.__connect_task, None
+        if connect_task is not None and not connect_task.done():
+            connect_task.cancel()  # Still connecting; disconnecting stops the attempts
+        if self.__pending_store is not None:
+            result.persisted = self.__message_queue.persist(self.__pending_store, reason="Not delivered before stop")
         await self.__sink.disconnect()
-        logger.info("SDK stopped successfully")
+        self.__started = False
+        logger.info(
+            f"SDK stopped successfully: {result.delivered} delivered, {result.abandoned} abandoned, "
+            f"{result.persisted} persisted"
+        )
+        return result
+
+
+def _log_connect_failure(task: "asyncio.Task[None]") -> None:
+    if not task.cancelled() and task.exception() is not None:
+        logger.error(f"Connecting the SDK sink failed: {task.exception()}")
+
+
+def _reset_in_forked_children(sdk: StellaNowSDK) -> None:
+    """Reset the SDK in child processes forked after this point, without keeping it alive for the hook's sake."""
+    if not hasattr(os, "register_at_fork"):  # Not available on Windows, which cannot fork
+        return
+    sdk_ref = weakref.ref(sdk)
+
+    def after_in_child() -> None:
+        instance = sdk_ref()
+        if instance is not None:
+            instance._reset_after_fork()
+
+    os.register_at_fork(after_in_child=after_in_child)
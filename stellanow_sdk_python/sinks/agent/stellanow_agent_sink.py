@@ -0,0 +1,140 @@
+"""
+Copyright (C) 2022-2025 Stella Technologies (UK) Limited.
+
+Permission is hereby granted, free of charge, to any person obtaining a copy
+of this software and associated documentation files (the "Software"), to deal
+in the Software without restriction, including without limitation the rights
+to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+copies of the Software, and to permit persons to whom the Software is
+furnished to do so, subject to the following conditions:
+
+The above copyright notice and this permission notice shall be included in
+all copies or substantial portions of the Software.
+
+THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING
+FROM, OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS
+IN THE SOFTWARE.
+"""
+
+import asyncio
+from typing import Optional
+
+from loguru import logger
+
+from stellanow_sdk_python.agent.agent_protocol import DEFAULT_AGENT_SOCKET_PATH, encode_event_frame
+from stellanow_sdk_python.messages.event import StellaNowEventWrapper
+from stellanow_sdk_python.sinks.i_stellanow_sink import IStellaNowSink
+from stellanow_sdk_python.utils.backoff import ExponentialBackoff
+
+
+class StellaNowAgentSink(IStellaNowSink):
+    """
+    A sink handing events to a StellaNow agent on the same host over a Unix domain socket.
+
+    The agent publishes them over its own broker connection, so application processes sharing a host, such as the
+    workers of a pre-fork server, share one broker connection and OIDC session instead of holding one each. Events are
+    serialized here and forwarded by the agent without being parsed again. An event counts as sent once it is written
+    to the socket; events the agent has not read when it exits are lost.
+    """
+
+    def __init__(
+        self, socket_path: str = DEFAULT_AGENT_SOCKET_PATH, reconnect_backoff: Optional[ExponentialBackoff] = None
+    ):
+        """
+        :param socket_path: Path of the Unix domain socket the agent listens on.
+        :param reconnect_backoff: Delay policy between reconnect attempts. Defaults to full-jitter exponential
+            backoff starting at 25 ms.
+        """
+        self.socket_path = socket_path
+        self.reconnect_backoff = reconnect_backoff or ExponentialBackoff()
+        self._writer: Optional[asyncio.StreamWriter] = None
+        self._is_connected_event = asyncio.Event()
+        self._shutdown = False
+        self._monitor_task: Optional[asyncio.Task[None]] = None
+
+    async def connect(self) -> None:
+        if self._shutdown:
+            logger.info("Shutdown requested, skipping connection attempt.")
+            return
+        if not self._monitor_task:
+            self._monitor_task = asyncio.create_task(self._connection_monitor())
+            await self._is_connected_event.wait()
+            logger.info("Initial connection to StellaNow agent established")
+
+    async def disconnect(self) -> None:
+        logger.info("Disconnecting from StellaNow agent...")
+        self._shutdown = True
+        writer = self._writer
+        if writer is not None:
+            try:
+                await writer.drain()
+            except (ConnectionError, OSError) as e:
+                logger.debug(f"Error flushing events to StellaNow agent: {e}")
+        if self._monitor_task:
+            self._monitor_task.cancel()
+            try:
+                await self._monitor_task
+            except asyncio.CancelledError:
+                pass
+            self._monitor_task = None
+        self._connection_lost()
+
+    def reset_after_fork(self) -> None:
+        # Frames written by parent and child over one shared connection would interleave
+        self._writer = None
+        self._is_connected_event = asyncio.Event()
+        self._shutdown = False
+        self._monitor_task = None
+
+    async def send_message(self, message: StellaNowEventWrapper) -> None:
+        writer = self._writer
+        if writer is None:
+            logger.warning(
+                f"Cannot send message {message.message_id}: StellaNow agent sink is disconnected. "
+                "Awaiting reconnection..."
+            )
+            raise Exception("StellaNow agent sink is disconnected; connection monitor is attempting to reconnect.")
+        writer.write(encode_event_frame(message))
+        try:
+            await writer.drain()  # Returns at once unless the agent falls behind reading
+        except (ConnectionError, OSError):
+            self._connection_lost()
+            raise
+        logger.debug(f"Message handed to StellaNow agent with messageId: {message.message_id}")
+
+    def is_connected(self) -> bool:
+        return self._writer is not None
+
+    async def _connection_monitor(self) -> None:
+        logger.info("Started StellaNow agent connection monitor")
+        while not self._shutdown:
+            try:
+                reader, writer = await asyncio.open_unix_connection(self.socket_path)
+            except OSError as e:
+                retry_delay = self.reconnect_backoff.next_delay()
+                logger.error(f"Connecting to StellaNow agent at {self.socket_path} failed: {e}")
+                logger.info(f"Reconnecting in {retry_delay:.3f} seconds...")
+                await asyncio.sleep(retry_delay)
+                continue
+
+            self.reconnect_backoff.reset()
+            self._writer = writer
+            self._is_connected_event.set()
+            logger.info(f"Connected to StellaNow agent at {self.socket_path}")
+            try:
+                await reader.read()  # The agent never writes, so this returns once it closes the connection
+            except (ConnectionError, OSError):
+                pass
+            if writer is self._writer:
+                logger.warning("Lost connection to StellaNow agent")
+                self._connection_lost()
+
+    def _connection_lost(self) -> None:
+        writer, self._writer = self._writer, None
+        self._is_connected_event.clear()
+        if writer is not None:
+            writer.close()
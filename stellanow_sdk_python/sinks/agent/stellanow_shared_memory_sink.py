@@ -0,0 +1,89 @@
+"""
+Copyright (C) 2022-2025 Stella Technologies (UK) Limited.
+
+Permission is hereby granted, free of charge, to any person obtaining a copy
+of this software and associated documentation files (the "Software"), to deal
+in the Software without restriction, including without limitation the rights
+to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+copies of the Software, and to permit persons to whom the Software is
+furnished to do so, subject to the following conditions:
+
+The above copyright notice and this permission notice shall be included in
+all copies or substantial portions of the Software.
+
+THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING
+FROM, OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS
+IN THE SOFTWARE.
+"""
+
+import asyncio
+from typing import Optional
+
+from loguru import logger
+
+from stellanow_sdk_python.agent.agent_protocol import encode_event_frame
+from stellanow_sdk_python.agent.shared_memory_ring import DEFAULT_RING_NAME, SharedMemoryRing
+from stellanow_sdk_python.messages.event import StellaNowEventWrapper
+from stellanow_sdk_python.sinks.i_stellanow_sink import IStellaNowSink
+from stellanow_sdk_python.utils.backoff import ExponentialBackoff
+
+
+class StellaNowSharedMemorySink(IStellaNowSink):
+    """
+    A sink writing events into a shared memory ring drained by a StellaNow agent on the same host.
+
+    Compared with StellaNowAgentSink, handing an event over is a copy into shared memory rather than a socket write.
+    The mapping is inherited across forks, so the workers of a pre-fork server can share a sink created before forking.
+    An event counts as sent once it is in the ring; events the agent has not read when it exits are lost.
+    """
+
+    def __init__(self, ring_name: str = DEFAULT_RING_NAME, reconnect_backoff: Optional[ExponentialBackoff] = None):
+        """
+        :param ring_name: Name of the shared memory ring the agent created.
+        :param reconnect_backoff: Delay policy between attempts to attach to the ring. Defaults to full-jitter
+            exponential backoff starting at 25 ms.
+        """
+        self.ring_name = ring_name
+        self.reconnect_backoff = reconnect_backoff or ExponentialBackoff()
+        self._ring: Optional[SharedMemoryRing] = None
+        self._shutdown = False
+
+    async def connect(self) -> None:
+        self._shutdown = False
+        while not self.is_connected():
+            retry_delay = self.reconnect_backoff.next_delay()
+            logger.info(f"StellaNow agent ring {self.ring_name} not found, retrying in {retry_delay:.3f} seconds...")
+            await asyncio.sleep(retry_delay)
+        self.reconnect_backoff.reset()
+        logger.info(f"Attached to StellaNow agent ring {self.ring_name}")
+
+    async def disconnect(self) -> None:
+        self._shutdown = True
+        if self._ring is not None:
+            self._ring.close()
+            self._ring = None
+
+    async def send_message(self, message: StellaNowEventWrapper) -> None:
+        if not self.is_connected():
+            raise Exception(f"StellaNow agent ring {self.ring_name} is not available; is the agent running?")
+        assert self._ring is not None
+        if not self._ring.write(encode_event_frame(message)):
+            raise Exception(f"StellaNow agent ring {self.ring_name} is full; the agent is falling behind.")
+        logger.debug(f"Message handed to StellaNow agent ring with messageId: {message.message_id}")
+
+    def is_connected(self) -> bool:
+        # Attaching is cheap, so a ring replaced by a restarted agent is picked up here rather than by a monitor task
+        if self._ring is not None and self._ring.closed:
+            logger.warning(f"StellaNow agent ring {self.ring_name} was closed by the agent")
+            self._ring.close()
+            self._ring = None
+        if self._ring is None and not self._shutdown:
+            try:
+                self._ring = SharedMemoryRing.attach(self.ring_name)
+            except FileNotFoundError:
+                return False
+        return self._ring is not None
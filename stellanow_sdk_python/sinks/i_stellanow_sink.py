@@ -21,9 +21,12 @@ IN THE SOFTWARE.
 """
 
 from abc import ABC, abstractmethod
+from typing import Callable
 
 from stellanow_sdk_python.messages.event import StellaNowEventWrapper
 
+RejectionListener = Callable[[StellaNowEventWrapper, str], None]
+
 
 class IStellaNowSink(ABC):
     """
@@ -55,3 +58,26 @@ class IStellaNowSink(ABC):
         Checks if the sink is connected.
         :return: True if connected; otherwise, False.
         """
+
+    async def wait_for_acknowledgements(self, timeout: float) -> int:
+        """
+        Waits until the messages sent so far are acknowledged by the receiving end.
+        :param timeout: Maximum time to wait (in seconds).
+        :return: The number of messages still awaiting acknowledgement. Sinks that do not track acknowledgements
+            need not override this.
+        """
+        return 0
+
+    def add_rejection_listener(self, listener: RejectionListener) -> None:
+        """
+        Registers a function called when the receiving end refuses a message after send_message() has returned.
+        Sinks that report every failure by raising from send_message() never call it.
+        :param listener: The function to call with the rejected message and the reason.
+        """
+
+    def reset_after_fork(self) -> None:
+        """
+        Drops the connection state inherited from the parent process; called in a forked child process.
+
+        The child connects again on its own with connect(). Sinks without connection state need not override this.
+        """
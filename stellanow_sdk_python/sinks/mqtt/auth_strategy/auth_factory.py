@@ -2,15 +2,17 @@
 Factory for creating MQTT authentication strategies.
 """
 
+from typing import Optional
+
 from loguru import logger
 
+from stellanow_sdk_python.authentication.i_token_cache import ITokenCache
 from stellanow_sdk_python.config.eniviroment_config.stellanow_env_config import StellaNowEnvironmentConfig
 from stellanow_sdk_python.config.enums.auth_strategy import AuthStrategyTypes
 from stellanow_sdk_python.config.stellanow_auth_credentials import StellaNowCredentials
 from stellanow_sdk_python.config.stellanow_config import StellaProjectInfo
 from stellanow_sdk_python.sinks.mqtt.auth_strategy.i_mqtt_auth_strategy import IMqttAuthStrategy
 from stellanow_sdk_python.sinks.mqtt.auth_strategy.no_auth_mqtt_auth_strategy import NoAuthMqttAuthStrategy
-from stellanow_sdk_python.sinks.mqtt.auth_strategy.oidc_mqtt_auth_strategy import OidcMqttAuthStrategy
 from stellanow_sdk_python.sinks.mqtt.auth_strategy.user_pass_auth_mqtt_auth_strategy import UserPassAuthMqttAuthStrategy
 
 
@@ -19,6 +21,7 @@ def create_auth_strategy(
     project_info: StellaProjectInfo,
     credentials: StellaNowCredentials,
     env_config: StellaNowEnvironmentConfig,
+    token_cache: Optional[ITokenCache] = None,
 ) -> IMqttAuthStrategy:
     """
     Create an authentication strategy based on the specified type.
@@ -28,6 +31,7 @@ def create_auth_strategy(
         project_info (StellaProjectInfo): Project information including organization_id.
         credentials (StellaNowCredentials): The credentials object containing auth details.
         env_config (StellaNowEnvironmentConfig): The environment configuration.
+        token_cache (Optional[ITokenCache]): Store persisting OIDC tokens across process restarts.
 
     Returns:
         IMqttAuthStrategy: The instantiated authentication strategy.
@@ -41,7 +45,10 @@ def create_auth_strategy(
 
     logger.info(f"Creating auth strategy: {auth_strategy_type}")
     if auth_strategy_type == AuthStrategyTypes.OIDC.value:
-        return OidcMqttAuthStrategy(project_info, credentials, env_config)
+        # Imported here so keycloak and its HTTP stack are only loaded by applications authenticating with OIDC
+        from stellanow_sdk_python.sinks.mqtt.auth_strategy.oidc_mqtt_auth_strategy import OidcMqttAuthStrategy
+
+        return OidcMqttAuthStrategy(project_info, credentials, env_config, token_cache=token_cache)
     elif auth_strategy_type == AuthStrategyTypes.BASIC.value:
         return UserPassAuthMqttAuthStrategy(credentials)
     elif auth_strategy_type == AuthStrategyTypes.NO_AUTH.value:
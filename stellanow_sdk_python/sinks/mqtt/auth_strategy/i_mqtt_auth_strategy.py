@@ -21,8 +21,16 @@ IN THE SOFTWARE.
 """
 
 from abc import ABC, abstractmethod
+from typing import Awaitable, Callable, Optional, Protocol
 
-import paho.mqtt.client as mqtt
+
+class MqttCredentialsTarget(Protocol):
+    """Anything MQTT connect credentials can be applied to, such as a paho client."""
+
+    def username_pw_set(self, username: Optional[str], password: Optional[str] = None) -> None: ...
+
+
+TokenListener = Callable[[str], Awaitable[None]]
 
 
 class IMqttAuthStrategy(ABC):
@@ -31,8 +39,26 @@ class IMqttAuthStrategy(ABC):
     """
 
     @abstractmethod
-    async def authenticate(self, client: mqtt.Client) -> None:
+    async def authenticate(self, client: MqttCredentialsTarget) -> None:
         """
         Authenticates the MQTT client.
         :param client: The MQTT client to authenticate.
         """
+
+    def add_token_listener(self, listener: TokenListener) -> None:
+        """
+        Registers a coroutine function called with the new credentials whenever the strategy rotates them.
+        Strategies with static credentials never call it.
+        :param listener: The coroutine function to call with the new token.
+        """
+
+    def reset_after_fork(self) -> None:
+        """
+        Drops the state inherited from the parent process, such as a token refresh task; called in a forked child.
+        Strategies without such state need not override this.
+        """
+
+    async def close(self) -> None:
+        """
+        Stops background work of the strategy, such as refreshing tokens, when its sink disconnects.
+        """
@@ -20,14 +20,13 @@ FROM, OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS
 IN THE SOFTWARE.
 """
 
-import paho.mqtt.client as mqtt
 from loguru import logger
 
-from stellanow_sdk_python.sinks.mqtt.auth_strategy.i_mqtt_auth_strategy import IMqttAuthStrategy
+from stellanow_sdk_python.sinks.mqtt.auth_strategy.i_mqtt_auth_strategy import IMqttAuthStrategy, MqttCredentialsTarget
 
 
 class NoAuthMqttAuthStrategy(IMqttAuthStrategy):
     """No authentication strategy for MQTT connections."""
 
-    async def authenticate(self, client: mqtt.Client) -> None:
+    async def authenticate(self, client: MqttCredentialsTarget) -> None:
         logger.info("Using NoAuth strategy for MQTT connection.")
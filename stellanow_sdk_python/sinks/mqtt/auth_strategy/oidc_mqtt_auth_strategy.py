@@ -20,21 +20,33 @@ FROM, OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS
 IN THE SOFTWARE.
 """
 
+import asyncio
+from typing import Optional
+
 import paho.mqtt.client as mqtt
 from loguru import logger
 
 from stellanow_sdk_python.authentication.auth_service import StellaNowAuthenticationService
+from stellanow_sdk_python.authentication.i_token_cache import ITokenCache
 from stellanow_sdk_python.config.eniviroment_config.stellanow_env_config import StellaNowEnvironmentConfig
 from stellanow_sdk_python.config.stellanow_auth_credentials import StellaNowCredentials
 from stellanow_sdk_python.config.stellanow_config import StellaProjectInfo
-from stellanow_sdk_python.sinks.mqtt.auth_strategy.i_mqtt_auth_strategy import IMqttAuthStrategy
+from stellanow_sdk_python.sinks.mqtt.auth_strategy.i_mqtt_auth_strategy import (
+    IMqttAuthStrategy,
+    MqttCredentialsTarget,
+    TokenListener,
+)
 
 
 class OidcMqttAuthStrategy(IMqttAuthStrategy):
     """Authentication strategy using OpenID Connect (OIDC)."""
 
     def __init__(
-        self, project_info: StellaProjectInfo, credentials: StellaNowCredentials, env_config: StellaNowEnvironmentConfig
+        self,
+        project_info: StellaProjectInfo,
+        credentials: StellaNowCredentials,
+        env_config: StellaNowEnvironmentConfig,
+        token_cache: Optional[ITokenCache] = None,
     ) -> None:
         self.project_info = project_info
         self.credentials = credentials
@@ -43,30 +55,39 @@ class OidcMqttAuthStrategy(IMqttAuthStrategy):
             project_info=self.project_info,
             credentials=self.credentials,
             env_config=self.env_config,
+            token_cache=token_cache,
         )
         self.client = None
+        self._token_listeners: list[TokenListener] = []
         self.auth_service.register_token_update_callback(self._update_token)
         logger.debug("Initialized OidcMqttAuthStrategy and registered callback")
 
+    def add_token_listener(self, listener: TokenListener) -> None:
+        """Register a sink to be handed every refreshed token, so it can re-authenticate its connections."""
+        self._token_listeners.append(listener)
+
+    def reset_after_fork(self) -> None:
+        self.auth_service.reset_after_fork()
+
+    async def close(self) -> None:
+        await self.auth_service.stop_refresh_task()
+
     async def _update_token(self, new_token: str) -> None:
-        """Update MQTT client credentials with new token and reconnect."""
+        """Hand the refreshed token to every registered listener."""
         logger.info(f"Received token update callback with new token: {new_token[:20]}...")
-        if self.client:
-            logger.debug("Updating MQTT client credentials and forcing reconnect")
-            self.client.username_pw_set(username=new_token, password=None)
-            try:
-                self.client.disconnect()
-                logger.debug("Disconnected MQTT client for token update")
-                self.client.reconnect()
-                logger.info("Reconnected MQTT client after token update")
-            except Exception as e:
-                logger.error(f"Failed to reconnect after token update: {e}")
-        else:
+        if not self._token_listeners:
             logger.warning("No MQTT client available to update token")
+        results = await asyncio.gather(
+            *(listener(new_token) for listener in self._token_listeners), return_exceptions=True
+        )
+        for result in results:
+            if isinstance(result, BaseException):
+                logger.error(f"Failed to update MQTT credentials after token update: {result}")
 
-    async def authenticate(self, client: mqtt.Client) -> None:
+    async def authenticate(self, client: MqttCredentialsTarget) -> None:
         """Authenticate the MQTT client using OIDC."""
-        self.client = client
+        if isinstance(client, mqtt.Client):
+            self.client = client
         access_token = await self.auth_service.get_access_token()
         logger.info("Authenticating MQTT client using OIDC.")
         logger.debug(f"Using token: {access_token[:20]}...")
@@ -20,11 +20,10 @@ FROM, OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS
 IN THE SOFTWARE.
 """
 
-import paho.mqtt.client as mqtt
 from loguru import logger
 
 from stellanow_sdk_python.config.stellanow_auth_credentials import StellaNowCredentials
-from stellanow_sdk_python.sinks.mqtt.auth_strategy.i_mqtt_auth_strategy import IMqttAuthStrategy
+from stellanow_sdk_python.sinks.mqtt.auth_strategy.i_mqtt_auth_strategy import IMqttAuthStrategy, MqttCredentialsTarget
 
 
 class UserPassAuthMqttAuthStrategy(IMqttAuthStrategy):
@@ -33,7 +32,7 @@ class UserPassAuthMqttAuthStrategy(IMqttAuthStrategy):
     def __init__(self, credentials: StellaNowCredentials):
         self.credentials = credentials
 
-    async def authenticate(self, client: mqtt.Client) -> None:
+    async def authenticate(self, client: MqttCredentialsTarget) -> None:
         logger.info("Authenticating MQTT client using username/password.")
         try:
             client.username_pw_set(self.credentials.username, self.credentials.password)
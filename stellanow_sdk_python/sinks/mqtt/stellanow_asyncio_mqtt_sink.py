@@ -0,0 +1,432 @@
+"""
+Copyright (C) 2022-2025 Stella Technologies (UK) Limited.
+
+Permission is hereby granted, free of charge, to any person obtaining a copy
+of this software and associated documentation files (the "Software"), to deal
+in the Software without restriction, including without limitation the rights
+to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+copies of the Software, and to permit persons to whom the Software is
+furnished to do so, subject to the following conditions:
+
+The above copyright notice and this permission notice shall be included in
+all copies or substantial portions of the Software.
+
+THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING
+FROM, OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS
+IN THE SOFTWARE.
+"""
+
+import asyncio
+import os
+import ssl
+from typing import Optional
+
+from loguru import logger
+
+from stellanow_sdk_python.config.eniviroment_config.stellanow_env_config import StellaNowEnvironmentConfig
+from stellanow_sdk_python.config.stellanow_config import StellaProjectInfo
+from stellanow_sdk_python.messages.event import StellaNowEventWrapper
+from stellanow_sdk_python.sinks.i_stellanow_sink import IStellaNowSink, RejectionListener
+from stellanow_sdk_python.sinks.mqtt.auth_strategy.i_mqtt_auth_strategy import IMqttAuthStrategy
+from stellanow_sdk_python.sinks.mqtt.utils.broker_selector import BrokerSelector
+from stellanow_sdk_python.sinks.mqtt.utils.client_id import generate_client_id
+from stellanow_sdk_python.sinks.mqtt.utils.connection_state import MqttConnectionState
+from stellanow_sdk_python.sinks.mqtt.utils.mqtt_packets import (
+    DISCONNECT_PACKET,
+    PINGREQ_PACKET,
+    PROPERTY_RECEIVE_MAXIMUM,
+    PROPERTY_SERVER_KEEP_ALIVE,
+    PacketType,
+    decode_connack,
+    decode_puback,
+    encode_connect,
+    encode_publish,
+)
+from stellanow_sdk_python.sinks.mqtt.utils.mqtt_streams import MqttStream, open_mqtt_stream
+from stellanow_sdk_python.sinks.mqtt.utils.mqtt_url_parser import MqttUrlConfig
+from stellanow_sdk_python.sinks.mqtt.utils.tls_context import ResumableSSLContext
+from stellanow_sdk_python.utils.backoff import ExponentialBackoff
+
+# Pause publishing once this many bytes are waiting in the transport
+WRITE_BUFFER_HIGH_WATER = 1024 * 1024
+
+
+class MqttConnectCredentials:
+    """Holds the username and password an auth strategy applies for the next CONNECT."""
+
+    def __init__(self) -> None:
+        self.username: Optional[str] = None
+        self.password: Optional[str] = None
+
+    def username_pw_set(self, username: Optional[str], password: Optional[str] = None) -> None:
+        self.username = username
+        self.password = password
+
+
+class StellaNowAsyncioMqttSink(IStellaNowSink):
+    """
+    An MQTT v5 sink implemented natively on asyncio streams.
+
+    Connecting, publishing and handling PUBACKs all happen on the event loop, so there is no network thread and no
+    cross-thread hand-off. Publishes issued within one loop iteration are coalesced into a single write, and
+    unacknowledged publishes are retransmitted after a reconnect. A refreshed token is applied by reconnecting.
+    """
+
+    def __init__(
+        self,
+        auth_strategy: IMqttAuthStrategy,
+        env_config: StellaNowEnvironmentConfig,
+        project_info: StellaProjectInfo,
+        client_id: Optional[str] = None,
+        keepalive: int = 5,
+        connect_timeout: float = 5.0,
+        drain_timeout: float = 5.0,
+        session_expiry_interval: int = 300,
+        reconnect_backoff: Optional[ExponentialBackoff] = None,
+        probe_interval: float = 30.0,
+    ):
+        self.auth_strategy = auth_strategy
+        self.env_config = env_config
+        self.project_info = project_info
+        self.default_qos = 1
+        self.client_id = client_id or generate_client_id()
+        self.keepalive = keepalive
+        self.connect_timeout = connect_timeout
+        self.drain_timeout = drain_timeout
+        self.session_expiry_interval = session_expiry_interval
+        self.reconnect_backoff = reconnect_backoff or ExponentialBackoff()
+        self.probe_interval = probe_interval
+        self.brokers = BrokerSelector(env_config.mqtt_url_configs)
+        self.credentials = MqttConnectCredentials()
+        self.ssl_context: Optional[ssl.SSLContext] = None
+        self._topic = f"in/{project_info.organization_id}".encode("utf-8")
+
+        self._configured_client_id = client_id
+        self._rejection_listeners: list[RejectionListener] = []
+        self._init_connection_state()
+
+        self.auth_strategy.add_token_listener(self._on_token_refreshed)
+        logger.info(f'SDK Client ID is "{self.client_id}"')
+
+    def _init_connection_state(self) -> None:
+        """Set up the session, tasks and events of a sink that has not connected yet."""
+        self._stream: Optional[MqttStream] = None
+        self._state = MqttConnectionState.DISCONNECTED
+        self._is_connected_event = asyncio.Event()
+        self._shutdown = False
+        self._monitor_task: Optional[asyncio.Task[None]] = None
+        self._probe_task: Optional[asyncio.Task[None]] = None
+        self._endpoint: Optional[MqttUrlConfig] = None  # Broker of the current or last connection attempt
+        self._planned_reconnect = False  # Set when the sink drops its own connection, which is no broker failure
+        self._session_started = False  # Clean start only until the broker has accepted a first connection
+
+        # Packet ID -> PUBLISH packet awaiting its PUBACK, and the message it carries
+        self._pending: dict[int, tuple[bytes, StellaNowEventWrapper]] = {}
+        self._last_packet_id = 0
+        self._receive_maximum = 65535
+        self._window_open = asyncio.Event()
+        self._window_open.set()
+        self._write_buffer = bytearray()
+        self._flush_scheduled = False
+
+    def reset_after_fork(self) -> None:
+        """
+        Drop the connection and session inherited from the parent process and take a client ID of its own.
+
+        The parent keeps publishing over the inherited connection and resends its own unacknowledged publishes.
+        """
+        if self._configured_client_id:
+            self.client_id = f"{self._configured_client_id}_{os.getpid()}"
+        else:
+            self.client_id = generate_client_id()
+        self._init_connection_state()
+        self.auth_strategy.reset_after_fork()
+        logger.info(f'SDK Client ID after fork is "{self.client_id}"')
+
+    async def connect(self) -> None:
+        if self._shutdown:
+            logger.info("Shutdown requested, skipping connection attempt.")
+            return
+        if not self._monitor_task:
+            self._monitor_task = asyncio.create_task(self._connection_monitor())
+            if len(self.brokers.configs) > 1:
+                self._probe_task = asyncio.create_task(self._probe_brokers())
+            await self._is_connected_event.wait()
+            logger.info("Initial connection established")
+
+    async def disconnect(self) -> None:
+        logger.info("Disconnecting from MQTT broker...")
+        self._shutdown = True
+        stream = self._stream
+        if stream is not None:
+            self._flush()
+            if self._pending:
+                self._state = MqttConnectionState.DRAINING
+                await self._drain()
+            try:
+                stream.write(DISCONNECT_PACKET)
+                await stream.drain()
+            except (ConnectionError, OSError) as e:
+                logger.debug(f"Error sending DISCONNECT: {e}")
+        for task in (self._monitor_task, self._probe_task):
+            if task:
+                task.cancel()
+                try:
+                    await task
+                except asyncio.CancelledError:
+                    pass
+        self._monitor_task = self._probe_task = None
+        await self.auth_strategy.close()
+        self._state = MqttConnectionState.DISCONNECTED
+
+    async def send_message(self, message: StellaNowEventWrapper) -> None:
+        if not self.is_connected() or self._stream is None:
+            logger.warning(
+                f"Cannot send message {message.message_id}: MQTT sink is disconnected. Awaiting reconnection..."
+            )
+            raise Exception("MQTT sink is disconnected; connection monitor is attempting to reconnect.")
+        while len(self._pending) >= self._receive_maximum:
+            self._window_open.clear()
+            await self._window_open.wait()
+
+        packet_id = self._next_packet_id()
+        packet = encode_publish(
+            self._topic, message.model_dump_json(by_alias=True).encode("utf-8"), self.default_qos, packet_id
+        )
+        self._pending[packet_id] = (packet, message)
+        self._write(packet)
+        logger.debug(f"Message sent to with messageId: {message.message_id}, packet ID: {packet_id}")
+
+        stream = self._stream
+        if stream is not None and stream.write_buffer_size > WRITE_BUFFER_HIGH_WATER:
+            await stream.drain()
+
+    def is_connected(self) -> bool:
+        return self._state is MqttConnectionState.CONNECTED
+
+    async def wait_for_acknowledgements(self, timeout: float) -> int:
+        try:
+            async with asyncio.timeout(timeout):
+                while self._pending:
+                    self._window_open.clear()
+                    await self._window_open.wait()  # Set on every PUBACK
+        except TimeoutError:
+            pass
+        return len(self._pending)
+
+    def add_rejection_listener(self, listener: RejectionListener) -> None:
+        self._rejection_listeners.append(listener)
+
+    @property
+    def state(self) -> MqttConnectionState:
+        """Current state of the broker connection."""
+        return self._state
+
+    @property
+    def in_flight_count(self) -> int:
+        """Number of published messages still awaiting acknowledgement from the broker."""
+        return len(self._pending)
+
+    def _next_packet_id(self) -> int:
+        packet_id = self._last_packet_id
+        while True:
+            packet_id = packet_id % 65535 + 1
+            if packet_id not in self._pending:
+                self._last_packet_id = packet_id
+                return packet_id
+
+    def _write(self, packet: bytes) -> None:
+        """Buffer a packet and schedule a single write for everything buffered in this loop iteration."""
+        self._write_buffer += packet
+        if not self._flush_scheduled:
+            self._flush_scheduled = True
+            asyncio.get_running_loop().call_soon(self._flush)
+
+    def _flush(self) -> None:
+        self._flush_scheduled = False
+        if self._stream is not None and self._write_buffer:
+            self._stream.write(bytes(self._write_buffer))
+        self._write_buffer.clear()
+
+    async def _connection_monitor(self) -> None:
+        logger.info("Started connection monitor")
+        attempt = 1
+        if len(self.brokers.configs) > 1:
+            await self.brokers.probe()
+        while not self._shutdown:
+            if self._endpoint is not None:
+                planned, self._planned_reconnect = self._planned_reconnect, False
+                # Another broker is tried right away; only once every broker failed is the reconnect backed off
+                if planned:
+                    failover = self.brokers.preferred is not self._endpoint
+                else:
+                    failover = self.brokers.report_failure(self._endpoint)
+                if not failover:
+                    # Jittered even for the first retry, so clients dropped together by a broker do not reconnect at
+                    # once
+                    retry_delay = self.reconnect_backoff.next_delay()
+                    logger.info(f"Reconnecting in {retry_delay:.3f} seconds...")
+                    await asyncio.sleep(retry_delay)
+
+            endpoint = self._endpoint = self.brokers.preferred
+            logger.info(f"Attempting connection (Attempt {attempt}) to {endpoint.address}")
+            try:
+                stream = await self._open_connection(endpoint)
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                logger.error(f"Connection attempt {attempt} failed: {e}")
+                self._state = MqttConnectionState.DISCONNECTED
+                attempt += 1
+                continue
+
+            attempt = 1
+            self.reconnect_backoff.reset()
+            self.brokers.report_success(endpoint)
+            try:
+                await self._read_packets(stream)
+            except (ConnectionError, OSError, asyncio.IncompleteReadError, ValueError) as e:
+                logger.warning(f"Disconnected from MQTT broker: {e or type(e).__name__}")
+            finally:
+                self._state = MqttConnectionState.DISCONNECTED
+                self._is_connected_event.clear()
+                self._window_open.set()  # Wake a drain waiting for acknowledgements that will not arrive
+                self._stream = None
+                self._write_buffer.clear()
+                stream.close()
+
+    async def _drain(self) -> None:
+        """Wait for in-flight publishes to be acknowledged, giving up after drain_timeout or on connection loss."""
+        deadline = asyncio.get_running_loop().time() + self.drain_timeout
+        while self._pending and self._state is MqttConnectionState.DRAINING:
+            remaining = deadline - asyncio.get_running_loop().time()
+            if remaining <= 0:
+                logger.warning(f"Disconnecting with {len(self._pending)} messages still awaiting acknowledgement")
+                return
+            self._window_open.clear()
+            try:
+                await asyncio.wait_for(self._window_open.wait(), timeout=remaining)
+            except asyncio.TimeoutError:
+                pass
+
+    async def _on_token_refreshed(self, token: str) -> None:
+        """Reconnect with a refreshed token, resuming the session so unacknowledged publishes are resent."""
+        stream = self._stream
+        if self._shutdown or not self.is_connected() or stream is None:
+            return  # The next connection attempt authenticates with the refreshed token
+        logger.debug("Reconnecting MQTT connection to authenticate with the refreshed token")
+        self._planned_reconnect = True
+        stream.close()
+
+    async def _probe_brokers(self) -> None:
+        """Re-rank the brokers periodically, moving the connection to one that has become much faster."""
+        while True:
+            await asyncio.sleep(self.probe_interval)
+            await self.brokers.probe()
+            endpoint, stream = self._endpoint, self._stream
+            if self.is_connected() and endpoint and stream and self.brokers.should_switch(endpoint):
+                preferred = self.brokers.preferred
+                logger.info(f"Moving MQTT connection to faster broker {preferred.address}")
+                self._planned_reconnect = True
+                stream.close()
+
+    async def _open_connection(self, endpoint: MqttUrlConfig) -> MqttStream:
+        """
+        Open the transport to a broker, authenticate and complete the CONNECT/CONNACK exchange.
+
+        The transport (DNS lookup, TCP, TLS and WebSocket handshakes) is opened while the auth strategy fetches its
+        credentials, and the CONNECT carrying them is sent once both are done.
+        """
+        self._state = MqttConnectionState.CONNECTING
+        opened, authenticated = await asyncio.gather(
+            asyncio.wait_for(open_mqtt_stream(endpoint, self.ssl_context), timeout=self.connect_timeout),
+            self.auth_strategy.authenticate(self.credentials),
+            return_exceptions=True,
+        )
+        if isinstance(opened, BaseException):
+            raise opened
+        stream = opened
+        try:
+            if isinstance(authenticated, BaseException):
+                raise authenticated
+            stream.write(
+                encode_connect(
+                    self.client_id,
+                    keepalive=self.keepalive,
+                    username=self.credentials.username,
+                    password=self.credentials.password,
+                    clean_start=not self._session_started,
+                    session_expiry_interval=self.session_expiry_interval,
+                )
+            )
+            await stream.drain()
+            async with asyncio.timeout(self.connect_timeout):
+                packet_type, _, body = await stream.read_packet()
+            if packet_type != PacketType.CONNACK:
+                raise ConnectionError(f"Expected CONNACK, received packet type {packet_type}")
+            connack = decode_connack(body)
+            if connack.reason_code >= 0x80:
+                raise ConnectionError(f"Connection refused with reason code {connack.reason_code:#x}")
+        except BaseException:
+            stream.close()
+            raise
+
+        context = self.ssl_context or endpoint.ssl_context
+        if isinstance(context, ResumableSSLContext):
+            # asyncio does not close an SSLSocket the context could collect the session from
+            context.remember_session(stream.writer.get_extra_info("ssl_object"))
+        receive_maximum = connack.properties.get(PROPERTY_RECEIVE_MAXIMUM)
+        self._receive_maximum = receive_maximum if isinstance(receive_maximum, int) else 65535
+        server_keepalive = connack.properties.get(PROPERTY_SERVER_KEEP_ALIVE)
+        if isinstance(server_keepalive, int):
+            self.keepalive = server_keepalive
+        self._stream = stream
+        self._session_started = True
+        if self._pending:
+            logger.info(f"Retransmitting {len(self._pending)} unacknowledged messages")
+            for packet, _ in self._pending.values():
+                self._write(bytes([packet[0] | 0x08]) + packet[1:])  # Set the DUP flag
+        self._state = MqttConnectionState.CONNECTED
+        self._is_connected_event.set()
+        logger.info("Connected to MQTT broker")
+        return stream
+
+    async def _read_packets(self, stream: MqttStream) -> None:
+        """Handle packets from the broker and keep the connection alive until it is lost."""
+        awaiting_ping_response = False
+        while True:
+            try:
+                async with asyncio.timeout(self.keepalive or None):
+                    packet_type, _, body = await stream.read_packet()
+            except TimeoutError:
+                if awaiting_ping_response:
+                    raise ConnectionError("Keep alive timeout")
+                self._write(PINGREQ_PACKET)
+                awaiting_ping_response = True
+                continue
+
+            awaiting_ping_response = False
+            if packet_type == PacketType.PUBACK:
+                self._handle_puback(body)
+            elif packet_type == PacketType.DISCONNECT:
+                reason_code = body[0] if body else 0
+                raise ConnectionError(f"Broker sent DISCONNECT with reason code {reason_code:#x}")
+
+    def _handle_puback(self, body: bytes) -> None:
+        puback = decode_puback(body)
+        pending = self._pending.pop(puback.packet_id, None)
+        if pending is None:
+            return
+        if puback.reason_code >= 0x80:
+            _, message = pending
+            reason = f"Broker rejected the publish with reason code {puback.reason_code:#x}"
+            logger.error(f"{reason}: message {message.message_id}, packet ID {puback.packet_id}")
+            for listener in self._rejection_listeners:
+                listener(message, reason)
+        else:
+            logger.success(f"Message published with packet ID: {puback.packet_id}")
+        self._window_open.set()
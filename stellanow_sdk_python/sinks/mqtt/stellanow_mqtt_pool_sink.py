@@ -0,0 +1,139 @@
+"""
+Copyright (C) 2022-2025 Stella Technologies (UK) Limited.
+
+Permission is hereby granted, free of charge, to any person obtaining a copy
+of this software and associated documentation files (the "Software"), to deal
+in the Software without restriction, including without limitation the rights
+to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+copies of the Software, and to permit persons to whom the Software is
+furnished to do so, subject to the following conditions:
+
+The above copyright notice and this permission notice shall be included in
+all copies or substantial portions of the Software.
+
+THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING
+FROM, OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS
+IN THE SOFTWARE.
+"""
+
+import asyncio
+import zlib
+from enum import Enum
+from typing import Optional
+
+from loguru import logger
+
+from stellanow_sdk_python.config.eniviroment_config.stellanow_env_config import StellaNowEnvironmentConfig
+from stellanow_sdk_python.config.enums.token_rotation import TokenRotationMode
+from stellanow_sdk_python.config.stellanow_config import StellaProjectInfo
+from stellanow_sdk_python.messages.event import StellaNowEventWrapper
+from stellanow_sdk_python.sinks.i_stellanow_sink import IStellaNowSink
+from stellanow_sdk_python.sinks.mqtt.auth_strategy.i_mqtt_auth_strategy import IMqttAuthStrategy
+from stellanow_sdk_python.sinks.mqtt.stellanow_mqtt_sink import StellaNowMqttSink
+from stellanow_sdk_python.sinks.mqtt.utils.client_id import generate_client_id
+
+
+class PoolDistribution(Enum):
+    """How publishes are distributed across the connections of a pool."""
+
+    ENTITY_HASH = "entity_hash"
+    LEAST_IN_FLIGHT = "least_in_flight"
+
+
+class StellaNowMqttPoolSink(IStellaNowSink):
+    """
+    An MQTT sink publishing over a pool of independent broker connections.
+
+    Every connection is a `StellaNowMqttSink` with its own paho network thread, client ID and connection monitor, so
+    a lost connection is re-established on its own while the remaining connections keep publishing.
+    """
+
+    def __init__(
+        self,
+        auth_strategy: IMqttAuthStrategy,
+        env_config: StellaNowEnvironmentConfig,
+        project_info: StellaProjectInfo,
+        pool_size: int = 4,
+        distribution: PoolDistribution = PoolDistribution.ENTITY_HASH,
+        token_rotation: TokenRotationMode = TokenRotationMode.RECONNECT,
+    ):
+        if pool_size < 1:
+            raise ValueError(f"Connection pool size must be at least 1, got {pool_size}")
+        self.distribution = distribution
+        self.client_id = generate_client_id()
+        # Connections rotate to a refreshed token one at a time, so a reconnecting rotation never empties the pool
+        rotation_lock = asyncio.Lock()
+        self.sinks = [
+            StellaNowMqttSink(
+                auth_strategy=auth_strategy,
+                env_config=env_config,
+                project_info=project_info,
+                client_id=f"{self.client_id}_{index}",
+                token_rotation=token_rotation,
+                rotation_lock=rotation_lock,
+            )
+            for index in range(pool_size)
+        ]
+        self._connect_tasks: list[asyncio.Task[None]] = []
+        logger.info(f'SDK connection pool of {pool_size} uses client IDs "{self.client_id}_<n>"')
+
+    async def connect(self) -> None:
+        """Start connecting every pooled connection and return once the first one is established."""
+        if not self._connect_tasks:
+            self._connect_tasks = [asyncio.create_task(sink.connect()) for sink in self.sinks]
+        if not self.is_connected():
+            await asyncio.wait(self._connect_tasks, return_when=asyncio.FIRST_COMPLETED)
+        logger.info(f"Connection pool ready with {self.connected_count}/{len(self.sinks)} connections")
+
+    async def disconnect(self) -> None:
+        for task in self._connect_tasks:
+            task.cancel()
+        await asyncio.gather(*self._connect_tasks, return_exceptions=True)
+        self._connect_tasks = []
+        await asyncio.gather(*(sink.disconnect() for sink in self.sinks))
+
+    def reset_after_fork(self) -> None:
+        rotation_lock = asyncio.Lock()  # The parent may have been rotating a connection while forking
+        for sink in self.sinks:
+            sink.reset_after_fork()
+            sink.rotation_lock = rotation_lock
+        self._connect_tasks = []
+
+    async def send_message(self, message: StellaNowEventWrapper) -> None:
+        sink = self._select_sink(message)
+        if sink is None:
+            logger.warning(
+                f"Cannot send message {message.message_id}: all pooled MQTT connections are disconnected. "
+                "Awaiting reconnection..."
+            )
+            raise Exception("MQTT connection pool is disconnected; connection monitors are attempting to reconnect.")
+        await sink.send_message(message)
+
+    def is_connected(self) -> bool:
+        return any(sink.is_connected() for sink in self.sinks)
+
+    async def wait_for_acknowledgements(self, timeout: float) -> int:
+        return sum(await asyncio.gather(*(sink.wait_for_acknowledgements(timeout) for sink in self.sinks)))
+
+    @property
+    def connected_count(self) -> int:
+        """Number of pooled connections that are currently established."""
+        return sum(1 for sink in self.sinks if sink.is_connected())
+
+    def _select_sink(self, message: StellaNowEventWrapper) -> Optional[StellaNowMqttSink]:
+        """Pick the connection for a message, skipping connections that are down."""
+        if self.distribution == PoolDistribution.LEAST_IN_FLIGHT:
+            connected = [sink for sink in self.sinks if sink.is_connected()]
+            return min(connected, key=lambda sink: sink.in_flight_count, default=None)
+
+        # Probe from the entity's home connection so an entity sticks to one connection while it is up
+        start = zlib.crc32(message.key.entity_id.encode("utf-8")) % len(self.sinks)
+        for offset in range(len(self.sinks)):
+            sink = self.sinks[(start + offset) % len(self.sinks)]
+            if sink.is_connected():
+                return sink
+        return None
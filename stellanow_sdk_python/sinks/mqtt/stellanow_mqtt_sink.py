@@ -21,18 +21,37 @@ IN THE SOFTWARE.
 """
 
 import asyncio
-from typing import Any, Dict, Optional
+import os
+import threading
+from dataclasses import dataclass
+from typing import Any, Callable, Dict, Optional
 
 import paho.mqtt.client as mqtt
 from loguru import logger
-from nanoid import generate
+from paho.mqtt.packettypes import PacketTypes
+from paho.mqtt.properties import Properties
 
 from stellanow_sdk_python.config.eniviroment_config.stellanow_env_config import StellaNowEnvironmentConfig
+from stellanow_sdk_python.config.enums.token_rotation import TokenRotationMode
 from stellanow_sdk_python.config.stellanow_config import StellaProjectInfo
 from stellanow_sdk_python.messages.event import StellaNowEventWrapper
 from stellanow_sdk_python.sinks.i_stellanow_sink import IStellaNowSink
 from stellanow_sdk_python.sinks.mqtt.auth_strategy.i_mqtt_auth_strategy import IMqttAuthStrategy
-from stellanow_sdk_python.sinks.mqtt.auth_strategy.oidc_mqtt_auth_strategy import OidcMqttAuthStrategy
+from stellanow_sdk_python.sinks.mqtt.utils.broker_selector import BrokerSelector
+from stellanow_sdk_python.sinks.mqtt.utils.client_id import generate_client_id
+from stellanow_sdk_python.sinks.mqtt.utils.connection_state import MqttConnectionState
+from stellanow_sdk_python.sinks.mqtt.utils.mqtt_url_parser import MqttUrlConfig
+from stellanow_sdk_python.sinks.mqtt.utils.pipelined_mqtt_client import PipelinedMqttClient
+from stellanow_sdk_python.utils.backoff import ExponentialBackoff
+
+
+@dataclass
+class _StandbyConnection:
+    """A client kept besides the primary one, with the broker it was last connected to."""
+
+    client: PipelinedMqttClient
+    client_id: str
+    endpoint: Optional[MqttUrlConfig] = None
 
 
 class StellaNowMqttSink(IStellaNowSink):
@@ -41,43 +60,129 @@ class StellaNowMqttSink(IStellaNowSink):
         auth_strategy: IMqttAuthStrategy,
         env_config: StellaNowEnvironmentConfig,
         project_info: StellaProjectInfo,
+        client_id: Optional[str] = None,
+        drain_timeout: float = 5.0,
+        session_expiry_interval: int = 300,
+        reconnect_backoff: Optional[ExponentialBackoff] = None,
+        token_rotation: TokenRotationMode = TokenRotationMode.RECONNECT,
+        probe_interval: float = 30.0,
+        hot_standby: bool = False,
+        rotation_lock: Optional[asyncio.Lock] = None,
     ):
+        """
+        :param session_expiry_interval: Seconds the broker keeps the MQTT session after the connection is lost, so
+            publishes still awaiting acknowledgement survive a reconnect. 0 discards the session on disconnect.
+        :param reconnect_backoff: Delay policy between reconnect attempts. Defaults to full-jitter exponential
+            backoff starting at 25 ms.
+        :param token_rotation: How the connection moves to a refreshed token. MAKE_BEFORE_BREAK keeps publishing
+            on the old connection until one under a new client ID is established, then drains and closes the old one.
+        :param probe_interval: Seconds between connect latency probes when the environment lists several brokers.
+            The connection moves to a broker that has become much faster than the current one.
+        :param hot_standby: Keep a second, idle connection under its own client ID open, to another broker when the
+            environment lists several. Publishing switches to it as soon as the primary connection is lost, and the
+            lost client reconnects in the background, resending its unacknowledged publishes, to become the next
+            standby.
+        :param rotation_lock: Lock shared by sinks that rotate their tokens together, as the connections of a pool
+            do. A reconnecting rotation holds it until the connection is back, so the sinks sharing it never drop
+            their connections at the same time.
+        """
         self.auth_strategy = auth_strategy
         self.env_config = env_config
         self.project_info = project_info
         self.default_qos = 1
-        self.client_id = f"StellaNowSDKPython_{generate(size=10)}"
-        mqtt_config = env_config.mqtt_url_config
+        self.client_id = client_id or generate_client_id()
+        self.drain_timeout = drain_timeout
+        self.session_expiry_interval = session_expiry_interval
+        self.reconnect_backoff = reconnect_backoff or ExponentialBackoff()
+        self.token_rotation = token_rotation
+        self.probe_interval = probe_interval
+        self.hot_standby = hot_standby
+        self.rotation_lock = rotation_lock
+        self.brokers = BrokerSelector(env_config.mqtt_url_configs)
+        self._configured_client_id = client_id
+        self._init_connection_state()
 
-        self.client: Optional[mqtt.Client] = mqtt.Client(
-            callback_api_version=mqtt.CallbackAPIVersion.VERSION2,  # type: ignore[attr-defined]
-            protocol=mqtt.MQTTv5,
-            transport=mqtt_config.transport,
-            client_id=self.client_id,
-        )
-        self.client.keepalive = 5
-        if mqtt_config.use_tls:
-            self.client.tls_set()
+        self.auth_strategy.add_token_listener(self._on_token_refreshed)
+        logger.info(f'SDK Client ID is "{self.client_id}"')
+
+    def _init_connection_state(self) -> None:
+        """Set up the client, tasks and events of a sink that has not connected yet."""
+        self._endpoint: Optional[MqttUrlConfig] = None  # Broker of the current or last connection attempt
+        self._planned_reconnect = False  # Set when the sink drops its own connection, which is no broker failure
+        self._probe_task: Optional[asyncio.Task[None]] = None
+        self._in_flight: dict[mqtt.Client, int] = {}  # Unacknowledged publishes per client, retiring ones included
+        self._in_flight_lock = threading.Lock()
+        self._acknowledged = asyncio.Event()  # Set whenever no publish is awaiting acknowledgement
 
+        # One client is kept across reconnects so its MQTT session, including unacknowledged publishes, carries over.
+        # Only a make-before-break token rotation replaces it.
+        self.client = self._create_client(self.client_id)
+        self._connect_called = False
+        self._connacks: dict[mqtt.Client, asyncio.Future[bool]] = {}  # CONNACKs awaited by non-primary clients
+        self._connection_lock = asyncio.Lock()  # Serializes connection attempts and token rotations
+        self._retiring_tasks: set[asyncio.Task[None]] = set()
+
+        # The state is written from paho's network thread as well as the event loop; the events are only ever touched
+        # on the event loop, see _set_state
+        self._state = MqttConnectionState.DISCONNECTED
+        self._state_changed = asyncio.Event()
         self._is_connected_event = asyncio.Event()
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
         self._shutdown = False
         self._monitor_task: Optional[asyncio.Task[None]] = None
 
-        self.client.on_connect = self.on_connect
-        self.client.on_publish = self.on_publish
-        self.client.on_disconnect = self.on_disconnect  # type: ignore[assignment]
+        # Both are replaced from paho's network thread when the standby is promoted; the spare is the client a
+        # promoted standby replaced, or a lost standby, waiting to be reconnected as the next standby
+        self._standby: Optional[_StandbyConnection] = None
+        self._spare: Optional[_StandbyConnection] = None
+        self._standby_needed = asyncio.Event()
+        self._standby_task: Optional[asyncio.Task[None]] = None
 
-        # Start the loop once during initialization
-        self.client.loop_start()
+    def reset_after_fork(self) -> None:
+        """
+        Replace the clients inherited from the parent process with a fresh one under a client ID of its own.
 
-        logger.info(f'SDK Client ID is "{self.client_id}"')
+        The inherited clients are dropped without a DISCONNECT, which would end the parent's connection, and their
+        paho network threads do not exist in the child.
+        """
+        if self._configured_client_id:
+            self.client_id = f"{self._configured_client_id}_{os.getpid()}"
+        else:
+            self.client_id = generate_client_id()
+        self._init_connection_state()
+        self.auth_strategy.reset_after_fork()
+        logger.info(f'SDK Client ID after fork is "{self.client_id}"')
+
+    def _create_client(self, client_id: str) -> PipelinedMqttClient:
+        # Reconnecting is driven by the connection monitor rather than paho's own loop, which retries on a fixed
+        # schedule without jitter
+        mqtt_config = self.env_config.mqtt_url_config
+        client = PipelinedMqttClient(
+            callback_api_version=mqtt.CallbackAPIVersion.VERSION2,  # type: ignore[attr-defined]
+            protocol=mqtt.MQTTv5,
+            transport=mqtt_config.transport,
+            client_id=client_id,
+            reconnect_on_failure=False,
+        )
+        client.keepalive = 5
+        if mqtt_config.ssl_context is not None:
+            client.tls_set_context(mqtt_config.ssl_context)
+        client.on_connect = self.on_connect
+        client.on_publish = self.on_publish
+        client.on_disconnect = self.on_disconnect  # type: ignore[assignment]
+        return client
 
     async def connect(self) -> None:
         if self._shutdown:
             logger.info("Shutdown requested, skipping connection attempt.")
             return
         if not self._monitor_task:
+            self._loop = asyncio.get_running_loop()
             self._monitor_task = asyncio.create_task(self._connection_monitor())
+            if len(self.brokers.configs) > 1:
+                self._probe_task = asyncio.create_task(self._probe_brokers())
+            if self.hot_standby:
+                self._standby_task = asyncio.create_task(self._maintain_standby())
             try:
                 await asyncio.wait_for(self._is_connected_event.wait(), timeout=None)
                 logger.info("Initial connection established")
@@ -87,38 +192,70 @@ class StellaNowMqttSink(IStellaNowSink):
     async def disconnect(self) -> None:
         logger.info("Disconnecting from MQTT broker...")
         self._shutdown = True
-        if self._monitor_task:
-            self._monitor_task.cancel()
-            try:
-                await self._monitor_task
-            except asyncio.CancelledError:
-                pass
-        if isinstance(self.auth_strategy, OidcMqttAuthStrategy):
-            await self.auth_strategy.auth_service.stop_refresh_task()
-        if self.client is not None:
-            self.client.disconnect()
-            self.client.loop_stop()
-            self._is_connected_event.clear()
+        if self._state is MqttConnectionState.CONNECTED:
+            self._set_state(MqttConnectionState.DRAINING)
+            await self._drain()
+        for task in (self._monitor_task, self._probe_task, self._standby_task):
+            if task:
+                task.cancel()
+                try:
+                    await task
+                except asyncio.CancelledError:
+                    pass
+        for connection in (self._standby, self._spare):
+            if connection:
+                connection.client.disconnect()
+                await asyncio.to_thread(connection.client.loop_stop)
+        if self._retiring_tasks:
+            await asyncio.gather(*self._retiring_tasks, return_exceptions=True)
+        await self.auth_strategy.close()
+        self.client.disconnect()
+        await asyncio.to_thread(self.client.loop_stop)
+        self.client.discard_prepared_transport()
+        self._set_state(MqttConnectionState.DISCONNECTED)
 
     async def send_message(self, message: StellaNowEventWrapper) -> None:
-        if not self.is_connected() or self.client is None:
+        if not self.is_connected():
             logger.warning(
                 f"Cannot send message {message.message_id}: MQTT sink is disconnected. Awaiting reconnection..."
             )
             raise Exception("MQTT sink is disconnected; connection monitor is attempting to reconnect.")
         mqtt_topic = f"in/{self.project_info.organization_id}"
-        result = self.client.publish(mqtt_topic, message.model_dump_json(by_alias=True), qos=self.default_qos)
+        client = self.client
+        with self._in_flight_lock:
+            self._in_flight[client] = self._in_flight.get(client, 0) + 1
+        result = client.publish(mqtt_topic, message.model_dump_json(by_alias=True), qos=self.default_qos)
         logger.debug(f"Publish result: {result.rc}, MID: {result.mid}")
         if result.rc != mqtt.MQTT_ERR_SUCCESS:
+            with self._in_flight_lock:
+                self._in_flight[client] -= 1
             logger.error(f"Failed to send message {message.message_id}. Status: {result.rc}")
             raise Exception(f"Publish failed with status: {result.rc}")
         logger.debug(f"Message sent to with messageId: {message.message_id}")
 
+    @property
+    def state(self) -> MqttConnectionState:
+        """Current state of the broker connection."""
+        return self._state
+
+    @property
+    def in_flight_count(self) -> int:
+        """Number of published messages still awaiting acknowledgement from the broker."""
+        return sum(self._in_flight.values())
+
     def is_connected(self) -> bool:
-        if not self._is_connected_event.is_set():
-            return False
-        # Ensure the client is still functional
-        return self.client.loop_misc() == mqtt.MQTT_ERR_SUCCESS
+        return self._state is MqttConnectionState.CONNECTED
+
+    async def wait_for_acknowledgements(self, timeout: float) -> int:
+        try:
+            async with asyncio.timeout(timeout):
+                while self.in_flight_count:
+                    self._acknowledged.clear()
+                    if self.in_flight_count:
+                        await self._acknowledged.wait()
+        except TimeoutError:
+            pass
+        return self.in_flight_count
 
     def on_connect(
         self,
@@ -128,12 +265,15 @@ class StellaNowMqttSink(IStellaNowSink):
         reason_code: mqtt.ReasonCode,  # type: ignore # noqa
         properties: Optional[mqtt.Properties],  # type: ignore # noqa
     ) -> None:
+        if client is not self.client:
+            self._resolve_connack(client, reason_code == 0)
+            return
         if reason_code == 0:
             logger.info("Connected to MQTT broker")
-            self._is_connected_event.set()
+            self._set_state(MqttConnectionState.CONNECTED)
         else:
             logger.error(f"Connection failed with code {reason_code}")
-            self._is_connected_event.clear()
+            self._set_state(MqttConnectionState.DISCONNECTED)
 
     def on_publish(  # noqa
         self,
@@ -143,7 +283,14 @@ class StellaNowMqttSink(IStellaNowSink):
         reason_code: mqtt.ReasonCode,  # type: ignore # noqa
         properties: Optional[mqtt.Properties],  # type: ignore # noqa
     ) -> None:
-        logger.success(f"Message published with MID: {mid}")
+        with self._in_flight_lock:
+            self._in_flight[client] = max(self._in_flight.get(client, 0) - 1, 0)
+        if not self.in_flight_count:
+            self._call_in_loop(self._acknowledged.set)
+        if reason_code.is_failure:
+            logger.error(f"Broker rejected message with MID {mid}: {reason_code}")
+        else:
+            logger.success(f"Message published with MID: {mid}")
 
     def on_disconnect(
         self,
@@ -153,55 +300,337 @@ class StellaNowMqttSink(IStellaNowSink):
         rc: int,
         properties: Optional[Any] = None,  # noqa
     ) -> None:
+        standby = self._standby
+        if client is not self.client:
+            self._resolve_connack(client, False)
+            if standby is not None and client is standby.client:
+                logger.warning(f"Lost the standby MQTT connection with reason code {rc}")
+                self._standby = None
+                if self._spare is None:
+                    self._spare = standby
+                self._request_standby()
+            return  # A retiring connection closing, or a rotation candidate or standby that did not make it
         reason_str = mqtt.error_string(rc)
         logger.warning(f"Disconnected from MQTT broker with reason code {rc}: {reason_str}")
-        self._is_connected_event.clear()
+        if (
+            standby is not None
+            and self._state is MqttConnectionState.CONNECTED
+            and not self._shutdown
+            and not self._planned_reconnect
+        ):
+            self._promote_standby(standby)
+            return
+        self._set_state(MqttConnectionState.DISCONNECTED)
+
+    def _set_state(self, state: MqttConnectionState) -> None:
+        """
+        Move to a new connection state.
+
+        Paho invokes callbacks on its network thread, where touching asyncio primitives is unsafe, so waking the event
+        loop is handed over with call_soon_threadsafe. The state attribute itself is updated immediately, which keeps
+        is_connected() a plain attribute read.
+        """
+        self._state = state
+        self._call_in_loop(self._notify_state_changed)
+
+    def _call_in_loop(self, callback: Callable[[], object]) -> None:
+        """Run a callback touching asyncio primitives on the sink's event loop, from paho's thread or the loop."""
+        loop = self._loop
+        if loop is None or loop.is_closed():
+            callback()
+            return
+        try:
+            running_loop: Optional[asyncio.AbstractEventLoop] = asyncio.get_running_loop()
+        except RuntimeError:
+            running_loop = None
+        if running_loop is loop:
+            callback()
+        else:
+            loop.call_soon_threadsafe(callback)
+
+    def _notify_state_changed(self) -> None:
+        if self._state is MqttConnectionState.CONNECTED:
+            self._is_connected_event.set()
+        else:
+            self._is_connected_event.clear()
+        self._state_changed.set()
+
+    async def _drain(self) -> None:
+        """Wait for in-flight publishes to be acknowledged, giving up after drain_timeout or on connection loss."""
+        deadline = asyncio.get_running_loop().time() + self.drain_timeout
+        while self.in_flight_count and self._state is MqttConnectionState.DRAINING:
+            remaining = deadline - asyncio.get_running_loop().time()
+            if remaining <= 0:
+                logger.warning(f"Disconnecting with {self.in_flight_count} messages still awaiting acknowledgement")
+                return
+            await asyncio.sleep(min(0.01, remaining))
 
     async def _connection_monitor(self) -> None:
         logger.info("Started connection monitor")
         attempt = 1
-        while True:
-            is_connected = self.is_connected()
-            if not is_connected:
-                mqtt_config = self.env_config.mqtt_url_config
-                logger.info(f"Attempting connection (Attempt {attempt}) to {mqtt_config.hostname}:{mqtt_config.port}")
-
-                logger.debug("Initializing fresh MQTT client")
-                if hasattr(self, "client") and self.client is not None:
-                    try:
-                        self.client.loop_stop()
-                    except Exception as e:
-                        logger.debug(f"Error stopping previous client: {e}")
-                    self.client = None
-
-                self.client: Optional[mqtt.Client] = mqtt.Client(
-                    callback_api_version=mqtt.CallbackAPIVersion.VERSION2,  # type: ignore[attr-defined]
-                    protocol=mqtt.MQTTv5,
-                    transport=mqtt_config.transport,
-                    client_id=self.client_id,
-                )
-                if mqtt_config.use_tls:
-                    self.client.tls_set()
-                self.client.on_connect = self.on_connect
-                self.client.on_publish = self.on_publish
-                self.client.on_disconnect = self.on_disconnect  # type: ignore[assignment]
-
-                # Authenticate and connect
+        if len(self.brokers.configs) > 1:
+            await self.brokers.probe()
+        # Checking the shutdown flag as well as relying on cancellation: asyncio.wait_for may swallow a cancellation
+        # that races with the connection event being set
+        while not self._shutdown:
+            # Cleared before reading the state so a transition in between still wakes the wait below
+            self._state_changed.clear()
+            if self._state is not MqttConnectionState.DISCONNECTED:
+                await self._state_changed.wait()
+                continue
+
+            if self._connect_called:
+                planned, self._planned_reconnect = self._planned_reconnect, False
+                # Another broker is tried right away; only once every broker failed is the reconnect backed off
+                if planned:
+                    failover = self.brokers.preferred is not self._endpoint
+                else:
+                    failover = self._endpoint is not None and self.brokers.report_failure(self._endpoint)
+                if not failover:
+                    # Jittered even for the first retry, so clients dropped together by a broker do not reconnect at
+                    # once
+                    retry_delay = self.reconnect_backoff.next_delay()
+                    logger.info(f"Reconnecting in {retry_delay:.3f} seconds...")
+                    await asyncio.sleep(retry_delay)
+
+            endpoint = self.brokers.preferred
+            logger.info(f"Attempting connection (Attempt {attempt}) to {endpoint.address}")
+            async with self._connection_lock:
                 try:
-                    await self.auth_strategy.authenticate(self.client)
-                    self.client.connect_async(mqtt_config.hostname, mqtt_config.port, keepalive=5)
-                    self.client.loop_start()
-                    await asyncio.wait_for(self._is_connected_event.wait(), timeout=5.0)
+                    self._set_state(MqttConnectionState.CONNECTING)
+                    resume = self._connect_called and endpoint is self._endpoint
+                    self._endpoint = endpoint
+                    await self._open_connection(self.client, endpoint, resume=resume, authenticate=True)
+                    self._connect_called = True
+                    await asyncio.wait_for(self._wait_for_connection_result(), timeout=5.0)
                     logger.info("Successfully connected to MQTT broker")
+                    attempt = 1
+                    self.reconnect_backoff.reset()
+                    self.brokers.report_success(endpoint)
+                    if self.hot_standby:
+                        self._standby_needed.set()
                 except Exception as e:
-                    logger.error(f"Connection attempt {attempt} failed: {e}", exc_info=True)
-                    try:
-                        self.client.loop_stop()
-                    except Exception as stop_e:
-                        logger.debug(f"Error stopping loop: {stop_e}")
-                    self.client = None
+                    if self._shutdown:
+                        break
+                    logger.error(f"Connection attempt {attempt} failed: {e}")
+                    await asyncio.to_thread(self.client.loop_stop)
+                    self._set_state(MqttConnectionState.DISCONNECTED)
                     attempt += 1
-                    retry_delay = min(attempt * 10, 60)
-                    logger.info(f"Retrying connection in {retry_delay} seconds...")
-                    await asyncio.sleep(retry_delay)
-            await asyncio.sleep(2.5)
+
+    async def _open_connection(
+        self, client: PipelinedMqttClient, endpoint: MqttUrlConfig, resume: bool, authenticate: bool = False
+    ) -> None:
+        """
+        Connect a client to a broker and (re)start its network thread.
+
+        The first connection of a client starts a clean MQTT session; later ones resume it, so paho resends publishes
+        that were not acknowledged before the connection was lost, also when failing over to another broker. With
+        resume set the client reconnects to the broker it was last connected to. Blocking socket work runs in a worker
+        thread.
+
+        With authenticate set, the auth strategy fetches its credentials while the transport is being opened (DNS
+        lookup, TCP, TLS and WebSocket handshakes), and the CONNECT carrying them is sent once both are done.
+        """
+        # Without paho's own reconnect loop the network thread ends after a connection loss; make sure it has
+        await asyncio.to_thread(client.loop_stop)
+        if not resume:
+            properties = Properties(PacketTypes.CONNECT)  # type: ignore[no-untyped-call]
+            properties.SessionExpiryInterval = self.session_expiry_interval
+            if endpoint.ssl_context is not None:
+                client.use_ssl_context(endpoint.ssl_context)
+            client.connect_async(
+                endpoint.hostname,
+                endpoint.port,
+                keepalive=5,
+                clean_start=mqtt.MQTT_CLEAN_START_FIRST_ONLY,
+                properties=properties,
+            )
+        credentials = self.auth_strategy.authenticate(client) if authenticate else asyncio.sleep(0)
+        results = await asyncio.gather(asyncio.to_thread(client.prepare_transport), credentials, return_exceptions=True)
+        failure = next((result for result in results if isinstance(result, BaseException)), None)
+        if failure is not None:
+            client.discard_prepared_transport()
+            raise failure
+        await asyncio.to_thread(client.reconnect)
+        client.loop_start()
+
+    async def _wait_for_connection_result(self) -> None:
+        """Wait for the CONNACK of the pending connection attempt, raising if the broker refused it."""
+        while self._state is MqttConnectionState.CONNECTING:
+            self._state_changed.clear()
+            if self._state is not MqttConnectionState.CONNECTING:
+                break
+            await self._state_changed.wait()
+        if self._state is MqttConnectionState.DISCONNECTED:
+            raise ConnectionError(f"Connection attempt ended in state {self._state.value}")
+
+    async def _on_token_refreshed(self, token: str) -> None:
+        """Move the connection over to a refreshed token, as configured by token_rotation."""
+        standby = self._standby
+        if standby is not None:
+            standby.client.disconnect()  # Reconnected with the refreshed token as the next standby
+        if self._shutdown or self._state is not MqttConnectionState.CONNECTED:
+            return  # The next connection attempt authenticates with the refreshed token
+        if self.token_rotation is TokenRotationMode.MAKE_BEFORE_BREAK:
+            await self._rotate_connection(token)
+        elif self.rotation_lock is None:
+            self._reconnect_with_token(token)
+        else:
+            async with self.rotation_lock:
+                if self._shutdown or self._state is not MqttConnectionState.CONNECTED:
+                    return  # Connection dropped while another sink rotated; the reconnect uses the refreshed token
+                self._reconnect_with_token(token)
+                await self._wait_for_reconnect(timeout=10.0)
+
+    def _reconnect_with_token(self, token: str) -> None:
+        logger.debug("Updating MQTT client credentials and forcing reconnect")
+        self.client.username_pw_set(username=token, password=None)
+        self._planned_reconnect = True
+        self.client.disconnect()  # The connection monitor reconnects, resuming the session
+
+    async def _wait_for_reconnect(self, timeout: float) -> None:
+        """Wait until a connection dropped for a token rotation is closed and established again."""
+        try:
+            async with asyncio.timeout(timeout):
+                while self.is_connected():
+                    await asyncio.sleep(0.01)
+                while not self._shutdown and not self.is_connected():
+                    await asyncio.sleep(0.01)
+        except TimeoutError:
+            logger.warning(f"Connection {self.client_id} did not come back within {timeout}s after token rotation")
+
+    async def _rotate_connection(self, token: str) -> None:
+        """
+        Replace the connection with one authenticated by the refreshed token without a publishing gap.
+
+        A second client under a new client ID (reusing the ID would make the broker take the session over and drop
+        the live connection) connects while messages keep flowing over the current one. Publishing switches over once
+        the broker accepts it, and the old client is closed after its in-flight publishes are acknowledged.
+        """
+        async with self._connection_lock:
+            if self._shutdown or self._state is not MqttConnectionState.CONNECTED:
+                return
+            assert self._loop is not None and self._endpoint is not None
+            client_id = generate_client_id()
+            candidate = self._create_client(client_id)
+            candidate.username_pw_set(username=token, password=None)
+            connack = self._expect_connack(candidate)
+            try:
+                await self._open_connection(candidate, self._endpoint, resume=False)
+                if not await asyncio.wait_for(connack, timeout=5.0):
+                    raise ConnectionError("Broker refused the connection")
+            except Exception as e:
+                logger.error(f"Make-before-break token rotation failed, reconnecting instead: {e}")
+                candidate.disconnect()
+                await asyncio.to_thread(candidate.loop_stop)
+                self.client.username_pw_set(username=token, password=None)
+                self._planned_reconnect = True
+                self.client.disconnect()
+                return
+            finally:
+                self._connacks.pop(candidate, None)
+
+            previous = self.client
+            self.client = candidate
+            self.client_id = client_id
+            logger.info(f'Rotated MQTT connection to client ID "{client_id}" for the refreshed token')
+            task = asyncio.create_task(self._retire_client(previous))
+            self._retiring_tasks.add(task)
+            task.add_done_callback(self._retiring_tasks.discard)
+
+    async def _probe_brokers(self) -> None:
+        """Re-rank the brokers periodically, moving the connection to one that has become much faster."""
+        while True:
+            await asyncio.sleep(self.probe_interval)
+            await self.brokers.probe()
+            endpoint = self._endpoint
+            if self._state is MqttConnectionState.CONNECTED and endpoint and self.brokers.should_switch(endpoint):
+                preferred = self.brokers.preferred
+                logger.info(f"Moving MQTT connection to faster broker {preferred.address}")
+                self._planned_reconnect = True
+                self.client.disconnect()
+
+    async def _maintain_standby(self) -> None:
+        """Keep an idle, authenticated standby connection open while the primary one is established."""
+        backoff = ExponentialBackoff(
+            self.reconnect_backoff.initial_delay, self.reconnect_backoff.max_delay, self.reconnect_backoff.multiplier
+        )
+        while not self._shutdown:
+            await self._standby_needed.wait()
+            self._standby_needed.clear()
+            if self._standby is not None:
+                continue
+
+            spare, self._spare = self._spare, None
+            if spare is None:
+                client_id = generate_client_id()
+                spare = _StandbyConnection(self._create_client(client_id), client_id)
+            endpoint = self.brokers.alternate(self._endpoint)
+            # A replaced primary client resumes its session where it has one, so paho resends its unacknowledged
+            # publishes
+            resume, spare.endpoint = spare.endpoint is endpoint, endpoint
+            connack = self._expect_connack(spare.client)
+            try:
+                await self._open_connection(spare.client, endpoint, resume=resume, authenticate=True)
+                if not await asyncio.wait_for(connack, timeout=5.0):
+                    raise ConnectionError("Broker refused the connection")
+            except Exception as e:
+                logger.error(f"Standby connection attempt failed: {e}")
+                spare.client.disconnect()
+                await asyncio.to_thread(spare.client.loop_stop)
+                self._spare = spare
+                if not self.brokers.report_failure(endpoint):
+                    await asyncio.sleep(backoff.next_delay())
+                self._standby_needed.set()
+                continue
+            finally:
+                self._connacks.pop(spare.client, None)
+
+            backoff.reset()
+            self._standby = spare
+            logger.info(f'Standby MQTT connection "{spare.client_id}" ready on {endpoint.address}')
+
+    def _promote_standby(self, standby: _StandbyConnection) -> None:
+        """Move publishing over to the standby connection after the primary one was lost, on paho's network thread."""
+        self._standby = None
+        self._spare = _StandbyConnection(self.client, self.client_id, self._endpoint)
+        self.client, self.client_id, self._endpoint = standby.client, standby.client_id, standby.endpoint
+        logger.warning(f'Publishing over standby MQTT connection "{standby.client_id}"')
+        self._request_standby()
+
+    def _request_standby(self) -> None:
+        """Have a new standby connection opened; callable from paho's network thread."""
+        loop = self._loop
+        if loop is not None and not loop.is_closed():
+            loop.call_soon_threadsafe(self._standby_needed.set)
+
+    async def _retire_client(self, client: mqtt.Client) -> None:
+        """Close a replaced client once its in-flight publishes are acknowledged, or after drain_timeout."""
+        deadline = asyncio.get_running_loop().time() + self.drain_timeout
+        while self._in_flight.get(client, 0) and asyncio.get_running_loop().time() < deadline:
+            await asyncio.sleep(0.01)
+        with self._in_flight_lock:
+            abandoned = self._in_flight.pop(client, 0)
+        if abandoned:
+            logger.warning(f"Closing replaced MQTT connection with {abandoned} messages still awaiting acknowledgement")
+        client.disconnect()
+        await asyncio.to_thread(client.loop_stop)
+
+    def _expect_connack(self, client: mqtt.Client) -> asyncio.Future[bool]:
+        """Return a future resolved with whether the broker accepted the next connection of a non-primary client."""
+        assert self._loop is not None
+        future: asyncio.Future[bool] = self._loop.create_future()
+        self._connacks[client] = future
+        return future
+
+    def _resolve_connack(self, client: mqtt.Client, accepted: bool) -> None:
+        """Report the CONNACK of a rotation candidate or standby from paho's network thread to the waiting task."""
+        future, loop = self._connacks.get(client), self._loop
+        if future is None or loop is None or loop.is_closed():
+            return
+
+        def resolve() -> None:
+            if not future.done():
+                future.set_result(accepted)
+
+        loop.call_soon_threadsafe(resolve)
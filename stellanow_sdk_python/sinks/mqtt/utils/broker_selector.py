@@ -0,0 +1,136 @@
+"""
+Copyright (C) 2022-2025 Stella Technologies (UK) Limited.
+
+Permission is hereby granted, free of charge, to any person obtaining a copy
+of this software and associated documentation files (the "Software"), to deal
+in the Software without restriction, including without limitation the rights
+to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+copies of the Software, and to permit persons to whom the Software is
+furnished to do so, subject to the following conditions:
+
+The above copyright notice and this permission notice shall be included in
+all copies or substantial portions of the Software.
+
+THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING
+FROM, OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS
+IN THE SOFTWARE.
+"""
+
+import asyncio
+import time
+from typing import Optional, Sequence
+
+from loguru import logger
+
+from stellanow_sdk_python.sinks.mqtt.utils.mqtt_url_parser import MqttUrlConfig
+
+# A healthy broker is only abandoned for one whose connect latency is at most this fraction of its own, so brokers
+# with similar latencies do not make the sink switch back and forth
+SWITCH_LATENCY_RATIO = 0.5
+
+
+class BrokerSelector:
+    """
+    Picks which of several equivalent brokers to connect to.
+
+    Brokers are ranked by the latency of a plain TCP (or Unix domain socket) connect, measured by probe(); brokers not
+    probed yet keep their configured order. A broker whose connection failed, or that the last probe could not reach,
+    is skipped until the next probe finds it reachable or every other broker failed too, so a sink can fail over to the
+    next broker without waiting out a reconnect backoff.
+
+    :param configs: The brokers, in order of preference until probed.
+    :param probe_timeout: Seconds a probe waits for a broker to accept a TCP connection before deeming it down.
+    """
+
+    def __init__(self, configs: Sequence[MqttUrlConfig], probe_timeout: float = 2.0):
+        if not configs:
+            raise ValueError("At least one broker is required.")
+        self.configs = list(configs)
+        self.probe_timeout = probe_timeout
+        self.latencies: dict[MqttUrlConfig, Optional[float]] = {}  # None for brokers the last probe could not reach
+        self._failed: set[MqttUrlConfig] = set()
+
+    @property
+    def preferred(self) -> MqttUrlConfig:
+        """The broker to connect to next: the fastest one that is reachable and has not failed."""
+        candidates = [config for config in self.configs if config not in self._failed] or self.configs
+        return min(candidates, key=self._rank)
+
+    def alternate(self, current: Optional[MqttUrlConfig]) -> MqttUrlConfig:
+        """The broker for a second connection: the fastest healthy one other than current, else the preferred one."""
+        others = [config for config in self.configs if config is not current and config not in self._failed]
+        return min(others, key=self._rank) if others else self.preferred
+
+    def report_failure(self, config: MqttUrlConfig) -> bool:
+        """
+        Record that connecting to a broker failed or its connection was lost.
+
+        :return: True if another broker is left to try right away, False if every broker failed and the caller
+            should back off before starting over.
+        """
+        self._failed.add(config)
+        if all(candidate in self._failed for candidate in self.configs):
+            self._failed.clear()
+            return False
+        logger.warning(f"Failing over from MQTT broker {config.address} to {self._describe()}")
+        return True
+
+    def report_success(self, config: MqttUrlConfig) -> None:
+        """Record that a broker accepted a connection."""
+        self._failed.discard(config)
+
+    def should_switch(self, current: MqttUrlConfig) -> bool:
+        """Whether a connection to current should move to the preferred broker, judged by the last probe."""
+        preferred = self.preferred
+        if preferred is current:
+            return False
+        current_latency, preferred_latency = self.latencies.get(current), self.latencies.get(preferred)
+        if preferred_latency is None:
+            return False
+        return current_latency is None or preferred_latency <= current_latency * SWITCH_LATENCY_RATIO
+
+    async def probe(self) -> None:
+        """Measure the TCP connect latency of every broker concurrently."""
+        results = await asyncio.gather(*(self._probe(config) for config in self.configs))
+        for config, latency in zip(self.configs, results):
+            self.latencies[config] = latency
+            if latency is None:
+                self._failed.add(config)
+            else:
+                self._failed.discard(config)
+        logger.debug(
+            "Probed MQTT brokers: "
+            + ", ".join(
+                f"{config.address} " + (f"{latency * 1000:.1f} ms" if latency is not None else "unreachable")
+                for config, latency in zip(self.configs, results)
+            )
+        )
+
+    async def _probe(self, config: MqttUrlConfig) -> Optional[float]:
+        started = time.perf_counter()
+        if config.transport == "unix":
+            connection = asyncio.open_unix_connection(config.hostname)
+        else:
+            connection = asyncio.open_connection(config.hostname, config.port)
+        try:
+            _, writer = await asyncio.wait_for(connection, timeout=self.probe_timeout)
+        except (OSError, asyncio.TimeoutError):
+            return None
+        latency = time.perf_counter() - started
+        writer.close()
+        return latency
+
+    def _rank(self, config: MqttUrlConfig) -> tuple[int, float, int]:
+        if config not in self.latencies:
+            return 1, 0.0, self.configs.index(config)  # Not probed yet: after reachable brokers, in configured order
+        latency = self.latencies[config]
+        if latency is None:
+            return 2, 0.0, self.configs.index(config)
+        return 0, latency, self.configs.index(config)
+
+    def _describe(self) -> str:
+        return self.preferred.address
@@ -0,0 +1,201 @@
+"""
+Copyright (C) 2022-2025 Stella Technologies (UK) Limited.
+
+Permission is hereby granted, free of charge, to any person obtaining a copy
+of this software and associated documentation files (the "Software"), to deal
+in the Software without restriction, including without limitation the rights
+to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+copies of the Software, and to permit persons to whom the Software is
+furnished to do so, subject to the following conditions:
+
+The above copyright notice and this permission notice shall be included in
+all copies or substantial portions of the Software.
+
+THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING
+FROM, OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS
+IN THE SOFTWARE.
+"""
+
+from dataclasses import dataclass, field
+from enum import IntEnum
+from typing import Optional
+
+
+class PacketType(IntEnum):
+    """MQTT control packet types used by the publisher."""
+
+    CONNECT = 1
+    CONNACK = 2
+    PUBLISH = 3
+    PUBACK = 4
+    PINGREQ = 12
+    PINGRESP = 13
+    DISCONNECT = 14
+
+
+# MQTT v5 property identifiers used by the publisher
+PROPERTY_SESSION_EXPIRY_INTERVAL = 0x11
+PROPERTY_RECEIVE_MAXIMUM = 0x21
+PROPERTY_SERVER_KEEP_ALIVE = 0x13
+
+# Property identifier -> value encoding, see MQTT v5 section 2.2.2.2
+_BYTE, _TWO_BYTE, _FOUR_BYTE, _VARINT, _STRING, _BINARY, _STRING_PAIR = range(7)
+_PROPERTY_TYPES = {
+    0x01: _BYTE,
+    0x02: _FOUR_BYTE,
+    0x03: _STRING,
+    0x08: _STRING,
+    0x09: _BINARY,
+    0x0B: _VARINT,
+    0x11: _FOUR_BYTE,
+    0x12: _STRING,
+    0x13: _TWO_BYTE,
+    0x15: _STRING,
+    0x16: _BINARY,
+    0x17: _BYTE,
+    0x18: _FOUR_BYTE,
+    0x19: _BYTE,
+    0x1A: _STRING,
+    0x1C: _STRING,
+    0x1F: _STRING,
+    0x21: _TWO_BYTE,
+    0x22: _TWO_BYTE,
+    0x23: _TWO_BYTE,
+    0x24: _BYTE,
+    0x25: _BYTE,
+    0x26: _STRING_PAIR,
+    0x27: _FOUR_BYTE,
+    0x28: _BYTE,
+    0x29: _BYTE,
+    0x2A: _BYTE,
+}
+
+PINGREQ_PACKET = bytes([PacketType.PINGREQ << 4, 0])
+DISCONNECT_PACKET = bytes([PacketType.DISCONNECT << 4, 0])
+
+
+@dataclass
+class ConnAck:
+    session_present: bool
+    reason_code: int
+    properties: dict[int, object] = field(default_factory=dict)
+
+
+@dataclass
+class PubAck:
+    packet_id: int
+    reason_code: int
+
+
+def encode_varint(value: int) -> bytes:
+    """Encode an MQTT variable byte integer."""
+    encoded = bytearray()
+    while True:
+        byte, value = value % 128, value // 128
+        encoded.append(byte | (0x80 if value else 0))
+        if not value:
+            return bytes(encoded)
+
+
+def decode_varint(data: bytes, offset: int = 0) -> tuple[int, int]:
+    """Decode an MQTT variable byte integer, returning the value and the offset after it."""
+    value, multiplier = 0, 1
+    for _ in range(4):
+        byte = data[offset]
+        offset += 1
+        value += (byte & 0x7F) * multiplier
+        if not byte & 0x80:
+            return value, offset
+        multiplier *= 128
+    raise ValueError("Malformed variable byte integer")
+
+
+def _encode_field(value: bytes) -> bytes:
+    """Encode a two-byte length prefixed string or binary field."""
+    return len(value).to_bytes(2, "big") + value
+
+
+def _packet(first_byte: int, body: bytes) -> bytes:
+    return bytes([first_byte]) + encode_varint(len(body)) + body
+
+
+def encode_connect(
+    client_id: str,
+    keepalive: int,
+    clean_start: bool = True,
+    username: Optional[str] = None,
+    password: Optional[str] = None,
+    session_expiry_interval: int = 0,
+) -> bytes:
+    """Encode an MQTT v5 CONNECT packet."""
+    flags = 0x02 if clean_start else 0
+    payload = _encode_field(client_id.encode("utf-8"))
+    if username is not None:
+        flags |= 0x80
+        payload += _encode_field(username.encode("utf-8"))
+    if password is not None:
+        flags |= 0x40
+        payload += _encode_field(password.encode("utf-8"))
+    properties = b""
+    if session_expiry_interval:
+        properties = bytes([PROPERTY_SESSION_EXPIRY_INTERVAL]) + session_expiry_interval.to_bytes(4, "big")
+    variable_header = _encode_field(b"MQTT") + bytes([5, flags]) + keepalive.to_bytes(2, "big")
+    return _packet(PacketType.CONNECT << 4, variable_header + encode_varint(len(properties)) + properties + payload)
+
+
+def encode_publish(topic: bytes, payload: bytes, qos: int, packet_id: int, dup: bool = False) -> bytes:
+    """Encode an MQTT v5 PUBLISH packet without properties."""
+    body = _encode_field(topic)
+    if qos:
+        body += packet_id.to_bytes(2, "big")
+    body += b"\x00" + payload  # Empty property list
+    return _packet((PacketType.PUBLISH << 4) | (0x08 if dup else 0) | (qos << 1), body)
+
+
+def decode_properties(data: bytes, offset: int) -> tuple[dict[int, object], int]:
+    """Decode a property list, returning the properties and the offset after them."""
+    length, offset = decode_varint(data, offset)
+    end = offset + length
+    properties: dict[int, object] = {}
+    while offset < end:
+        identifier, offset = decode_varint(data, offset)
+        kind = _PROPERTY_TYPES.get(identifier)
+        value: object
+        if kind == _BYTE:
+            value, offset = data[offset], offset + 1
+        elif kind == _TWO_BYTE:
+            value, offset = int.from_bytes(data[offset : offset + 2], "big"), offset + 2
+        elif kind == _FOUR_BYTE:
+            value, offset = int.from_bytes(data[offset : offset + 4], "big"), offset + 4
+        elif kind == _VARINT:
+            value, offset = decode_varint(data, offset)
+        elif kind in (_STRING, _BINARY):
+            size = int.from_bytes(data[offset : offset + 2], "big")
+            value, offset = data[offset + 2 : offset + 2 + size], offset + 2 + size
+        elif kind == _STRING_PAIR:
+            key_size = int.from_bytes(data[offset : offset + 2], "big")
+            key, offset = data[offset + 2 : offset + 2 + key_size], offset + 2 + key_size
+            value_size = int.from_bytes(data[offset : offset + 2], "big")
+            value, offset = (key, data[offset + 2 : offset + 2 + value_size]), offset + 2 + value_size
+        else:
+            raise ValueError(f"Unknown MQTT property identifier: {identifier:#x}")
+        properties[identifier] = value
+    return properties, end
+
+
+def decode_connack(body: bytes) -> ConnAck:
+    """Decode the variable header of a CONNACK packet."""
+    properties: dict[int, object] = {}
+    if len(body) > 2:
+        properties, _ = decode_properties(body, 2)
+    return ConnAck(session_present=bool(body[0] & 0x01), reason_code=body[1], properties=properties)
+
+
+def decode_puback(body: bytes) -> PubAck:
+    """Decode the variable header of a PUBACK packet."""
+    reason_code = body[2] if len(body) > 2 else 0
+    return PubAck(packet_id=int.from_bytes(body[:2], "big"), reason_code=reason_code)
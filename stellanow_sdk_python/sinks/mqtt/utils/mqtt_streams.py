@@ -0,0 +1,190 @@
+"""
+Copyright (C) 2022-2025 Stella Technologies (UK) Limited.
+
+Permission is hereby granted, free of charge, to any person obtaining a copy
+of this software and associated documentation files (the "Software"), to deal
+in the Software without restriction, including without limitation the rights
+to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+copies of the Software, and to permit persons to whom the Software is
+furnished to do so, subject to the following conditions:
+
+The above copyright notice and this permission notice shall be included in
+all copies or substantial portions of the Software.
+
+THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING
+FROM, OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS
+IN THE SOFTWARE.
+"""
+
+import asyncio
+import base64
+import hashlib
+import os
+import ssl
+from typing import Optional
+
+from stellanow_sdk_python.sinks.mqtt.utils.mqtt_url_parser import MqttUrlConfig
+
+WEBSOCKET_GUID = b"258EAFA5-E914-47DA-95CA-C5AB0DC85B11"
+DEFAULT_WEBSOCKET_PATH = "/mqtt"
+
+
+class MqttStream:
+    """Carries MQTT packets over a TCP, TLS or Unix domain socket stream."""
+
+    def __init__(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter):
+        self.reader = reader
+        self.writer = writer
+
+    async def read_packet(self) -> tuple[int, int, bytes]:
+        """Read a single MQTT packet, returning its type, flags and body."""
+        header = await self._read_exactly(2)  # Every packet has a fixed header of at least two bytes
+        remaining, multiplier, byte = 0, 1, header[1]
+        while True:
+            remaining += (byte & 0x7F) * multiplier
+            if not byte & 0x80:
+                break
+            multiplier *= 128
+            byte = (await self._read_exactly(1))[0]
+        body = await self._read_exactly(remaining) if remaining else b""
+        return header[0] >> 4, header[0] & 0x0F, body
+
+    def write(self, data: bytes) -> None:
+        self.writer.write(data)
+
+    async def drain(self) -> None:
+        await self.writer.drain()
+
+    @property
+    def write_buffer_size(self) -> int:
+        return self.writer.transport.get_write_buffer_size()
+
+    def close(self) -> None:
+        self.writer.close()
+
+    async def _read_exactly(self, size: int) -> bytes:
+        return await self.reader.readexactly(size)
+
+
+class WebSocketMqttStream(MqttStream):
+    """Carries MQTT packets in binary WebSocket frames (RFC 6455) using the `mqtt` subprotocol."""
+
+    def __init__(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter):
+        super().__init__(reader, writer)
+        self._buffer = bytearray()
+
+    async def handshake(self, host: str, port: int, path: str = DEFAULT_WEBSOCKET_PATH) -> None:
+        """Upgrade the connection to a WebSocket."""
+        key = base64.b64encode(os.urandom(16))
+        request = (
+            f"GET {path} HTTP/1.1\r\n"
+            f"Host: {host}:{port}\r\n"
+            "Upgrade: websocket\r\n"
+            "Connection: Upgrade\r\n"
+            f"Sec-WebSocket-Key: {key.decode()}\r\n"
+            "Sec-WebSocket-Version: 13\r\n"
+            "Sec-WebSocket-Protocol: mqtt\r\n\r\n"
+        )
+        self.writer.write(request.encode("ascii"))
+        await self.writer.drain()
+
+        response = (await self.reader.readuntil(b"\r\n\r\n")).decode("latin-1")
+        status_line, *header_lines = response.split("\r\n")
+        if " 101 " not in f"{status_line} ":
+            raise ConnectionError(f"WebSocket upgrade failed: {status_line}")
+        headers = {
+            name.strip().lower(): value.strip() for name, _, value in (line.partition(":") for line in header_lines)
+        }
+        expected_accept = base64.b64encode(hashlib.sha1(key + WEBSOCKET_GUID).digest()).decode()
+        if headers.get("sec-websocket-accept") != expected_accept:
+            raise ConnectionError("WebSocket upgrade failed: invalid Sec-WebSocket-Accept header")
+
+    def write(self, data: bytes) -> None:
+        self.writer.write(encode_websocket_frame(data, opcode=0x2, mask=True))
+
+    async def _read_exactly(self, size: int) -> bytes:
+        while len(self._buffer) < size:
+            await self._read_frame()
+        data = bytes(self._buffer[:size])
+        del self._buffer[:size]
+        return data
+
+    async def _read_frame(self) -> None:
+        first, second = await self.reader.readexactly(2)
+        opcode, length = first & 0x0F, second & 0x7F
+        if length == 126:
+            length = int.from_bytes(await self.reader.readexactly(2), "big")
+        elif length == 127:
+            length = int.from_bytes(await self.reader.readexactly(8), "big")
+        mask = await self.reader.readexactly(4) if second & 0x80 else None
+        payload = await self.reader.readexactly(length)
+        if mask is not None:
+            payload = apply_websocket_mask(payload, mask)
+
+        if opcode in (0x0, 0x1, 0x2):
+            self._buffer += payload
+        elif opcode == 0x8:
+            raise ConnectionError("WebSocket closed by broker")
+        elif opcode == 0x9:
+            self.writer.write(encode_websocket_frame(payload, opcode=0xA, mask=True))
+
+
+def apply_websocket_mask(payload: bytes, mask: bytes) -> bytes:
+    """XOR the payload with the four-byte WebSocket masking key."""
+    size = len(payload)
+    if not size:
+        return payload
+    key = (mask * (size // 4 + 1))[:size]
+    return (int.from_bytes(payload, "big") ^ int.from_bytes(key, "big")).to_bytes(size, "big")
+
+
+def encode_websocket_frame(payload: bytes, opcode: int, mask: bool) -> bytes:
+    """Encode a single final WebSocket frame."""
+    size = len(payload)
+    mask_bit = 0x80 if mask else 0
+    if size < 126:
+        header = bytes([0x80 | opcode, mask_bit | size])
+    elif size < 1 << 16:
+        header = bytes([0x80 | opcode, mask_bit | 126]) + size.to_bytes(2, "big")
+    else:
+        header = bytes([0x80 | opcode, mask_bit | 127]) + size.to_bytes(8, "big")
+    if not mask:
+        return header + payload
+    key = os.urandom(4)
+    return header + key + apply_websocket_mask(payload, key)
+
+
+async def open_mqtt_stream(config: MqttUrlConfig, ssl_context: Optional[ssl.SSLContext] = None) -> MqttStream:
+    """
+    Open a stream to the broker described by the URL config.
+
+    Args:
+        config (MqttUrlConfig): Broker address, transport and TLS flag.
+        ssl_context (Optional[ssl.SSLContext]): Context for TLS connections. Defaults to the context shared by all
+            connections to the broker, see MqttUrlConfig.ssl_context.
+
+    Returns:
+        MqttStream: A stream ready to carry MQTT packets.
+    """
+    if config.transport == "unix":
+        reader, writer = await asyncio.open_unix_connection(config.hostname)
+        return MqttStream(reader, writer)
+
+    context = (ssl_context or config.ssl_context) if config.use_tls else None
+    reader, writer = await asyncio.open_connection(
+        config.hostname, config.port, ssl=context, server_hostname=config.hostname if context else None
+    )
+    if config.transport != "websockets":
+        return MqttStream(reader, writer)
+
+    stream = WebSocketMqttStream(reader, writer)
+    try:
+        await stream.handshake(config.hostname, config.port)
+    except BaseException:
+        writer.close()
+        raise
+    return stream
@@ -20,31 +20,67 @@ FROM, OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS
 IN THE SOFTWARE.
 """
 
-from typing import Literal
+from typing import Literal, Optional, Sequence, Union
 from urllib.parse import urlparse
 
+from stellanow_sdk_python.sinks.mqtt.utils.tls_context import ResumableSSLContext, TlsConfig
+
+# paho requires a port even for Unix domain sockets, where it is not used
+UNIX_SOCKET_PORT = 1883
+
 
 class MqttUrlConfig:
     def __init__(
-        self, scheme: str, hostname: str, port: int, transport: Literal["tcp", "websockets", "unix"], use_tls: bool
+        self,
+        scheme: str,
+        hostname: str,
+        port: int,
+        transport: Literal["tcp", "websockets", "unix"],
+        use_tls: bool,
+        tls_config: Optional[TlsConfig] = None,
     ):
         self.scheme = scheme
         self.hostname = hostname
         self.port = port
         self.transport = transport
         self.use_tls = use_tls
-
-
-def parse_mqtt_url(url: str) -> MqttUrlConfig:
+        self.tls_config = tls_config or TlsConfig()
+        self._ssl_context: Optional[ResumableSSLContext] = None
+
+    @property
+    def address(self) -> str:
+        """The broker address for log messages: host and port, or the socket path for the unix transport."""
+        return self.hostname if self.transport == "unix" else f"{self.hostname}:{self.port}"
+
+    @property
+    def ssl_context(self) -> Optional[ResumableSSLContext]:
+        """
+        TLS context shared by every connection to this broker, created on first use; None without TLS.
+
+        Sharing it loads the CA certificates once, and lets reconnects resume the TLS session of the previous
+        connection instead of performing a full handshake.
+        """
+        if not self.use_tls:
+            return None
+        if self._ssl_context is None:
+            self._ssl_context = self.tls_config.create_ssl_context()
+        return self._ssl_context
+
+
+def parse_mqtt_url(url: str, tls_config: Optional[TlsConfig] = None) -> MqttUrlConfig:
     """
     Parse an MQTT URL and return its configuration components.
 
     Args:
         url (str): The MQTT URL, e.g., 'mqtt-tcp://ingestor.dev.stella.cloud:1883',
-                  'mqtts://broker:8883', 'ws://broker:80', or 'wss://broker:443'
+                  'mqtts://broker:8883', 'ws://broker:80', 'wss://broker:443', or 'unix:///run/mqtt.sock' for a
+                  broker listening on a Unix domain socket
+        tls_config (Optional[TlsConfig]): TLS options for 'mqtts' and 'wss' URLs. Defaults to verifying the broker
+                  against the system trust store.
 
     Returns:
-        MqttUrlConfig: Object containing scheme, hostname, port, transport, and TLS flag.
+        MqttUrlConfig: Object containing scheme, hostname, port, transport, and TLS flag. For Unix domain sockets
+                  the hostname is the socket path.
 
     Raises:
         ValueError: If the URL is malformed or unsupported.
@@ -53,7 +89,7 @@ def parse_mqtt_url(url: str) -> MqttUrlConfig:
 
     # Validate scheme and determine transport/TLS
     scheme = parsed.scheme.lower()
-    transport: Literal["tcp", "websockets"]
+    transport: Literal["tcp", "websockets", "unix"]
     use_tls: bool
 
     match scheme:
@@ -69,8 +105,23 @@ def parse_mqtt_url(url: str) -> MqttUrlConfig:
         case "wss":
             transport = "websockets"
             use_tls = True
+        case "unix" | "mqtt+unix":
+            transport = "unix"
+            use_tls = False
         case _:
-            raise ValueError(f"Unsupported MQTT scheme: {scheme}. Use 'mqtt', 'mqtt-tcp', 'mqtts', 'ws', or 'wss'.")
+            raise ValueError(
+                f"Unsupported MQTT scheme: {scheme}. Use 'mqtt', 'mqtt-tcp', 'mqtts', 'ws', 'wss', 'unix', or "
+                "'mqtt+unix'."
+            )
+
+    # Unix domain socket URLs carry the socket path, e.g. 'unix:///run/mqtt.sock'
+    if transport == "unix":
+        socket_path = parsed.netloc + parsed.path
+        if not socket_path:
+            raise ValueError("No socket path provided in MQTT URL.")
+        return MqttUrlConfig(
+            scheme=scheme, hostname=socket_path, port=UNIX_SOCKET_PORT, transport=transport, use_tls=use_tls
+        )
 
     # Extract hostname
     hostname = parsed.hostname
@@ -92,4 +143,31 @@ def parse_mqtt_url(url: str) -> MqttUrlConfig:
             case _:
                 raise ValueError(f"No default port defined for scheme: {scheme}")
 
-    return MqttUrlConfig(scheme=scheme, hostname=hostname, port=port, transport=transport, use_tls=use_tls)
+    return MqttUrlConfig(
+        scheme=scheme, hostname=hostname, port=port, transport=transport, use_tls=use_tls, tls_config=tls_config
+    )
+
+
+def parse_mqtt_urls(urls: Union[str, Sequence[str]], tls_config: Optional[TlsConfig] = None) -> list[MqttUrlConfig]:
+    """
+    Parse the URLs of one or more equivalent MQTT brokers.
+
+    Args:
+        urls (Union[str, Sequence[str]]): A single URL, a comma-separated list of URLs, e.g.
+                  'mqtts://broker-1:8883,mqtts://broker-2:8883', or a sequence of URLs.
+        tls_config (Optional[TlsConfig]): TLS options applied to every broker.
+
+    Returns:
+        list[MqttUrlConfig]: One configuration per broker, in the given order.
+
+    Raises:
+        ValueError: If no URL is given, a URL is malformed, or the URLs use different transports.
+    """
+    if isinstance(urls, str):
+        urls = urls.split(",")
+    configs = [parse_mqtt_url(url.strip(), tls_config) for url in urls if url.strip()]
+    if not configs:
+        raise ValueError("No MQTT broker URL provided.")
+    if len({(config.transport, config.use_tls) for config in configs}) > 1:
+        raise ValueError("All MQTT broker URLs must use the same transport and TLS setting.")
+    return configs
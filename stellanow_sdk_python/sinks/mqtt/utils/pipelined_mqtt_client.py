@@ -0,0 +1,70 @@
+"""
+Copyright (C) 2022-2025 Stella Technologies (UK) Limited.
+
+Permission is hereby granted, free of charge, to any person obtaining a copy
+of this software and associated documentation files (the "Software"), to deal
+in the Software without restriction, including without limitation the rights
+to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+copies of the Software, and to permit persons to whom the Software is
+furnished to do so, subject to the following conditions:
+
+The above copyright notice and this permission notice shall be included in
+all copies or substantial portions of the Software.
+
+THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING
+FROM, OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS
+IN THE SOFTWARE.
+"""
+
+import ssl
+from typing import Any, Optional
+
+import paho.mqtt.client as mqtt
+
+
+class PipelinedMqttClient(mqtt.Client):
+    """
+    A paho client whose transport can be opened ahead of the MQTT CONNECT.
+
+    paho opens the socket and sends CONNECT in a single reconnect() call, so everything the CONNECT depends on, such as
+    the token used as username, has to be ready before the DNS lookup even starts. prepare_transport() opens the
+    socket on its own, including the TLS and WebSocket handshakes, and the next reconnect() sends CONNECT over it with
+    the credentials set by then.
+    """
+
+    def __init__(self, *args: Any, **kwargs: Any) -> None:
+        super().__init__(*args, **kwargs)
+        self._prepared_socket: Optional[Any] = None
+
+    def prepare_transport(self) -> None:
+        """
+        Resolve the broker address and open the transport for the next reconnect(). Blocks, so run it in a thread.
+
+        Requires connect() or connect_async() to have been called, which set the broker address.
+        """
+        self.discard_prepared_transport()
+        self._prepared_socket = super()._create_socket()
+
+    def discard_prepared_transport(self) -> None:
+        """Close a transport prepared by prepare_transport() that will not be used."""
+        sock, self._prepared_socket = self._prepared_socket, None
+        if sock is not None:
+            sock.close()
+
+    def use_ssl_context(self, context: ssl.SSLContext) -> None:
+        """
+        Switch the TLS context of a client configured with tls_set_context(), e.g. before connecting to another broker.
+
+        paho only allows configuring TLS once, but the context is only read when a connection is opened.
+        """
+        if self._ssl_context is None:
+            raise ValueError("TLS is not configured for this client.")
+        self._ssl_context = context
+
+    def _create_socket(self) -> Any:
+        sock, self._prepared_socket = self._prepared_socket, None
+        return sock if sock is not None else super()._create_socket()
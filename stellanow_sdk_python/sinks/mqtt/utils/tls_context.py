@@ -0,0 +1,159 @@
+"""
+Copyright (C) 2022-2025 Stella Technologies (UK) Limited.
+
+Permission is hereby granted, free of charge, to any person obtaining a copy
+of this software and associated documentation files (the "Software"), to deal
+in the Software without restriction, including without limitation the rights
+to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+copies of the Software, and to permit persons to whom the Software is
+furnished to do so, subject to the following conditions:
+
+The above copyright notice and this permission notice shall be included in
+all copies or substantial portions of the Software.
+
+THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING
+FROM, OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS
+IN THE SOFTWARE.
+"""
+
+import socket
+import ssl
+from typing import Any, Optional, Sequence, Union
+
+from loguru import logger
+
+
+class ResumableSSLSocket(ssl.SSLSocket):
+    """An SSLSocket handing its TLS session back to its context when closed, so the next connection can resume it."""
+
+    def close(self) -> None:
+        if isinstance(self.context, ResumableSSLContext):
+            self.context.remember_session(self)
+        super().close()
+
+
+class ResumableSSLContext(ssl.SSLContext):
+    """
+    A client SSLContext resuming the TLS session of the previous connection.
+
+    Python does not cache client sessions, so every connection would otherwise perform a full handshake. The context
+    keeps the last session it was handed and offers it on the next connection, which then skips certificate
+    exchange and verification. Sessions are collected from closed sockets and can be handed over explicitly with
+    remember_session(), as needed for asyncio connections, which use SSLObject rather than SSLSocket.
+
+    A context is meant to be shared by all connections to one broker, since a session is only valid for the server
+    that issued it.
+    """
+
+    sslsocket_class = ResumableSSLSocket
+    _session: Optional[ssl.SSLSession]
+
+    def __new__(cls, protocol: int = ssl.PROTOCOL_TLS_CLIENT, *args: Any, **kwargs: Any) -> "ResumableSSLContext":
+        context = super().__new__(cls, protocol, *args, **kwargs)
+        context._session = None
+        return context
+
+    def remember_session(self, connection: Union[ssl.SSLSocket, ssl.SSLObject, None]) -> None:
+        """Keep the session of an established connection for the next one."""
+        session = connection.session if connection is not None else None
+        if session is not None:
+            self._session = session
+
+    @property
+    def session(self) -> Optional[ssl.SSLSession]:
+        """The session offered to the next connection."""
+        return self._session
+
+    def wrap_socket(
+        self,
+        sock: socket.socket,
+        server_side: bool = False,
+        do_handshake_on_connect: bool = True,
+        suppress_ragged_eofs: bool = True,
+        server_hostname: Union[str, bytes, None] = None,
+        session: Optional[ssl.SSLSession] = None,
+    ) -> ssl.SSLSocket:
+        return super().wrap_socket(
+            sock,
+            server_side=server_side,
+            do_handshake_on_connect=do_handshake_on_connect,
+            suppress_ragged_eofs=suppress_ragged_eofs,
+            server_hostname=server_hostname,
+            session=session or self._session,
+        )
+
+    def wrap_bio(
+        self,
+        incoming: ssl.MemoryBIO,
+        outgoing: ssl.MemoryBIO,
+        server_side: bool = False,
+        server_hostname: Union[str, bytes, None] = None,
+        session: Optional[ssl.SSLSession] = None,
+    ) -> ssl.SSLObject:
+        return super().wrap_bio(
+            incoming,
+            outgoing,
+            server_side=server_side,
+            server_hostname=server_hostname,
+            session=session or self._session,
+        )
+
+
+class TlsConfig:
+    """
+    TLS options for broker connections.
+
+    Args:
+        ca_file (Optional[str]): PEM file with the certificates of trusted CAs. Defaults to the system trust store.
+        ca_path (Optional[str]): Directory of trusted CA certificates, as prepared by `openssl rehash`.
+        cert_file (Optional[str]): PEM file with the client certificate, for brokers requiring mutual TLS.
+        key_file (Optional[str]): PEM file with the client private key, if not included in cert_file.
+        key_password (Optional[str]): Password decrypting the client private key.
+        ciphers (Optional[str]): OpenSSL cipher list for TLS 1.2 connections, e.g. 'ECDHE+AESGCM'.
+        alpn_protocols (Optional[Sequence[str]]): Protocols offered through ALPN, e.g. ['mqtt'] for brokers serving
+            MQTT and HTTPS on port 443.
+        minimum_version (Optional[ssl.TLSVersion]): Lowest TLS version accepted. Defaults to TLS 1.2.
+    """
+
+    def __init__(
+        self,
+        ca_file: Optional[str] = None,
+        ca_path: Optional[str] = None,
+        cert_file: Optional[str] = None,
+        key_file: Optional[str] = None,
+        key_password: Optional[str] = None,
+        ciphers: Optional[str] = None,
+        alpn_protocols: Optional[Sequence[str]] = None,
+        minimum_version: Optional[ssl.TLSVersion] = None,
+    ):
+        if key_file is not None and cert_file is None:
+            raise ValueError("A client key file requires a client certificate file.")
+        self.ca_file = ca_file
+        self.ca_path = ca_path
+        self.cert_file = cert_file
+        self.key_file = key_file
+        self.key_password = key_password
+        self.ciphers = ciphers
+        self.alpn_protocols = list(alpn_protocols) if alpn_protocols is not None else None
+        self.minimum_version = minimum_version
+
+    def create_ssl_context(self) -> ResumableSSLContext:
+        """Create a client context verifying the broker certificate and hostname, with these options applied."""
+        context = ResumableSSLContext(ssl.PROTOCOL_TLS_CLIENT)
+        context.minimum_version = self.minimum_version or ssl.TLSVersion.TLSv1_2
+        if self.ca_file is not None or self.ca_path is not None:
+            context.load_verify_locations(cafile=self.ca_file, capath=self.ca_path)
+        else:
+            context.load_default_certs(ssl.Purpose.SERVER_AUTH)
+        if self.cert_file is not None:
+            context.load_cert_chain(self.cert_file, self.key_file, self.key_password)
+        if self.ciphers is not None:
+            context.set_ciphers(self.ciphers)
+        if self.alpn_protocols:
+            context.set_alpn_protocols(self.alpn_protocols)
+        logger.debug("Created TLS context for broker connections")
+        return context
@@ -0,0 +1,64 @@
+"""
+Copyright (C) 2022-2025 Stella Technologies (UK) Limited.
+
+Permission is hereby granted, free of charge, to any person obtaining a copy
+of this software and associated documentation files (the "Software"), to deal
+in the Software without restriction, including without limitation the rights
+to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+copies of the Software, and to permit persons to whom the Software is
+furnished to do so, subject to the following conditions:
+
+The above copyright notice and this permission notice shall be included in
+all copies or substantial portions of the Software.
+
+THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING
+FROM, OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS
+IN THE SOFTWARE.
+"""
+
+import math
+import random
+
+
+class ExponentialBackoff:
+    """
+    Exponential backoff with full jitter.
+
+    Each delay is drawn uniformly between zero and an exponentially growing cap, so a fleet of clients that lost the
+    same broker spreads its reconnects out instead of retrying in lockstep.
+
+    :param initial_delay: Upper bound of the first delay in seconds.
+    :param max_delay: Upper bound no delay exceeds, in seconds.
+    :param multiplier: Growth factor of the bound per attempt.
+    """
+
+    def __init__(self, initial_delay: float = 0.025, max_delay: float = 30.0, multiplier: float = 2.0):
+        if initial_delay <= 0 or max_delay < initial_delay:
+            raise ValueError("initial_delay must be positive and not greater than max_delay")
+        if multiplier < 1:
+            raise ValueError("multiplier must be at least 1")
+        self.initial_delay = initial_delay
+        self.max_delay = max_delay
+        self.multiplier = multiplier
+        self.attempt = 0
+        # First attempt whose bound reaches max_delay; the exponent stops growing there, so it cannot overflow
+        self._max_exponent = 0 if multiplier == 1 else math.ceil(math.log(max_delay / initial_delay, multiplier))
+
+    def next_delay(self) -> float:
+        """Return the delay before the next attempt and advance the attempt counter."""
+        delay = self.delay(self.attempt)
+        self.attempt = min(self.attempt + 1, self._max_exponent)
+        return delay
+
+    def delay(self, attempt: int) -> float:
+        """Return a delay for the given zero-based attempt, for callers keeping their own count."""
+        bound = min(self.max_delay, self.initial_delay * self.multiplier ** min(attempt, self._max_exponent))
+        return random.uniform(0, bound)
+
+    def reset(self) -> None:
+        """Start over from the initial delay, typically after a successful attempt."""
+        self.attempt = 0
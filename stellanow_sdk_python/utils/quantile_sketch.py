@@ -0,0 +1,89 @@
+"""
+Copyright (C) 2022-2025 Stella Technologies (UK) Limited.
+
+Permission is hereby granted, free of charge, to any person obtaining a copy
+of this software and associated documentation files (the "Software"), to deal
+in the Software without restriction, including without limitation the rights
+to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+copies of the Software, and to permit persons to whom the Software is
+furnished to do so, subject to the following conditions:
+
+The above copyright notice and this permission notice shall be included in
+all copies or substantial portions of the Software.
+
+THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING
+FROM, OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS
+IN THE SOFTWARE.
+"""
+
+import heapq
+import math
+
+
+class QuantileSketch:
+    """
+    Approximate quantiles of a stream of numbers in bounded memory.
+
+    Values are counted in buckets whose bounds grow geometrically, so every quantile is estimated within the relative
+    accuracy of the true value, whatever the spread of the values. Once more than max_buckets are in use, the
+    buckets of the smallest magnitudes are merged, giving up accuracy on the smallest values first.
+
+    :param relative_accuracy: Maximum relative error of an estimated quantile.
+    :param max_buckets: Upper bound of the buckets kept, for positive and negative values each.
+    """
+
+    def __init__(self, relative_accuracy: float = 0.01, max_buckets: int = 2048):
+        if not 0 < relative_accuracy < 1:
+            raise ValueError("relative_accuracy must be between 0 and 1")
+        if max_buckets < 1:
+            raise ValueError("max_buckets must be at least 1")
+        self.relative_accuracy = relative_accuracy
+        self.max_buckets = max_buckets
+        self.count = 0
+        self._gamma = (1 + relative_accuracy) / (1 - relative_accuracy)
+        self._log_gamma = math.log(self._gamma)
+        self._positive: dict[int, int] = {}  # Bucket index -> values of the magnitude
+        self._negative: dict[int, int] = {}
+        self._zero_count = 0
+
+    def add(self, value: float) -> None:
+        """Count a value."""
+        self.count += 1
+        if value == 0:
+            self._zero_count += 1
+            return
+        buckets = self._positive if value > 0 else self._negative
+        index = math.ceil(math.log(abs(value)) / self._log_gamma)
+        buckets[index] = buckets.get(index, 0) + 1
+        if len(buckets) > self.max_buckets:
+            lowest, second = heapq.nsmallest(2, buckets)
+            buckets[second] += buckets.pop(lowest)
+
+    def quantile(self, q: float) -> float:
+        """Return the estimated value below which the fraction q of the values fall; 0.0 if none were counted."""
+        if not 0 <= q <= 1:
+            raise ValueError("q must be between 0 and 1")
+        if not self.count:
+            return 0.0
+        rank = q * (self.count - 1)
+        seen = 0
+        for index in sorted(self._negative, reverse=True):
+            seen += self._negative[index]
+            if seen > rank:
+                return -self._value_of(index)
+        seen += self._zero_count
+        if seen > rank:
+            return 0.0
+        for index in sorted(self._positive):
+            seen += self._positive[index]
+            if seen > rank:
+                return self._value_of(index)
+        return self._value_of(max(self._positive))
+
+    def _value_of(self, index: int) -> float:
+        # The point of the bucket (gamma^(index-1), gamma^index] within the relative accuracy of both its bounds
+        return 2 * self._gamma**index / (self._gamma + 1)
@@ -0,0 +1,122 @@
+"""
+Copyright (C) 2022-2025 Stella Technologies (UK) Limited.
+
+Permission is hereby granted, free of charge, to any person obtaining a copy
+of this software and associated documentation files (the "Software"), to deal
+in the Software without restriction, including without limitation the rights
+to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+copies of the Software, and to permit persons to whom the Software is
+furnished to do so, subject to the following conditions:
+
+The above copyright notice and this permission notice shall be included in
+all copies or substantial portions of the Software.
+
+THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING
+FROM, OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS
+IN THE SOFTWARE.
+---
+
+Benchmark: cold-start time to first publish
+===========================================
+
+Starts a sink against a local WebSocket broker stand-in whose upgrade response is held back, standing in for the
+TCP, TLS and WebSocket round trips to a remote broker, and authenticates through OIDC against a Keycloak stand-in
+that answers token requests after a delay. Reports the time from connect() to the first acknowledged publish, next
+to the two steps timed on their own: connecting without authentication and fetching the token. The sinks open the
+transport while the token is fetched, so time to first publish should approach the slower of the two steps rather
+than their sum.
+
+Run with: python -m tests.benchmarks.bench_connect_pipelining
+"""
+
+import argparse
+import asyncio
+import time
+from typing import Any
+
+from stellanow_sdk_python.config.eniviroment_config.stellanow_env_config import EnvConfig
+from stellanow_sdk_python.config.stellanow_auth_credentials import StellaNowCredentials
+from stellanow_sdk_python.sinks.i_stellanow_sink import IStellaNowSink
+from stellanow_sdk_python.sinks.mqtt.auth_strategy.i_mqtt_auth_strategy import IMqttAuthStrategy
+from stellanow_sdk_python.sinks.mqtt.auth_strategy.no_auth_mqtt_auth_strategy import NoAuthMqttAuthStrategy
+from stellanow_sdk_python.sinks.mqtt.auth_strategy.oidc_mqtt_auth_strategy import OidcMqttAuthStrategy
+from stellanow_sdk_python.sinks.mqtt.stellanow_asyncio_mqtt_sink import StellaNowAsyncioMqttSink
+from stellanow_sdk_python.sinks.mqtt.stellanow_mqtt_sink import StellaNowMqttSink
+from tests.mqtt_broker_stub import MqttBrokerStub
+from tests.test_stellanow_message_queue import make_event
+from tests.test_stellanow_mqtt_pool_sink import PROJECT_INFO
+
+
+def make_oidc_strategy(env_config: EnvConfig, token_latency: float) -> OidcMqttAuthStrategy:
+    """Create an OIDC auth strategy whose Keycloak token endpoint answers after token_latency seconds."""
+    strategy = OidcMqttAuthStrategy(PROJECT_INFO, StellaNowCredentials(username="user", password="secret"), env_config)
+
+    async def token(**_: Any) -> dict[str, Any]:
+        await asyncio.sleep(token_latency)
+        return {"access_token": "token", "expires_in": 300, "refresh_token": "refresh", "refresh_expires_in": 1800}
+
+    strategy.auth_service.keycloak_openid.a_token = token
+    return strategy
+
+
+async def time_to_first_publish(sink_class: type, broker: MqttBrokerStub, auth_strategy: IMqttAuthStrategy) -> float:
+    env_config = EnvConfig.create_custom_env(api_base_url="http://localhost", mqtt_broker_url=broker.url)
+    sink: IStellaNowSink = sink_class(auth_strategy=auth_strategy, env_config=env_config, project_info=PROJECT_INFO)
+    received = len(broker.received)
+    started = time.perf_counter()
+    await sink.connect()
+    await sink.send_message(make_event("entity", 0))
+    await broker.wait_for_messages(received + 1)
+    elapsed = time.perf_counter() - started
+    await sink.disconnect()
+    return elapsed
+
+
+async def run(sink_class: type, handshake_delay: float, token_latency: float, repeats: int) -> None:
+    """Time cold starts of a sink and the steps they are made of."""
+    async with MqttBrokerStub(websocket=True, handshake_delay=handshake_delay) as broker:
+        env_config = EnvConfig.create_custom_env(api_base_url="http://localhost", mqtt_broker_url=broker.url)
+        connect_only, token_only, pipelined = [], [], []
+        for _ in range(repeats):
+            connect_only.append(await time_to_first_publish(sink_class, broker, NoAuthMqttAuthStrategy()))
+
+            strategy = make_oidc_strategy(env_config, token_latency)
+            started = time.perf_counter()
+            await strategy.auth_service.get_access_token()
+            token_only.append(time.perf_counter() - started)
+            await strategy.auth_service.stop_refresh_task()
+
+            strategy = make_oidc_strategy(env_config, token_latency)
+            pipelined.append(await time_to_first_publish(sink_class, broker, strategy))
+
+    def median_ms(samples: list[float]) -> float:
+        return sorted(samples)[len(samples) // 2] * 1000
+
+    print(
+        f"{sink_class.__name__:>25}: connect only {median_ms(connect_only):.0f} ms, "
+        f"token only {median_ms(token_only):.0f} ms, sequential sum "
+        f"{median_ms(connect_only) + median_ms(token_only):.0f} ms, "
+        f"time to first publish {median_ms(pipelined):.0f} ms"
+    )
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--handshake-delay", type=float, default=0.15, help="Seconds the broker handshake takes")
+    parser.add_argument("--token-latency", type=float, default=0.2, help="Seconds a token request takes")
+    parser.add_argument("--repeats", type=int, default=5, help="Cold starts to take the median of")
+    args = parser.parse_args()
+
+    from loguru import logger
+
+    logger.remove()
+    for sink_class in (StellaNowMqttSink, StellaNowAsyncioMqttSink):
+        asyncio.run(run(sink_class, args.handshake_delay, args.token_latency, args.repeats))
+
+
+if __name__ == "__main__":
+    main()
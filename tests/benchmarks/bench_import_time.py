@@ -0,0 +1,70 @@
+"""
+Copyright (C) 2022-2025 Stella Technologies (UK) Limited.
+
+Permission is hereby granted, free of charge, to any person obtaining a copy
+of this software and associated documentation files (the "Software"), to deal
+in the Software without restriction, including without limitation the rights
+to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+copies of the Software, and to permit persons to whom the Software is
+furnished to do so, subject to the following conditions:
+
+The above copyright notice and this permission notice shall be included in
+all copies or substantial portions of the Software.
+
+THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING
+FROM, OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS
+IN THE SOFTWARE.
+---
+
+Benchmark: SDK import time
+==========================
+
+Imports a module in fresh interpreters with `python -X importtime` and reports the median cumulative import time
+of the module, next to the slowest imports it pulled in. Heavy dependencies (keycloak, paho-mqtt) and optional
+subsystems (agent sinks, shared memory ring) are only loaded when their strategy or sink is created, so importing
+configure_sdk should not list them.
+
+Run with: python -m tests.benchmarks.bench_import_time
+"""
+
+import argparse
+import subprocess
+import sys
+
+
+def import_times(module: str) -> dict[str, int]:
+    """Import a module in a fresh interpreter and return the cumulative import time of every module, in µs."""
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {module}"], capture_output=True, text=True, check=True
+    )
+    times: dict[str, int] = {}
+    for line in result.stderr.splitlines():
+        if not line.startswith("import time:") or "|" not in line:
+            continue
+        _, cumulative, name = line[len("import time:") :].split("|")
+        if cumulative.strip().isdigit():
+            times[name.strip()] = int(cumulative)
+    return times
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--module", default="stellanow_sdk_python.configure_sdk", help="Module to import")
+    parser.add_argument("--repeats", type=int, default=5, help="Fresh interpreters to take the median of")
+    parser.add_argument("--top", type=int, default=10, help="Slowest imports to list")
+    args = parser.parse_args()
+
+    runs = [import_times(args.module) for _ in range(args.repeats)]
+    totals = sorted(times[args.module] for times in runs)
+    print(f"{args.module}: {totals[len(totals) // 2] / 1000:.1f} ms (median of {args.repeats})")
+    slowest = sorted(runs[-1].items(), key=lambda item: item[1], reverse=True)
+    for name, cumulative in slowest[1 : args.top + 1]:
+        print(f"{cumulative / 1000:>10.1f} ms  {name}")
+
+
+if __name__ == "__main__":
+    main()
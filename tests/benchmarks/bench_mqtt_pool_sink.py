@@ -0,0 +1,100 @@
+"""
+Copyright (C) 2022-2025 Stella Technologies (UK) Limited.
+
+Permission is hereby granted, free of charge, to any person obtaining a copy
+of this software and associated documentation files (the "Software"), to deal
+in the Software without restriction, including without limitation the rights
+to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+copies of the Software, and to permit persons to whom the Software is
+furnished to do so, subject to the following conditions:
+
+The above copyright notice and this permission notice shall be included in
+all copies or substantial portions of the Software.
+
+THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING
+FROM, OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS
+IN THE SOFTWARE.
+---
+
+Benchmark: MQTT connection pool sink
+====================================
+
+Measures publish throughput of `StellaNowMqttPoolSink` for different pool sizes against the local broker stand-in,
+which runs in its own process so it does not compete with the SDK for the GIL. Every message is published with QoS 1;
+the run ends once every publish has been acknowledged.
+
+Run with: python -m tests.benchmarks.bench_mqtt_pool_sink
+"""
+
+import argparse
+import asyncio
+import sys
+import time
+from contextlib import asynccontextmanager
+from typing import AsyncIterator
+
+from loguru import logger
+
+from stellanow_sdk_python.sinks.mqtt.stellanow_mqtt_pool_sink import PoolDistribution
+from tests.mqtt_broker_stub import MqttBrokerStub
+from tests.test_stellanow_message_queue import make_event
+from tests.test_stellanow_mqtt_pool_sink import connect_pool, make_pool_sink
+
+
+@asynccontextmanager
+async def broker_process(ack_delay: float) -> AsyncIterator[MqttBrokerStub]:
+    """Run the broker stand-in in a subprocess, yielding a handle that carries its port."""
+    process = await asyncio.create_subprocess_exec(
+        sys.executable, "-m", "tests.mqtt_broker_stub", "--ack-delay", str(ack_delay), stdout=asyncio.subprocess.PIPE
+    )
+    assert process.stdout is not None
+    url = (await process.stdout.readline()).decode().strip()
+    try:
+        yield MqttBrokerStub(port=int(url.rsplit(":", 1)[1]))
+    finally:
+        process.terminate()
+        await process.wait()
+
+
+async def run(pool_size: int, messages: int, entities: int, distribution: PoolDistribution, ack_delay: float) -> float:
+    """Publish the messages over a pool of the given size and return the throughput in messages per second."""
+    events = [make_event(f"entity_{sequence % entities}", sequence) for sequence in range(messages)]
+    async with broker_process(ack_delay) as broker:
+        sink = make_pool_sink(broker, pool_size=pool_size, distribution=distribution)
+        await connect_pool(sink)
+
+        started = time.perf_counter()
+        for event in events:
+            await sink.send_message(event)
+        while any(pooled.in_flight_count for pooled in sink.sinks):
+            await asyncio.sleep(0.001)
+        elapsed = time.perf_counter() - started
+
+        await sink.disconnect()
+    return messages / elapsed
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--messages", type=int, default=20000)
+    parser.add_argument("--entities", type=int, default=1024)
+    parser.add_argument("--pool-sizes", type=int, nargs="+", default=[1, 2, 4])
+    parser.add_argument("--ack-delay", type=float, default=0.0, help="Broker delay before each PUBACK in seconds")
+    parser.add_argument(
+        "--distribution", choices=[item.value for item in PoolDistribution], default=PoolDistribution.ENTITY_HASH.value
+    )
+    args = parser.parse_args()
+
+    logger.remove()
+    for pool_size in args.pool_sizes:
+        distribution = PoolDistribution(args.distribution)
+        throughput = asyncio.run(run(pool_size, args.messages, args.entities, distribution, args.ack_delay))
+        print(f"pool_size={pool_size:>2}  {throughput:>10.0f} msg/s")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,102 @@
+"""
+Copyright (C) 2022-2025 Stella Technologies (UK) Limited.
+
+Permission is hereby granted, free of charge, to any person obtaining a copy
+of this software and associated documentation files (the "Software"), to deal
+in the Software without restriction, including without limitation the rights
+to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+copies of the Software, and to permit persons to whom the Software is
+furnished to do so, subject to the following conditions:
+
+The above copyright notice and this permission notice shall be included in
+all copies or substantial portions of the Software.
+
+THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING
+FROM, OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS
+IN THE SOFTWARE.
+---
+
+Benchmark: partitioned queue workers
+====================================
+
+Measures how `StellaNowMessageQueue` throughput scales with the number of workers. The sink stands in for a local
+broker by holding every publish for a fixed round-trip time before acknowledging it, so a single worker is bound by
+that latency and additional workers overlap it.
+
+Run with: python -m tests.benchmarks.bench_parallel_consumers
+"""
+
+import argparse
+import asyncio
+import time
+
+from stellanow_sdk_python.message_queue.message_queue import StellaNowMessageQueue
+from stellanow_sdk_python.message_queue.message_queue_strategy.fifo_message_queue_strategy import (
+    FifoMessageQueueStrategy,
+)
+from stellanow_sdk_python.messages.event import StellaNowEventWrapper
+from stellanow_sdk_python.sinks.i_stellanow_sink import IStellaNowSink
+from tests.test_stellanow_message_queue import make_event
+
+
+class RoundTripSink(IStellaNowSink):
+    """Broker stand-in acknowledging every publish after a fixed round-trip time."""
+
+    def __init__(self, round_trip: float):
+        self.round_trip = round_trip
+        self.delivered = 0
+
+    async def connect(self) -> None:
+        pass
+
+    async def disconnect(self) -> None:
+        pass
+
+    async def send_message(self, message: StellaNowEventWrapper) -> None:
+        await asyncio.sleep(self.round_trip)
+        self.delivered += 1
+
+    def is_connected(self) -> bool:
+        return True
+
+
+async def run(workers: int, messages: int, entities: int, round_trip: float) -> float:
+    """Publish the messages with the given number of workers and return the throughput in messages per second."""
+    sink = RoundTripSink(round_trip)
+    queue = StellaNowMessageQueue(strategy=FifoMessageQueueStrategy(), sink=sink, workers=workers)
+    for sequence in range(messages):
+        queue.enqueue(make_event(f"entity_{sequence % entities}", sequence))
+
+    started = time.perf_counter()
+    queue.start_processing()
+    while sink.delivered < messages:
+        await asyncio.sleep(0.001)
+    elapsed = time.perf_counter() - started
+    await queue.stop_processing()
+    return messages / elapsed
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--messages", type=int, default=2000)
+    parser.add_argument("--entities", type=int, default=256)
+    parser.add_argument("--round-trip", type=float, default=0.002, help="Simulated broker round-trip in seconds")
+    parser.add_argument("--workers", type=int, nargs="+", default=[1, 2, 4, 8, 16])
+    args = parser.parse_args()
+
+    from loguru import logger
+
+    logger.remove()
+    baseline = None
+    for workers in args.workers:
+        throughput = asyncio.run(run(workers, args.messages, args.entities, args.round_trip))
+        baseline = baseline or throughput
+        print(f"workers={workers:>3}  {throughput:>10.0f} msg/s  speed-up x{throughput / baseline:.2f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,90 @@
+"""
+Copyright (C) 2022-2025 Stella Technologies (UK) Limited.
+
+Permission is hereby granted, free of charge, to any person obtaining a copy
+of this software and associated documentation files (the "Software"), to deal
+in the Software without restriction, including without limitation the rights
+to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+copies of the Software, and to permit persons to whom the Software is
+furnished to do so, subject to the following conditions:
+
+The above copyright notice and this permission notice shall be included in
+all copies or substantial portions of the Software.
+
+THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING
+FROM, OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS
+IN THE SOFTWARE.
+---
+
+Benchmark: queue strategy cost at a deep backlog
+================================================
+
+Fills each queue strategy with a backlog of events (1M by default), as after a long broker outage, and reports the
+cost per enqueue and per dequeue. The priority strategy is timed with events spread over four event type priorities,
+with and without aging. Its cost grows with the number of priorities rather than with the backlog, so it should stay
+within a small factor of the FIFO strategy at any queue depth.
+
+Run with: python -m tests.benchmarks.bench_queue_strategies
+"""
+
+import argparse
+import time
+from typing import Callable
+
+from stellanow_sdk_python.message_queue.message_queue_strategy.fifo_message_queue_strategy import (
+    FifoMessageQueueStrategy,
+)
+from stellanow_sdk_python.message_queue.message_queue_strategy.i_message_queue_strategy import IMessageQueueStrategy
+from stellanow_sdk_python.message_queue.message_queue_strategy.lifo_message_queue_strategy import (
+    LifoMessageQueueStrategy,
+)
+from stellanow_sdk_python.message_queue.message_queue_strategy.priority_message_queue_strategy import (
+    PriorityMessageQueueStrategy,
+)
+from stellanow_sdk_python.messages.event import StellaNowEventWrapper
+from tests.test_stellanow_queue_strategies import make_typed_event
+
+EVENT_TYPE_PRIORITIES = {"receipt": 3, "order": 2, "click": 1, "telemetry": 0}
+
+STRATEGIES: dict[str, Callable[[], IMessageQueueStrategy]] = {
+    "fifo": FifoMessageQueueStrategy,
+    "lifo": LifoMessageQueueStrategy,
+    "priority": lambda: PriorityMessageQueueStrategy(EVENT_TYPE_PRIORITIES),
+    "priority (no aging)": lambda: PriorityMessageQueueStrategy(EVENT_TYPE_PRIORITIES, aging_interval=None),
+}
+
+
+def time_strategy(
+    strategy: IMessageQueueStrategy, events: list[StellaNowEventWrapper], items: int
+) -> tuple[float, float]:
+    """Queue items events, then dequeue them all, returning the mean cost of each operation in µs."""
+    started = time.perf_counter()
+    for i in range(items):
+        strategy.enqueue(events[i % len(events)])
+    enqueued = time.perf_counter()
+    while strategy.try_dequeue() is not None:
+        pass
+    dequeued = time.perf_counter()
+    return (enqueued - started) / items * 1e6, (dequeued - enqueued) / items * 1e6
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--items", type=int, default=1_000_000, help="Events queued before dequeuing")
+    parser.add_argument("--distinct", type=int, default=1000, help="Distinct events created and queued repeatedly")
+    args = parser.parse_args()
+
+    event_types = list(EVENT_TYPE_PRIORITIES)
+    events = [make_typed_event(f"entity-{i}", event_types[i % len(event_types)], i) for i in range(args.distinct)]
+    print(f"{'strategy':<22}{'enqueue':>12}{'dequeue':>12}")
+    for name, create in STRATEGIES.items():
+        enqueue, dequeue = time_strategy(create(), events, args.items)
+        print(f"{name:<22}{enqueue:>9.2f} µs{dequeue:>9.2f} µs")
+
+
+if __name__ == "__main__":
+    main()
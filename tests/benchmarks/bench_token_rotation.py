@@ -0,0 +1,104 @@
+"""
+Copyright (C) 2022-2025 Stella Technologies (UK) Limited.
+
+Permission is hereby granted, free of charge, to any person obtaining a copy
+of this software and associated documentation files (the "Software"), to deal
+in the Software without restriction, including without limitation the rights
+to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+copies of the Software, and to permit persons to whom the Software is
+furnished to do so, subject to the following conditions:
+
+The above copyright notice and this permission notice shall be included in
+all copies or substantial portions of the Software.
+
+THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING
+FROM, OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS
+IN THE SOFTWARE.
+---
+
+Benchmark: token rotation publish gap
+=====================================
+
+Publishes at a steady rate to a local broker stand-in while the OIDC token is rotated every few hundred
+milliseconds, and reports how many sends were rejected and the longest gap between accepted publishes for each
+`TokenRotationMode`. With make-before-break rotation no send should be rejected and the longest gap should stay at
+the level of ordinary scheduling jitter, which a run with --refresh-interval longer than --duration shows.
+
+Run with: python -m tests.benchmarks.bench_token_rotation
+"""
+
+import argparse
+import asyncio
+import time
+
+from stellanow_sdk_python.config.eniviroment_config.stellanow_env_config import EnvConfig
+from stellanow_sdk_python.config.enums.token_rotation import TokenRotationMode
+from stellanow_sdk_python.sinks.mqtt.stellanow_mqtt_sink import StellaNowMqttSink
+from tests.mqtt_broker_stub import MqttBrokerStub
+from tests.test_stellanow_message_queue import make_event
+from tests.test_stellanow_mqtt_pool_sink import PROJECT_INFO
+from tests.test_stellanow_mqtt_token_rotation import RotatingTokenAuthStrategy
+
+
+async def run(mode: TokenRotationMode, duration: float, refresh_interval: float, send_interval: float) -> None:
+    """Publish at a steady rate while rotating the token and report rejected sends and the longest publish gap."""
+    async with MqttBrokerStub() as broker:
+        auth_strategy = RotatingTokenAuthStrategy()
+        env_config = EnvConfig.create_custom_env(api_base_url="http://localhost", mqtt_broker_url=broker.url)
+        sink = StellaNowMqttSink(
+            auth_strategy=auth_strategy, env_config=env_config, project_info=PROJECT_INFO, token_rotation=mode
+        )
+        await sink.connect()
+
+        async def rotate_tokens() -> None:
+            generation = 0
+            while True:
+                await asyncio.sleep(refresh_interval)
+                generation += 1
+                await auth_strategy.rotate(f"token-{generation}")
+
+        rotation = asyncio.create_task(rotate_tokens())
+        sent = rejected = 0
+        longest_gap = 0.0
+        started = last_sent = time.perf_counter()
+        while time.perf_counter() - started < duration:
+            try:
+                await sink.send_message(make_event("entity", sent))
+                now = time.perf_counter()
+                longest_gap = max(longest_gap, now - last_sent)
+                last_sent = now
+                sent += 1
+            except Exception:
+                rejected += 1
+            await asyncio.sleep(send_interval)
+        rotation.cancel()
+        await broker.wait_for_messages(sent)
+        await sink.disconnect()
+
+    rotations = int(duration / refresh_interval)
+    print(
+        f"{mode.value:>18}: {rotations} rotations, {sent} sent, {rejected} rejected, "
+        f"longest gap between publishes {longest_gap * 1000:.1f} ms"
+    )
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--duration", type=float, default=5.0, help="Seconds to publish for")
+    parser.add_argument("--refresh-interval", type=float, default=0.5, help="Seconds between token refreshes")
+    parser.add_argument("--send-interval", type=float, default=0.001, help="Seconds between publishes")
+    args = parser.parse_args()
+
+    from loguru import logger
+
+    logger.remove()
+    for mode in TokenRotationMode:
+        asyncio.run(run(mode, args.duration, args.refresh_interval, args.send_interval))
+
+
+if __name__ == "__main__":
+    main()
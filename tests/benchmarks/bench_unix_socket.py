@@ -0,0 +1,100 @@
+"""
+Copyright (C) 2022-2025 Stella Technologies (UK) Limited.
+
+Permission is hereby granted, free of charge, to any person obtaining a copy
+of this software and associated documentation files (the "Software"), to deal
+in the Software without restriction, including without limitation the rights
+to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+copies of the Software, and to permit persons to whom the Software is
+furnished to do so, subject to the following conditions:
+
+The above copyright notice and this permission notice shall be included in
+all copies or substantial portions of the Software.
+
+THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING
+FROM, OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS
+IN THE SOFTWARE.
+---
+
+Benchmark: Unix domain socket transport
+=======================================
+
+Compares the publish throughput of the MQTT sinks to a co-located broker over a Unix domain socket with localhost TCP.
+The broker stand-in runs in its own process so it does not compete with the SDK for the GIL. Every message is
+published with QoS 1; the run ends once every publish has been acknowledged.
+
+Run with: python -m tests.benchmarks.bench_unix_socket
+"""
+
+import argparse
+import asyncio
+import os
+import sys
+import tempfile
+import time
+from contextlib import asynccontextmanager
+from typing import AsyncIterator, Optional
+
+from loguru import logger
+
+from tests.mqtt_broker_stub import MqttBrokerStub
+from tests.test_stellanow_message_queue import make_event
+from tests.test_stellanow_mqtt_sink_contract import SINK_CLASSES, make_sink
+
+TRANSPORTS = ["tcp", "unix"]
+
+
+@asynccontextmanager
+async def broker_process(unix_path: Optional[str]) -> AsyncIterator[MqttBrokerStub]:
+    """Run the broker stand-in in a subprocess, yielding a handle that carries its URL."""
+    arguments = ["--unix-path", unix_path] if unix_path else []
+    process = await asyncio.create_subprocess_exec(
+        sys.executable, "-m", "tests.mqtt_broker_stub", *arguments, stdout=asyncio.subprocess.PIPE
+    )
+    assert process.stdout is not None
+    url = (await process.stdout.readline()).decode().strip()
+    try:
+        yield MqttBrokerStub(unix_path=unix_path) if unix_path else MqttBrokerStub(port=int(url.rsplit(":", 1)[1]))
+    finally:
+        process.terminate()
+        await process.wait()
+
+
+async def run(sink_class: type, transport: str, messages: int) -> float:
+    """Publish the messages over the given transport and return the throughput in messages per second."""
+    events = [make_event(f"entity_{sequence % 1024}", sequence) for sequence in range(messages)]
+    with tempfile.TemporaryDirectory() as directory:
+        unix_path = os.path.join(directory, "mqtt.sock") if transport == "unix" else None
+        async with broker_process(unix_path) as broker:
+            sink = make_sink(sink_class, broker)
+            await sink.connect()
+
+            started = time.perf_counter()
+            for event in events:
+                await sink.send_message(event)
+            while sink.in_flight_count:
+                await asyncio.sleep(0.001)
+            elapsed = time.perf_counter() - started
+
+            await sink.disconnect()
+    return messages / elapsed
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--messages", type=int, default=20000)
+    args = parser.parse_args()
+
+    logger.remove()
+    for sink_class in SINK_CLASSES:
+        for transport in TRANSPORTS:
+            throughput = asyncio.run(run(sink_class, transport, args.messages))
+            print(f"{sink_class.__name__:<26} {transport:<5} {throughput:>10.0f} msg/s")
+
+
+if __name__ == "__main__":
+    main()
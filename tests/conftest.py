@@ -31,9 +31,15 @@ async def cleanup_sdk():
     yield
     # Stop any running SDK or message queue tasks
     for task in asyncio.all_tasks():
-        if task.get_coro().__qualname__.startswith("StellaNowMessageQueue._process_queue"):
+        if task.get_coro().__qualname__.startswith(
+            (
+                "StellaNowMessageQueue._process_queue",
+                "StellaNowMessageQueue._dispatch_queue",
+                "StellaNowMessageQueue._process_partition",
+            )
+        ):
             task.cancel()
             try:
                 await task
             except asyncio.CancelledError:
-                pass
\ No newline at end of file
+                pass
@@ -0,0 +1,362 @@
+"""
+Copyright (C) 2022-2025 Stella Technologies (UK) Limited.
+
+Permission is hereby granted, free of charge, to any person obtaining a copy
+of this software and associated documentation files (the "Software"), to deal
+in the Software without restriction, including without limitation the rights
+to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+copies of the Software, and to permit persons to whom the Software is
+furnished to do so, subject to the following conditions:
+
+The above copyright notice and this permission notice shall be included in
+all copies or substantial portions of the Software.
+
+THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING
+FROM, OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS
+IN THE SOFTWARE.
+---
+
+Local MQTT v5 broker stand-in
+=============================
+
+A minimal in-process broker used by the tests and benchmarks. It implements the subset of MQTT v5 the SDK relies on:
+CONNECT/CONNACK, QoS 0/1 PUBLISH with PUBACK, PINGREQ/PINGRESP and DISCONNECT, including session takeover for
+duplicate client IDs, over plain TCP, WebSockets or a Unix domain socket. Received publishes are recorded for inspection.
+"""
+
+import asyncio
+import base64
+import hashlib
+import ssl
+from dataclasses import dataclass
+from typing import Any, Optional
+
+from stellanow_sdk_python.sinks.mqtt.utils.mqtt_packets import PROPERTY_SESSION_EXPIRY_INTERVAL, decode_properties
+from stellanow_sdk_python.sinks.mqtt.utils.mqtt_streams import (
+    WEBSOCKET_GUID,
+    apply_websocket_mask,
+    encode_websocket_frame,
+)
+
+CONNECT = 1
+CONNACK = 2
+PUBLISH = 3
+PUBACK = 4
+PINGREQ = 12
+PINGRESP = 13
+DISCONNECT = 14
+
+
+@dataclass
+class ReceivedPublish:
+    client_id: str
+    topic: str
+    payload: bytes
+    qos: int
+    dup: bool
+
+
+@dataclass
+class ConnectRequest:
+    client_id: str
+    clean_start: bool
+    username: Optional[str]
+    password: Optional[bytes]
+    session_expiry_interval: int = 0
+
+
+def encode_varint(value: int) -> bytes:
+    """Encode an MQTT variable byte integer."""
+    encoded = bytearray()
+    while True:
+        byte, value = value % 128, value // 128
+        encoded.append(byte | (0x80 if value else 0))
+        if not value:
+            return bytes(encoded)
+
+
+def decode_varint(data: bytes, offset: int) -> tuple[int, int]:
+    """Decode an MQTT variable byte integer, returning the value and the new offset."""
+    value, multiplier = 0, 1
+    while True:
+        byte = data[offset]
+        offset += 1
+        value += (byte & 0x7F) * multiplier
+        if not byte & 0x80:
+            return value, offset
+        multiplier *= 128
+
+
+def read_string(data: bytes, offset: int) -> tuple[bytes, int]:
+    """Read a two-byte length prefixed field."""
+    length = int.from_bytes(data[offset : offset + 2], "big")
+    return data[offset + 2 : offset + 2 + length], offset + 2 + length
+
+
+class MqttBrokerStub:
+    """In-process MQTT v5 broker stand-in listening on localhost."""
+
+    def __init__(
+        self,
+        port: int = 0,
+        ack_delay: float = 0.0,
+        accept_connections: bool = True,
+        websocket: bool = False,
+        handshake_delay: float = 0.0,
+        ssl_context: Optional[ssl.SSLContext] = None,
+        unix_path: Optional[str] = None,
+    ):
+        """
+        :param handshake_delay: Seconds the WebSocket upgrade response is held back, standing in for the handshake
+            round trips to a remote broker. Only applies with websocket set.
+        :param ssl_context: Server context to accept TLS connections with, making the URL mqtts:// or wss://.
+        :param unix_path: Listen on a Unix domain socket at this path instead of a TCP port, making the URL unix://.
+        """
+        self.port = port
+        self.ack_delay = ack_delay
+        self.puback_reason_code = 0  # Reason code of 0x80 or above rejects every publish
+        self.handshake_delay = handshake_delay
+        self.ssl_context = ssl_context
+        self.unix_path = unix_path
+        self.tls_sessions_reused: list[bool] = []  # Whether each TLS connection resumed an earlier session
+        self.accept_connections = accept_connections
+        self.websocket = websocket
+        self.received: list[ReceivedPublish] = []
+        self.connects: list[ConnectRequest] = []
+        self._server: Optional[asyncio.Server] = None
+        self._clients: dict[str, Any] = {}
+        self._sessions: set[str] = set()
+        self._received_event = asyncio.Event()
+
+    @property
+    def url(self) -> str:
+        if self.unix_path:
+            return f"unix://{self.unix_path}"
+        scheme = "ws" if self.websocket else "mqtt"
+        return f"{scheme}{'s' if self.ssl_context else ''}://localhost:{self.port}"
+
+    @property
+    def connected_client_ids(self) -> list[str]:
+        return list(self._clients)
+
+    async def start(self) -> "MqttBrokerStub":
+        if self.unix_path:
+            self._server = await asyncio.start_unix_server(self._handle_connection, self.unix_path)
+            return self
+        self._server = await asyncio.start_server(self._handle_connection, "localhost", self.port, ssl=self.ssl_context)
+        self.port = self._server.sockets[0].getsockname()[1]
+        return self
+
+    async def stop(self) -> None:
+        """Stop listening and drop every client connection."""
+        if self._server is not None:
+            self._server.close()
+            self.drop_connections()
+            await self._server.wait_closed()
+            self._server = None
+
+    def drop_connections(self) -> None:
+        """Abruptly close all client connections, as a broker restart or network blip would."""
+        for client_id in list(self._clients):
+            self.drop_client(client_id)
+
+    def drop_client(self, client_id: str) -> None:
+        """Abruptly close the connection of a single client."""
+        writer = self._clients.pop(client_id, None)
+        if writer is not None:
+            writer.transport.abort()
+
+    async def wait_for_messages(self, count: int, timeout: float = 10.0) -> list[ReceivedPublish]:
+        """Wait until at least `count` publishes were received."""
+        async with asyncio.timeout(timeout):
+            while len(self.received) < count:
+                self._received_event.clear()
+                await self._received_event.wait()
+        return self.received
+
+    async def wait_for_clients(self, count: int, timeout: float = 10.0) -> None:
+        """Wait until at least `count` clients are connected."""
+        async with asyncio.timeout(timeout):
+            while len(self._clients) < count:
+                await asyncio.sleep(0.01)
+
+    async def __aenter__(self) -> "MqttBrokerStub":
+        return await self.start()
+
+    async def __aexit__(self, *exc_info: object) -> None:
+        await self.stop()
+
+    async def _handle_connection(self, reader: asyncio.StreamReader, writer: Any) -> None:
+        client_id: Optional[str] = None
+        ssl_object = writer.get_extra_info("ssl_object")
+        if ssl_object is not None:
+            self.tls_sessions_reused.append(ssl_object.session_reused)
+        try:
+            if self.websocket:
+                reader, writer = await _accept_websocket(reader, writer, self.handshake_delay)
+            while True:
+                packet_type, flags, body = await self._read_packet(reader)
+                if packet_type == CONNECT:
+                    request = self._parse_connect(body)
+                    if not self.accept_connections:
+                        writer.write(bytes([CONNACK << 4, 3, 0, 0x87, 0]))  # Not authorized
+                        await writer.drain()
+                        return
+                    client_id = request.client_id
+                    self.connects.append(request)
+                    previous = self._clients.pop(client_id, None)
+                    if previous is not None:
+                        previous.transport.abort()  # Session takeover
+                    session_present = not request.clean_start and client_id in self._sessions
+                    self._sessions.add(client_id)
+                    self._clients[client_id] = writer
+                    writer.write(bytes([CONNACK << 4, 3, int(session_present), 0, 0]))
+                elif packet_type == PUBLISH:
+                    await self._handle_publish(client_id or "", flags, body, writer)
+                elif packet_type == PINGREQ:
+                    writer.write(bytes([PINGRESP << 4, 0]))
+                elif packet_type == DISCONNECT:
+                    return
+                await writer.drain()
+        except (asyncio.IncompleteReadError, ConnectionError):
+            pass
+        finally:
+            if client_id is not None and self._clients.get(client_id) is writer:
+                del self._clients[client_id]
+            writer.close()
+
+    async def _handle_publish(self, client_id: str, flags: int, body: bytes, writer: Any) -> None:
+        qos = (flags >> 1) & 0x03
+        topic, offset = read_string(body, 0)
+        packet_id = None
+        if qos:
+            packet_id = body[offset : offset + 2]
+            offset += 2
+        properties_length, offset = decode_varint(body, offset)
+        payload = body[offset + properties_length :]
+        self.received.append(ReceivedPublish(client_id, topic.decode(), payload, qos, bool(flags & 0x08)))
+        self._received_event.set()
+        if packet_id is not None:
+            if self.ack_delay:
+                await asyncio.sleep(self.ack_delay)
+            if self.puback_reason_code:
+                writer.write(bytes([PUBACK << 4, 3]) + packet_id + bytes([self.puback_reason_code]))
+            else:
+                writer.write(bytes([PUBACK << 4, 2]) + packet_id)
+
+    @staticmethod
+    async def _read_packet(reader: asyncio.StreamReader) -> tuple[int, int, bytes]:
+        header = await reader.readexactly(1)
+        remaining, multiplier = 0, 1
+        while True:
+            byte = (await reader.readexactly(1))[0]
+            remaining += (byte & 0x7F) * multiplier
+            if not byte & 0x80:
+                break
+            multiplier *= 128
+        body = await reader.readexactly(remaining)
+        return header[0] >> 4, header[0] & 0x0F, body
+
+    @staticmethod
+    def _parse_connect(body: bytes) -> ConnectRequest:
+        _, offset = read_string(body, 0)  # Protocol name
+        offset += 1  # Protocol level
+        flags = body[offset]
+        offset += 3  # Flags and keep alive
+        properties, offset = decode_properties(body, offset)
+        client_id, offset = read_string(body, offset)
+        if flags & 0x04:  # Will flag
+            will_properties_length, offset = decode_varint(body, offset)
+            offset += will_properties_length
+            _, offset = read_string(body, offset)
+            _, offset = read_string(body, offset)
+        username = password = None
+        if flags & 0x80:
+            raw_username, offset = read_string(body, offset)
+            username = raw_username.decode()
+        if flags & 0x40:
+            password, offset = read_string(body, offset)
+        session_expiry_interval = properties.get(PROPERTY_SESSION_EXPIRY_INTERVAL, 0)
+        assert isinstance(session_expiry_interval, int)
+        return ConnectRequest(client_id.decode(), bool(flags & 0x02), username, password, session_expiry_interval)
+
+
+class _WebSocketWriter:
+    """Writes data as unmasked binary WebSocket frames, mirroring the parts of StreamWriter the broker uses."""
+
+    def __init__(self, writer: asyncio.StreamWriter):
+        self.writer = writer
+        self.transport = writer.transport
+
+    def write(self, data: bytes) -> None:
+        self.writer.write(encode_websocket_frame(data, opcode=0x2, mask=False))
+
+    async def drain(self) -> None:
+        await self.writer.drain()
+
+    def close(self) -> None:
+        self.writer.close()
+
+
+async def _accept_websocket(
+    reader: asyncio.StreamReader, writer: asyncio.StreamWriter, handshake_delay: float = 0.0
+) -> tuple[asyncio.StreamReader, _WebSocketWriter]:
+    """Complete the WebSocket upgrade and return a reader/writer pair carrying the unframed MQTT bytes."""
+    request = (await reader.readuntil(b"\r\n\r\n")).decode("latin-1")
+    if handshake_delay:
+        await asyncio.sleep(handshake_delay)
+    headers = {
+        name.strip().lower(): value.strip()
+        for name, _, value in (line.partition(":") for line in request.split("\r\n")[1:])
+    }
+    accept = base64.b64encode(hashlib.sha1(headers["sec-websocket-key"].encode() + WEBSOCKET_GUID).digest())
+    writer.write(
+        b"HTTP/1.1 101 Switching Protocols\r\nUpgrade: websocket\r\nConnection: Upgrade\r\n"
+        b"Sec-WebSocket-Protocol: mqtt\r\nSec-WebSocket-Accept: " + accept + b"\r\n\r\n"
+    )
+    await writer.drain()
+
+    unframed = asyncio.StreamReader()
+
+    async def pump() -> None:
+        try:
+            while True:
+                first, second = await reader.readexactly(2)
+                length = second & 0x7F
+                if length == 126:
+                    length = int.from_bytes(await reader.readexactly(2), "big")
+                elif length == 127:
+                    length = int.from_bytes(await reader.readexactly(8), "big")
+                mask = await reader.readexactly(4) if second & 0x80 else b""
+                payload = await reader.readexactly(length)
+                if first & 0x0F == 0x8:
+                    break
+                unframed.feed_data(apply_websocket_mask(payload, mask) if mask else payload)
+        except (asyncio.IncompleteReadError, ConnectionError):
+            pass
+        unframed.feed_eof()
+
+    unframed._pump_task = asyncio.create_task(pump())  # type: ignore[attr-defined]  # Keep a reference
+    return unframed, _WebSocketWriter(writer)
+
+
+async def serve(port: int, ack_delay: float, unix_path: Optional[str] = None) -> None:
+    """Run a broker stand-in until cancelled, printing its URL once it is listening."""
+    async with MqttBrokerStub(port=port, ack_delay=ack_delay, unix_path=unix_path) as broker:
+        print(broker.url, flush=True)
+        await asyncio.Event().wait()
+
+
+if __name__ == "__main__":
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Run the local MQTT broker stand-in.")
+    parser.add_argument("--port", type=int, default=0)
+    parser.add_argument("--ack-delay", type=float, default=0.0)
+    parser.add_argument("--unix-path", help="Listen on a Unix domain socket at this path instead of a TCP port")
+    arguments = parser.parse_args()
+    asyncio.run(serve(arguments.port, arguments.ack_delay, arguments.unix_path))
@@ -0,0 +1,123 @@
+"""
+Copyright (C) 2022-2025 Stella Technologies (UK) Limited.
+
+Permission is hereby granted, free of charge, to any person obtaining a copy
+of this software and associated documentation files (the "Software"), to deal
+in the Software without restriction, including without limitation the rights
+to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+copies of the Software, and to permit persons to whom the Software is
+furnished to do so, subject to the following conditions:
+
+The above copyright notice and this permission notice shall be included in
+all copies or substantial portions of the Software.
+
+THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING
+FROM, OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS
+IN THE SOFTWARE.
+"""
+
+import asyncio
+
+import pytest
+
+from stellanow_sdk_python.agent.agent_protocol import encode_event_frame, read_event_frame
+from stellanow_sdk_python.agent.stellanow_agent import StellaNowAgent
+from stellanow_sdk_python.message_queue.message_queue_strategy.fifo_message_queue_strategy import (
+    FifoMessageQueueStrategy,
+)
+from stellanow_sdk_python.sdk import StellaNowSDK
+from stellanow_sdk_python.sinks.agent.stellanow_agent_sink import StellaNowAgentSink
+from stellanow_sdk_python.utils.backoff import ExponentialBackoff
+from tests.test_stellanow_message_queue import RecordingSink, make_event, wait_for_delivery
+from tests.test_stellanow_mqtt_pool_sink import PROJECT_INFO
+from tests.test_stellanow_mqtt_sink_contract import wait_until
+
+
+def make_agent(socket_path: str) -> tuple[StellaNowAgent, RecordingSink]:
+    """Create an agent whose SDK publishes to a recording sink."""
+    sink = RecordingSink()
+    sdk = StellaNowSDK(project_info=PROJECT_INFO, sink=sink, queue_strategy=FifoMessageQueueStrategy())
+    return StellaNowAgent(sdk, socket_path), sink
+
+
+def make_client(socket_path: str) -> StellaNowAgentSink:
+    """Create an agent client that retries quickly."""
+    return StellaNowAgentSink(socket_path, reconnect_backoff=ExponentialBackoff(initial_delay=0.01, max_delay=0.05))
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("priority", [None, -3, 20])
+async def test_event_frame_round_trip(priority):
+    """Test that a framed event keeps its routing fields and priority and serializes to exactly the original JSON."""
+    event = make_event("entity", 0)
+    event.priority = priority
+    reader = asyncio.StreamReader()
+    reader.feed_data(encode_event_frame(event))
+
+    forwarded = await read_event_frame(reader)
+
+    assert forwarded.key.entity_id == "entity"
+    assert forwarded.message_id == event.message_id
+    assert forwarded.priority == priority
+    assert forwarded.model_dump_json(by_alias=True) == event.model_dump_json(by_alias=True)
+
+
+@pytest.mark.asyncio
+async def test_read_event_frame_rejects_oversized_frames(monkeypatch):
+    """Test that a frame announcing an event larger than the limit is rejected before it is read."""
+    frame = encode_event_frame(make_event("entity", 0))
+    monkeypatch.setattr("stellanow_sdk_python.agent.agent_protocol.MAX_EVENT_SIZE", 10)
+    reader = asyncio.StreamReader()
+    reader.feed_data(frame)
+
+    with pytest.raises(ValueError, match="exceeds"):
+        await read_event_frame(reader)
+
+
+@pytest.mark.asyncio
+async def test_agent_publishes_events_from_several_clients(tmp_path):
+    """Test that events sent by several clients are all published by the agent as serialized by the clients."""
+    socket_path = str(tmp_path / "agent.sock")
+    agent, sink = make_agent(socket_path)
+    await agent.start()
+    clients = [make_client(socket_path) for _ in range(3)]
+    for client in clients:
+        await client.connect()
+
+    events = [make_event(f"entity-{index}", sequence) for index in range(3) for sequence in range(5)]
+    for index, event in enumerate(events):
+        await clients[index % len(clients)].send_message(event)
+    await wait_for_delivery(sink, len(events))
+
+    expected = sorted(event.model_dump_json(by_alias=True) for event in events)
+    assert sorted(message.model_dump_json(by_alias=True) for message in sink.delivered) == expected
+    for client in clients:
+        await client.disconnect()
+    await agent.stop()
+
+
+@pytest.mark.asyncio
+async def test_client_reconnects_after_agent_restart(tmp_path):
+    """Test that a client notices the agent going away and reconnects once it is back."""
+    socket_path = str(tmp_path / "agent.sock")
+    agent, _ = make_agent(socket_path)
+    await agent.start()
+    client = make_client(socket_path)
+    await client.connect()
+
+    await agent.stop()
+    await wait_until(lambda: not client.is_connected())
+    with pytest.raises(Exception, match="disconnected"):
+        await client.send_message(make_event("entity", 0))
+
+    agent, sink = make_agent(socket_path)
+    await agent.start()
+    await wait_until(client.is_connected)
+    await client.send_message(make_event("entity", 1))
+    await wait_for_delivery(sink, 1)
+    await client.disconnect()
+    await agent.stop()
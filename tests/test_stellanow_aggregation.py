@@ -0,0 +1,173 @@
+"""
+Copyright (C) 2022-2025 Stella Technologies (UK) Limited.
+
+Permission is hereby granted, free of charge, to any person obtaining a copy
+of this software and associated documentation files (the "Software"), to deal
+in the Software without restriction, including without limitation the rights
+to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+copies of the Software, and to permit persons to whom the Software is
+furnished to do so, subject to the following conditions:
+
+The above copyright notice and this permission notice shall be included in
+all copies or substantial portions of the Software.
+
+THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING
+FROM, OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS
+IN THE SOFTWARE.
+"""
+
+import json
+import random
+from typing import Optional
+
+import pytest
+
+from stellanow_sdk_python.message_queue.message_queue_strategy.fifo_message_queue_strategy import (
+    FifoMessageQueueStrategy,
+)
+from stellanow_sdk_python.message_queue.message_stage import aggregating_message_stage
+from stellanow_sdk_python.message_queue.message_stage.aggregating_message_stage import (
+    AggregatingMessageStage,
+    Aggregation,
+)
+from stellanow_sdk_python.messages.event import StellaNowEventWrapper
+from stellanow_sdk_python.messages.message import Entity, StellaNowMessageWrapper
+from stellanow_sdk_python.sdk import StellaNowSDK
+from stellanow_sdk_python.utils.quantile_sketch import QuantileSketch
+from tests.test_stellanow_load_shedding import make_queue
+from tests.test_stellanow_message_queue import ORGANIZATION_ID, PROJECT_ID, RecordingSink, wait_for_delivery
+from tests.test_stellanow_mqtt_pool_sink import PROJECT_INFO
+
+AGGREGATIONS = {"sensor_reading": Aggregation(event_name="sensor_reading_summary", fields=["temperature"])}
+
+
+def make_reading(
+    entity_id: str, temperature: float, event_type: str = "sensor_reading", message_json: Optional[str] = None
+) -> StellaNowEventWrapper:
+    """Create a reading of the given entity with a JSON payload."""
+    wrapper = StellaNowMessageWrapper.create_raw(
+        event_type_definition_id=event_type,
+        entity_types=[Entity(entity_type_definition_id="sensor", entity_id=entity_id)],
+        message_json=message_json or json.dumps({"temperature": temperature, "unit": "C"}),
+    )
+    return StellaNowEventWrapper.create(message=wrapper, organization_id=ORGANIZATION_ID, project_id=PROJECT_ID)
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    """Wall clock of the aggregating stage, starting at the beginning of a minute."""
+    now = [1_800_000_000.0]
+    monkeypatch.setattr(aggregating_message_stage.time, "time", lambda: now[0])
+    return now
+
+
+def test_aggregating_stage_emits_one_summary_per_entity_and_window(clock):
+    """Test that readings within a window are replaced by a summary per entity once the window closes."""
+    queue = make_queue()
+    stage = AggregatingMessageStage(AGGREGATIONS, window=60.0)
+    stage.attach(queue, PROJECT_INFO)
+    for temperature in range(1, 101):
+        stage.process(make_reading("a", temperature), queue.enqueue)
+    stage.process(make_reading("b", -5.5), queue.enqueue)
+    clock[0] += 59.0
+    stage.poll(queue.enqueue)
+    assert queue.get_message_count() == 0
+
+    clock[0] += 1.0
+    stage.poll(queue.enqueue)
+
+    summaries = {message.key.entity_id: message for message in iter(queue.strategy.try_dequeue, None)}
+    assert summaries["a"].event_type_definition_id == "sensor_reading_summary"
+    assert summaries["a"].entities == [Entity(entity_type_definition_id="sensor", entity_id="a")]
+    payload = json.loads(summaries["a"].payload)
+    assert payload["source_event_type"] == "sensor_reading"
+    assert payload["count"] == 100
+    assert payload["fields"]["temperature"] == {
+        "count": 100,
+        "sum": 5050.0,
+        "min": 1.0,
+        "max": 100.0,
+        "quantiles": None,
+    }
+    assert payload["window_end"] == "2027-01-15T08:01:00.000000Z"
+    assert json.loads(summaries["b"].payload)["fields"]["temperature"]["min"] == -5.5
+    assert (stage.aggregated_count, stage.emitted_count) == (101, 2)
+
+
+def test_aggregating_stage_estimates_quantiles(clock):
+    """Test that configured quantiles are estimated for each field."""
+    queue = make_queue()
+    aggregation = Aggregation(event_name="sensor_reading_summary", quantiles=[0.5, 0.99])
+    stage = AggregatingMessageStage({"sensor_reading": aggregation}, window=10.0)
+    stage.attach(queue, PROJECT_INFO)
+    for temperature in range(1, 1001):
+        stage.process(make_reading("a", temperature), queue.enqueue)
+
+    stage.flush(queue.enqueue)
+
+    quantiles = json.loads(queue.strategy.try_dequeue().payload)["fields"]["temperature"]["quantiles"]
+    assert quantiles["p50"] == pytest.approx(500, rel=0.02)
+    assert quantiles["p99"] == pytest.approx(990, rel=0.02)
+
+
+def test_aggregating_stage_passes_other_messages_on(clock):
+    """Test that other event types, payloads without JSON objects and groups beyond the limit are not aggregated."""
+    queue = make_queue()
+    stage = AggregatingMessageStage(AGGREGATIONS, max_groups=1)
+    stage.attach(queue, PROJECT_INFO)
+    stage.process(make_reading("a", 20.0, event_type="door_opened"), queue.enqueue)
+    stage.process(make_reading("a", 20.0), queue.enqueue)
+    stage.process(make_reading("b", 21.0), queue.enqueue)
+
+    assert [message.key.entity_id for message in iter(queue.strategy.try_dequeue, None)] == ["a", "b"]
+    assert stage.overflow_count == 1
+
+
+def test_aggregating_stage_skips_numbers_beyond_float_range(clock):
+    """Test that numbers a float cannot hold are left out of the summary rather than failing the message."""
+    queue = make_queue()
+    stage = AggregatingMessageStage(AGGREGATIONS)
+    stage.attach(queue, PROJECT_INFO)
+    stage.process(make_reading("a", 0, message_json='{"temperature": 1' + "0" * 400 + "}"), queue.enqueue)
+    stage.process(make_reading("a", 0, message_json='{"temperature": 1e400}'), queue.enqueue)
+    stage.process(make_reading("a", 20.0), queue.enqueue)
+
+    stage.flush(queue.enqueue)
+
+    payload = json.loads(queue.strategy.try_dequeue().payload)
+    assert payload["count"] == 3
+    assert payload["fields"]["temperature"] == {"count": 1, "sum": 20.0, "min": 20.0, "max": 20.0, "quantiles": None}
+
+
+def test_quantile_sketch_stays_within_relative_accuracy():
+    """Test that estimated quantiles are within the relative accuracy of the true ones, negatives included."""
+    random.seed(3)
+    values = [random.lognormvariate(0, 2) for _ in range(10_000)] + [-random.random() - 1 for _ in range(1000)]
+    sketch = QuantileSketch(relative_accuracy=0.01)
+    for value in values:
+        sketch.add(value)
+
+    values.sort()
+    for q in (0, 0.05, 0.5, 0.9, 0.99, 1):
+        assert sketch.quantile(q) == pytest.approx(values[int(q * (len(values) - 1))], rel=0.01)
+
+
+@pytest.mark.asyncio
+async def test_sdk_flushes_open_window_on_stop(clock):
+    """Test that stopping the SDK sends the summary of the window still open."""
+    sink = RecordingSink()
+    stage = AggregatingMessageStage(AGGREGATIONS, window=3600.0)
+    sdk = StellaNowSDK(project_info=PROJECT_INFO, sink=sink, queue_strategy=FifoMessageQueueStrategy(), stages=[stage])
+    await sdk.start()
+    for temperature in range(50):
+        await sdk.send_message(make_reading("a", temperature))
+
+    await sdk.stop()
+
+    await wait_for_delivery(sink, 1)
+    assert len(sink.delivered) == 1
+    assert json.loads(sink.delivered[0].payload)["count"] == 50
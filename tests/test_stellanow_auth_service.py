@@ -0,0 +1,124 @@
+"""
+Copyright (C) 2022-2025 Stella Technologies (UK) Limited.
+
+Permission is hereby granted, free of charge, to any person obtaining a copy
+of this software and associated documentation files (the "Software"), to deal
+in the Software without restriction, including without limitation the rights
+to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+copies of the Software, and to permit persons to whom the Software is
+furnished to do so, subject to the following conditions:
+
+The above copyright notice and this permission notice shall be included in
+all copies or substantial portions of the Software.
+
+THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING
+FROM, OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS
+IN THE SOFTWARE.
+"""
+
+import asyncio
+import base64
+import json
+import time
+from datetime import datetime
+from unittest.mock import AsyncMock
+
+import pytest
+
+from stellanow_sdk_python.authentication.auth_service import StellaNowAuthenticationService
+from stellanow_sdk_python.authentication.jwt_claims import decode_jwt_claims
+from stellanow_sdk_python.config.eniviroment_config.stellanow_env_config import EnvConfig
+from stellanow_sdk_python.config.stellanow_auth_credentials import StellaNowCredentials
+from tests.test_stellanow_mqtt_pool_sink import PROJECT_INFO
+
+
+def make_jwt(**claims) -> str:
+    payload = base64.urlsafe_b64encode(json.dumps(claims).encode()).rstrip(b"=").decode()
+    return f"eyJhbGciOiJSUzI1NiJ9.{payload}.signature"
+
+
+def make_token_response(issued_at: float, lifetime: float = 300) -> dict:
+    access_token = make_jwt(iat=int(issued_at), exp=int(issued_at + lifetime))
+    return {"access_token": access_token, "expires_in": lifetime, "refresh_token": "refresh"}
+
+
+@pytest.fixture
+async def auth_service():
+    """Fixture providing an authentication service whose Keycloak calls are mocked."""
+    service = StellaNowAuthenticationService(
+        project_info=PROJECT_INFO,
+        credentials=StellaNowCredentials(username="user", password="secret"),
+        env_config=EnvConfig.create_custom_env(api_base_url="http://localhost", mqtt_broker_url="mqtt://localhost"),
+    )
+    yield service
+    await service.stop_refresh_task()
+
+
+def test_decode_jwt_claims():
+    assert decode_jwt_claims(make_jwt(iat=1, exp=2, sub="user")) == {"iat": 1, "exp": 2, "sub": "user"}
+    assert decode_jwt_claims("opaque-token") == {}
+    assert decode_jwt_claims("a.!!!.c") == {}
+
+
+def test_expiry_is_corrected_for_clock_skew(auth_service):
+    now = time.time()
+    auth_service._accept_token_response(make_token_response(issued_at=now + 120))  # Authority clock 2 minutes ahead
+
+    assert auth_service.clock_skew == pytest.approx(120, abs=2)
+    assert auth_service.token_expires_at == pytest.approx(now + 300, abs=2)
+    assert not auth_service._is_token_expired()
+
+
+def test_cached_token_keeps_skew_estimate(auth_service):
+    now = time.time()
+    auth_service._accept_token_response(make_token_response(issued_at=now + 120))
+    auth_service._accept_token_response(make_token_response(issued_at=now - 3600), fresh=False)
+
+    assert auth_service.clock_skew == pytest.approx(120, abs=2)
+    assert auth_service.token_expires_at == pytest.approx(now + 300, abs=2)
+
+
+def test_refresh_is_scheduled_at_randomized_fraction_of_lifetime(auth_service):
+    refresh_offsets = set()
+    for _ in range(50):
+        now = time.time()
+        auth_service._accept_token_response(make_token_response(issued_at=now))
+        offset = auth_service.refresh_at.timestamp() - now
+        assert 0.7 * 300 - 2 <= offset <= 0.85 * 300 + 1
+        refresh_offsets.add(round(offset))
+
+    assert len(refresh_offsets) > 10
+
+
+async def test_concurrent_callers_share_one_token_request(auth_service):
+    async def slow_token(**_):
+        await asyncio.sleep(0.05)
+        return make_token_response(issued_at=time.time())
+
+    auth_service.keycloak_openid.a_token = AsyncMock(side_effect=slow_token)
+
+    tokens = await asyncio.gather(*(auth_service.get_access_token() for _ in range(20)))
+
+    assert len(set(tokens)) == 1
+    auth_service.keycloak_openid.a_token.assert_awaited_once()
+    assert auth_service._token_request is None
+    assert auth_service.refresh_at is not None and auth_service.refresh_at > datetime.now()
+
+
+async def test_cancelled_caller_does_not_cancel_shared_request(auth_service):
+    async def slow_token(**_):
+        await asyncio.sleep(0.05)
+        return make_token_response(issued_at=time.time())
+
+    auth_service.keycloak_openid.a_token = AsyncMock(side_effect=slow_token)
+    cancelled = asyncio.create_task(auth_service.get_access_token())
+    waiting = asyncio.create_task(auth_service.get_access_token())
+    await asyncio.sleep(0.01)
+    cancelled.cancel()
+
+    assert await waiting == auth_service.token_response["access_token"]
+    auth_service.keycloak_openid.a_token.assert_awaited_once()
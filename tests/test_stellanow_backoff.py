@@ -0,0 +1,61 @@
+"""
+Copyright (C) 2022-2025 Stella Technologies (UK) Limited.
+
+Permission is hereby granted, free of charge, to any person obtaining a copy
+of this software and associated documentation files (the "Software"), to deal
+in the Software without restriction, including without limitation the rights
+to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+copies of the Software, and to permit persons to whom the Software is
+furnished to do so, subject to the following conditions:
+
+The above copyright notice and this permission notice shall be included in
+all copies or substantial portions of the Software.
+
+THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING
+FROM, OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS
+IN THE SOFTWARE.
+"""
+
+import pytest
+
+from stellanow_sdk_python.utils.backoff import ExponentialBackoff
+
+
+def test_backoff_delays_stay_within_growing_bounds():
+    """Test that each delay lies between zero and the exponentially growing, capped bound."""
+    backoff = ExponentialBackoff(initial_delay=0.025, max_delay=1.0)
+    for bound in [0.025, 0.05, 0.1, 0.2, 0.4, 0.8, 1.0, 1.0]:
+        assert 0 <= backoff.next_delay() <= bound
+
+
+def test_backoff_delays_are_jittered():
+    """Test that delays for the same attempt are spread out rather than identical."""
+    delays = {ExponentialBackoff(initial_delay=1.0).next_delay() for _ in range(20)}
+    assert len(delays) > 1
+
+
+def test_backoff_reset_starts_over():
+    """Test that resetting returns to the initial bound."""
+    backoff = ExponentialBackoff(initial_delay=0.025, max_delay=30.0)
+    for _ in range(10):
+        backoff.next_delay()
+    backoff.reset()
+    assert backoff.next_delay() <= 0.025
+
+
+def test_backoff_rejects_invalid_bounds():
+    """Test that a maximum below the initial delay is rejected."""
+    with pytest.raises(ValueError):
+        ExponentialBackoff(initial_delay=1.0, max_delay=0.5)
+
+
+def test_backoff_survives_unbounded_attempts():
+    """Test that long outages and high attempt counts keep yielding capped delays instead of overflowing."""
+    backoff = ExponentialBackoff(initial_delay=0.025, max_delay=30.0)
+    for _ in range(5000):
+        assert 0 <= backoff.next_delay() <= 30.0
+    assert 0 <= backoff.delay(10**6) <= 30.0
@@ -0,0 +1,176 @@
+"""
+Copyright (C) 2022-2025 Stella Technologies (UK) Limited.
+
+Permission is hereby granted, free of charge, to any person obtaining a copy
+of this software and associated documentation files (the "Software"), to deal
+in the Software without restriction, including without limitation the rights
+to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+copies of the Software, and to permit persons to whom the Software is
+furnished to do so, subject to the following conditions:
+
+The above copyright notice and this permission notice shall be included in
+all copies or substantial portions of the Software.
+
+THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING
+FROM, OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS
+IN THE SOFTWARE.
+"""
+
+import socket
+
+import pytest
+
+from stellanow_sdk_python.config.eniviroment_config.stellanow_env_config import EnvConfig
+from stellanow_sdk_python.sinks.mqtt.auth_strategy.no_auth_mqtt_auth_strategy import NoAuthMqttAuthStrategy
+from stellanow_sdk_python.sinks.mqtt.utils.broker_selector import BrokerSelector
+from stellanow_sdk_python.sinks.mqtt.utils.mqtt_url_parser import parse_mqtt_urls
+from stellanow_sdk_python.utils.backoff import ExponentialBackoff
+from tests.mqtt_broker_stub import MqttBrokerStub
+from tests.test_stellanow_message_queue import make_event
+from tests.test_stellanow_mqtt_pool_sink import PROJECT_INFO
+from tests.test_stellanow_mqtt_sink_contract import SINK_CLASSES, wait_until
+
+
+@pytest.fixture(params=SINK_CLASSES, ids=lambda sink_class: sink_class.__name__)
+def sink_class(request):
+    """Fixture providing each MQTT sink implementation."""
+    return request.param
+
+
+@pytest.fixture
+async def brokers():
+    """Fixture providing two running local MQTT broker stand-ins."""
+    async with MqttBrokerStub() as first, MqttBrokerStub() as second:
+        yield first, second
+
+
+def unused_url() -> str:
+    """Return the URL of a local port nothing listens on."""
+    with socket.socket() as sock:
+        sock.bind(("localhost", 0))
+        return f"mqtt://localhost:{sock.getsockname()[1]}"
+
+
+def make_sink(sink_class, urls: list[str], **kwargs):
+    """Create a sink failing over between the given broker URLs, with a reconnect backoff far too slow to wait out."""
+    env_config = EnvConfig.create_custom_env(api_base_url="http://localhost", mqtt_broker_url=urls)
+    return sink_class(
+        auth_strategy=NoAuthMqttAuthStrategy(),
+        env_config=env_config,
+        project_info=PROJECT_INFO,
+        reconnect_backoff=ExponentialBackoff(initial_delay=30.0, max_delay=30.0),
+        **kwargs,
+    )
+
+
+def test_parse_mqtt_urls_accepts_lists_and_comma_separated_urls():
+    """Test that several broker URLs can be given as a sequence or a comma-separated string."""
+    from_string = parse_mqtt_urls("mqtts://broker-1:8883, mqtts://broker-2")
+    from_list = parse_mqtt_urls(["mqtts://broker-1:8883", "mqtts://broker-2"])
+
+    for configs in (from_string, from_list):
+        assert [(config.hostname, config.port) for config in configs] == [("broker-1", 8883), ("broker-2", 8883)]
+
+
+def test_parse_mqtt_urls_rejects_mixed_transports():
+    """Test that brokers must share a transport and TLS setting, and at least one URL is required."""
+    with pytest.raises(ValueError, match="same transport"):
+        parse_mqtt_urls(["mqtts://broker-1", "ws://broker-2"])
+    with pytest.raises(ValueError, match="No MQTT broker URL"):
+        parse_mqtt_urls(" , ")
+
+
+def test_custom_env_exposes_every_broker():
+    """Test that a custom environment lists every broker and keeps the first as mqtt_url_config."""
+    env_config = EnvConfig.create_custom_env(
+        api_base_url="http://localhost", mqtt_broker_url="mqtt://broker-1,mqtt://broker-2"
+    )
+
+    assert [config.hostname for config in env_config.mqtt_url_configs] == ["broker-1", "broker-2"]
+    assert env_config.mqtt_url_config is env_config.mqtt_url_configs[0]
+
+
+@pytest.mark.asyncio
+async def test_broker_selector_prefers_fastest_healthy_broker(monkeypatch):
+    """Test that brokers are ranked by probed latency and failed brokers are skipped until all have failed."""
+    fast, slow, down = parse_mqtt_urls("mqtt://fast,mqtt://slow,mqtt://down")
+    selector = BrokerSelector([down, slow, fast])
+    assert selector.preferred is down  # Configured order until probed
+
+    latencies = {fast: 0.001, slow: 0.010, down: None}
+
+    async def probe(config):
+        return latencies[config]
+
+    monkeypatch.setattr(selector, "_probe", probe)
+    await selector.probe()
+    assert selector.preferred is fast
+    assert selector.report_failure(fast)
+    assert selector.preferred is slow
+    assert not selector.report_failure(slow)  # Down was never reachable, so every broker has failed
+    assert selector.preferred is fast
+
+
+def test_broker_selector_only_switches_to_much_faster_broker():
+    """Test that a healthy connection only moves to a broker with at most half its latency."""
+    current, other = parse_mqtt_urls("mqtt://current,mqtt://other")
+    selector = BrokerSelector([current, other])
+
+    selector.latencies = {current: 0.010, other: 0.008}
+    assert not selector.should_switch(current)
+    selector.latencies = {current: 0.010, other: 0.004}
+    assert selector.should_switch(current)
+    selector.latencies = {current: None, other: 0.008}
+    assert selector.should_switch(current)
+
+
+@pytest.mark.asyncio
+async def test_sink_skips_unreachable_broker(sink_class, brokers):
+    """Test that the first connection goes to a reachable broker when the first one listed is down."""
+    first, _ = brokers
+    sink = make_sink(sink_class, [unused_url(), first.url])
+    await sink.connect()
+
+    assert first.connected_client_ids == [sink.client_id]
+    await sink.disconnect()
+
+
+@pytest.mark.asyncio
+async def test_sink_fails_over_without_backoff(sink_class, brokers):
+    """Test that losing the broker moves the connection to the other one at once, resuming the session."""
+    sink = make_sink(sink_class, [broker.url for broker in brokers])
+    await sink.connect()
+    current = next(broker for broker in brokers if broker.connected_client_ids)
+    other = next(broker for broker in brokers if broker is not current)
+
+    await current.stop()
+    await wait_until(lambda: sink.is_connected() and other.connected_client_ids, timeout=2.0)
+    await sink.send_message(make_event("entity", 0))
+    received = await other.wait_for_messages(1)
+    assert received[0].client_id == sink.client_id
+    assert not other.connects[-1].clean_start
+    await sink.disconnect()
+
+
+@pytest.mark.asyncio
+async def test_sink_moves_to_faster_broker(sink_class, brokers, monkeypatch):
+    """Test that periodic probing moves a healthy connection to a broker that has become much faster."""
+    first, second = brokers
+    sink = make_sink(sink_class, [first.url, second.url], probe_interval=0.05)
+    latencies = {first.port: 0.001, second.port: 0.010}
+
+    async def probe(config):
+        return latencies[config.port]
+
+    monkeypatch.setattr(sink.brokers, "_probe", probe)
+    await sink.connect()
+    assert first.connected_client_ids == [sink.client_id]
+
+    latencies[second.port] = 0.0001
+    await wait_until(lambda: sink.is_connected() and second.connected_client_ids, timeout=2.0)
+    assert not first.connected_client_ids
+    await sink.disconnect()
@@ -0,0 +1,133 @@
+"""
+Copyright (C) 2022-2025 Stella Technologies (UK) Limited.
+
+Permission is hereby granted, free of charge, to any person obtaining a copy
+of this software and associated documentation files (the "Software"), to deal
+in the Software without restriction, including without limitation the rights
+to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+copies of the Software, and to permit persons to whom the Software is
+furnished to do so, subject to the following conditions:
+
+The above copyright notice and this permission notice shall be included in
+all copies or substantial portions of the Software.
+
+THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING
+FROM, OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS
+IN THE SOFTWARE.
+"""
+
+import pytest
+
+from stellanow_sdk_python.agent.agent_protocol import ForwardedEvent
+from stellanow_sdk_python.message_queue import duplicate_filter as duplicate_filter_module
+from stellanow_sdk_python.message_queue.duplicate_filter import DuplicateFilter
+from stellanow_sdk_python.message_queue.message_queue_strategy.fifo_message_queue_strategy import (
+    FifoMessageQueueStrategy,
+)
+from stellanow_sdk_python.sdk import StellaNowSDK
+from tests.test_stellanow_message_queue import RecordingSink, make_event, wait_for_delivery
+from tests.test_stellanow_mqtt_pool_sink import PROJECT_INFO
+
+
+class FakeClock:
+    """Monotonic clock stand-in advanced by the test."""
+
+    def __init__(self) -> None:
+        self.now = 1000.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    fake = FakeClock()
+    monkeypatch.setattr(duplicate_filter_module.time, "monotonic", fake)
+    return fake
+
+
+def test_duplicate_filter_suppresses_repeated_payload():
+    """Test that a message with the event type, entity and payload of an earlier one is a duplicate."""
+    duplicates = DuplicateFilter()
+
+    assert not duplicates.is_duplicate(make_event("a", 1))
+    assert duplicates.is_duplicate(make_event("a", 1))
+    assert not duplicates.is_duplicate(make_event("a", 2))
+    assert not duplicates.is_duplicate(make_event("b", 1))
+    assert duplicates.suppressed_count == 1
+
+
+def test_duplicate_filter_uses_idempotency_key():
+    """Test that messages sharing an idempotency key are duplicates whatever their payload."""
+    duplicates = DuplicateFilter()
+
+    assert not duplicates.is_duplicate(make_event("a", 1), idempotency_key="order-1")
+    assert duplicates.is_duplicate(make_event("a", 2), idempotency_key="order-1")
+    assert not duplicates.is_duplicate(make_event("a", 1), idempotency_key="order-2")
+
+
+def test_duplicate_filter_recognizes_forwarded_events():
+    """Test that an event forwarded to the agent is identified by the payload in its JSON."""
+    duplicates = DuplicateFilter()
+    event = make_event("a", 1)
+
+    assert not duplicates.is_duplicate(event)
+    assert duplicates.is_duplicate(ForwardedEvent.from_json(event.model_dump_json(by_alias=True), "a", "id"))
+
+
+def test_duplicate_filter_forgets_keys_after_two_windows(clock):
+    """Test that a key is remembered for at least one window and forgotten after two."""
+    duplicates = DuplicateFilter(window=10.0)
+    assert not duplicates.is_duplicate(make_event("a", 1))
+
+    clock.now += 15.0
+    assert duplicates.is_duplicate(make_event("a", 1))
+
+    clock.now += 20.0
+    assert not duplicates.is_duplicate(make_event("a", 1))
+
+
+def test_duplicate_filter_memory_stays_bounded_beyond_capacity(clock):
+    """Test that a filter over its capacity rotates early instead of growing or filling up with false positives."""
+    duplicates = DuplicateFilter(window=60.0, capacity=1000)
+    memory = duplicates.memory_bytes
+
+    suppressed = sum(duplicates.is_duplicate(make_event("a", seq)) for seq in range(20_000))
+
+    assert duplicates.memory_bytes == memory
+    assert suppressed < 100
+    assert not duplicates.is_duplicate(make_event("a", 0))
+
+
+def test_duplicate_filter_rejects_invalid_settings():
+    """Test that the window, capacity and false positive rate are validated."""
+    with pytest.raises(ValueError, match="window"):
+        DuplicateFilter(window=0)
+    with pytest.raises(ValueError, match="capacity"):
+        DuplicateFilter(capacity=0)
+    with pytest.raises(ValueError, match="false positive rate"):
+        DuplicateFilter(false_positive_rate=1.0)
+
+
+@pytest.mark.asyncio
+async def test_sdk_drops_duplicates_before_queuing():
+    """Test that the SDK does not queue a message its duplicate filter has seen."""
+    sink = RecordingSink()
+    duplicates = DuplicateFilter()
+    sdk = StellaNowSDK(
+        project_info=PROJECT_INFO, sink=sink, queue_strategy=FifoMessageQueueStrategy(), duplicate_filter=duplicates
+    )
+    await sdk.start()
+    await sdk.send_message(make_event("a", 1), idempotency_key="order-1")
+    await sdk.send_message(make_event("a", 1), idempotency_key="order-1")
+    await sdk.send_message(make_event("a", 2), idempotency_key="order-2")
+
+    await wait_for_delivery(sink, 2)
+    await sdk.stop()
+
+    assert [message.value.payload for message in sink.delivered] == ["1", "2"]
+    assert duplicates.suppressed_count == 1
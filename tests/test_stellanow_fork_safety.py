@@ -0,0 +1,168 @@
+"""
+Copyright (C) 2022-2025 Stella Technologies (UK) Limited.
+
+Permission is hereby granted, free of charge, to any person obtaining a copy
+of this software and associated documentation files (the "Software"), to deal
+in the Software without restriction, including without limitation the rights
+to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+copies of the Software, and to permit persons to whom the Software is
+furnished to do so, subject to the following conditions:
+
+The above copyright notice and this permission notice shall be included in
+all copies or substantial portions of the Software.
+
+THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING
+FROM, OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS
+IN THE SOFTWARE.
+"""
+
+import asyncio
+import os
+import uuid
+
+import pytest
+
+from stellanow_sdk_python.agent.agent_protocol import decode_event_frames, encode_event_frame
+from stellanow_sdk_python.agent.shared_memory_ring import SharedMemoryRing
+from stellanow_sdk_python.agent.stellanow_agent import RING_BATCH_SIZE, StellaNowAgent
+from stellanow_sdk_python.config.eniviroment_config.stellanow_env_config import EnvConfig
+from stellanow_sdk_python.message_queue.message_queue_strategy.fifo_message_queue_strategy import (
+    FifoMessageQueueStrategy,
+)
+from stellanow_sdk_python.sdk import StellaNowSDK
+from stellanow_sdk_python.sinks.agent.stellanow_shared_memory_sink import StellaNowSharedMemorySink
+from stellanow_sdk_python.sinks.mqtt.auth_strategy.no_auth_mqtt_auth_strategy import NoAuthMqttAuthStrategy
+from stellanow_sdk_python.sinks.mqtt.stellanow_mqtt_sink import StellaNowMqttSink
+from tests.test_stellanow_message_queue import RecordingSink, make_event, wait_for_delivery
+from tests.test_stellanow_mqtt_pool_sink import PROJECT_INFO
+
+
+@pytest.fixture
+def ring_name():
+    """Fixture providing a shared memory ring name no other test uses."""
+    return f"stellanow-test-{uuid.uuid4().hex[:12]}"
+
+
+def run_in_child(child) -> str:
+    """Fork, run child() in the child process and return the string it returned."""
+    read_fd, write_fd = os.pipe()
+    pid = os.fork()
+    if pid == 0:
+        os.close(read_fd)
+        try:
+            os.write(write_fd, child().encode("utf-8"))
+        finally:
+            os._exit(0)
+    os.close(write_fd)
+    with os.fdopen(read_fd, "rb") as pipe:
+        result = pipe.read().decode("utf-8")
+    os.waitpid(pid, 0)
+    return result
+
+
+def test_forked_child_gets_own_client_id_and_empty_queue():
+    """Test that a child forked from a process with an SDK connects under its own client ID without parent events."""
+    env_config = EnvConfig.create_custom_env(api_base_url="http://localhost", mqtt_broker_url="mqtt://localhost")
+    sink = StellaNowMqttSink(auth_strategy=NoAuthMqttAuthStrategy(), env_config=env_config, project_info=PROJECT_INFO)
+    sdk = StellaNowSDK(project_info=PROJECT_INFO, sink=sink, queue_strategy=FifoMessageQueueStrategy())
+    asyncio.run(sdk.send_message(make_event("entity", 0)))
+
+    child_result = run_in_child(lambda: f"{sink.client_id} {sdk.wait_for_queue_to_empty(timeout=0)}")
+
+    child_client_id, child_queue_empty = child_result.split()
+    assert child_client_id != sink.client_id
+    assert child_client_id.startswith("StellaNowSDKPython_")
+    assert child_queue_empty == "True"
+    assert not sdk.wait_for_queue_to_empty(timeout=0)  # The parent still holds its event
+
+
+def test_ring_wraps_around_and_refuses_writes_when_full(ring_name):
+    """Test that records crossing the end of the ring read back intact and a full ring refuses writes."""
+    ring = SharedMemoryRing.create(ring_name, capacity=64)
+    try:
+        assert ring.write(b"a" * 40)
+        assert ring.read() == b"a" * 40
+        assert ring.write(b"0123456789" * 5)  # Wraps past the end of the data area
+        assert not ring.write(b"b" * 20)
+        assert ring.read() == b"0123456789" * 5
+        with pytest.raises(ValueError, match="exceeds"):
+            ring.write(b"c" * 65)
+    finally:
+        ring.unlink()
+
+
+def test_forked_workers_write_to_ring_inherited_from_parent(ring_name):
+    """Test that children forked after attaching to a ring all hand their events to the reader through it."""
+    ring = SharedMemoryRing.create(ring_name)
+    writer = SharedMemoryRing.attach(ring_name)
+    try:
+        for worker in range(3):
+            run_in_child(lambda: str(writer.write(encode_event_frame(make_event(f"worker-{worker}", 0)))))
+
+        events = decode_event_frames(ring.read())
+        assert sorted(event.key.entity_id for event in events) == ["worker-0", "worker-1", "worker-2"]
+    finally:
+        writer.close()
+        ring.unlink()
+
+
+@pytest.mark.asyncio
+async def test_agent_publishes_events_from_ring(tmp_path, ring_name):
+    """Test that the agent publishes events written by shared memory sinks, and they reattach after a restart."""
+    sink = RecordingSink()
+    sdk = StellaNowSDK(project_info=PROJECT_INFO, sink=sink, queue_strategy=FifoMessageQueueStrategy())
+    agent = StellaNowAgent(sdk, str(tmp_path / "agent.sock"), ring_name=ring_name)
+    await agent.start()
+    client = StellaNowSharedMemorySink(ring_name)
+    await client.connect()
+
+    event = make_event("entity", 0)
+    await client.send_message(event)
+    await wait_for_delivery(sink, 1)
+    assert sink.delivered[0].model_dump_json(by_alias=True) == event.model_dump_json(by_alias=True)
+
+    await agent.stop()
+    assert not client.is_connected()
+    sink = RecordingSink()
+    sdk = StellaNowSDK(project_info=PROJECT_INFO, sink=sink, queue_strategy=FifoMessageQueueStrategy())
+    agent = StellaNowAgent(sdk, str(tmp_path / "agent.sock"), ring_name=ring_name)
+    await agent.start()
+    assert client.is_connected()
+    await client.send_message(make_event("entity", 1))
+    await wait_for_delivery(sink, 1)
+    await client.disconnect()
+    await agent.stop()
+
+
+@pytest.mark.asyncio
+async def test_agent_yields_while_publishing_a_full_ring(tmp_path, ring_name):
+    """Test that a large backlog in the ring is queued in batches, letting other tasks run in between."""
+    queue_strategy = FifoMessageQueueStrategy()
+    sdk = StellaNowSDK(project_info=PROJECT_INFO, sink=RecordingSink(), queue_strategy=queue_strategy)
+    agent = StellaNowAgent(sdk, str(tmp_path / "agent.sock"), ring_name=ring_name)
+    ring = SharedMemoryRing.create(ring_name, capacity=1024 * 1024)
+    try:
+        for seq in range(4 * RING_BATCH_SIZE):
+            assert ring.write(encode_event_frame(make_event(f"entity-{seq}", seq)))
+
+        ticks = 0
+
+        async def tick() -> None:
+            nonlocal ticks
+            while True:
+                ticks += 1
+                await asyncio.sleep(0)
+
+        ticker = asyncio.create_task(tick())
+        await asyncio.sleep(0)
+        assert await agent._publish_ring_events(ring)
+        ticker.cancel()
+
+        assert ticks >= 4
+        assert queue_strategy.get_message_count() == 4 * RING_BATCH_SIZE
+    finally:
+        ring.unlink()
@@ -0,0 +1,55 @@
+"""
+Copyright (C) 2022-2025 Stella Technologies (UK) Limited.
+
+Permission is hereby granted, free of charge, to any person obtaining a copy
+of this software and associated documentation files (the "Software"), to deal
+in the Software without restriction, including without limitation the rights
+to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+copies of the Software, and to permit persons to whom the Software is
+furnished to do so, subject to the following conditions:
+
+The above copyright notice and this permission notice shall be included in
+all copies or substantial portions of the Software.
+
+THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING
+FROM, OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS
+IN THE SOFTWARE.
+"""
+
+import subprocess
+import sys
+
+import pytest
+
+from tests.benchmarks.bench_import_time import import_times
+
+
+@pytest.mark.parametrize("deferred", ["keycloak", "paho", "stellanow_sdk_python.agent.shared_memory_ring"])
+def test_configure_sdk_defers_heavy_imports(deferred: str):
+    """Test that importing configure_sdk loads neither heavy dependencies nor optional subsystems."""
+    times = import_times("stellanow_sdk_python.configure_sdk")
+
+    assert "stellanow_sdk_python.configure_sdk" in times
+    assert deferred not in times
+
+
+def test_auth_strategy_imports_keycloak_when_created():
+    """Test that creating the OIDC strategy still loads keycloak on demand."""
+    code = (
+        "import sys\n"
+        "import uuid\n"
+        "from stellanow_sdk_python.config.eniviroment_config.stellanow_env_config import EnvConfig\n"
+        "from stellanow_sdk_python.config.stellanow_auth_credentials import StellaNowCredentials\n"
+        "from stellanow_sdk_python.config.stellanow_config import StellaProjectInfo\n"
+        "from stellanow_sdk_python.sinks.mqtt.auth_strategy.auth_factory import create_auth_strategy\n"
+        "project_info = StellaProjectInfo(organization_id=uuid.uuid4(), project_id=uuid.uuid4())\n"
+        "credentials = StellaNowCredentials(username='user', password='secret')\n"
+        "create_auth_strategy('oidc', project_info, credentials, EnvConfig.stellanow_dev())\n"
+        "print('keycloak' in sys.modules)\n"
+    )
+    result = subprocess.run([sys.executable, "-c", code], capture_output=True, text=True, check=True)
+    assert result.stdout.strip().splitlines()[-1] == "True"
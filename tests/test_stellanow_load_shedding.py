@@ -0,0 +1,125 @@
+"""
+Copyright (C) 2022-2025 Stella Technologies (UK) Limited.
+
+Permission is hereby granted, free of charge, to any person obtaining a copy
+of this software and associated documentation files (the "Software"), to deal
+in the Software without restriction, including without limitation the rights
+to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+copies of the Software, and to permit persons to whom the Software is
+furnished to do so, subject to the following conditions:
+
+The above copyright notice and this permission notice shall be included in
+all copies or substantial portions of the Software.
+
+THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING
+FROM, OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS
+IN THE SOFTWARE.
+"""
+
+import random
+
+import pytest
+
+from stellanow_sdk_python.message_queue.message_queue import StellaNowMessageQueue
+from stellanow_sdk_python.message_queue.message_queue_strategy.fifo_message_queue_strategy import (
+    FifoMessageQueueStrategy,
+)
+from stellanow_sdk_python.message_queue.message_stage.load_shedding_message_stage import LoadSheddingMessageStage
+from stellanow_sdk_python.message_queue.message_stage.shedding_policy import (
+    LatestPerEntitySheddingPolicy,
+    SamplingSheddingPolicy,
+)
+from stellanow_sdk_python.sdk import StellaNowSDK
+from tests.test_stellanow_message_queue import RecordingSink
+from tests.test_stellanow_mqtt_pool_sink import PROJECT_INFO
+from tests.test_stellanow_queue_strategies import drain, make_typed_event
+
+
+def make_queue() -> StellaNowMessageQueue:
+    """A message queue that is not processing, so its backlog grows with every message."""
+    return StellaNowMessageQueue(strategy=FifoMessageQueueStrategy(), sink=RecordingSink())
+
+
+def test_sampling_policy_sheds_low_priority_event_types_under_overload():
+    """Test that past the depth limit, sampled event types are cut down while other event types pass."""
+    random.seed(7)
+    queue = make_queue()
+    stage = LoadSheddingMessageStage([SamplingSheddingPolicy(["telemetry"])], max_queue_depth=100, check_interval=0)
+    stage.attach(queue, PROJECT_INFO)
+    for seq in range(100):
+        stage.process(make_typed_event("a", "telemetry", seq), queue.enqueue)
+    assert queue.get_message_count() == 100
+
+    for seq in range(1000):
+        stage.process(make_typed_event("a", "telemetry", seq), queue.enqueue)
+        stage.process(make_typed_event("a", "receipt", seq), queue.enqueue)
+
+    assert stage.shedding
+    assert queue.get_message_count() - 1100 < 300
+    assert stage.shed_counts["telemetry"] > 700
+    assert "receipt" not in stage.shed_counts
+
+
+def test_latest_per_entity_policy_releases_newest_messages_on_recovery():
+    """Test that under overload only the newest message per entity is kept, and passed on once the backlog clears."""
+    queue = make_queue()
+    stage = LoadSheddingMessageStage([LatestPerEntitySheddingPolicy(["position"])], max_queue_depth=2, check_interval=0)
+    stage.attach(queue, PROJECT_INFO)
+    stage.process(make_typed_event("a", "position", 1), queue.enqueue)
+    stage.process(make_typed_event("b", "position", 2), queue.enqueue)
+    for seq in range(3, 8):
+        stage.process(make_typed_event("a" if seq % 2 else "b", "position", seq), queue.enqueue)
+    assert stage.shedding
+    assert [payload for _, _, payload in drain(queue.strategy)] == ["1", "2"]
+
+    stage.poll(queue.enqueue)
+
+    assert not stage.shedding
+    assert drain(queue.strategy) == [("a", "position", "7"), ("b", "position", "6")]
+    assert stage.shed_counts == {"position": 3}
+
+
+def test_load_shedding_on_queue_wait_when_nothing_is_sent():
+    """Test that a backlog the queue is not sending from counts as an unbounded wait."""
+    queue = make_queue()
+    stage = LoadSheddingMessageStage(
+        [SamplingSheddingPolicy(["telemetry"], min_keep_rate=0.01)],
+        max_queue_depth=None,
+        max_queue_wait=5.0,
+        check_interval=0,
+    )
+    stage.attach(queue, PROJECT_INFO)
+    stage.process(make_typed_event("a", "telemetry", 1), queue.enqueue)
+    stage.poll(queue.enqueue)
+
+    assert stage.shedding
+    assert stage.pressure == float("inf")
+
+
+def test_load_shedding_rejects_invalid_settings():
+    """Test that a limit is required and the recovery ratio is validated."""
+    with pytest.raises(ValueError, match="maximum queue depth or wait"):
+        LoadSheddingMessageStage([], max_queue_depth=None)
+    with pytest.raises(ValueError, match="recovery ratio"):
+        LoadSheddingMessageStage([], recovery_ratio=0)
+
+
+@pytest.mark.asyncio
+async def test_sdk_queues_held_messages_on_stop():
+    """Test that stopping the SDK flushes its stages, queuing the messages they held back."""
+    sink = RecordingSink()
+    stage = LoadSheddingMessageStage([LatestPerEntitySheddingPolicy(["position"])], max_queue_depth=1, check_interval=0)
+    sdk = StellaNowSDK(project_info=PROJECT_INFO, sink=sink, queue_strategy=FifoMessageQueueStrategy(), stages=[stage])
+    await sdk.start()
+    sink.connected = False
+    for seq in range(3):
+        await sdk.send_message(make_typed_event("a", "position", seq))
+
+    result = await sdk.stop(timeout=0.2)
+
+    assert result.abandoned == 2
+    assert stage.shed_counts == {"position": 1}
@@ -0,0 +1,147 @@
+"""
+Copyright (C) 2022-2025 Stella Technologies (UK) Limited.
+
+Permission is hereby granted, free of charge, to any person obtaining a copy
+of this software and associated documentation files (the "Software"), to deal
+in the Software without restriction, including without limitation the rights
+to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+copies of the Software, and to permit persons to whom the Software is
+furnished to do so, subject to the following conditions:
+
+The above copyright notice and this permission notice shall be included in
+all copies or substantial portions of the Software.
+
+THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING
+FROM, OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS
+IN THE SOFTWARE.
+"""
+
+import asyncio
+import random
+from collections import defaultdict
+from uuid import UUID
+
+import pytest
+
+from stellanow_sdk_python.message_queue.message_queue import StellaNowMessageQueue
+from stellanow_sdk_python.message_queue.message_queue_strategy.fifo_message_queue_strategy import (
+    FifoMessageQueueStrategy,
+)
+from stellanow_sdk_python.messages.event import StellaNowEventWrapper
+from stellanow_sdk_python.messages.message import Entity, StellaNowMessageWrapper
+from stellanow_sdk_python.sinks.i_stellanow_sink import IStellaNowSink
+
+ORGANIZATION_ID = UUID("1f40a798-edad-4b51-a41e-178c69491293")
+PROJECT_ID = UUID("1c2825c5-6870-4543-9939-8dccbc7918c4")
+
+
+class RecordingSink(IStellaNowSink):
+    """Sink stand-in that records delivered messages and simulates a publish round-trip."""
+
+    def __init__(self, latency: float = 0.0):
+        self.latency = latency
+        self.connected = True
+        self.delivered: list[StellaNowEventWrapper] = []
+        self.in_flight = 0
+        self.max_in_flight = 0
+
+    async def connect(self) -> None:
+        self.connected = True
+
+    async def disconnect(self) -> None:
+        self.connected = False
+
+    async def send_message(self, message: StellaNowEventWrapper) -> None:
+        self.in_flight += 1
+        self.max_in_flight = max(self.max_in_flight, self.in_flight)
+        try:
+            await asyncio.sleep(random.uniform(0, self.latency))
+            self.delivered.append(message)
+        finally:
+            self.in_flight -= 1
+
+    def is_connected(self) -> bool:
+        return self.connected
+
+
+def make_event(entity_id: str, sequence: int) -> StellaNowEventWrapper:
+    """Create an event for the given entity carrying its sequence number as payload."""
+    wrapper = StellaNowMessageWrapper.create_raw(
+        event_type_definition_id="test_event",
+        entity_types=[Entity(entity_type_definition_id="test", entity_id=entity_id)],
+        message_json=str(sequence),
+    )
+    return StellaNowEventWrapper.create(message=wrapper, organization_id=ORGANIZATION_ID, project_id=PROJECT_ID)
+
+
+async def wait_for_delivery(sink: RecordingSink, expected: int, timeout: float = 5.0) -> None:
+    """Wait until the sink has received the expected number of messages."""
+    async with asyncio.timeout(timeout):
+        while len(sink.delivered) < expected:
+            await asyncio.sleep(0.01)
+
+
+def test_message_queue_rejects_invalid_worker_count():
+    """Test that at least one queue worker is required."""
+    with pytest.raises(ValueError, match="at least 1"):
+        StellaNowMessageQueue(strategy=FifoMessageQueueStrategy(), sink=RecordingSink(), workers=0)
+
+
+@pytest.mark.asyncio
+async def test_partitioned_workers_preserve_per_entity_order():
+    """Test that events for the same entity are delivered in order while entities are sent concurrently."""
+    sink = RecordingSink(latency=0.005)
+    queue = StellaNowMessageQueue(strategy=FifoMessageQueueStrategy(), sink=sink, workers=4)
+    for sequence in range(20):
+        for entity in range(8):
+            queue.enqueue(make_event(f"entity_{entity}", sequence))
+
+    queue.start_processing()
+    await wait_for_delivery(sink, 160)
+    await queue.stop_processing()
+
+    sequences: dict[str, list[int]] = defaultdict(list)
+    for message in sink.delivered:
+        sequences[message.key.entity_id].append(int(message.value.payload))
+    assert all(received == list(range(20)) for received in sequences.values())
+    assert sink.max_in_flight > 1
+    assert queue.is_empty()
+
+
+@pytest.mark.asyncio
+async def test_partitioned_workers_return_pending_messages_on_stop():
+    """Test that messages waiting in partitions are returned to the strategy when processing stops."""
+    sink = RecordingSink()
+    sink.connected = False
+    strategy = FifoMessageQueueStrategy()
+    queue = StellaNowMessageQueue(strategy=strategy, sink=sink, workers=2)
+    queue.start_processing()
+    for sequence in range(5):
+        queue.enqueue(make_event("entity", sequence))
+
+    await queue.stop_processing(timeout=1.0)
+
+    assert queue.get_message_count() == 5
+    assert sink.delivered == []
+
+
+@pytest.mark.asyncio
+async def test_stop_with_full_partitions_keeps_every_message():
+    """Test that stopping while the dispatcher waits on a full partition is prompt and loses no message."""
+    sink = RecordingSink(latency=0.01)
+    queue = StellaNowMessageQueue(strategy=FifoMessageQueueStrategy(), sink=sink, workers=2, partition_buffer_size=2)
+    for sequence in range(200):
+        queue.enqueue(make_event(f"entity-{sequence % 4}", sequence))
+    queue.start_processing()
+    await wait_for_delivery(sink, 10)
+
+    loop = asyncio.get_running_loop()
+    started = loop.time()
+    await queue.stop_processing(timeout=2.0)
+
+    assert loop.time() - started < 1.0
+    assert len(sink.delivered) + queue.get_message_count() == 200
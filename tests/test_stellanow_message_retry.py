@@ -0,0 +1,137 @@
+"""
+Copyright (C) 2022-2025 Stella Technologies (UK) Limited.
+
+Permission is hereby granted, free of charge, to any person obtaining a copy
+of this software and associated documentation files (the "Software"), to deal
+in the Software without restriction, including without limitation the rights
+to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+copies of the Software, and to permit persons to whom the Software is
+furnished to do so, subject to the following conditions:
+
+The above copyright notice and this permission notice shall be included in
+all copies or substantial portions of the Software.
+
+THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING
+FROM, OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS
+IN THE SOFTWARE.
+"""
+
+import asyncio
+
+import pytest
+
+from stellanow_sdk_python.message_queue.dead_letter_store.file_dead_letter_store import FileDeadLetterStore
+from stellanow_sdk_python.message_queue.message_queue import StellaNowMessageQueue
+from stellanow_sdk_python.message_queue.message_queue_strategy.fifo_message_queue_strategy import (
+    FifoMessageQueueStrategy,
+)
+from stellanow_sdk_python.messages.event import StellaNowEventWrapper
+from stellanow_sdk_python.utils.backoff import ExponentialBackoff
+from tests.test_stellanow_message_queue import RecordingSink, make_event, wait_for_delivery
+
+
+class FlakySink(RecordingSink):
+    """Recording sink that fails the first attempts to send the messages of some entities."""
+
+    def __init__(self, failures: dict[str, int]):
+        super().__init__()
+        self.failures = failures
+
+    async def send_message(self, message: StellaNowEventWrapper) -> None:
+        remaining = self.failures.get(message.key.entity_id, 0)
+        if remaining:
+            self.failures[message.key.entity_id] = remaining - 1
+            raise ConnectionError("Publish rejected")
+        await super().send_message(message)
+
+
+def make_queue(sink: RecordingSink, workers: int = 1, **kwargs) -> StellaNowMessageQueue:
+    """Create a queue retrying failed messages after a short backoff."""
+    return StellaNowMessageQueue(
+        strategy=FifoMessageQueueStrategy(),
+        sink=sink,
+        workers=workers,
+        retry_backoff=ExponentialBackoff(initial_delay=0.05, max_delay=0.05, multiplier=1.0),
+        **kwargs,
+    )
+
+
+def delivered_payloads(sink: RecordingSink) -> list[tuple[str, str]]:
+    """Return the (entity ID, sequence) of every delivered message, in delivery order."""
+    return [(message.key.entity_id, message.value.payload) for message in sink.delivered]
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("workers", [1, 2])
+async def test_failed_message_backs_off_without_stalling_other_entities(workers):
+    """Test that a failing message is retried in order with its entity while other entities keep flowing."""
+    sink = FlakySink(failures={"bad": 2})
+    queue = make_queue(sink, workers=workers)
+    for sequence in range(3):
+        queue.enqueue(make_event("bad", sequence))
+        queue.enqueue(make_event("good", sequence))
+    queue.start_processing()
+
+    await wait_for_delivery(sink, 6)
+    delivered = delivered_payloads(sink)
+    assert delivered[:3] == [("good", "0"), ("good", "1"), ("good", "2")]
+    assert [payload for payload in delivered if payload[0] == "bad"] == [("bad", "0"), ("bad", "1"), ("bad", "2")]
+    await queue.stop_processing()
+
+
+@pytest.mark.asyncio
+async def test_message_is_dead_lettered_after_max_attempts_and_replayed():
+    """Test that a message failing every attempt moves to the dead letter store and is sent again on replay."""
+    sink = FlakySink(failures={"bad": 3})
+    queue = make_queue(sink, max_attempts=3)
+    queue.enqueue(make_event("bad", 0))
+    queue.enqueue(make_event("bad", 1))
+    queue.start_processing()
+
+    await wait_for_delivery(sink, 1)  # Held behind the dead-lettered message, then released
+    assert delivered_payloads(sink) == [("bad", "1")]
+    assert queue.dead_letters.get_message_count() == 1
+    assert queue.is_empty()
+
+    assert queue.replay_dead_letters() == 1
+    await wait_for_delivery(sink, 2)
+    assert delivered_payloads(sink)[1] == ("bad", "0")
+    assert queue.dead_letters.get_message_count() == 0
+    await queue.stop_processing()
+
+
+@pytest.mark.asyncio
+async def test_stop_returns_backing_off_messages_to_queue():
+    """Test that messages waiting for a retry, and the ones held behind them, are kept on stop."""
+    sink = FlakySink(failures={"bad": 1000})
+    queue = make_queue(sink, max_attempts=1000)
+    queue.enqueue(make_event("bad", 0))
+    queue.enqueue(make_event("bad", 1))
+    queue.start_processing()
+
+    await asyncio.sleep(0.2)
+    await queue.stop_processing()
+    assert queue.get_message_count() == 2
+    assert queue.strategy.try_dequeue().value.payload == "0"
+
+
+def test_file_dead_letter_store_survives_restart(tmp_path):
+    """Test that dead letters written to a file are counted and replayed, as serialized, by a later store."""
+    path = tmp_path / "dead_letters.jsonl"
+    event = make_event("entity", 0)
+    event.priority = 7
+    assert FileDeadLetterStore(path).add(event, reason="Publish rejected")
+
+    store = FileDeadLetterStore(path, max_messages=1)
+    assert store.get_message_count() == 1
+    assert not store.add(make_event("entity", 1), reason="Publish rejected")  # Full
+    replayed = store.drain()
+
+    assert [message.model_dump_json(by_alias=True) for message in replayed] == [event.model_dump_json(by_alias=True)]
+    assert replayed[0].key.entity_id == "entity" and replayed[0].message_id == event.message_id
+    assert replayed[0].priority == 7
+    assert store.get_message_count() == 0 and not path.exists()
@@ -0,0 +1,122 @@
+"""
+Copyright (C) 2022-2025 Stella Technologies (UK) Limited.
+
+Permission is hereby granted, free of charge, to any person obtaining a copy
+of this software and associated documentation files (the "Software"), to deal
+in the Software without restriction, including without limitation the rights
+to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+copies of the Software, and to permit persons to whom the Software is
+furnished to do so, subject to the following conditions:
+
+The above copyright notice and this permission notice shall be included in
+all copies or substantial portions of the Software.
+
+THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING
+FROM, OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS
+IN THE SOFTWARE.
+"""
+
+import pytest
+
+from stellanow_sdk_python.config.eniviroment_config.stellanow_env_config import EnvConfig
+from stellanow_sdk_python.sinks.mqtt.auth_strategy.no_auth_mqtt_auth_strategy import NoAuthMqttAuthStrategy
+from stellanow_sdk_python.sinks.mqtt.stellanow_mqtt_sink import StellaNowMqttSink
+from stellanow_sdk_python.sinks.mqtt.utils.connection_state import MqttConnectionState
+from stellanow_sdk_python.utils.backoff import ExponentialBackoff
+from tests.mqtt_broker_stub import MqttBrokerStub
+from tests.test_stellanow_message_queue import make_event
+from tests.test_stellanow_mqtt_pool_sink import PROJECT_INFO
+from tests.test_stellanow_mqtt_sink_contract import wait_until
+
+
+@pytest.fixture
+async def broker():
+    """Fixture providing a running local MQTT broker stand-in."""
+    async with MqttBrokerStub() as broker:
+        yield broker
+
+
+def make_standby_sink(*brokers: MqttBrokerStub) -> StellaNowMqttSink:
+    """Create a sink with a hot standby, whose reconnect backoff is far too slow to go unnoticed."""
+    env_config = EnvConfig.create_custom_env(
+        api_base_url="http://localhost", mqtt_broker_url=[broker.url for broker in brokers]
+    )
+    return StellaNowMqttSink(
+        auth_strategy=NoAuthMqttAuthStrategy(),
+        env_config=env_config,
+        project_info=PROJECT_INFO,
+        reconnect_backoff=ExponentialBackoff(initial_delay=30.0, max_delay=30.0),
+        hot_standby=True,
+    )
+
+
+@pytest.mark.asyncio
+async def test_standby_takes_over_without_disconnecting(broker: MqttBrokerStub, monkeypatch):
+    """Test that losing the primary connection switches publishing to the standby without a disconnected state."""
+    sink = make_standby_sink(broker)
+    await sink.connect()
+    await broker.wait_for_clients(2)
+    primary_id = sink.client_id
+    states = []  # Any state change would mean a publishing gap
+    set_state = sink._set_state
+
+    def record_state(state):
+        states.append(state)
+        set_state(state)
+
+    monkeypatch.setattr(sink, "_set_state", record_state)
+
+    broker.drop_client(primary_id)
+    await wait_until(lambda: sink.client_id != primary_id)
+    assert sink.is_connected()
+    await sink.send_message(make_event("entity", 0))
+    received = await broker.wait_for_messages(1)
+    assert received[0].client_id == sink.client_id
+    assert states == []
+
+    # The lost client comes back as the next standby
+    await wait_until(lambda: sorted(broker.connected_client_ids) == sorted([primary_id, sink.client_id]))
+    await sink.disconnect()
+
+
+@pytest.mark.asyncio
+async def test_replaced_client_resends_unacknowledged_messages(broker: MqttBrokerStub):
+    """Test that publishes left unacknowledged by the lost primary are resent once it reconnects as standby."""
+    broker.ack_delay = 60
+    sink = make_standby_sink(broker)
+    await sink.connect()
+    await broker.wait_for_clients(2)
+    primary_id = sink.client_id
+    await sink.send_message(make_event("entity", 0))
+    await broker.wait_for_messages(1)
+
+    broker.ack_delay = 0
+    broker.drop_client(primary_id)
+    received = await broker.wait_for_messages(2)
+
+    assert received[1].client_id == primary_id
+    assert received[1].dup and received[1].payload == received[0].payload
+    await wait_until(lambda: sink.in_flight_count == 0)
+    await sink.disconnect()
+
+
+@pytest.mark.asyncio
+async def test_standby_connects_to_alternate_broker():
+    """Test that the standby uses another broker, so losing the primary broker leaves publishing uninterrupted."""
+    async with MqttBrokerStub() as first, MqttBrokerStub() as second:
+        sink = make_standby_sink(first, second)
+        await sink.connect()
+        await wait_until(lambda: first.connected_client_ids and second.connected_client_ids)
+        primary = first if sink.client_id in first.connected_client_ids else second
+        standby = second if primary is first else first
+
+        await primary.stop()
+        await wait_until(lambda: sink.client_id in standby.connected_client_ids)
+        assert sink.state is MqttConnectionState.CONNECTED
+        await sink.send_message(make_event("entity", 0))
+        await standby.wait_for_messages(1)
+        await sink.disconnect()
@@ -0,0 +1,118 @@
+"""
+Copyright (C) 2022-2025 Stella Technologies (UK) Limited.
+
+Permission is hereby granted, free of charge, to any person obtaining a copy
+of this software and associated documentation files (the "Software"), to deal
+in the Software without restriction, including without limitation the rights
+to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+copies of the Software, and to permit persons to whom the Software is
+furnished to do so, subject to the following conditions:
+
+The above copyright notice and this permission notice shall be included in
+all copies or substantial portions of the Software.
+
+THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING
+FROM, OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS
+IN THE SOFTWARE.
+"""
+
+import asyncio
+import json
+from uuid import UUID
+
+import pytest
+
+from stellanow_sdk_python.config.eniviroment_config.stellanow_env_config import EnvConfig
+from stellanow_sdk_python.config.stellanow_config import StellaProjectInfo
+from stellanow_sdk_python.sinks.mqtt.auth_strategy.no_auth_mqtt_auth_strategy import NoAuthMqttAuthStrategy
+from stellanow_sdk_python.sinks.mqtt.stellanow_mqtt_pool_sink import PoolDistribution, StellaNowMqttPoolSink
+from tests.mqtt_broker_stub import MqttBrokerStub
+from tests.test_stellanow_message_queue import make_event
+
+PROJECT_INFO = StellaProjectInfo(
+    organization_id=UUID("1f40a798-edad-4b51-a41e-178c69491293"),
+    project_id=UUID("1c2825c5-6870-4543-9939-8dccbc7918c4"),
+)
+
+
+@pytest.fixture
+async def broker():
+    """Fixture providing a running local MQTT broker stand-in."""
+    async with MqttBrokerStub() as broker:
+        yield broker
+
+
+def make_pool_sink(broker: MqttBrokerStub, **kwargs) -> StellaNowMqttPoolSink:
+    """Create a pool sink connected to the broker stand-in without authentication."""
+    env_config = EnvConfig.create_custom_env(api_base_url="http://localhost", mqtt_broker_url=broker.url)
+    return StellaNowMqttPoolSink(
+        auth_strategy=NoAuthMqttAuthStrategy(), env_config=env_config, project_info=PROJECT_INFO, **kwargs
+    )
+
+
+async def connect_pool(sink: StellaNowMqttPoolSink) -> None:
+    """Connect the pool and wait until every pooled connection is established."""
+    await sink.connect()
+    async with asyncio.timeout(5):
+        while sink.connected_count < len(sink.sinks):
+            await asyncio.sleep(0.01)
+
+
+@pytest.mark.asyncio
+async def test_pool_sink_uses_unique_client_ids(broker: MqttBrokerStub):
+    """Test that every pooled connection connects with its own client ID derived from the SDK scheme."""
+    sink = make_pool_sink(broker, pool_size=3)
+    await connect_pool(sink)
+
+    client_ids = sorted(broker.connected_client_ids)
+    assert client_ids == [f"{sink.client_id}_{index}" for index in range(3)]
+    assert sink.client_id.startswith("StellaNowSDKPython_")
+    await sink.disconnect()
+
+
+@pytest.mark.asyncio
+async def test_pool_sink_keeps_entities_on_one_connection(broker: MqttBrokerStub):
+    """Test that entity-hash distribution spreads entities across connections but keeps each entity on one."""
+    sink = make_pool_sink(broker, pool_size=3, distribution=PoolDistribution.ENTITY_HASH)
+    await connect_pool(sink)
+
+    for sequence in range(5):
+        for entity in range(12):
+            await sink.send_message(make_event(f"entity_{entity}", sequence))
+    received = await broker.wait_for_messages(60)
+
+    connections_per_entity: dict[str, set[str]] = {}
+    for publish in received:
+        entity_id = make_entity_id(publish.payload)
+        connections_per_entity.setdefault(entity_id, set()).add(publish.client_id)
+    assert all(len(connections) == 1 for connections in connections_per_entity.values())
+    assert len({publish.client_id for publish in received}) > 1
+    await sink.disconnect()
+
+
+@pytest.mark.asyncio
+async def test_pool_sink_keeps_publishing_when_one_connection_drops(broker: MqttBrokerStub):
+    """Test that losing one pooled connection does not stall publishing on the others."""
+    sink = make_pool_sink(broker, pool_size=2, distribution=PoolDistribution.LEAST_IN_FLIGHT)
+    await connect_pool(sink)
+
+    broker.accept_connections = False
+    broker.drop_client(f"{sink.client_id}_0")
+    async with asyncio.timeout(5):
+        while sink.sinks[0].is_connected():
+            await asyncio.sleep(0.01)
+    for sequence in range(10):
+        await sink.send_message(make_event("entity", sequence))
+
+    received = await broker.wait_for_messages(10)
+    assert {publish.client_id for publish in received} == {f"{sink.client_id}_1"}
+    await sink.disconnect()
+
+
+def make_entity_id(payload: bytes) -> str:
+    """Extract the entity ID from a published event."""
+    return json.loads(payload)["key"]["entityId"]
@@ -0,0 +1,298 @@
+"""
+Copyright (C) 2022-2025 Stella Technologies (UK) Limited.
+
+Permission is hereby granted, free of charge, to any person obtaining a copy
+of this software and associated documentation files (the "Software"), to deal
+in the Software without restriction, including without limitation the rights
+to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+copies of the Software, and to permit persons to whom the Software is
+furnished to do so, subject to the following conditions:
+
+The above copyright notice and this permission notice shall be included in
+all copies or substantial portions of the Software.
+
+THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING
+FROM, OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS
+IN THE SOFTWARE.
+"""
+
+import asyncio
+import json
+
+import pytest
+
+from stellanow_sdk_python.config.eniviroment_config.stellanow_env_config import EnvConfig
+from stellanow_sdk_python.config.stellanow_auth_credentials import StellaNowCredentials
+from stellanow_sdk_python.sinks.i_stellanow_sink import IStellaNowSink
+from stellanow_sdk_python.sinks.mqtt.auth_strategy.i_mqtt_auth_strategy import IMqttAuthStrategy, MqttCredentialsTarget
+from stellanow_sdk_python.sinks.mqtt.auth_strategy.no_auth_mqtt_auth_strategy import NoAuthMqttAuthStrategy
+from stellanow_sdk_python.sinks.mqtt.auth_strategy.user_pass_auth_mqtt_auth_strategy import UserPassAuthMqttAuthStrategy
+from stellanow_sdk_python.sinks.mqtt.stellanow_asyncio_mqtt_sink import StellaNowAsyncioMqttSink
+from stellanow_sdk_python.sinks.mqtt.stellanow_mqtt_sink import StellaNowMqttSink
+from stellanow_sdk_python.sinks.mqtt.utils.connection_state import MqttConnectionState
+from tests.mqtt_broker_stub import MqttBrokerStub
+from tests.test_stellanow_message_queue import make_event
+from tests.test_stellanow_mqtt_pool_sink import PROJECT_INFO
+
+SINK_CLASSES = [StellaNowMqttSink, StellaNowAsyncioMqttSink]
+
+
+@pytest.fixture(params=SINK_CLASSES, ids=lambda sink_class: sink_class.__name__)
+def sink_class(request):
+    """Fixture providing each MQTT sink implementation that must satisfy the sink contract."""
+    return request.param
+
+
+@pytest.fixture
+async def broker():
+    """Fixture providing a running local MQTT broker stand-in."""
+    async with MqttBrokerStub() as broker:
+        yield broker
+
+
+class SlowAuthStrategy(IMqttAuthStrategy):
+    """Auth strategy taking a while to hand out its credentials, as a token request to Keycloak would."""
+
+    def __init__(self, delay: float, fail: bool = False):
+        self.delay = delay
+        self.fail = fail
+        self.calls = 0
+
+    async def authenticate(self, client: MqttCredentialsTarget) -> None:
+        self.calls += 1
+        await asyncio.sleep(self.delay)
+        if self.fail and self.calls == 1:
+            raise ConnectionError("Token request failed")
+        client.username_pw_set(username=f"token-{self.calls}", password=None)
+
+
+def make_sink(sink_class, broker: MqttBrokerStub, auth_strategy: IMqttAuthStrategy = None) -> IStellaNowSink:
+    """Create a sink of the given class connecting to the broker stand-in."""
+    env_config = EnvConfig.create_custom_env(api_base_url="http://localhost", mqtt_broker_url=broker.url)
+    return sink_class(
+        auth_strategy=auth_strategy or NoAuthMqttAuthStrategy(), env_config=env_config, project_info=PROJECT_INFO
+    )
+
+
+async def wait_until(condition, timeout: float = 10.0) -> None:
+    """Wait until the condition holds."""
+    async with asyncio.timeout(timeout):
+        while not condition():
+            await asyncio.sleep(0.01)
+
+
+@pytest.mark.asyncio
+async def test_sink_connects_with_generated_client_id(sink_class, broker: MqttBrokerStub):
+    """Test that the sink connects with a unique client ID in the StellaNowSDKPython_<nanoid> format."""
+    sink = make_sink(sink_class, broker)
+    await sink.connect()
+
+    assert sink.is_connected()
+    assert broker.connects[-1].client_id == sink.client_id
+    assert sink.client_id.startswith("StellaNowSDKPython_")
+    await sink.disconnect()
+
+
+@pytest.mark.asyncio
+async def test_sink_applies_auth_strategy_credentials(sink_class, broker: MqttBrokerStub):
+    """Test that credentials applied by the auth strategy are sent in the CONNECT packet."""
+    credentials = StellaNowCredentials(username="user", password="secret")
+    sink = make_sink(sink_class, broker, UserPassAuthMqttAuthStrategy(credentials))
+    await sink.connect()
+
+    assert broker.connects[-1].username == "user"
+    assert broker.connects[-1].password == b"secret"
+    await sink.disconnect()
+
+
+@pytest.mark.asyncio
+async def test_sink_publishes_events_with_qos_1(sink_class, broker: MqttBrokerStub):
+    """Test that events are published to the organization topic as the serialized event wrapper."""
+    sink = make_sink(sink_class, broker)
+    await sink.connect()
+    events = [make_event("entity", sequence) for sequence in range(3)]
+    events[0].priority = 5  # Kept by the SDK, not published
+    for event in events:
+        await sink.send_message(event)
+
+    received = await broker.wait_for_messages(3)
+    assert [publish.topic for publish in received] == [f"in/{PROJECT_INFO.organization_id}"] * 3
+    assert [publish.qos for publish in received] == [1, 1, 1]
+    assert [json.loads(publish.payload) for publish in received] == [
+        json.loads(event.model_dump_json(by_alias=True)) for event in events
+    ]
+    await wait_until(lambda: sink.in_flight_count == 0)
+    await sink.disconnect()
+
+
+@pytest.mark.asyncio
+async def test_sink_opens_transport_while_authenticating(sink_class):
+    """Test that the transport handshake and the credential fetch overlap rather than add up."""
+    async with MqttBrokerStub(websocket=True, handshake_delay=0.4) as broker:
+        sink = make_sink(sink_class, broker, SlowAuthStrategy(delay=0.4))
+        started = asyncio.get_running_loop().time()
+        await sink.connect()
+        elapsed = asyncio.get_running_loop().time() - started
+
+        assert elapsed < 0.7
+        assert broker.connects[-1].username == "token-1"
+        await sink.disconnect()
+
+
+@pytest.mark.asyncio
+async def test_sink_retries_after_failed_authentication(sink_class, broker: MqttBrokerStub):
+    """Test that a transport opened alongside a failed credential fetch is discarded and the attempt retried."""
+    sink = make_sink(sink_class, broker, SlowAuthStrategy(delay=0.01, fail=True))
+    await sink.connect()
+
+    assert [request.username for request in broker.connects] == ["token-2"]
+    await sink.disconnect()
+
+
+@pytest.mark.asyncio
+async def test_sink_reconnects_after_connection_loss(sink_class, broker: MqttBrokerStub):
+    """Test that the sink reconnects on its own after the broker drops the connection."""
+    sink = make_sink(sink_class, broker)
+    await sink.connect()
+    connect_count = len(broker.connects)
+
+    broker.drop_connections()
+    await wait_until(lambda: len(broker.connects) > connect_count and sink.is_connected())
+    await sink.send_message(make_event("entity", 1))
+    received = await broker.wait_for_messages(1)
+    assert json.loads(received[0].payload)["value"]["payload"] == "1"
+    await sink.disconnect()
+
+
+@pytest.mark.asyncio
+async def test_sink_rejects_messages_while_disconnected(sink_class, broker: MqttBrokerStub):
+    """Test that sending while the broker is unreachable raises so the queue can re-enqueue the message."""
+    sink = make_sink(sink_class, broker)
+    await sink.connect()
+
+    await broker.stop()
+    await wait_until(lambda: not sink.is_connected())
+    with pytest.raises(Exception, match="disconnected"):
+        await sink.send_message(make_event("entity", 0))
+    await sink.disconnect()
+
+
+@pytest.mark.asyncio
+async def test_sink_resumes_session_after_connection_loss(sink_class, broker: MqttBrokerStub):
+    """Test that only the first connection starts a clean session and reconnecting takes well under a second."""
+    sink = make_sink(sink_class, broker)
+    await sink.connect()
+
+    broker.drop_connections()
+    await wait_until(lambda: len(broker.connects) == 2 and sink.is_connected(), timeout=1.0)
+    assert [connect.clean_start for connect in broker.connects] == [True, False]
+    assert all(connect.session_expiry_interval == sink.session_expiry_interval for connect in broker.connects)
+    await sink.disconnect()
+
+
+@pytest.mark.asyncio
+async def test_sink_retransmits_unacknowledged_messages(sink_class, broker: MqttBrokerStub):
+    """Test that publishes not acknowledged before a connection loss are resent with the DUP flag."""
+    broker.ack_delay = 60
+    sink = make_sink(sink_class, broker)
+    await sink.connect()
+    await sink.send_message(make_event("entity", 0))
+    await broker.wait_for_messages(1)
+
+    broker.ack_delay = 0
+    broker.drop_connections()
+    received = await broker.wait_for_messages(2)
+
+    assert received[1].dup and received[1].payload == received[0].payload
+    await wait_until(lambda: sink.in_flight_count == 0)
+    await sink.disconnect()
+
+
+@pytest.mark.asyncio
+async def test_sink_disconnects(sink_class, broker: MqttBrokerStub):
+    """Test that disconnecting closes the broker connection."""
+    sink = make_sink(sink_class, broker)
+    await sink.connect()
+    await sink.disconnect()
+
+    assert not sink.is_connected()
+    await wait_until(lambda: not broker.connected_client_ids)
+
+
+@pytest.mark.asyncio
+async def test_sink_tracks_connection_state(sink_class, broker: MqttBrokerStub):
+    """Test that the connection state follows the broker connection."""
+    sink = make_sink(sink_class, broker)
+    assert sink.state is MqttConnectionState.DISCONNECTED
+    await sink.connect()
+    assert sink.state is MqttConnectionState.CONNECTED
+
+    await broker.stop()
+    await wait_until(lambda: sink.state is not MqttConnectionState.CONNECTED)
+    await sink.disconnect()
+    assert sink.state is MqttConnectionState.DISCONNECTED
+
+
+@pytest.mark.asyncio
+async def test_sink_drains_in_flight_messages_on_disconnect(sink_class, broker: MqttBrokerStub):
+    """Test that disconnecting waits for unacknowledged publishes to be acknowledged first."""
+    broker.ack_delay = 0.2
+    sink = make_sink(sink_class, broker)
+    await sink.connect()
+    await sink.send_message(make_event("entity", 0))
+    await broker.wait_for_messages(1)
+    assert sink.in_flight_count == 1
+
+    await sink.disconnect()
+    assert sink.in_flight_count == 0
+
+
+@pytest.mark.asyncio
+async def test_sink_waits_for_acknowledgements(sink_class, broker: MqttBrokerStub):
+    """Test that waiting for acknowledgements returns once the broker acknowledged, or reports what is still open."""
+    broker.ack_delay = 0.2
+    sink = make_sink(sink_class, broker)
+    await sink.connect()
+    await sink.send_message(make_event("entity", 0))
+    assert await sink.wait_for_acknowledgements(timeout=5.0) == 0
+
+    broker.ack_delay = 60
+    await sink.send_message(make_event("entity", 1))
+    assert await sink.wait_for_acknowledgements(timeout=0.1) == 1
+    broker.drop_connections()
+    await sink.disconnect()
+
+
+@pytest.mark.asyncio
+async def test_asyncio_sink_publishes_over_websockets():
+    """Test that the asyncio sink publishes over the WebSocket transport."""
+    async with MqttBrokerStub(websocket=True) as broker:
+        sink = make_sink(StellaNowAsyncioMqttSink, broker)
+        await sink.connect()
+        await sink.send_message(make_event("entity", 0))
+
+        received = await broker.wait_for_messages(1)
+        assert received[0].topic == f"in/{PROJECT_INFO.organization_id}"
+        await wait_until(lambda: sink.in_flight_count == 0)
+        await sink.disconnect()
+
+
+@pytest.mark.asyncio
+async def test_asyncio_sink_reports_rejected_publishes(broker: MqttBrokerStub):
+    """Test that a publish the broker refuses in its PUBACK is reported to the rejection listeners."""
+    broker.puback_reason_code = 0x97  # Quota exceeded
+    sink = make_sink(StellaNowAsyncioMqttSink, broker)
+    rejected = []
+    sink.add_rejection_listener(lambda message, reason: rejected.append((message, reason)))
+    await sink.connect()
+    event = make_event("entity", 0)
+    await sink.send_message(event)
+
+    assert await sink.wait_for_acknowledgements(timeout=5.0) == 0
+    assert [message for message, _ in rejected] == [event]
+    assert "0x97" in rejected[0][1]
+    await sink.disconnect()
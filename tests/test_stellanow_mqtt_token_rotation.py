@@ -0,0 +1,197 @@
+"""
+Copyright (C) 2022-2025 Stella Technologies (UK) Limited.
+
+Permission is hereby granted, free of charge, to any person obtaining a copy
+of this software and associated documentation files (the "Software"), to deal
+in the Software without restriction, including without limitation the rights
+to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+copies of the Software, and to permit persons to whom the Software is
+furnished to do so, subject to the following conditions:
+
+The above copyright notice and this permission notice shall be included in
+all copies or substantial portions of the Software.
+
+THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING
+FROM, OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS
+IN THE SOFTWARE.
+"""
+
+import asyncio
+
+import pytest
+
+from stellanow_sdk_python.config.eniviroment_config.stellanow_env_config import EnvConfig
+from stellanow_sdk_python.config.enums.mqtt_client import MqttClientTypes
+from stellanow_sdk_python.config.enums.token_rotation import TokenRotationMode
+from stellanow_sdk_python.configure_sdk import configure_sdk
+from stellanow_sdk_python.sinks.mqtt.auth_strategy.i_mqtt_auth_strategy import (
+    IMqttAuthStrategy,
+    MqttCredentialsTarget,
+    TokenListener,
+)
+from stellanow_sdk_python.sinks.mqtt.stellanow_asyncio_mqtt_sink import StellaNowAsyncioMqttSink
+from stellanow_sdk_python.sinks.mqtt.stellanow_mqtt_pool_sink import StellaNowMqttPoolSink
+from stellanow_sdk_python.sinks.mqtt.stellanow_mqtt_sink import StellaNowMqttSink
+from tests.mqtt_broker_stub import MqttBrokerStub
+from tests.test_stellanow_message_queue import make_event
+from tests.test_stellanow_mqtt_pool_sink import PROJECT_INFO, connect_pool
+
+
+class RotatingTokenAuthStrategy(IMqttAuthStrategy):
+    """Auth strategy handing out a token that the test rotates, as an OIDC refresh would."""
+
+    def __init__(self, token: str = "token-0"):
+        self.token = token
+        self.listeners: list[TokenListener] = []
+
+    async def authenticate(self, client: MqttCredentialsTarget) -> None:
+        client.username_pw_set(username=self.token, password=None)
+
+    def add_token_listener(self, listener: TokenListener) -> None:
+        self.listeners.append(listener)
+
+    async def rotate(self, token: str) -> None:
+        self.token = token
+        for listener in self.listeners:
+            await listener(token)
+
+
+@pytest.fixture
+async def broker():
+    """Fixture providing a running local MQTT broker stand-in."""
+    async with MqttBrokerStub() as broker:
+        yield broker
+
+
+def make_sink(broker: MqttBrokerStub, auth_strategy: IMqttAuthStrategy, mode: TokenRotationMode) -> StellaNowMqttSink:
+    env_config = EnvConfig.create_custom_env(api_base_url="http://localhost", mqtt_broker_url=broker.url)
+    return StellaNowMqttSink(
+        auth_strategy=auth_strategy, env_config=env_config, project_info=PROJECT_INFO, token_rotation=mode
+    )
+
+
+@pytest.mark.asyncio
+async def test_make_before_break_rotation_keeps_publishing(broker: MqttBrokerStub):
+    """Test that messages keep flowing while the connection moves to a new client authenticated by the new token."""
+    auth_strategy = RotatingTokenAuthStrategy()
+    sink = make_sink(broker, auth_strategy, TokenRotationMode.MAKE_BEFORE_BREAK)
+    await sink.connect()
+    old_client_id = sink.client_id
+
+    rejected = 0
+    sent = 0
+
+    async def publish_continuously() -> None:
+        nonlocal rejected, sent
+        while True:
+            try:
+                await sink.send_message(make_event("entity", sent))
+                sent += 1
+            except Exception:
+                rejected += 1
+            await asyncio.sleep(0.001)
+
+    publisher = asyncio.create_task(publish_continuously())
+    await asyncio.sleep(0.05)
+    await auth_strategy.rotate("token-1")
+    await asyncio.sleep(0.05)
+    publisher.cancel()
+
+    assert rejected == 0
+    assert sink.client_id != old_client_id
+    assert broker.connects[-1].client_id == sink.client_id
+    assert broker.connects[-1].username == "token-1"
+    received = await broker.wait_for_messages(sent)
+    assert {publish.client_id for publish in received} == {old_client_id, sink.client_id}
+    async with asyncio.timeout(5):
+        while old_client_id in broker.connected_client_ids:
+            await asyncio.sleep(0.01)
+    await sink.disconnect()
+
+
+@pytest.mark.asyncio
+async def test_reconnect_rotation_reconnects_with_new_token(broker: MqttBrokerStub):
+    """Test that the default rotation reconnects the same client, resuming its session, with the new token."""
+    auth_strategy = RotatingTokenAuthStrategy()
+    sink = make_sink(broker, auth_strategy, TokenRotationMode.RECONNECT)
+    await sink.connect()
+
+    await auth_strategy.rotate("token-1")
+    async with asyncio.timeout(5):
+        while len(broker.connects) < 2 or not sink.is_connected():
+            await asyncio.sleep(0.01)
+
+    assert [connect.client_id for connect in broker.connects] == [sink.client_id] * 2
+    assert broker.connects[-1].username == "token-1"
+    assert not broker.connects[-1].clean_start
+    await sink.disconnect()
+
+
+@pytest.mark.asyncio
+async def test_pool_reconnect_rotation_keeps_other_connections_up(broker: MqttBrokerStub):
+    """Test that pooled connections reconnect for a refreshed token one at a time rather than all at once."""
+    auth_strategy = RotatingTokenAuthStrategy()
+    env_config = EnvConfig.create_custom_env(api_base_url="http://localhost", mqtt_broker_url=broker.url)
+    sink = StellaNowMqttPoolSink(
+        auth_strategy=auth_strategy, env_config=env_config, project_info=PROJECT_INFO, pool_size=3
+    )
+    await connect_pool(sink)
+
+    lowest = len(sink.sinks)
+
+    async def watch_connections() -> None:
+        nonlocal lowest
+        while True:
+            lowest = min(lowest, sink.connected_count)
+            await asyncio.sleep(0)
+
+    watcher = asyncio.create_task(watch_connections())
+    auth_strategy.token = "token-1"
+    # Listeners are notified concurrently, as the OIDC strategy does
+    await asyncio.gather(*(listener("token-1") for listener in auth_strategy.listeners))
+    watcher.cancel()
+
+    assert lowest == len(sink.sinks) - 1
+    assert sink.connected_count == len(sink.sinks)
+    assert [connect.username for connect in broker.connects[-3:]] == ["token-1"] * 3
+    await sink.disconnect()
+
+
+@pytest.mark.asyncio
+async def test_asyncio_sink_reconnects_with_new_token(broker: MqttBrokerStub):
+    """Test that the asyncio sink reconnects with a refreshed token, resuming its session."""
+    auth_strategy = RotatingTokenAuthStrategy()
+    env_config = EnvConfig.create_custom_env(api_base_url="http://localhost", mqtt_broker_url=broker.url)
+    sink = StellaNowAsyncioMqttSink(auth_strategy=auth_strategy, env_config=env_config, project_info=PROJECT_INFO)
+    await sink.connect()
+
+    await auth_strategy.rotate("token-1")
+    async with asyncio.timeout(5):
+        while len(broker.connects) < 2 or not sink.is_connected():
+            await asyncio.sleep(0.01)
+
+    assert [connect.client_id for connect in broker.connects] == [sink.client_id] * 2
+    assert broker.connects[-1].username == "token-1"
+    assert not broker.connects[-1].clean_start
+    await sink.send_message(make_event("entity", 0))
+    await broker.wait_for_messages(1)
+    await sink.disconnect()
+
+
+@pytest.mark.parametrize(
+    "options",
+    [
+        {"mqtt_client_type": MqttClientTypes.ASYNCIO.value, "hot_standby": True},
+        {"mqtt_client_type": MqttClientTypes.ASYNCIO.value, "token_rotation_mode": "make_before_break"},
+        {"mqtt_client_type": MqttClientTypes.ASYNCIO.value, "connection_pool_size": 2},
+        {"hot_standby": True, "connection_pool_size": 2},
+    ],
+)
+def test_configure_sdk_rejects_unsupported_connection_options(options: dict):
+    """Test that connection options a sink cannot honour are rejected instead of silently ignored."""
+    with pytest.raises(ValueError, match="asyncio MQTT client|connection pool"):
+        configure_sdk(auth_strategy_type="none", env_config=EnvConfig.stellanow_dev(), **options)
@@ -0,0 +1,239 @@
+"""
+Copyright (C) 2022-2025 Stella Technologies (UK) Limited.
+
+Permission is hereby granted, free of charge, to any person obtaining a copy
+of this software and associated documentation files (the "Software"), to deal
+in the Software without restriction, including without limitation the rights
+to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+copies of the Software, and to permit persons to whom the Software is
+furnished to do so, subject to the following conditions:
+
+The above copyright notice and this permission notice shall be included in
+all copies or substantial portions of the Software.
+
+THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING
+FROM, OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS
+IN THE SOFTWARE.
+"""
+
+from datetime import UTC, datetime, timedelta
+from typing import Optional
+
+import pytest
+
+from stellanow_sdk_python.config.eniviroment_config.stellanow_env_config import EnvConfig
+from stellanow_sdk_python.configure_sdk import configure_sdk
+from stellanow_sdk_python.message_queue.message_queue_strategy import (
+    expiring_message_queue_strategy,
+    priority_message_queue_strategy,
+)
+from stellanow_sdk_python.message_queue.message_queue_strategy.coalescing_message_queue_strategy import (
+    CoalescingMessageQueueStrategy,
+)
+from stellanow_sdk_python.message_queue.message_queue_strategy.expiring_message_queue_strategy import (
+    ExpiringMessageQueueStrategy,
+)
+from stellanow_sdk_python.message_queue.message_queue_strategy.fifo_message_queue_strategy import (
+    FifoMessageQueueStrategy,
+)
+from stellanow_sdk_python.message_queue.message_queue_strategy.i_message_queue_strategy import IMessageQueueStrategy
+from stellanow_sdk_python.message_queue.message_queue_strategy.priority_message_queue_strategy import (
+    PriorityMessageQueueStrategy,
+)
+from stellanow_sdk_python.messages.event import StellaNowEventWrapper
+from stellanow_sdk_python.messages.message import Entity, StellaNowMessageWrapper
+from tests.test_stellanow_message_queue import ORGANIZATION_ID, PROJECT_ID
+
+
+def make_typed_event(
+    entity_id: str, event_type: str, sequence: int, origin: Optional[datetime] = None
+) -> StellaNowEventWrapper:
+    """Create an event of the given type for the given entity carrying its sequence number as payload."""
+    wrapper = StellaNowMessageWrapper.create_raw(
+        event_type_definition_id=event_type,
+        entity_types=[Entity(entity_type_definition_id="test", entity_id=entity_id)],
+        message_json=str(sequence),
+        message_origin_date_utc=origin,
+    )
+    return StellaNowEventWrapper.create(message=wrapper, organization_id=ORGANIZATION_ID, project_id=PROJECT_ID)
+
+
+def drain(strategy: IMessageQueueStrategy) -> list[tuple[str, str, str]]:
+    """Dequeue every message as (entity ID, event type, payload)."""
+    messages = []
+    while (message := strategy.try_dequeue()) is not None:
+        messages.append((message.key.entity_id, message.event_type_definition_id, message.value.payload))
+    return messages
+
+
+def test_coalescing_strategy_keeps_latest_message_in_place():
+    """Test that a newer message of a coalesced event type takes the place of the queued one."""
+    strategy = CoalescingMessageQueueStrategy(coalesced_event_types=["position"])
+    strategy.enqueue(make_typed_event("a", "position", 1))
+    strategy.enqueue(make_typed_event("b", "position", 2))
+    strategy.enqueue(make_typed_event("a", "click", 3))
+    strategy.enqueue(make_typed_event("a", "position", 4))
+    strategy.enqueue(make_typed_event("a", "click", 5))
+
+    assert strategy.get_message_count() == 4
+    assert strategy.coalesced_count == 1
+    assert drain(strategy) == [
+        ("a", "position", "4"),
+        ("b", "position", "2"),
+        ("a", "click", "3"),
+        ("a", "click", "5"),
+    ]
+    assert strategy.is_empty()
+
+
+def test_coalescing_strategy_queues_again_after_dequeue():
+    """Test that a message dequeued for delivery is not replaced by the next one of its entity and event type."""
+    strategy = CoalescingMessageQueueStrategy(coalesced_event_types=["position"])
+    strategy.enqueue(make_typed_event("a", "position", 1))
+    assert strategy.try_dequeue() is not None
+
+    strategy.enqueue(make_typed_event("a", "position", 2))
+
+    assert drain(strategy) == [("a", "position", "2")]
+    assert strategy.coalesced_count == 0
+
+
+def test_coalescing_strategy_drops_older_requeued_message():
+    """Test that a message handed back after a failed attempt does not replace a newer queued one."""
+    strategy = CoalescingMessageQueueStrategy(coalesced_event_types=["position"])
+    now = datetime.now(UTC)
+    strategy.enqueue(make_typed_event("a", "position", 2, origin=now))
+
+    strategy.enqueue(make_typed_event("a", "position", 1, origin=now - timedelta(seconds=1)))
+
+    assert drain(strategy) == [("a", "position", "2")]
+    assert strategy.coalesced_count == 1
+
+
+def test_configure_sdk_requires_coalesced_event_types():
+    """Test that the coalescing queue strategy is rejected without event types to coalesce."""
+    with pytest.raises(ValueError, match="event types to coalesce"):
+        configure_sdk(auth_strategy_type="none", env_config=EnvConfig.stellanow_dev(), queue_strategy_type="coalescing")
+
+
+def test_priority_strategy_sends_higher_priorities_first_in_order():
+    """Test that messages of higher priority overtake the others, while equal priorities stay first-in, first-out."""
+    strategy = PriorityMessageQueueStrategy(event_type_priorities={"receipt": 10, "telemetry": -1})
+    strategy.enqueue(make_typed_event("a", "telemetry", 1))
+    strategy.enqueue(make_typed_event("a", "click", 2))
+    strategy.enqueue(make_typed_event("a", "receipt", 3))
+    strategy.enqueue(make_typed_event("b", "telemetry", 4))
+    strategy.enqueue(make_typed_event("b", "receipt", 5))
+
+    assert strategy.get_message_count() == 5
+    assert [payload for _, _, payload in drain(strategy)] == ["3", "5", "2", "1", "4"]
+    assert strategy.is_empty()
+
+
+def test_priority_strategy_prefers_priority_set_on_message():
+    """Test that a priority set on a message overrides the priority of its event type."""
+    strategy = PriorityMessageQueueStrategy(event_type_priorities={"receipt": 10})
+    strategy.enqueue(make_typed_event("a", "receipt", 1))
+    urgent = make_typed_event("a", "telemetry", 2)
+    urgent.priority = 20
+    strategy.enqueue(urgent)
+
+    assert [payload for _, _, payload in drain(strategy)] == ["2", "1"]
+
+
+def test_priority_strategy_ages_waiting_messages(monkeypatch):
+    """Test that a message of low priority is sent once it has waited long enough, despite newer important ones."""
+    now = [0.0]
+    monkeypatch.setattr(priority_message_queue_strategy.time, "monotonic", lambda: now[0])
+    strategy = PriorityMessageQueueStrategy(event_type_priorities={"receipt": 2}, aging_interval=10.0)
+    strategy.enqueue(make_typed_event("a", "telemetry", 1))
+
+    now[0] = 15.0
+    strategy.enqueue(make_typed_event("a", "receipt", 2))
+    assert strategy.try_dequeue().value.payload == "2"
+
+    now[0] = 25.0
+    strategy.enqueue(make_typed_event("a", "receipt", 3))
+    assert strategy.try_dequeue().value.payload == "1"
+
+
+def test_priority_strategy_rejects_invalid_aging_interval():
+    """Test that the aging interval must be positive."""
+    with pytest.raises(ValueError, match="aging interval"):
+        PriorityMessageQueueStrategy(aging_interval=0)
+
+
+@pytest.fixture
+def wall_clock(monkeypatch):
+    """Wall clock of the expiring strategy, frozen at the current time until the test advances it."""
+    now = [datetime.now(UTC).timestamp()]
+    monkeypatch.setattr(expiring_message_queue_strategy.time, "time", lambda: now[0])
+    return now
+
+
+def origin_at(timestamp: float) -> datetime:
+    return datetime.fromtimestamp(timestamp, UTC)
+
+
+def test_expiring_strategy_drops_messages_expired_before_queuing(wall_clock):
+    """Test that a message older than its maximum age is not queued, and counted by event type."""
+    strategy = ExpiringMessageQueueStrategy(FifoMessageQueueStrategy(), max_age=60.0)
+    strategy.enqueue(make_typed_event("a", "telemetry", 1, origin=origin_at(wall_clock[0] - 61)))
+    strategy.enqueue(make_typed_event("a", "telemetry", 2, origin=origin_at(wall_clock[0] - 59)))
+
+    assert drain(strategy) == [("a", "telemetry", "2")]
+    assert strategy.expired_counts == {"telemetry": 1}
+
+
+def test_expiring_strategy_expires_queued_messages_by_event_type(wall_clock):
+    """Test that queued messages expire after the maximum age of their event type, without dequeuing them."""
+    inner = FifoMessageQueueStrategy()
+    strategy = ExpiringMessageQueueStrategy(inner, max_age=60.0, event_type_max_ages={"telemetry": 10.0})
+    origin = origin_at(wall_clock[0])
+    strategy.enqueue(make_typed_event("a", "telemetry", 1, origin=origin))
+    strategy.enqueue(make_typed_event("a", "receipt", 2, origin=origin))
+    strategy.enqueue(make_typed_event("b", "telemetry", 3, origin=origin))
+
+    wall_clock[0] += 12.0
+    assert strategy.get_message_count() == 1
+    assert strategy.expired_counts == {"telemetry": 2}
+
+    wall_clock[0] += 60.0
+    assert strategy.is_empty()
+    assert inner.is_empty()
+    assert strategy.expired_counts == {"telemetry": 2, "receipt": 1}
+
+
+def test_expiring_strategy_skips_expired_messages_on_dequeue(wall_clock):
+    """Test that dequeuing passes over expired messages and keeps the order of the others."""
+    strategy = ExpiringMessageQueueStrategy(FifoMessageQueueStrategy(), event_type_max_ages={"telemetry": 10.0})
+    origin = origin_at(wall_clock[0])
+    strategy.enqueue(make_typed_event("a", "receipt", 1, origin=origin))
+    strategy.enqueue(make_typed_event("a", "telemetry", 2, origin=origin))
+    strategy.enqueue(make_typed_event("a", "receipt", 3, origin=origin))
+
+    wall_clock[0] += 30.0
+    assert drain(strategy) == [("a", "receipt", "1"), ("a", "receipt", "3")]
+    assert strategy.expired_counts == {"telemetry": 1}
+
+
+def test_expiring_strategy_expires_coalesced_messages_on_dequeue(wall_clock):
+    """Test that messages of a strategy replacing messages expire when dequeued."""
+    strategy = ExpiringMessageQueueStrategy(
+        CoalescingMessageQueueStrategy(coalesced_event_types=["position"]), max_age=10.0
+    )
+    strategy.enqueue(make_typed_event("a", "position", 1, origin=origin_at(wall_clock[0])))
+    strategy.enqueue(make_typed_event("a", "position", 2, origin=origin_at(wall_clock[0] + 5)))
+
+    wall_clock[0] += 12.0
+    assert strategy.get_message_count() == 1
+    assert drain(strategy) == [("a", "position", "2")]
+
+    strategy.enqueue(make_typed_event("a", "position", 3, origin=origin_at(wall_clock[0])))
+    wall_clock[0] += 12.0
+    assert drain(strategy) == []
+    assert strategy.expired_counts == {"position": 1}
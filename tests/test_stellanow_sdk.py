@@ -66,6 +66,7 @@ def mock_sink():
     mock.connect = AsyncMock()
     mock.send_message = AsyncMock()
     mock.disconnect = AsyncMock()
+    mock.wait_for_acknowledgements = AsyncMock(return_value=0)
     return mock
 
 
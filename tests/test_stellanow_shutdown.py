@@ -0,0 +1,174 @@
+"""
+Copyright (C) 2022-2025 Stella Technologies (UK) Limited.
+
+Permission is hereby granted, free of charge, to any person obtaining a copy
+of this software and associated documentation files (the "Software"), to deal
+in the Software without restriction, including without limitation the rights
+to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+copies of the Software, and to permit persons to whom the Software is
+furnished to do so, subject to the following conditions:
+
+The above copyright notice and this permission notice shall be included in
+all copies or substantial portions of the Software.
+
+THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING
+FROM, OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS
+IN THE SOFTWARE.
+"""
+
+import asyncio
+
+import pytest
+
+from stellanow_sdk_python.message_queue.dead_letter_store.file_dead_letter_store import FileDeadLetterStore
+from stellanow_sdk_python.message_queue.dead_letter_store.in_memory_dead_letter_store import InMemoryDeadLetterStore
+from stellanow_sdk_python.message_queue.message_queue_strategy.expiring_message_queue_strategy import (
+    ExpiringMessageQueueStrategy,
+)
+from stellanow_sdk_python.message_queue.message_queue_strategy.fifo_message_queue_strategy import (
+    FifoMessageQueueStrategy,
+)
+from stellanow_sdk_python.messages.event import StellaNowEventWrapper
+from stellanow_sdk_python.sdk import StellaNowSDK
+from stellanow_sdk_python.sinks.i_stellanow_sink import RejectionListener
+from tests.test_stellanow_message_queue import RecordingSink, make_event, wait_for_delivery
+from tests.test_stellanow_mqtt_pool_sink import PROJECT_INFO
+
+
+class RejectingSink(RecordingSink):
+    """Recording sink whose receiving end refuses the messages of some entities after they were sent."""
+
+    def __init__(self, rejected_entities: set[str]):
+        super().__init__()
+        self.rejected_entities = rejected_entities
+        self.listeners: list[RejectionListener] = []
+
+    def add_rejection_listener(self, listener: RejectionListener) -> None:
+        self.listeners.append(listener)
+
+    async def send_message(self, message: StellaNowEventWrapper) -> None:
+        await super().send_message(message)
+        if message.key.entity_id in self.rejected_entities:
+            for listener in self.listeners:
+                listener(message, "Quota exceeded")
+
+
+@pytest.mark.asyncio
+async def test_flush_delivers_queued_messages_without_blocking_the_loop():
+    """Test that flush() returns once every queued message is delivered, while other tasks keep running."""
+    sink = RecordingSink(latency=0.01)
+    sdk = StellaNowSDK(project_info=PROJECT_INFO, sink=sink, queue_strategy=FifoMessageQueueStrategy())
+    await sdk.start()
+    for seq in range(20):
+        await sdk.send_message(make_event("entity", seq))
+
+    ticks = 0
+
+    async def tick() -> None:
+        nonlocal ticks
+        while True:
+            ticks += 1
+            await asyncio.sleep(0.01)
+
+    ticker = asyncio.create_task(tick())
+    result = await sdk.flush(timeout=5.0)
+    ticker.cancel()
+
+    assert (result.delivered, result.abandoned) == (20, 0)
+    assert len(sink.delivered) == 20
+    assert ticks > 1
+    await sdk.stop()
+
+
+@pytest.mark.asyncio
+async def test_stop_reports_abandoned_messages_at_the_deadline():
+    """Test that stop() gives up after its timeout and reports the messages it could not deliver."""
+    sink = RecordingSink()
+    sdk = StellaNowSDK(project_info=PROJECT_INFO, sink=sink, queue_strategy=FifoMessageQueueStrategy())
+    await sdk.start()
+    sink.connected = False
+    for seq in range(5):
+        await sdk.send_message(make_event("entity", seq))
+
+    async with asyncio.timeout(2):
+        result = await sdk.stop(timeout=0.2)
+
+    assert (result.delivered, result.abandoned, result.persisted) == (0, 5, 0)
+
+
+@pytest.mark.asyncio
+async def test_flush_does_not_count_rejected_messages_as_delivered():
+    """Test that messages refused after sending are reported as rejected and moved to the dead letter store."""
+    sink = RejectingSink(rejected_entities={"refused"})
+    dead_letters = InMemoryDeadLetterStore()
+    sdk = StellaNowSDK(
+        project_info=PROJECT_INFO,
+        sink=sink,
+        queue_strategy=FifoMessageQueueStrategy(),
+        dead_letter_store=dead_letters,
+    )
+    await sdk.start()
+    refused = make_event("refused", 0)
+    await sdk.send_message(refused)
+    await sdk.send_message(make_event("accepted", 0))
+
+    result = await sdk.flush(timeout=2.0)
+
+    assert (result.delivered, result.rejected, result.abandoned) == (1, 1, 0)
+    assert [message.message_id for message in dead_letters.drain()] == [refused.message_id]
+    await sdk.stop()
+
+
+@pytest.mark.asyncio
+async def test_flush_returns_once_queued_messages_expire():
+    """Test that flush() returns as soon as the messages queued while the sink is down have expired."""
+    sink = RecordingSink()
+    strategy = ExpiringMessageQueueStrategy(FifoMessageQueueStrategy(), max_age=0.3, resolution=0.1)
+    sdk = StellaNowSDK(project_info=PROJECT_INFO, sink=sink, queue_strategy=strategy)
+    await sdk.start()
+    sink.connected = False
+    for seq in range(3):
+        await sdk.send_message(make_event("entity", seq))
+
+    loop = asyncio.get_running_loop()
+    started = loop.time()
+    result = await sdk.flush(timeout=3.0)
+
+    assert loop.time() - started < 1.5
+    assert (result.delivered, result.abandoned) == (0, 0)
+    assert strategy.expired_counts == {"test_event": 3}
+    await sdk.stop()
+
+
+@pytest.mark.asyncio
+async def test_undelivered_messages_are_persisted_for_the_next_start(tmp_path):
+    """Test that messages left at stop() are written to the pending store and sent after the next start()."""
+    sink = RecordingSink()
+    pending_store = FileDeadLetterStore(tmp_path / "pending.jsonl")
+    sdk = StellaNowSDK(
+        project_info=PROJECT_INFO, sink=sink, queue_strategy=FifoMessageQueueStrategy(), pending_store=pending_store
+    )
+    await sdk.start()
+    sink.connected = False
+    events = [make_event("entity", seq) for seq in range(3)]
+    for seq, event in enumerate(events):
+        await sdk.send_message(event, priority=seq)
+    result = await sdk.stop(timeout=0.1)
+    assert result.persisted == 3
+
+    sink = RecordingSink()
+    sdk = StellaNowSDK(
+        project_info=PROJECT_INFO,
+        sink=sink,
+        queue_strategy=FifoMessageQueueStrategy(),
+        pending_store=FileDeadLetterStore(tmp_path / "pending.jsonl"),
+    )
+    await sdk.start()
+    await wait_for_delivery(sink, 3)
+    assert [message.message_id for message in sink.delivered] == [event.message_id for event in events]
+    assert [message.priority for message in sink.delivered] == [0, 1, 2]
+    await sdk.stop()
@@ -0,0 +1,77 @@
+"""
+Copyright (C) 2022-2025 Stella Technologies (UK) Limited.
+
+Permission is hereby granted, free of charge, to any person obtaining a copy
+of this software and associated documentation files (the "Software"), to deal
+in the Software without restriction, including without limitation the rights
+to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+copies of the Software, and to permit persons to whom the Software is
+furnished to do so, subject to the following conditions:
+
+The above copyright notice and this permission notice shall be included in
+all copies or substantial portions of the Software.
+
+THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING
+FROM, OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS
+IN THE SOFTWARE.
+"""
+
+import asyncio
+
+import pytest
+
+from stellanow_sdk_python.message_queue.message_queue_strategy.fifo_message_queue_strategy import (
+    FifoMessageQueueStrategy,
+)
+from stellanow_sdk_python.sdk import StellaNowSDK
+from tests.test_stellanow_message_queue import RecordingSink, make_event, wait_for_delivery
+from tests.test_stellanow_mqtt_pool_sink import PROJECT_INFO
+
+
+class GatedSink(RecordingSink):
+    """Sink stand-in whose connection is only established once the test opens the gate."""
+
+    def __init__(self) -> None:
+        super().__init__()
+        self.connected = False
+        self.gate = asyncio.Event()
+
+    async def connect(self) -> None:
+        await self.gate.wait()
+        self.connected = True
+
+
+@pytest.mark.asyncio
+async def test_start_without_waiting_queues_messages_while_connecting():
+    """Test that start(wait_for_connection=False) returns at once and sends queued messages after connecting."""
+    sink = GatedSink()
+    sdk = StellaNowSDK(project_info=PROJECT_INFO, sink=sink, queue_strategy=FifoMessageQueueStrategy())
+    async with asyncio.timeout(1):
+        await sdk.start(wait_for_connection=False)
+    for seq in range(3):
+        await sdk.send_message(make_event("entity", seq))
+
+    assert not await sdk.wait_until_ready(timeout=0.05)
+    assert not sink.delivered
+
+    sink.gate.set()
+    assert await sdk.wait_until_ready(timeout=1)
+    await wait_for_delivery(sink, 3)
+    await sdk.stop()
+
+
+@pytest.mark.asyncio
+async def test_stop_while_still_connecting():
+    """Test that stopping an SDK whose sink never connected does not wait for the connection."""
+    sink = GatedSink()
+    sdk = StellaNowSDK(project_info=PROJECT_INFO, sink=sink, queue_strategy=FifoMessageQueueStrategy())
+    await sdk.start(wait_for_connection=False)
+    await sdk.send_message(make_event("entity", 0))
+
+    async with asyncio.timeout(2):
+        result = await sdk.stop(timeout=0.1)
+    assert result.abandoned == 1
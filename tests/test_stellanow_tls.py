@@ -0,0 +1,111 @@
+"""
+Copyright (C) 2022-2025 Stella Technologies (UK) Limited.
+
+Permission is hereby granted, free of charge, to any person obtaining a copy
+of this software and associated documentation files (the "Software"), to deal
+in the Software without restriction, including without limitation the rights
+to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+copies of the Software, and to permit persons to whom the Software is
+furnished to do so, subject to the following conditions:
+
+The above copyright notice and this permission notice shall be included in
+all copies or substantial portions of the Software.
+
+THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING
+FROM, OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS
+IN THE SOFTWARE.
+"""
+
+import shutil
+import ssl
+import subprocess
+
+import pytest
+
+from stellanow_sdk_python.config.eniviroment_config.stellanow_env_config import EnvConfig
+from stellanow_sdk_python.sinks.mqtt.auth_strategy.no_auth_mqtt_auth_strategy import NoAuthMqttAuthStrategy
+from stellanow_sdk_python.sinks.mqtt.utils.mqtt_url_parser import parse_mqtt_url
+from stellanow_sdk_python.sinks.mqtt.utils.tls_context import ResumableSSLContext, TlsConfig
+from tests.mqtt_broker_stub import MqttBrokerStub
+from tests.test_stellanow_mqtt_pool_sink import PROJECT_INFO
+from tests.test_stellanow_mqtt_sink_contract import SINK_CLASSES, wait_until
+
+
+@pytest.fixture(scope="module")
+def certificate(tmp_path_factory):
+    """Fixture providing the paths of a self-signed certificate for localhost and its key."""
+    if shutil.which("openssl") is None:
+        pytest.skip("openssl is required to create a test certificate")
+    directory = tmp_path_factory.mktemp("tls")
+    cert_file, key_file = directory / "cert.pem", directory / "key.pem"
+    subprocess.run(
+        ["openssl", "req", "-x509", "-newkey", "ec", "-pkeyopt", "ec_paramgen_curve:prime256v1", "-nodes"]
+        + ["-keyout", str(key_file), "-out", str(cert_file), "-days", "1", "-subj", "/CN=localhost"]
+        + ["-addext", "subjectAltName=DNS:localhost"],
+        check=True,
+        capture_output=True,
+    )
+    return str(cert_file), str(key_file)
+
+
+@pytest.fixture
+async def tls_broker(certificate):
+    """Fixture providing a broker stand-in accepting TLS connections with the test certificate."""
+    server_context = ssl.create_default_context(ssl.Purpose.CLIENT_AUTH)
+    server_context.load_cert_chain(*certificate)
+    async with MqttBrokerStub(ssl_context=server_context) as broker:
+        yield broker
+
+
+def test_ssl_context_is_shared_per_url_config():
+    config = parse_mqtt_url("mqtts://broker.example.com")
+
+    assert isinstance(config.ssl_context, ResumableSSLContext)
+    assert config.ssl_context is config.ssl_context
+    assert config.ssl_context.verify_mode == ssl.CERT_REQUIRED
+    assert config.ssl_context.check_hostname
+    assert parse_mqtt_url("mqtt://broker.example.com").ssl_context is None
+
+
+def test_tls_config_applies_options(certificate):
+    cert_file, key_file = certificate
+    context = TlsConfig(
+        ca_file=cert_file,
+        cert_file=cert_file,
+        key_file=key_file,
+        ciphers="ECDHE+AESGCM",
+        alpn_protocols=["mqtt"],
+        minimum_version=ssl.TLSVersion.TLSv1_3,
+    ).create_ssl_context()
+
+    assert context.minimum_version == ssl.TLSVersion.TLSv1_3
+    assert [cert["subject"] for cert in context.get_ca_certs()] == [((("commonName", "localhost"),),)]
+    tls12_ciphers = [cipher["name"] for cipher in context.get_ciphers() if cipher["protocol"] == "TLSv1.2"]
+    assert tls12_ciphers and all(name.startswith("ECDHE-") and "-GCM-" in name for name in tls12_ciphers)
+
+
+def test_tls_config_rejects_key_without_certificate():
+    with pytest.raises(ValueError):
+        TlsConfig(key_file="key.pem")
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("sink_class", SINK_CLASSES, ids=lambda sink_class: sink_class.__name__)
+async def test_sink_resumes_tls_session_on_reconnect(sink_class, tls_broker: MqttBrokerStub, certificate):
+    """Test that reconnects share one TLS context and resume the session of the previous connection."""
+    env_config = EnvConfig.create_custom_env(
+        api_base_url="http://localhost", mqtt_broker_url=tls_broker.url, tls_config=TlsConfig(ca_file=certificate[0])
+    )
+    sink = sink_class(auth_strategy=NoAuthMqttAuthStrategy(), env_config=env_config, project_info=PROJECT_INFO)
+    await sink.connect()
+
+    for reconnects in range(1, 3):
+        tls_broker.drop_connections()
+        await wait_until(lambda: len(tls_broker.connects) > reconnects and sink.is_connected())
+
+    assert tls_broker.tls_sessions_reused == [False, True, True]
+    await sink.disconnect()
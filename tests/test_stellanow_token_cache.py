@@ -0,0 +1,127 @@
+"""
+Copyright (C) 2022-2025 Stella Technologies (UK) Limited.
+
+Permission is hereby granted, free of charge, to any person obtaining a copy
+of this software and associated documentation files (the "Software"), to deal
+in the Software without restriction, including without limitation the rights
+to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+copies of the Software, and to permit persons to whom the Software is
+furnished to do so, subject to the following conditions:
+
+The above copyright notice and this permission notice shall be included in
+all copies or substantial portions of the Software.
+
+THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING
+FROM, OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS
+IN THE SOFTWARE.
+"""
+
+import os
+import stat
+import time
+from concurrent.futures import ThreadPoolExecutor
+from unittest.mock import AsyncMock
+
+import pytest
+
+from stellanow_sdk_python.authentication.auth_service import StellaNowAuthenticationService
+from stellanow_sdk_python.authentication.file_token_cache import FileTokenCache
+from stellanow_sdk_python.authentication.i_token_cache import CachedToken
+from stellanow_sdk_python.config.eniviroment_config.stellanow_env_config import EnvConfig
+from stellanow_sdk_python.config.stellanow_auth_credentials import StellaNowCredentials
+from tests.test_stellanow_mqtt_pool_sink import PROJECT_INFO
+
+TOKEN_RESPONSE = {
+    "access_token": "fresh-access",
+    "expires_in": 300,
+    "refresh_token": "fresh-refresh",
+    "refresh_expires_in": 1800,
+}
+
+
+def make_token(access_ttl: float = 300, refresh_ttl: float = 1800) -> CachedToken:
+    now = time.time()
+    return CachedToken(
+        access_token="cached-access",
+        access_token_expires_at=now + access_ttl,
+        refresh_token="cached-refresh",
+        refresh_token_expires_at=now + refresh_ttl,
+    )
+
+
+@pytest.fixture
+def cache(tmp_path) -> FileTokenCache:
+    return FileTokenCache(tmp_path / "stellanow" / "tokens.json")
+
+
+@pytest.fixture
+async def auth_service(cache):
+    """Fixture providing an authentication service whose Keycloak calls are mocked."""
+    service = StellaNowAuthenticationService(
+        project_info=PROJECT_INFO,
+        credentials=StellaNowCredentials(username="user", password="secret"),
+        env_config=EnvConfig.create_custom_env(api_base_url="http://localhost", mqtt_broker_url="mqtt://localhost"),
+        token_cache=cache,
+    )
+    service.keycloak_openid.a_token = AsyncMock(return_value=dict(TOKEN_RESPONSE))
+    service.keycloak_openid.a_refresh_token = AsyncMock(return_value=dict(TOKEN_RESPONSE))
+    yield service
+    await service.stop_refresh_task()
+
+
+def test_file_token_cache_round_trip(cache):
+    token = make_token()
+    cache.store("key", token)
+
+    assert cache.load("key") == token
+    assert cache.load("other") is None
+    assert stat.S_IMODE(os.stat(cache.path).st_mode) == 0o600
+
+    cache.remove("key")
+    assert cache.load("key") is None
+
+
+def test_file_token_cache_ignores_malformed_file(cache):
+    cache.path.parent.mkdir(parents=True)
+    cache.path.write_text("{not json")
+
+    assert cache.load("key") is None
+    cache.store("key", make_token())
+    assert cache.load("key") is not None
+
+
+def test_file_token_cache_concurrent_stores_keep_every_entry(cache):
+    with ThreadPoolExecutor(max_workers=8) as executor:
+        list(executor.map(lambda index: FileTokenCache(cache.path).store(f"key-{index}", make_token()), range(32)))
+
+    assert all(cache.load(f"key-{index}") is not None for index in range(32))
+
+
+async def test_authenticate_reuses_cached_access_token(auth_service, cache):
+    cache.store(auth_service._token_cache_key, make_token())
+
+    assert await auth_service.authenticate() == "cached-access"
+    auth_service.keycloak_openid.a_token.assert_not_awaited()
+    auth_service.keycloak_openid.a_refresh_token.assert_not_awaited()
+
+
+async def test_authenticate_redeems_cached_refresh_token(auth_service, cache):
+    cache.store(auth_service._token_cache_key, make_token(access_ttl=-1))
+
+    assert await auth_service.authenticate() == "fresh-access"
+    auth_service.keycloak_openid.a_refresh_token.assert_awaited_once_with("cached-refresh")
+    auth_service.keycloak_openid.a_token.assert_not_awaited()
+    assert cache.load(auth_service._token_cache_key).access_token == "fresh-access"
+
+
+async def test_authenticate_falls_back_to_password_grant(auth_service, cache):
+    cache.store(auth_service._token_cache_key, make_token(access_ttl=-1, refresh_ttl=-1))
+
+    assert await auth_service.authenticate() == "fresh-access"
+    auth_service.keycloak_openid.a_token.assert_awaited_once()
+    auth_service.keycloak_openid.a_refresh_token.assert_not_awaited()
+    assert cache.load(auth_service._token_cache_key).refresh_token == "fresh-refresh"
@@ -0,0 +1,72 @@
+"""
+Copyright (C) 2022-2025 Stella Technologies (UK) Limited.
+
+Permission is hereby granted, free of charge, to any person obtaining a copy
+of this software and associated documentation files (the "Software"), to deal
+in the Software without restriction, including without limitation the rights
+to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+copies of the Software, and to permit persons to whom the Software is
+furnished to do so, subject to the following conditions:
+
+The above copyright notice and this permission notice shall be included in
+all copies or substantial portions of the Software.
+
+THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING
+FROM, OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS
+IN THE SOFTWARE.
+"""
+
+import socket
+
+import pytest
+
+from stellanow_sdk_python.sinks.mqtt.utils.mqtt_url_parser import parse_mqtt_url
+from tests.mqtt_broker_stub import MqttBrokerStub
+from tests.test_stellanow_message_queue import make_event
+from tests.test_stellanow_mqtt_pool_sink import PROJECT_INFO
+from tests.test_stellanow_mqtt_sink_contract import SINK_CLASSES, make_sink, wait_until
+
+pytestmark = pytest.mark.skipif(not hasattr(socket, "AF_UNIX"), reason="Unix domain sockets are not supported")
+
+
+@pytest.fixture
+async def unix_broker(tmp_path):
+    """Fixture providing a broker stand-in listening on a Unix domain socket."""
+    async with MqttBrokerStub(unix_path=str(tmp_path / "mqtt.sock")) as broker:
+        yield broker
+
+
+@pytest.mark.parametrize("scheme", ["unix", "mqtt+unix"])
+def test_parse_unix_socket_url(scheme):
+    """Test that Unix domain socket URLs carry the socket path and use no TLS."""
+    config = parse_mqtt_url(f"{scheme}:///run/nanomq/mqtt.sock")
+
+    assert config.transport == "unix"
+    assert config.hostname == "/run/nanomq/mqtt.sock"
+    assert config.address == "/run/nanomq/mqtt.sock"
+    assert not config.use_tls and config.ssl_context is None
+
+
+def test_parse_unix_socket_url_requires_path():
+    """Test that a Unix domain socket URL without a path is rejected."""
+    with pytest.raises(ValueError, match="socket path"):
+        parse_mqtt_url("unix://")
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("sink_class", SINK_CLASSES, ids=lambda sink_class: sink_class.__name__)
+async def test_sink_publishes_over_unix_socket(sink_class, unix_broker: MqttBrokerStub):
+    """Test that both sinks connect and publish to a broker on a Unix domain socket."""
+    sink = make_sink(sink_class, unix_broker)
+    await sink.connect()
+    await sink.send_message(make_event("entity", 0))
+
+    received = await unix_broker.wait_for_messages(1)
+    assert received[0].client_id == sink.client_id
+    assert received[0].topic == f"in/{PROJECT_INFO.organization_id}"
+    await wait_until(lambda: sink.in_flight_count == 0)
+    await sink.disconnect()